@@ -2,6 +2,7 @@
 import pandas as pd
 import numpy as np
 import math
+from utils.perfil_calculo import contar, medido
 
 class Cable_AEA:
     """
@@ -42,11 +43,49 @@ class Cable_AEA:
         self.propiedades = propiedades
         self.tipocable = tipocable  # Nueva propiedad obligatoria
         
-        # Propiedades básicas (validar y convertir a numéricas)
+        # Propiedades básicas y dependientes del tipo de cable (validadas y numéricas)
+        for atributo, valor in self.leer_propiedades_mecanicas(nombre, propiedades, tipocable).items():
+            setattr(self, atributo, valor)
+
+        self._inicializar_viento(viento_base_params)
+    
+    @classmethod
+    def desde_prototipo(cls, prototipo, viento_base_params=None):
+        """
+        Crea una instancia de cálculo a partir de un prototipo inmutable de la biblioteca
+        de cables, sin volver a validar ni convertir las propiedades
+        
+        Args:
+            prototipo (PrototipoCable): Prototipo con id, nombre, tipocable, propiedades y mecanicas
+            viento_base_params (dict): Parámetros base de viento (OBLIGATORIO)
+        """
+        cable = cls.__new__(cls)
+        cable.id = prototipo.id
+        cable.nombre = prototipo.nombre
+        # Copia propia: el prototipo queda congelado y la instancia se puede copiar y serializar
+        cable.propiedades = dict(prototipo.propiedades)
+        cable.tipocable = prototipo.tipocable
+        for atributo, valor in prototipo.mecanicas.items():
+            setattr(cable, atributo, valor)
+        cable._inicializar_viento(viento_base_params)
+        return cable
+    
+    @staticmethod
+    def leer_propiedades_mecanicas(nombre, propiedades, tipocable):
+        """
+        Valida y convierte las propiedades mecánicas del cable
+        
+        Para cables ACSS se usan sección, módulo y dilatación del núcleo de acero.
+        
+        Returns:
+            dict: diametro_m, peso_unitario_dan_m, carga_rotura_dan, seccion_mm2,
+                  modulo_elasticidad_dan_mm2, coeficiente_dilatacion
+        """
+        mecanicas = {}
         try:
-            self.diametro_m = float(propiedades.get("diametro_total_mm")) / 1000.0
-            self.peso_unitario_dan_m = float(propiedades.get("peso_unitario_dan_m"))
-            self.carga_rotura_dan = float(propiedades.get("carga_rotura_minima_dan"))
+            mecanicas["diametro_m"] = float(propiedades.get("diametro_total_mm")) / 1000.0
+            mecanicas["peso_unitario_dan_m"] = float(propiedades.get("peso_unitario_dan_m"))
+            mecanicas["carga_rotura_dan"] = float(propiedades.get("carga_rotura_minima_dan"))
         except (TypeError, ValueError) as e:
             raise ValueError(
                 f"ERROR: Parámetros numéricos faltantes o inválidos al crear Cable '{nombre}': "
@@ -71,20 +110,24 @@ class Cable_AEA:
             
             # Usar valores de acero para ACSS (validar conversión a numérico)
             try:
-                self.seccion_mm2 = float(propiedades.get("seccion_acero_mm2") if propiedades.get("seccion_acero_mm2") is not None else propiedades.get("seccion_total_mm2"))
-                self.modulo_elasticidad_dan_mm2 = float(propiedades.get("modulo_elasticidad_acero_dan_mm2") if propiedades.get("modulo_elasticidad_acero_dan_mm2") is not None else propiedades.get("modulo_elasticidad_dan_mm2"))
-                self.coeficiente_dilatacion = float(propiedades.get("coeficiente_dilatacion_acero_1_c") if propiedades.get("coeficiente_dilatacion_acero_1_c") is not None else propiedades.get("coeficiente_dilatacion_1_c"))
+                mecanicas["seccion_mm2"] = float(propiedades.get("seccion_acero_mm2") if propiedades.get("seccion_acero_mm2") is not None else propiedades.get("seccion_total_mm2"))
+                mecanicas["modulo_elasticidad_dan_mm2"] = float(propiedades.get("modulo_elasticidad_acero_dan_mm2") if propiedades.get("modulo_elasticidad_acero_dan_mm2") is not None else propiedades.get("modulo_elasticidad_dan_mm2"))
+                mecanicas["coeficiente_dilatacion"] = float(propiedades.get("coeficiente_dilatacion_acero_1_c") if propiedades.get("coeficiente_dilatacion_acero_1_c") is not None else propiedades.get("coeficiente_dilatacion_1_c"))
             except (TypeError, ValueError):
                 raise ValueError(f"ERROR: Parámetros numéricos de acero inválidos para cable ACSS '{nombre}'")
         else:
             # Usar valores normales para otros tipos de cable
             try:
-                self.seccion_mm2 = float(propiedades.get("seccion_total_mm2"))
-                self.modulo_elasticidad_dan_mm2 = float(propiedades.get("modulo_elasticidad_dan_mm2"))
-                self.coeficiente_dilatacion = float(propiedades.get("coeficiente_dilatacion_1_c"))
+                mecanicas["seccion_mm2"] = float(propiedades.get("seccion_total_mm2"))
+                mecanicas["modulo_elasticidad_dan_mm2"] = float(propiedades.get("modulo_elasticidad_dan_mm2"))
+                mecanicas["coeficiente_dilatacion"] = float(propiedades.get("coeficiente_dilatacion_1_c"))
             except (TypeError, ValueError):
                 raise ValueError(f"ERROR: Parámetros numéricos faltantes o inválidos al crear Cable '{nombre}' (seccion/modulo/coefi)")
-
+        
+        return mecanicas
+    
+    def _inicializar_viento(self, viento_base_params):
+        """Inicializa caches de viento, tabla de estados y vano peso"""
         # Cache de cálculos de viento base (OBLIGATORIO)
         if viento_base_params is None:
             raise ValueError("ERROR: No se pudo crear objeto cable, faltan parámetros iniciales de viento base.")
@@ -92,6 +135,10 @@ class Cable_AEA:
         self.viento_base_params = viento_base_params
         self.viento_cache = {}
         
+        # Tabla de cargas por estado climático (memoizada por cálculo)
+        self._tabla_estados = None
+        self._tabla_estados_clave = None
+        
         # Calcular cache de vientos
         self._calcular_cache_vientos(viento_base_params)
         
@@ -119,12 +166,10 @@ class Cable_AEA:
         self.H_PIQANTERIOR = h_anterior
         self.H_PIQPOSTERIOR = h_posterior
         
-        if vano_desnivelado and L_vano is not None:
-            # TODO: Implementar cálculo de vano peso según desnivel de catenarias
-            # Por ahora, placeholder: L_vanopeso = L_vano
-            self.L_vanopeso = L_vano
-        else:
-            self.L_vanopeso = L_vano if L_vano is not None else 0.0
+        # Sin tensiones todavía el vano peso es el geométrico; calculo_mecanico lo
+        # reemplaza por el de las catenarias (calcular_vanos_peso)
+        self.L_vanopeso = L_vano if L_vano is not None else 0.0
+        self.vanos_peso = None
     
     def _calcular_cache_vientos(self, params):
         """
@@ -152,6 +197,9 @@ class Cable_AEA:
         if V is None or Zc is None or Cf is None or L_vano is None:
             raise ValueError(f"ERROR: Faltan parámetros de viento base requeridos en {self.nombre}")
         
+        # Cambian los parámetros de viento: la tabla de estados deja de ser válida
+        self.invalidar_tabla_estados()
+        
         # Diámetros
         d_base = self.diametro_m
         d_hielo = self.diametro_equivalente(t_hielo)
@@ -381,17 +429,66 @@ class Cable_AEA:
                 t_new = t * 0.5
                 
             if abs(t_new - t) < tol:
+                contar("cmc.iteraciones_newton", i + 1)
                 return max(t_new, 0.1)
             
             t = t_new
         
         # Si no converge, devolver el último valor (pero positivo)
+        contar("cmc.iteraciones_newton", max_iter)
+        contar("cmc.newton_sin_convergencia")
         return max(t, 0.1)
+
+    def _resolver_ecuacion_cubica_vectorizada(self, A, B, semilla=100, tol=1e-8, max_iter=1000):
+        """
+        _resolver_ecuacion_cubica para arrays de coeficientes: resuelve todas las ecuaciones
+        t³ + A·t² + B = 0 a la vez (mismo Newton-Raphson, cada elemento se congela al converger)
+        """
+        A, B = np.broadcast_arrays(np.asarray(A, dtype=float), np.asarray(B, dtype=float))
+        t = np.full(A.shape, float(semilla) if semilla > 0 else 1.0)
+        activos = np.ones(A.shape, dtype=bool)
+
+        for i in range(max_iter):
+            f = t**3 + A * t**2 + B
+            f_prime = 3 * t**2 + 2 * A * t
+            plana = np.abs(f_prime) < 1e-12
+
+            # Derivada muy pequeña: paso de bisección como en la versión escalar
+            t_new = np.where(plana, np.where(f > 0, t * 0.9, t * 1.1),
+                             t - f / np.where(plana, 1.0, f_prime))
+            t_new = np.where(t_new <= 0, t * 0.5, t_new)
+
+            convergio = activos & ~plana & (np.abs(t_new - t) < tol)
+            t = np.where(activos, t_new, t)
+            activos &= ~convergio
+            if not activos.any():
+                contar("cmc.iteraciones_newton_vectorizado", i + 1)
+                break
+        else:
+            contar("cmc.iteraciones_newton_vectorizado", max_iter)
+            contar("cmc.newton_sin_convergencia", int(activos.sum()))
+
+        return np.maximum(t, 0.1)
+
+    def invalidar_tabla_estados(self):
+        """Descarta la tabla de cargas por estado (llamar si cambian cable o viento)"""
+        self._tabla_estados = None
+        self._tabla_estados_clave = None
     
-    def _calcular_estado(self, vano, estado_data, t0, q0, parametros_viento):
-        """Calcula tensiones y flechas para un estado climático específico dado un estado básico"""
-        # Obtener parámetros del estado (asegurar valores por defecto si vienen como None)
-        q = estado_data["temperatura"]
+    def _clave_tabla_estados(self, vano, estados_climaticos, parametros_viento):
+        """Clave de la tabla de estados: vano, parámetros de viento y datos de cada estado"""
+        clave_viento = tuple(sorted((k, str(v)) for k, v in (parametros_viento or {}).items()))
+        clave_estados = tuple(
+            (estado_id,
+             estado_data.get("temperatura"),
+             estado_data.get("viento_velocidad") or 0,
+             estado_data.get("espesor_hielo") or 0)
+            for estado_id, estado_data in estados_climaticos.items()
+        )
+        return (vano, clave_viento, clave_estados)
+    
+    def _cargas_estado(self, vano, estado_data, parametros_viento):
+        """Calcula las cargas unitarias de un estado climático (independientes de t0)"""
         viento_velocidad = estado_data.get("viento_velocidad") or 0
         espesor_hielo = estado_data.get("espesor_hielo") or 0
         
@@ -415,8 +512,54 @@ class Cable_AEA:
         else:
             carga_viento = 0
         
-        # Carga vectorial total
-        G = math.sqrt(peso_total**2 + carga_viento**2)
+        return {
+            "temperatura": estado_data["temperatura"],
+            "viento_velocidad": viento_velocidad,
+            "espesor_hielo": espesor_hielo,
+            "peso_total": peso_total,
+            "peso_hielo": peso_hielo,
+            "carga_viento": carga_viento,
+            # Carga vectorial total
+            "G": math.sqrt(peso_total**2 + carga_viento**2),
+            # Carga del estado básico: se asume sin hielo y sin viento
+            "Go": self.cargaPeso(espesor_hielo_m=0)
+        }
+    
+    def construir_tabla_estados(self, vano, estados_climaticos, parametros_viento):
+        """
+        Construye (o reutiliza) la tabla de cargas por estado climático
+        
+        Las cargas de cada estado (peso, hielo, viento, carga vectorial G) no dependen
+        de la tensión del estado básico, por lo que se calculan una sola vez por
+        cálculo y se reutilizan en todas las iteraciones de la búsqueda.
+        
+        Returns:
+            dict: {estado_id: {temperatura, viento_velocidad, espesor_hielo,
+                               peso_total, peso_hielo, carga_viento, G}}
+        """
+        clave = self._clave_tabla_estados(vano, estados_climaticos, parametros_viento)
+        if self._tabla_estados is not None and self._tabla_estados_clave == clave:
+            return self._tabla_estados
+        
+        self._tabla_estados = {
+            estado_id: self._cargas_estado(vano, estado_data, parametros_viento)
+            for estado_id, estado_data in estados_climaticos.items()
+        }
+        self._tabla_estados_clave = clave
+        return self._tabla_estados
+    
+    def _calcular_estado(self, vano, estado_data, t0, q0, parametros_viento, cargas=None):
+        """Calcula tensiones y flechas para un estado climático específico dado un estado básico"""
+        # Cargas del estado (desde la tabla de estados si se provee)
+        if cargas is None:
+            cargas = self._cargas_estado(vano, estado_data, parametros_viento)
+        q = cargas["temperatura"]
+        viento_velocidad = cargas["viento_velocidad"]
+        espesor_hielo = cargas["espesor_hielo"]
+        peso_total = cargas["peso_total"]
+        peso_hielo = cargas["peso_hielo"]
+        carga_viento = cargas["carga_viento"]
+        G = cargas["G"]
         
         # Parámetros del cable
         E = self.modulo_elasticidad_dan_mm2  # daN/mm²
@@ -427,13 +570,8 @@ class Cable_AEA:
         # En daN/mm², usando unidades consistentes
         L = vano
         
-        # Calcular Go (carga del estado básico)
-        # Para el estado básico, usar las condiciones iniciales
-        espesor_hielo_0 = 0  # Asumimos que el estado básico es sin hielo
-        peso_total_0 = self.cargaPeso(espesor_hielo_m=espesor_hielo_0)
-        viento_velocidad_0 = 0  # Asumimos que el estado básico es sin viento
-        carga_viento_0 = 0
-        Go = math.sqrt(peso_total_0**2 + carga_viento_0**2)
+        # Go (carga del estado básico, sin hielo ni viento)
+        Go = cargas["Go"]
         
         # Coeficiente A (corregido con unidades consistentes)
         A = (L**2 * E * Go**2) / (24 * t0**2 * S**2) + alfa * E * (q - q0) - t0
@@ -473,12 +611,93 @@ class Cable_AEA:
     def _calcular_tensiones_estado_basico(self, vano, estados_climaticos, t0, q0, parametros_viento):
         """Calcula tensiones para todos los estados climáticos dado un estado básico"""
         resultados = {}
+        tabla_estados = self.construir_tabla_estados(vano, estados_climaticos, parametros_viento)
         
         for estado_id, estado_data in estados_climaticos.items():
-            resultados[estado_id] = self._calcular_estado(vano, estado_data, t0, q0, parametros_viento)
+            resultados[estado_id] = self._calcular_estado(
+                vano, estado_data, t0, q0, parametros_viento, cargas=tabla_estados[estado_id]
+            )
         
         return resultados
-    
+
+    def tabla_tendido(self, vanos, temperaturas, estado_basico, vano_regulador=None,
+                      estados=None, parametros_viento=None):
+        """
+        Tabla de tendido (tensiones y flechas) para una grilla vanos × temperaturas × estados
+        de hielo/viento a partir de un estado ya resuelto, en una sola evaluación vectorizada
+        de la ecuación de cambio de estado
+
+        Args:
+            vanos (list): Vanos [m]
+            temperaturas (list): Temperaturas [°C]
+            estado_basico (dict): Estado de referencia con "tension_daN_mm2" y "temperatura_C"
+                y opcionalmente "carga_unitaria_daN_m" (por defecto el peso propio). Sirve
+                cualquier estado de los resultados de calculo_mecanico.
+            vano_regulador (float, optional): Si se indica, la tensión de todos los vanos es
+                la del vano regulador (tramo entre retenciones) y solo cambian las flechas;
+                si no, cada vano se resuelve como vano aislado desde el mismo estado básico.
+            estados (list, optional): Estados de carga [{"nombre", "espesor_hielo" [m],
+                "viento_velocidad" [m/s]}]; por defecto solo peso propio.
+            parametros_viento (dict, optional): exposicion, clase, Zc, Cf (si hay viento)
+
+        Returns:
+            dict: "vanos", "temperaturas", "estados" (nombres), "vano_regulador" y arrays
+                [estado, temperatura, vano]: tension_daN_mm2, tiro_daN, flecha_vertical_m,
+                flecha_resultante_m, porcentaje_rotura
+        """
+        vanos = np.asarray(vanos, dtype=float)
+        temperaturas = np.asarray(temperaturas, dtype=float)
+        estados = estados or [{"nombre": "Peso propio"}]
+        parametros_viento = parametros_viento or {}
+
+        E = self.modulo_elasticidad_dan_mm2
+        S = self.seccion_mm2
+        alfa = self.coeficiente_dilatacion
+        t_i = estado_basico["tension_daN_mm2"]
+        q_i = estado_basico["temperatura_C"]
+        G_i = estado_basico.get("carga_unitaria_daN_m") or self.cargaPeso(espesor_hielo_m=0)
+
+        def cargas(vano):
+            """[estado] -> (peso vertical, carga vectorial) para un vano"""
+            por_estado = [self._cargas_estado(vano, {"temperatura": 0, "viento_velocidad": e.get("viento_velocidad", 0),
+                                                     "espesor_hielo": e.get("espesor_hielo", 0)}, parametros_viento)
+                          for e in estados]
+            return (np.array([c["peso_total"] for c in por_estado]), np.array([c["G"] for c in por_estado]))
+
+        # Cargas [estado, vano]: el viento depende del vano (factor de ráfaga)
+        por_vano = [cargas(v) for v in vanos]
+        peso = np.stack([p for p, _ in por_vano], axis=1)
+        G = np.stack([g for _, g in por_vano], axis=1)
+
+        # Ecuación de cambio de estado con ejes [estado, temperatura, vano]
+        dq = (temperaturas - q_i)[None, :, None]
+        if vano_regulador:
+            L = float(vano_regulador)
+            _, G_regulador = cargas(L)
+            A = (L**2 * E * G_i**2) / (24 * t_i**2 * S**2) + alfa * E * dq - t_i
+            B = -(L**2 * E * G_regulador[:, None, None]**2) / (24 * S**2)
+            tension = self._resolver_ecuacion_cubica_vectorizada(A, B, semilla=t_i)
+            tension = np.broadcast_to(tension, (len(estados), len(temperaturas), len(vanos)))
+        else:
+            L = vanos[None, None, :]
+            A = (L**2 * E * G_i**2) / (24 * t_i**2 * S**2) + alfa * E * dq - t_i
+            B = -(L**2 * E * G[:, None, :]**2) / (24 * S**2)
+            tension = self._resolver_ecuacion_cubica_vectorizada(A, B, semilla=t_i)
+
+        tiro = tension * S
+        L2 = vanos[None, None, :]**2
+        return {
+            "vanos": vanos,
+            "temperaturas": temperaturas,
+            "estados": [e.get("nombre", f"Estado {i + 1}") for i, e in enumerate(estados)],
+            "vano_regulador": float(vano_regulador) if vano_regulador else None,
+            "tension_daN_mm2": tension,
+            "tiro_daN": tiro,
+            "flecha_vertical_m": peso[:, None, :] * L2 / (8 * tiro),
+            "flecha_resultante_m": G[:, None, :] * L2 / (8 * tiro),
+            "porcentaje_rotura": tiro / self.carga_rotura_dan * 100,
+        }
+
     def _encontrar_estado_max_tension(self, resultados):
         """Encuentra el estado con máxima tensión"""
         estado_max = None
@@ -612,6 +831,8 @@ class Cable_AEA:
             
             iteracion += 1
         
+        contar("cmc.evaluaciones_estado_basico")
+        contar("cmc.iteraciones_estado_basico", iteracion)
         return resultados_actuales, t0_actual, q0_actual, estado_basico_actual_id
     
     def _buscar_solucion_incremental(self, vano, estados_climaticos, parametros_viento, restricciones_cable,
@@ -684,6 +905,7 @@ class Cable_AEA:
             
             iteracion += 1
         
+        contar("cmc.iteraciones_busqueda", min(iteracion + 1, max_iteraciones))
         if iteracion >= max_iteraciones:
             print(f"    ⚠️  Se alcanzó el máximo de {max_iteraciones} iteraciones sin encontrar violación")
         
@@ -958,6 +1180,7 @@ class Cable_AEA:
             }
         return resultados_nan
     
+    @medido("cmc.calculo_mecanico")
     def calculo_mecanico(self, vano, estados_climaticos, parametros_viento, 
                         restricciones=None, objetivo='FlechaMin', es_guardia=False,
                         resultados_conductor=None, flecha_max_permitida=None,
@@ -1019,6 +1242,10 @@ class Cable_AEA:
             est_data['espesor_hielo'] = est_data.get('espesor_hielo') or 0
             est_data['viento_velocidad'] = est_data.get('viento_velocidad') or 0
 
+        # Tabla de cargas por estado: se construye una vez por cálculo
+        self.invalidar_tabla_estados()
+        self.construir_tabla_estados(vano, estados_climaticos, parametros_viento)
+
         # Para guardia con TiroMin, calcular flecha máxima basada en relación con conductor
         if (es_guardia and objetivo == 'TiroMin' and resultados_conductor and 
             (flecha_max_permitida is None or flecha_max_permitida == 0)):
@@ -1108,6 +1335,13 @@ class Cable_AEA:
         
         # Calcular y cachear catenarias (puntos cada 0.5m)
         self._calcular_y_cachear_catenarias(resultados_final, vano, definicion_catenaria=0.5)
+
+        # Vano peso por estado según desnivel de los piquetes adyacentes
+        self.vanos_peso = self.calcular_vanos_peso(resultados_final, vano)
+        for estado_id, vano_peso in self.vanos_peso.items():
+            resultados_final[estado_id]["vano_peso_m"] = vano_peso
+        if self.vanos_peso:
+            self.L_vanopeso = max(self.vanos_peso.values())
         
         # Generar memoria de cálculo
         from utils.memoria_calculo_cmc import gen_memoria_calculo_CMC
@@ -1143,6 +1377,53 @@ class Cable_AEA:
                 )
             }
     
+    @staticmethod
+    def _distancia_al_vertice(L, h, a):
+        """
+        Distancia horizontal desde un piquete al vértice de la catenaria del vano (vectorizada)
+
+        Para y = a·(cosh((x - x0)/a) - cosh(x0/a)) entre (0, 0) y (L, h) la condición de
+        extremo da x0 = L/2 - a·asinh(h / (2a·sinh(L/2a))), sin iterar. h es la cota del
+        piquete adyacente respecto del actual; x0 < 0 indica que el vértice cae fuera del
+        vano (el cable tira hacia arriba del piquete).
+        """
+        L, h, a = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (L, h, a)))
+        return L / 2 - a * np.arcsinh(h / (2 * a * np.sinh(L / (2 * a))))
+
+    def calcular_vanos_peso(self, resultados, vano, vano_anterior=None, vano_posterior=None):
+        """
+        Vano peso (gravivano) de cada estado climático a partir de las catenarias de los vanos
+        adyacentes: suma de las distancias horizontales del piquete a los vértices del vano
+        anterior y del posterior. Todos los estados se evalúan juntos.
+
+        Con VANO_DESNIVELADO desactivado (o sin desnivel) el resultado es
+        (vano_anterior + vano_posterior) / 2, es decir L_vano con vanos iguales.
+
+        Args:
+            resultados (dict): {estado_id: {"tiro_daN", "peso_total_daN_m", ...}} de calculo_mecanico
+            vano (float): Vano de cálculo [m]
+            vano_anterior, vano_posterior (float, optional): Vanos adyacentes (por defecto `vano`)
+
+        Returns:
+            dict: {estado_id: vano peso [m]}
+        """
+        if not resultados:
+            return {}
+        L_ant = vano_anterior or vano
+        L_post = vano_posterior or vano
+        desnivelado = bool(getattr(self, "VANO_DESNIVELADO", False))
+        h_ant = (getattr(self, "H_PIQANTERIOR", 0.0) or 0.0) if desnivelado else 0.0
+        h_post = (getattr(self, "H_PIQPOSTERIOR", 0.0) or 0.0) if desnivelado else 0.0
+
+        estados = list(resultados.keys())
+        tiro = np.array([resultados[e]["tiro_daN"] for e in estados], dtype=float)
+        peso = np.array([resultados[e]["peso_total_daN_m"] for e in estados], dtype=float)
+        a = tiro / peso  # Parámetro de la catenaria [m]
+
+        vanos_peso = (self._distancia_al_vertice(L_ant, h_ant, a)
+                      + self._distancia_al_vertice(L_post, h_post, a))
+        return {e: float(v) for e, v in zip(estados, vanos_peso)}
+
     def _calcular_catenaria(self, resultados_estado, L_vano, H_desnivel, direccion, definicion=0.5):
         """Calcula catenaria con puntos cada 'definicion' metros"""
         import numpy as np
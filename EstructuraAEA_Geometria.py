@@ -5,6 +5,7 @@ from NodoEstructural import NodoEstructural
 from EstructuraAEA_Geometria_Etapa0 import GeometriaEtapa0
 from EstructuraAEA_Geometria_Etapa1 import GeometriaEtapa1
 from EstructuraAEA_Geometria_Etapa2 import GeometriaEtapa2
+from utils.perfil_calculo import etapa
 
 
 class EstructuraAEA_Geometria:
@@ -788,36 +789,36 @@ class EstructuraAEA_Geometria:
             raise NotImplementedError("Configuración no soportada")
         
         # ETAPA 0: NODO BASE
-        etapa0 = GeometriaEtapa0(self)
-        etapa0.ejecutar()
+        with etapa("dge.etapa0"):
+            GeometriaEtapa0(self).ejecutar()
         
         # ETAPA 1: h1a y Lmen1
-        etapa1 = GeometriaEtapa1(self)
-        etapa1.ejecutar(vano, flecha_max_conductor, flecha_max_guardia)
+        with etapa("dge.etapa1"):
+            GeometriaEtapa1(self).ejecutar(vano, flecha_max_conductor, flecha_max_guardia)
         
         # ETAPA 2: h2a
-        etapa2 = GeometriaEtapa2(self)
-        etapa2.ejecutar()
+        with etapa("dge.etapa2"):
+            GeometriaEtapa2(self).ejecutar()
         
         # ETAPA 3: h3a
         from EstructuraAEA_Geometria_Etapa3 import GeometriaEtapa3
-        etapa3 = GeometriaEtapa3(self)
-        etapa3.ejecutar()
+        with etapa("dge.etapa3"):
+            GeometriaEtapa3(self).ejecutar()
         
         # ETAPA 4: Cable de Guardia
         from EstructuraAEA_Geometria_Etapa4 import GeometriaEtapa4
-        etapa4 = GeometriaEtapa4(self)
-        etapa4.ejecutar()
+        with etapa("dge.etapa4"):
+            GeometriaEtapa4(self).ejecutar()
         
         # ETAPA 5: Checkeo de Conexiones
         from EstructuraAEA_Geometria_Etapa5 import GeometriaEtapa5
-        etapa5 = GeometriaEtapa5(self)
-        etapa5.ejecutar()
+        with etapa("dge.etapa5"):
+            GeometriaEtapa5(self).ejecutar()
         
         # ETAPA 6: Checkeos Finales
         from EstructuraAEA_Geometria_Etapa6 import GeometriaEtapa6
-        etapa6 = GeometriaEtapa6(self)
-        etapa6.ejecutar()
+        with etapa("dge.etapa6"):
+            GeometriaEtapa6(self).ejecutar()
         
         # Extraer valores ya calculados en Etapa1 (NO recalcular)
         theta_max = self.dimensiones.get('theta_max', 0)
@@ -189,6 +189,12 @@ class EstructuraAEA_Mecanica:
                 )
                 return tiro_trans, tiro_long, 1.0, 1.0  # bilateral: factor 1.0
     
+    def _vano_peso_estado(self, resultados, estado, vano):
+        """Vano peso del estado según desnivel (Cable_AEA.calcular_vanos_peso) o el vano si no está"""
+        if resultados and estado in resultados:
+            return resultados[estado].get("vano_peso_m", vano)
+        return vano
+
     def asignar_cargas_hipotesis(self, df_cargas_totales, resultados_conductor, 
                                  resultados_guardia1, vano, hipotesis_maestro, 
                                  t_hielo, hipotesis_a_incluir="Todas", resultados_guardia2=None, 
@@ -338,15 +344,21 @@ class EstructuraAEA_Mecanica:
 
                     factor_peso = config["peso"]["factor"]
                     
+                    # Vano peso del estado de la hipótesis (igual al vano sin desnivel)
+                    estado_peso = estado_tiro or estado_viento
+                    vano_peso_cond = self._vano_peso_estado(resultados_conductor, estado_peso, vano)
+                    vano_peso_g1 = self._vano_peso_estado(resultados_guardia1, estado_peso, vano)
+                    vano_peso_g2 = self._vano_peso_estado(resultados_guardia2 or resultados_guardia1, estado_peso, vano)
+                    
                     # Calcular pesos globales (solo para guardias, conductores se calculan por nodo)
                     if config["peso"]["hielo"]:
-                        peso_guardia1 = (peso_guardia1_base_global + peso_hielo_guardia1_global) * vano * factor_peso
+                        peso_guardia1 = (peso_guardia1_base_global + peso_hielo_guardia1_global) * vano_peso_g1 * factor_peso
                         if self.geometria.cable_guardia2:
-                            peso_guardia2 = (peso_guardia2_base + peso_hielo_guardia2) * vano * factor_peso
+                            peso_guardia2 = (peso_guardia2_base + peso_hielo_guardia2) * vano_peso_g2 * factor_peso
                     else:
-                        peso_guardia1 = peso_guardia1_base_global * vano * factor_peso
+                        peso_guardia1 = peso_guardia1_base_global * vano_peso_g1 * factor_peso
                         if self.geometria.cable_guardia2:
-                            peso_guardia2 = peso_guardia2_base * vano * factor_peso
+                            peso_guardia2 = peso_guardia2_base * vano_peso_g2 * factor_peso
                     
                     # Obtener tiros usando estado resuelto
                     tiro_guardia2_base = None
@@ -448,9 +460,9 @@ class EstructuraAEA_Mecanica:
                         
                         # Calcular peso del conductor para este nodo
                         if config["peso"]["hielo"]:
-                            peso_cond = (peso_conductor_base + peso_hielo_conductor) * vano * factor_peso
+                            peso_cond = (peso_conductor_base + peso_hielo_conductor) * vano_peso_cond * factor_peso
                         else:
-                            peso_cond = peso_conductor_base * vano * factor_peso
+                            peso_cond = peso_conductor_base * vano_peso_cond * factor_peso
 
                         if patron_tiro == "doble-terna-a-simple":
                             # Para conductores: aplicar patrón doble-terna-a-simple
@@ -635,10 +647,11 @@ class EstructuraAEA_Mecanica:
                                 sufijo_viento = "2" if self.geometria.cable_guardia2 else "1"
                         
                         # Calcular peso del guardia para este nodo
+                        vano_peso_guardia = vano_peso_g2 if sufijo_viento == "2" else vano_peso_g1
                         if config["peso"]["hielo"]:
-                            peso_guardia = (peso_guardia_base_nodo + peso_hielo_guardia_nodo) * vano * factor_peso
+                            peso_guardia = (peso_guardia_base_nodo + peso_hielo_guardia_nodo) * vano_peso_guardia * factor_peso
                         else:
-                            peso_guardia = peso_guardia_base_nodo * vano * factor_peso
+                            peso_guardia = peso_guardia_base_nodo * vano_peso_guardia * factor_peso
 
                         if patron_tiro == "doble-terna-a-simple":
                             tiro_trans, tiro_long, factor_peso_nodo, factor_viento_nodo = self._aplicar_patron_doble_terna_a_simple(
@@ -278,6 +278,12 @@ class ListadorCargas:
         
         return self.cargas_cache[clave_cache]
     
+    def _vano_peso(self, resultados):
+        """Gravivano para los pesos del listado: el mayor vano peso entre estados, o L_vano sin desnivel calculado"""
+        valores = [r["vano_peso_m"] for r in (resultados or {}).values()
+                   if isinstance(r, dict) and "vano_peso_m" in r]
+        return max(valores) if valores else self.L_vano
+    
     def generar_lista_cargas(self, resultados_conductor, resultados_guardia1, resultados_guardia2=None):
         """Genera lista completa de cargas"""
         if self.df_cargas is None:
@@ -289,16 +295,20 @@ class ListadorCargas:
         peso_hielo_conductor = self.cable_conductor._calcular_peso_hielo(self.t_hielo, 900)
         peso_hielo_guardia1 = self.cable_guardia1._calcular_peso_hielo(self.t_hielo, 900)
         
-        Pc = round(peso_conductor_base * self.L_vano, 2)
-        Pcg1 = round(peso_guardia1_base * self.L_vano, 2)
-        Pch = round(peso_hielo_conductor * self.L_vano, 2)
-        Pcg1h = round(peso_hielo_guardia1 * self.L_vano, 2)
+        vano_peso_conductor = self._vano_peso(resultados_conductor)
+        vano_peso_guardia1 = self._vano_peso(resultados_guardia1)
+        
+        Pc = round(peso_conductor_base * vano_peso_conductor, 2)
+        Pcg1 = round(peso_guardia1_base * vano_peso_guardia1, 2)
+        Pch = round(peso_hielo_conductor * vano_peso_conductor, 2)
+        Pcg1h = round(peso_hielo_guardia1 * vano_peso_guardia1, 2)
         
         if self.cable_guardia2:
+            vano_peso_guardia2 = self._vano_peso(resultados_guardia2 or resultados_guardia1)
             peso_guardia2_base = self.cable_guardia2.peso_unitario_dan_m
             peso_hielo_guardia2 = self.cable_guardia2._calcular_peso_hielo(self.t_hielo, 900)
-            Pcg2 = round(peso_guardia2_base * self.L_vano, 2)
-            Pcg2h = round(peso_hielo_guardia2 * self.L_vano, 2)
+            Pcg2 = round(peso_guardia2_base * vano_peso_guardia2, 2)
+            Pcg2h = round(peso_hielo_guardia2 * vano_peso_guardia2, 2)
         
         estados_climaticos_map = {"I": "Tmax", "II": "Tmin", "III": "Vmax", "IV": "Vmed", "V": "Tma"}
         
@@ -14,9 +14,15 @@ from utils.console_capture import get_console_capture
 console_capture = get_console_capture()
 console_capture.start()
 
+# Medir el costo de importación de cada módulo durante el arranque
+from utils.importacion_diferida import PerfilImportacion, precargar_motores
+perfil_importacion = PerfilImportacion().iniciar()
+
 from config.app_config import APP_TITLE, APP_PORT, DEBUG_MODE, APP_STYLES, DATA_DIR, CABLES_PATH
+from config.app_config import PERFIL_IMPORTACION, PRECARGA_MOTORES
 from views.main_layout import crear_layout
 from models.app_state import AppState
+from utils.almacen_estructuras import instalar as instalar_almacen_estructuras
 
 # Importar controladores
 from controllers import (
@@ -86,8 +92,12 @@ app.index_string = f'''
 </html>
 '''
 
-# Configurar layout
-app.layout = crear_layout()
+# "estructura-actual" viaja como referencia; el diccionario queda en el servidor
+instalar_almacen_estructuras(app)
+
+# Configurar layout (función: cada carga de página abre una sesión con su propia referencia
+# de estructura y su contexto de cálculo)
+app.layout = crear_layout
 
 # Registrar todos los controladores
 navigation_controller.register_callbacks(app)
@@ -120,6 +130,12 @@ estados_climaticos_controller.register_callbacks(app)
 # hipotesis_controller.register_callbacks(app)
 # borrar_cache_controller no requiere register_callbacks - usa decorador @callback directo
 
+# Reporte de arranque y precarga de motores de cálculo (no demora el primer request)
+perfil_importacion.detener()
+if PERFIL_IMPORTACION > 0:
+    print(perfil_importacion.reporte(limite=PERFIL_IMPORTACION))
+precargar_motores(PRECARGA_MOTORES)
+
 
 # Endpoint para descargar archivos PLS-CADD desde la carpeta de cache
 from flask import send_from_directory, abort
@@ -139,6 +155,30 @@ def download_plscadd(filename):
         return (f"Error al servir archivo: {e}"), 500
 
 
+# Endpoint para descargar reportes exportados a disco (HTML/zip de familia) por bloques
+from flask import Response
+from urllib.parse import quote
+from utils import html_streaming
+
+@server.route('/descargar_reporte/<token>')
+def descargar_reporte(token):
+    """Enviar un reporte publicado con html_streaming.publicar_descarga y eliminarlo al terminar"""
+    descarga = html_streaming.abrir_descarga(token)
+    if descarga is None:
+        abort(404)
+    ruta, nombre = descarga
+    mimetype = "application/zip" if ruta.suffix == ".zip" else "text/html"
+    nombre_ascii = nombre.encode("ascii", "replace").decode().replace('"', "_")
+    return Response(
+        html_streaming.iterar_bloques_archivo(ruta, eliminar_al_terminar=True),
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f"attachment; filename=\"{nombre_ascii}\"; filename*=UTF-8''{quote(nombre)}",
+            "Content-Length": str(ruta.stat().st_size),
+        },
+    )
+
+
 def inicializar_datos():
     """Inicializar datos base de la aplicación"""
     
@@ -0,0 +1 @@
+"""Benchmarks de rendimiento sobre las familias incluidas en data/ (ver ejecutar_benchmarks.py)"""
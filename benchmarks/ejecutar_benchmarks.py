@@ -0,0 +1,559 @@
+"""
+Suite de benchmarks de punta a punta sobre las familias de data/*.familia.json
+
+Casos:
+    familia:<nombre>             ejecutar_calculo_familia_completa (CMC, DGE, DME, Árboles, SPH,
+                                 Fundación, Costeo, AEE) con tiempo por etapa
+    vano_economico:<nombre>      barrido de vanos de la familia
+    comparativa_cables:<nombre>  comparativa CMC de varios conductores con los estados de la familia
+
+Cada caso corre en un proceso nuevo (spawn) sobre una copia temporal de data/ sin cache:
+los tiempos son de cálculo en frío, el pico de RSS es el del caso y no se tocan los archivos
+del usuario. Corre sin red, sin navegador y sin kaleido (matplotlib en Agg, exportación PNG
+de Plotly omitida). Por caso se registra tiempo de pared, pico de RSS y cantidad de llamadas
+de funciones clave, y se compara contra la línea base guardada en benchmarks/linea_base.json.
+Cada caso se repite REPETICIONES veces (un proceso nuevo por vez) y se registra la mediana de
+tiempos y RSS: una sola medición en una máquina compartida varía más que el umbral. Las
+repeticiones se intercalan (todos los casos, luego todos otra vez): un período de máquina
+cargada afecta a una repetición de varios casos y no a todas las de un mismo caso.
+
+Uso:
+    python -m benchmarks.ejecutar_benchmarks
+    python -m benchmarks.ejecutar_benchmarks --familias Kachi_S_350_450_4000msnm --casos familia
+    python -m benchmarks.ejecutar_benchmarks --guardar-linea-base
+    python -m benchmarks.ejecutar_benchmarks --umbral 0.10 --con-graficos
+    python -m benchmarks.ejecutar_benchmarks --repeticiones 9
+"""
+
+import argparse
+import contextlib
+import functools
+import importlib
+import inspect
+import json
+import math
+import multiprocessing
+import os
+import platform
+import queue
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+DIR_BENCHMARKS = Path(__file__).resolve().parent
+LINEA_BASE = DIR_BENCHMARKS / "linea_base.json"
+DIR_RESULTADOS = DIR_BENCHMARKS / "resultados"
+
+# Regresión: el valor actual supera a la línea base en más de UMBRAL_REGRESION (relativo)
+# y en más del mínimo absoluto (evita alarmas por ruido en mediciones chicas)
+UMBRAL_REGRESION = 0.20
+MINIMO_TIEMPO_S = 0.5
+MINIMO_RSS_MB = 10.0
+# Una etapa además debe crecer más que esta fracción del tiempo del caso en la línea base
+MINIMO_ETAPA_FRACCION = 0.10
+REPETICIONES = 5
+TIEMPO_MAXIMO_CASO_S = 3600
+
+TIPOS_CASO = ("familia", "vano_economico", "comparativa_cables")
+FAMILIA_REFERENCIA = "Kachi_S_350_450_4000msnm"
+
+# Etapas de la secuencia por estructura: se mide tiempo, llamadas y pico de RSS
+ETAPAS = (
+    ("cmc", "controllers.geometria_controller:ejecutar_calculo_cmc_automatico"),
+    ("dge", "controllers.geometria_controller:ejecutar_calculo_dge"),
+    ("dme", "controllers.ejecutar_calculos:ejecutar_calculo_dme"),
+    ("arboles", "controllers.ejecutar_calculos:ejecutar_calculo_arboles"),
+    ("sph", "controllers.ejecutar_calculos:ejecutar_calculo_sph"),
+    ("fundacion", "controllers.ejecutar_calculos:ejecutar_calculo_fundacion"),
+    ("costeo", "controllers.ejecutar_calculos:ejecutar_calculo_costeo"),
+    ("aee", "controllers.ejecutar_calculos:ejecutar_calculo_aee"),
+)
+
+# Funciones cuyo número de llamadas se registra. Las funciones de módulo van primero: se
+# envuelven antes de importar los módulos que las importan por nombre.
+FUNCIONES_CONTADAS = (
+    "utils.figuras_plotly:guardar_figura",
+    "utils.figuras_plotly:cargar_figura",
+    "utils.calculo_cache:CalculoCache.calcular_hash",
+    "utils.calculo_mecanico_cables:CalculoMecanicoCables.calcular",
+    "CalculoCables:Cable_AEA.calculo_mecanico",
+    "CalculoCables:Cable_AEA._calcular_estado",
+    "CalculoCables:Cable_AEA._resolver_ecuacion_cubica",
+    "utils.Sulzberger:Sulzberger.calcular_fundacion",
+    "utils.analisis_estatico:AnalizadorEstatico.resolver_sistema",
+)
+
+# Conductores de la comparativa (además del conductor de la familia)
+CONDUCTORES_COMPARATIVA = ("AlAc 435/55", "AlAc 300/50", "Al/Ac 70/12")
+PARAMETROS_LINEA = ("L_vano", "theta", "Vmax", "Vmed", "t_hielo", "exposicion", "clase", "Zco", "Cf_cable")
+CONFIGURACION_CALCULO = ("VANO_DESNIVELADO", "H_PIQANTERIOR", "H_PIQPOSTERIOR", "SALTO_PORCENTUAL",
+                         "PASO_AFINADO", "OBJ_CONDUCTOR", "RELFLECHA_SIN_VIENTO")
+
+# Barrido de vano económico: vano base de la familia ±20 %
+LONGTRAZA_VANO_ECONOMICO = 10000.0
+RANGO_VANO_ECONOMICO = 0.2
+
+
+def rss_pico_mb():
+    """Pico de memoria residente del proceso actual en MB (None si no se puede medir)"""
+    try:
+        import resource
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa KB, macOS bytes
+        return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+
+def _resolver(objetivo):
+    """"modulo:Clase.atributo" -> (contenedor, nombre del atributo)"""
+    modulo, _, ruta = objetivo.partition(":")
+    contenedor = importlib.import_module(modulo)
+    *padres, nombre = ruta.split(".")
+    for padre in padres:
+        contenedor = getattr(contenedor, padre)
+    return contenedor, nombre
+
+
+class Instrumentacion:
+    """
+    Envuelve funciones en su lugar para contar llamadas y, opcionalmente, acumular tiempo
+    y el pico de RSS observado al terminar cada llamada
+    """
+
+    def __init__(self):
+        self.metricas = {}  # etiqueta -> {"llamadas"[, "tiempo_s", "rss_pico_mb"]}
+        self._originales = []
+
+    def envolver(self, objetivo, etiqueta=None, medir=False):
+        """Instrumenta "modulo:funcion" o "modulo:Clase.metodo"; False si no existe"""
+        etiqueta = etiqueta or objetivo.partition(":")[2]
+        try:
+            contenedor, nombre = _resolver(objetivo)
+            original = inspect.getattr_static(contenedor, nombre)
+        except (ImportError, AttributeError) as e:
+            print(f"⚠️ Benchmark: no se puede instrumentar {objetivo}: {e}")
+            return False
+
+        funcion = original.__func__ if isinstance(original, (staticmethod, classmethod)) else original
+        metrica = self.metricas.setdefault(etiqueta, {"llamadas": 0})
+        if medir:
+            metrica.update(tiempo_s=0.0, rss_pico_mb=None)
+
+        @functools.wraps(funcion)
+        def envuelta(*args, **kwargs):
+            metrica["llamadas"] += 1
+            if not medir:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                metrica["tiempo_s"] += time.perf_counter() - inicio
+                metrica["rss_pico_mb"] = rss_pico_mb()
+
+        if isinstance(original, staticmethod):
+            reemplazo = staticmethod(envuelta)
+        elif isinstance(original, classmethod):
+            reemplazo = classmethod(envuelta)
+        else:
+            reemplazo = envuelta
+        setattr(contenedor, nombre, reemplazo)
+        self._originales.append((contenedor, nombre, original))
+        return True
+
+    def restaurar(self):
+        for contenedor, nombre, original in reversed(self._originales):
+            setattr(contenedor, nombre, original)
+        self._originales.clear()
+
+
+def _desactivar_exportacion_png():
+    """Sin kaleido: write_image no hace nada (las figuras se siguen generando si se piden)"""
+    try:
+        from plotly.basedatatypes import BaseFigure
+    except ImportError:
+        return
+    BaseFigure.write_image = lambda self, *args, **kwargs: None
+
+
+# ---------------------------------------------------------------------------------------
+# Casos
+# ---------------------------------------------------------------------------------------
+
+def _numero(valor):
+    """Costos como float nativo (pueden venir como escalares numpy)"""
+    return None if valor is None else float(valor)
+
+
+def _cargar_familia(nombre):
+    from utils.familia_manager import FamiliaManager
+    return FamiliaManager.cargar_familia(nombre)
+
+
+def _caso_familia(nombre, opciones):
+    from utils.calcular_familia_logica_encadenada import ejecutar_calculo_familia_completa
+    familia = _cargar_familia(nombre)
+    resultado = ejecutar_calculo_familia_completa(familia, generar_plots=opciones["con_graficos"])
+    estructuras = resultado.get("resultados_estructuras", {})
+    errores = {n: r["error"] for n, r in estructuras.items() if "error" in r}
+    return {
+        "exito": bool(resultado.get("exito")) and not errores,
+        "errores": errores,
+        "resultado": {
+            "estructuras": len(estructuras),
+            "costo_global": _numero(resultado.get("costeo_global", {}).get("costo_global")),
+            "costos_individuales": {r["titulo"]: _numero(r.get("costo_individual")) for r in estructuras.values() if "error" not in r}
+        }
+    }
+
+
+def _caso_vano_economico(nombre, opciones):
+    from utils import vano_economico_utils as ve
+    from utils.calcular_familia_logica_encadenada import ejecutar_calculo_familia_completa
+
+    familia = _cargar_familia(nombre)
+    vano_base = float(next(iter(familia["estructuras"].values())).get("L_vano", 400))
+    vano_min = round(vano_base * (1 - RANGO_VANO_ECONOMICO))
+    vano_max = round(vano_base * (1 + RANGO_VANO_ECONOMICO))
+    salto = max(round((vano_max - vano_min) / max(opciones["vanos"] - 1, 1)), 1)
+    vanos = ve.generar_lista_vanos(vano_min, vano_max, salto)
+    criterio = ("Suspensiones", 3000.0, 10, 0)
+
+    valida, motivo = ve.validar_familia_vano_economico(familia)
+    costos = {}
+    if valida:
+        resultado = ve.calcular_vano_economico_iterativo(
+            nombre, vano_min, vano_max, salto, LONGTRAZA_VANO_ECONOMICO, *criterio,
+            generar_plots=opciones["con_graficos"]
+        )
+        costos = {str(v): _numero(r["costo_global"]) for v, r in resultado["resultados"].items()}
+    else:
+        # Las familias incluidas no tienen el trío S + RR + T que exige la vista: mismo
+        # barrido (cantidades dinámicas + cálculo de familia por vano) sin esa validación
+        cant_ra = ve.obtener_cant_ra_familia(familia)
+        for vano in vanos:
+            cantidades = ve.calcular_cantidades(LONGTRAZA_VANO_ECONOMICO, vano, *criterio, cant_ra)
+            familia_vano = ve.modificar_vano_y_cantidades_familia(familia, vano, cantidades)
+            resultado = ejecutar_calculo_familia_completa(familia_vano, generar_plots=opciones["con_graficos"])
+            if resultado.get("exito"):
+                costos[str(vano)] = _numero(resultado["costeo_global"]["costo_global"])
+
+    return {
+        "exito": len(costos) == len(vanos),
+        "errores": {} if len(costos) == len(vanos) else {"vanos": f"{len(costos)}/{len(vanos)} calculados"},
+        "resultado": {"vanos": len(vanos), "validacion": motivo, "costos": costos}
+    }
+
+
+def _caso_comparativa_cables(nombre, opciones):
+    from utils.biblioteca_cables import BibliotecaCables
+    from utils.comparativa_cmc_calculo import ejecutar_comparativa_cmc
+
+    familia = _cargar_familia(nombre)
+    estructura = next(iter(familia["estructuras"].values()))
+    disponibles = BibliotecaCables.obtener_datos()
+    candidatos = opciones.get("cables") or [estructura.get("cable_conductor_id"), *CONDUCTORES_COMPARATIVA]
+    cables = [c for c in dict.fromkeys(candidatos) if c in disponibles]
+
+    comparativa = {
+        "cables_seleccionados": cables,
+        "parametros_linea": {k: estructura[k] for k in PARAMETROS_LINEA if k in estructura},
+        "configuracion_calculo": {k: estructura[k] for k in CONFIGURACION_CALCULO if k in estructura},
+        "estados_climaticos": familia.get("estados_climaticos") or estructura.get("estados_climaticos", {})
+    }
+    resultados = ejecutar_comparativa_cmc(comparativa)
+    fallidos = {c: r.get("error", "sin convergencia") for c, r in resultados.items() if not r.get("convergencia")}
+    return {"exito": not fallidos, "errores": fallidos, "resultado": {"cables": cables}}
+
+
+_CASOS = {
+    "familia": _caso_familia,
+    "vano_economico": _caso_vano_economico,
+    "comparativa_cables": _caso_comparativa_cables,
+}
+
+
+def _medir_caso(caso, opciones):
+    """Ejecuta un caso en el proceso actual (llamado en el proceso hijo)"""
+    tipo, _, familia = caso.partition(":")
+    espacio = Path(tempfile.mkdtemp(prefix="agp_benchmark_"))
+    try:
+        shutil.copytree(RAIZ / "data", espacio / "data",
+                        ignore=shutil.ignore_patterns("cache", "sesiones", "ARCHIVO"))
+        os.chdir(espacio)
+        if str(RAIZ) not in sys.path:
+            sys.path.insert(0, str(RAIZ))
+        os.environ["MPLBACKEND"] = "Agg"
+
+        with open(opciones["log"], "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+            inicio = time.perf_counter()
+            _desactivar_exportacion_png()
+            instrumentacion = Instrumentacion()
+            for objetivo in FUNCIONES_CONTADAS:
+                instrumentacion.envolver(objetivo)
+            for etapa, objetivo in ETAPAS:
+                instrumentacion.envolver(objetivo, etiqueta=etapa, medir=True)
+            tiempo_importacion = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            detalle = _CASOS[tipo](familia, opciones)
+            tiempo = time.perf_counter() - inicio
+    finally:
+        os.chdir(RAIZ)
+        shutil.rmtree(espacio, ignore_errors=True)
+
+    etiquetas_etapa = {etapa for etapa, _ in ETAPAS}
+    metricas = instrumentacion.metricas
+    return {
+        **detalle,
+        "tiempo_s": tiempo,
+        "tiempo_importacion_s": tiempo_importacion,
+        "rss_pico_mb": rss_pico_mb(),
+        "llamadas": {n: m["llamadas"] for n, m in metricas.items() if n not in etiquetas_etapa},
+        "etapas": {n: m for n, m in metricas.items() if n in etiquetas_etapa and m["llamadas"]},
+    }
+
+
+def _proceso_caso(caso, opciones, cola):
+    try:
+        cola.put(_medir_caso(caso, opciones))
+    except BaseException as e:
+        cola.put({"exito": False, "errores": {"excepcion": f"{type(e).__name__}: {e}"},
+                  "traceback": traceback.format_exc()})
+
+
+def ejecutar_caso(caso, opciones):
+    """Ejecuta un caso en un proceso nuevo y devuelve sus métricas"""
+    contexto = multiprocessing.get_context("spawn")
+    cola = contexto.Queue()
+    proceso = contexto.Process(target=_proceso_caso, args=(caso, opciones, cola), name=f"benchmark-{caso}")
+    proceso.start()
+    limite = time.monotonic() + opciones.get("timeout", TIEMPO_MAXIMO_CASO_S)
+    resultado = None
+    while resultado is None:
+        try:
+            resultado = cola.get(timeout=1)
+        except queue.Empty:
+            if not proceso.is_alive():
+                resultado = {"exito": False, "errores": {"proceso": f"terminó con código {proceso.exitcode}"}}
+            elif time.monotonic() > limite:
+                proceso.terminate()
+                resultado = {"exito": False, "errores": {"proceso": "tiempo máximo excedido"}}
+    proceso.join()
+    return resultado
+
+
+def combinar_repeticiones(mediciones):
+    """
+    Une las repeticiones de un caso: mediana de tiempos y RSS (también por etapa)
+
+    Las llamadas y el resultado son deterministas y se toman de la primera medición. Si
+    alguna repetición falló se devuelve esa medición.
+    """
+    fallida = next((m for m in mediciones if not m.get("exito")), None)
+    if fallida is not None:
+        return fallida
+
+    def mediana(valores):
+        valores = [v for v in valores if v is not None]
+        return statistics.median(valores) if valores else None
+
+    combinado = dict(mediciones[0])
+    for metrica in ("tiempo_s", "tiempo_importacion_s", "rss_pico_mb"):
+        combinado[metrica] = mediana([m.get(metrica) for m in mediciones])
+    combinado["etapas"] = {
+        etapa: {**datos, **{metrica: mediana([m.get("etapas", {}).get(etapa, {}).get(metrica) for m in mediciones])
+                            for metrica in ("tiempo_s", "rss_pico_mb") if metrica in datos}}
+        for etapa, datos in mediciones[0].get("etapas", {}).items()
+    }
+    combinado["repeticiones"] = len(mediciones)
+    combinado["tiempos_s"] = [m.get("tiempo_s") for m in mediciones]
+    return combinado
+
+
+# ---------------------------------------------------------------------------------------
+# Línea base
+# ---------------------------------------------------------------------------------------
+
+def _iguales(a, b, rel_tol=1e-6):
+    """Igualdad de resultados tolerando ruido de punto flotante"""
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_iguales(a[k], b[k], rel_tol) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_iguales(x, y, rel_tol) for x, y in zip(a, b))
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)) and not isinstance(a, bool):
+        return math.isclose(a, b, rel_tol=rel_tol, abs_tol=1e-9)
+    return a == b
+
+
+def _supera(actual, base, umbral, minimo):
+    if actual is None or base is None:
+        return False
+    return actual > base * (1 + umbral) and actual - base > minimo
+
+
+def comparar_con_linea_base(casos, linea_base, umbral=UMBRAL_REGRESION):
+    """
+    Compara métricas de casos contra la línea base
+
+    Returns:
+        Lista de regresiones {"caso", "metrica", "base", "actual"}
+    """
+    regresiones = []
+
+    def registrar(caso, metrica, base, actual):
+        regresiones.append({"caso": caso, "metrica": metrica, "base": base, "actual": actual})
+
+    for caso, base in linea_base.get("casos", {}).items():
+        actual = casos.get(caso)
+        if actual is None or not base.get("exito"):
+            continue
+        if not actual.get("exito"):
+            registrar(caso, "exito", True, False)
+            continue
+        if _supera(actual.get("tiempo_s"), base.get("tiempo_s"), umbral, MINIMO_TIEMPO_S):
+            registrar(caso, "tiempo_s", base["tiempo_s"], actual["tiempo_s"])
+        if _supera(actual.get("rss_pico_mb"), base.get("rss_pico_mb"), umbral, MINIMO_RSS_MB):
+            registrar(caso, "rss_pico_mb", base["rss_pico_mb"], actual["rss_pico_mb"])
+        for funcion, llamadas in base.get("llamadas", {}).items():
+            if _supera(actual.get("llamadas", {}).get(funcion), llamadas, umbral, 0):
+                registrar(caso, f"llamadas:{funcion}", llamadas, actual["llamadas"][funcion])
+        for etapa, metrica in base.get("etapas", {}).items():
+            tiempo = actual.get("etapas", {}).get(etapa, {}).get("tiempo_s")
+            minimo = max(MINIMO_TIEMPO_S, MINIMO_ETAPA_FRACCION * (base.get("tiempo_s") or 0))
+            if _supera(tiempo, metrica.get("tiempo_s"), umbral, minimo):
+                registrar(caso, f"etapa:{etapa}", metrica["tiempo_s"], tiempo)
+        if "resultado" in base and not _iguales(actual.get("resultado"), base["resultado"]):
+            registrar(caso, "resultado", base["resultado"], actual.get("resultado"))
+    return regresiones
+
+
+def _entorno():
+    return {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+# ---------------------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------------------
+
+def listar_familias():
+    return sorted(p.name[:-len(".familia.json")] for p in (RAIZ / "data").glob("*.familia.json"))
+
+
+def armar_casos(familias, tipos, familia_referencia):
+    """familia:<f> para cada familia; vano económico y comparativa solo sobre la de referencia"""
+    casos = []
+    if "familia" in tipos:
+        casos += [f"familia:{f}" for f in familias]
+    for tipo in ("vano_economico", "comparativa_cables"):
+        if tipo in tipos:
+            casos.append(f"{tipo}:{familia_referencia}")
+    return casos
+
+
+def _formatear(valor, formato):
+    return "-" if valor is None else format(valor, formato)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de punta a punta sobre las familias de data/")
+    parser.add_argument("--familias", nargs="+", help="Familias (nombre de archivo sin .familia.json); por defecto todas")
+    parser.add_argument("--casos", nargs="+", choices=TIPOS_CASO, default=list(TIPOS_CASO))
+    parser.add_argument("--familia-referencia", help="Familia para vano económico y comparativa de cables")
+    parser.add_argument("--vanos", type=int, default=3, help="Vanos del barrido de vano económico")
+    parser.add_argument("--cables", nargs="+", help="Conductores de la comparativa")
+    parser.add_argument("--con-graficos", action="store_true", help="Generar figuras (generar_plots=True, sin PNG)")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION, help="Regresión relativa tolerada (0.20 = 20 %%)")
+    parser.add_argument("--linea-base", type=Path, default=LINEA_BASE)
+    parser.add_argument("--guardar-linea-base", action="store_true", help="Guardar estos resultados como línea base")
+    parser.add_argument("--timeout", type=float, default=TIEMPO_MAXIMO_CASO_S, help="Segundos máximos por caso")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES,
+                        help="Ejecuciones por caso; se compara la mediana")
+    args = parser.parse_args(argv)
+
+    disponibles = listar_familias()
+    familias = args.familias or disponibles
+    desconocidas = [f for f in familias if f not in disponibles]
+    if desconocidas:
+        parser.error(f"Familias inexistentes: {', '.join(desconocidas)}")
+    referencia = args.familia_referencia or (FAMILIA_REFERENCIA if FAMILIA_REFERENCIA in familias else familias[0])
+    casos = armar_casos(familias, args.casos, referencia)
+
+    marca = datetime.now().strftime("%Y%m%d_%H%M%S")
+    dir_logs = DIR_RESULTADOS / marca
+    dir_logs.mkdir(parents=True, exist_ok=True)
+
+    repeticiones = max(1, args.repeticiones)
+    print(f"🏁 Benchmarks: {len(casos)} casos x {repeticiones} (logs en {dir_logs})")
+    opciones = {
+        "con_graficos": args.con_graficos,
+        "vanos": args.vanos,
+        "cables": args.cables,
+        "timeout": args.timeout,
+    }
+    mediciones = {caso: [] for caso in casos}
+    for i in range(repeticiones):
+        print(f"   🔁 Repetición {i + 1}/{repeticiones}", flush=True)
+        for caso in casos:
+            # Un caso que falló no se repite
+            if mediciones[caso] and not mediciones[caso][-1].get("exito"):
+                continue
+            log = str(dir_logs / f"{caso.replace(':', '__')}_{i + 1}.log")
+            r = ejecutar_caso(caso, dict(opciones, log=log))
+            mediciones[caso].append(r)
+            print(f"   {'✅' if r.get('exito') else '❌'} {caso}: {_formatear(r.get('tiempo_s'), '.2f')} s, "
+                  f"RSS pico {_formatear(r.get('rss_pico_mb'), '.0f')} MB", flush=True)
+            if r.get("errores"):
+                print(f"      {r['errores']}")
+    resultados = {caso: combinar_repeticiones(mediciones[caso]) for caso in casos}
+
+    salida = {"fecha": datetime.now().isoformat(timespec="seconds"), "entorno": _entorno(),
+              "opciones": {"con_graficos": args.con_graficos, "vanos": args.vanos, "repeticiones": repeticiones}, "casos": resultados}
+    archivo = DIR_RESULTADOS / f"benchmark_{marca}.json"
+    archivo.write_text(json.dumps(salida, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"💾 Resultados: {archivo}")
+
+    fallidos = [c for c, r in resultados.items() if not r.get("exito")]
+    regresiones = []
+    if args.guardar_linea_base:
+        args.linea_base.write_text(json.dumps(salida, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"📌 Línea base guardada: {args.linea_base}")
+    elif args.linea_base.exists():
+        linea_base = json.loads(args.linea_base.read_text(encoding="utf-8"))
+        if linea_base.get("entorno") != salida["entorno"]:
+            print(f"⚠️ Línea base medida en otro entorno: {linea_base.get('entorno')}")
+        regresiones = comparar_con_linea_base(resultados, linea_base, args.umbral)
+        print(f"\n📊 Comparación con línea base ({linea_base.get('fecha')}, umbral {args.umbral:.0%})")
+        for caso, r in resultados.items():
+            base = linea_base.get("casos", {}).get(caso, {})
+            if r.get("tiempo_s") and base.get("tiempo_s"):
+                variacion = r["tiempo_s"] / base["tiempo_s"] - 1
+                print(f"   {caso}: {base['tiempo_s']:.2f} s -> {r['tiempo_s']:.2f} s ({variacion:+.1%})")
+        for regresion in regresiones:
+            print(f"   ❌ Regresión {regresion['caso']} [{regresion['metrica']}]: "
+                  f"{regresion['base']} -> {regresion['actual']}")
+    else:
+        print(f"ℹ️ Sin línea base en {args.linea_base} (usar --guardar-linea-base)")
+
+    return 1 if fallidos or regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
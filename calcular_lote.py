@@ -0,0 +1,8 @@
+"""Cálculo por lotes de estructuras y familias sin navegador (ver utils/calculo_lote.py)"""
+
+import sys
+
+from utils.calculo_lote import main
+
+if __name__ == "__main__":
+    sys.exit(main())
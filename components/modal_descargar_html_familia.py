@@ -15,7 +15,19 @@ def crear_modal_descargar_html_familia(modal_id="modal-descargar-html-familia"):
             ], className="mb-3"),
             # Checklist dinámico: options y value se actualizarán por callback
             dbc.Checklist(id="chk-secciones-html-familia", options=[], value=[], inline=False),
-            html.Div(id="modal-descargar-html-familia-aviso", className="mt-2 text-muted")
+            html.Div(id="modal-descargar-html-familia-aviso", className="mt-2 text-muted"),
+            html.Hr(),
+            html.Label("Imágenes", className="fw-bold"),
+            dbc.RadioItems(
+                id="radio-formato-imagenes-html-familia",
+                options=[
+                    {"label": "HTML único, imagen repetida en cada sección", "value": "embebido"},
+                    {"label": "HTML único, cada imagen distinta una sola vez (requiere JavaScript)", "value": "compartido"},
+                    {"label": "ZIP con index.html y carpeta assets/", "value": "assets"},
+                ],
+                value="embebido",
+                inline=False
+            )
         ]),
         dbc.ModalFooter([
             dbc.Button("Cancelar", id="modal-descargar-html-familia-cancel", color="secondary", className="me-2"),
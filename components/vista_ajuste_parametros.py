@@ -2,7 +2,6 @@
 
 from dash import html
 import dash_bootstrap_components as dbc
-import json
 from components.modal_estados_climaticos import crear_modal_estados_climaticos
 from components.modal_copiar_estados import crear_modal_copiar_estados
 
@@ -19,12 +18,8 @@ def crear_vista_ajuste_parametros_con_pestanas(estructura_actual=None, cables_di
         indicador = dbc.Alert("⚠️ No hay estructura activa", color="warning", className="mb-3")
     
     # Obtener cables disponibles
-    try:
-        with open("data/cables.json", "r", encoding="utf-8") as f:
-            cables_data = json.load(f)
-            cables_disponibles = list(cables_data.keys())
-    except:
-        cables_disponibles = []
+    from utils.biblioteca_cables import BibliotecaCables
+    cables_disponibles = list(BibliotecaCables.obtener_datos().keys())
     
     return html.Div([
         indicador,
@@ -282,7 +282,6 @@ def generar_resultados_aee(calculo_guardado, estructura_actual):
     # Seccion de diagramas
     diagramas = resultados.get('diagramas', {})
     esfuerzos = resultados.get('esfuerzos', {})
-    plots_interactivos = estructura_actual.get('AnalisisEstaticoEsfuerzos', {}).get('plots_interactivos', True) if estructura_actual else True
     
     # Resumen Comparativo
     if resultados.get('resumen_comparativo'):
@@ -299,34 +298,29 @@ def generar_resultados_aee(calculo_guardado, estructura_actual):
         ))
     
     if diagramas:
+        from utils import aee_diagramas
+        
         componentes.append(html.H5("Diagramas de Esfuerzos", className="mt-4 mb-3"))
         
-        for nombre_diagrama in diagramas.keys():
-            # Intentar cargar JSON si plots_interactivos
-            if plots_interactivos:
-                json_filename = f"AEE_{nombre_diagrama}.{hash_params}.json"
-                fig_dict = ViewHelpers.cargar_figura_plotly_json(json_filename)
-                
-                if fig_dict:
-                    componentes.append(html.H6(nombre_diagrama.replace('_', ' '), className="mt-3"))
-                    componentes.append(dcc.Graph(
-                        figure=fig_dict,
-                        config={'displayModeBar': True}
-                    ))
-                    continue
-            
-            # Fallback a PNG
-            img_filename = f"AEE_{nombre_diagrama}.{hash_params}.png"
-            img_str = ViewHelpers.cargar_imagen_base64(img_filename)
-            
-            if img_str:
-                componentes.append(html.Div([
-                    html.H6(nombre_diagrama.replace('_', ' '), className="mt-3"),
-                    html.Img(
-                        src=f'data:image/png;base64,{img_str}',
-                        style={'width': '100%', 'maxWidth': '1200px'}
-                    )
-                ]))
+        # Los diagramas se renderizan bajo demanda: solo el seleccionado
+        resultados.setdefault('hash', hash_params)
+        aee_diagramas.registrar_resultados(resultados)
+        nombres = aee_diagramas.listar_diagramas(resultados)
+        id_hash = resultados.get('hash', '')
+        componentes.append(dbc.Select(
+            id={"type": "aee-selector-diagrama", "hash": id_hash},
+            options=[{"label": n.replace('_', ' '), "value": n} for n in nombres],
+            value=nombres[0] if nombres else None,
+            className="mb-2"
+        ))
+        componentes.append(dcc.Store(
+            id={"type": "aee-origen-diagrama", "hash": id_hash},
+            data=resultados.get('nombre_estructura') or (estructura_actual or {}).get('TITULO')
+        ))
+        componentes.append(dcc.Loading(html.Div(
+            generar_diagrama_aee(resultados, nombres[0], estructura_actual) if nombres else None,
+            id={"type": "aee-diagrama-contenedor", "hash": id_hash}
+        )))
     else:
         componentes.append(html.P("No se generaron diagramas.", className="text-muted"))
 
@@ -353,3 +347,34 @@ def generar_resultados_aee(calculo_guardado, estructura_actual):
                 ])
     
     return html.Div(componentes, id="resultados-aee")
+
+
+def generar_diagrama_aee(resultados, nombre_diagrama, estructura_actual=None):
+    """Componente de un diagrama AEE, renderizado bajo demanda (Plotly interactivo o PNG)"""
+    from utils import aee_diagramas
+    from utils.view_helpers import ViewHelpers
+    
+    parametros_aee = (estructura_actual or {}).get('AnalisisEstaticoEsfuerzos', {})
+    opciones = aee_diagramas.opciones_diagrama(resultados, parametros_aee=parametros_aee)
+    titulo = html.H6(nombre_diagrama.replace('_', ' '), className="mt-3")
+    
+    try:
+        if opciones['interactivo']:
+            fig_dict = aee_diagramas.obtener_figura(resultados, nombre_diagrama, parametros_aee=parametros_aee)
+            return html.Div([titulo, dcc.Graph(figure=fig_dict, config={'displayModeBar': True})])
+        
+        img_filename = aee_diagramas.asegurar_png(resultados, nombre_diagrama, parametros_aee=parametros_aee)
+        img_str = ViewHelpers.cargar_imagen_base64(img_filename) if img_filename else None
+        if img_str:
+            return html.Div([
+                titulo,
+                html.Img(
+                    src=f'data:image/png;base64,{img_str}',
+                    style={'width': '100%', 'maxWidth': '1200px'}
+                )
+            ])
+    except Exception as e:
+        print(f"Error generando diagrama AEE {nombre_diagrama}: {e}")
+        return dbc.Alert(f"No se pudo generar {nombre_diagrama}: {e}", color="warning")
+    
+    return html.P(f"Diagrama {nombre_diagrama} no disponible.", className="text-muted")
@@ -4,7 +4,6 @@ Vista para Cálculo Mecánico de Conductores
 
 from dash import html, dcc
 import dash_bootstrap_components as dbc
-import pandas as pd
 from config.app_config import DATA_DIR
 from utils.view_helpers import ViewHelpers
 from utils.calculo_cache import CalculoCache
@@ -179,6 +178,7 @@ def crear_vista_calculo_mecanico(estructura_actual, calculo_guardado=None):
 def generar_resultados_cmc(calculo_guardado, estructura_actual, omitir_vigencia=False):
     """Generar HTML de resultados desde cálculo guardado"""
     try:
+        import pandas as pd
         from utils.format_helpers import formatear_resultados_cmc, formatear_dataframe_cmc
         
         resultados_html = []
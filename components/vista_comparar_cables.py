@@ -434,15 +434,9 @@ def crear_tabla_comparativa(resultados):
         return dbc.Alert("No hay cables con resultados exitosos", color="warning")
     
     try:
-        # Cargar propiedades de cables desde cables.json
-        from config.app_config import DATA_DIR
-        cables_path = DATA_DIR / "cables.json"
-        
-        propiedades_cables = {}
-        if cables_path.exists():
-            with open(cables_path, 'r', encoding='utf-8') as f:
-                cables_data = json.load(f)
-                propiedades_cables = cables_data
+        # Propiedades de cables desde la biblioteca compartida
+        from utils.biblioteca_cables import BibliotecaCables
+        propiedades_cables = BibliotecaCables.obtener_datos()
         
         # Crear filas de la tabla
         filas_datos = []
@@ -41,6 +41,113 @@ def crear_vista_consola():
             ], width=12)
         ]),
         
+        # Líneas de tiempo de cálculos (utils/perfil_calculo.py)
+        dbc.Row([
+            dbc.Col([
+                html.H4("Perfiles de cálculo", className="mt-4 mb-2"),
+                html.P("Tiempo por etapa y sub-paso de los últimos trabajos (familia, calcular todo, etapas sueltas)",
+                       className="text-muted"),
+            ])
+        ]),
+        dbc.Row([
+            dbc.Col([
+                dcc.Dropdown(id="consola-perfil-select", options=[], placeholder="Seleccionar trabajo...",
+                             clearable=False, style={"color": "#000"}),
+            ], width=9),
+            dbc.Col([
+                dbc.Button("Descargar JSON", id="btn-descargar-perfil", color="secondary"),
+                dcc.Download(id="descarga-perfil"),
+            ], width=3),
+        ], className="mb-3"),
+        dbc.Row([
+            dbc.Col([dcc.Graph(id="consola-perfil-grafico", config={"displaylogo": False})], width=12)
+        ]),
+        dbc.Row([
+            dbc.Col([
+                html.Pre(
+                    id="consola-perfil-detalle",
+                    style={
+                        "backgroundColor": "#1e1e1e",
+                        "color": "#d4d4d4",
+                        "padding": "15px",
+                        "borderRadius": "5px",
+                        "maxHeight": "50vh",
+                        "overflow": "auto",
+                        "fontFamily": "Consolas, Monaco, 'Courier New', monospace",
+                        "fontSize": "12px",
+                        "whiteSpace": "pre"
+                    }
+                )
+            ], width=12)
+        ]),
+        
         # Store para indicar que estamos en vista consola
         dcc.Store(id="consola-activa", data=True)
     ], className="container-fluid mt-4")
+
+
+MAX_BARRAS_LINEA_TIEMPO = 500
+
+
+def crear_figura_linea_tiempo(perfil):
+    """Gráfico de Gantt de los tramos de un trabajo: una fila por nombre de tramo"""
+    import plotly.graph_objects as go
+
+    eventos = [e for e in perfil.get("eventos", []) if e.get("duracion") is not None]
+    if len(eventos) > MAX_BARRAS_LINEA_TIEMPO:
+        eventos = sorted(eventos, key=lambda e: e["duracion"], reverse=True)[:MAX_BARRAS_LINEA_TIEMPO]
+        eventos.sort(key=lambda e: e["inicio"])
+
+    filas = list(dict.fromkeys(e["nombre"] for e in eventos))
+    colores = ["#2084f2", "#f28e2b", "#59a14f", "#e15759", "#b07aa1", "#76b7b2"]
+    fig = go.Figure()
+    for nivel in sorted({e["nivel"] for e in eventos}):
+        del_nivel = [e for e in eventos if e["nivel"] == nivel]
+        fig.add_trace(go.Bar(
+            y=[e["nombre"] for e in del_nivel],
+            x=[e["duracion"] for e in del_nivel],
+            base=[e["inicio"] for e in del_nivel],
+            orientation="h",
+            name=f"Nivel {nivel}",
+            marker_color=colores[nivel % len(colores)],
+            customdata=[[e["inicio"], e["duracion"], str(e.get("datos", "")), e.get("error", ""),
+                         e.get("hilo", perfil.get("hilo", ""))] for e in del_nivel],
+            hovertemplate="%{y}<br>inicio %{customdata[0]:.3f} s<br>duración %{customdata[1]:.3f} s"
+                          "<br>hilo %{customdata[4]}<br>%{customdata[2]}<br>%{customdata[3]}<extra></extra>"
+        ))
+    fig.update_layout(
+        title=f"{perfil.get('nombre')} - {perfil.get('duracion') or 0:.2f} s",
+        barmode="overlay",
+        template="plotly_dark",
+        height=max(300, 22 * len(filas) + 120),
+        xaxis_title="Tiempo [s]",
+        yaxis={"categoryorder": "array", "categoryarray": filas[::-1]},
+        margin={"l": 10, "r": 10, "t": 50, "b": 40},
+    )
+    return fig
+
+
+def formatear_detalle_perfil(perfil):
+    """Totales por tramo, contadores y perfil (si se capturó) en texto"""
+    lineas = [f"Trabajo: {perfil.get('nombre')} ({perfil.get('tipo')})  {perfil.get('fecha')}  "
+              f"{perfil.get('duracion') or 0:.2f} s  hilo {perfil.get('hilo')}"]
+    if perfil.get("datos"):
+        lineas.append(f"Datos: {perfil['datos']}")
+    if perfil.get("error"):
+        lineas.append(f"Error: {perfil['error']}")
+    if perfil.get("eventos_omitidos"):
+        lineas.append(f"Tramos sin detalle (solo en totales): {perfil['eventos_omitidos']}")
+
+    lineas += ["", f"{'tramo':<40} {'llamadas':>9} {'total [s]':>10}"]
+    totales = sorted(perfil.get("totales", {}).items(), key=lambda item: item[1]["segundos"], reverse=True)
+    for nombre, total in totales:
+        lineas.append(f"{nombre:<40} {total['llamadas']:>9} {total['segundos']:>10.3f}")
+
+    if perfil.get("contadores"):
+        lineas += ["", "Contadores:"]
+        for nombre, valor in sorted(perfil["contadores"].items()):
+            lineas.append(f"  {nombre:<38} {valor:>10}")
+
+    if perfil.get("perfil"):
+        lineas += ["", f"Perfil ({perfil.get('archivo_perfil')}):", perfil["perfil"]]
+    return "\n".join(lineas)
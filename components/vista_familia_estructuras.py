@@ -402,8 +402,8 @@ def crear_modal_familia():
                 className="mt-3",
                 style={"display": "none"}  # Oculto por defecto; se mostrará junto al otro botón
             ),
-            dcc.Download(id="download-html-familia"),
-            dcc.Download(id="download-html-personalizado"),
+            # Las descargas de HTML se piden por URL (/descargar_reporte/<token>) desde un iframe oculto
+            html.Iframe(id="iframe-descarga-html-familia", style={"display": "none"}),
             # Store para opciones actuales del modal y para persistencia de la selección
             dcc.Store(id="store-secciones-html-familia-options", data=None),
             dcc.Store(id="store-seleccion-secciones-html", data=None),
@@ -1,24 +1,85 @@
 """Configuración centralizada de la aplicación"""
 
+import os
 from pathlib import Path
 
 # Directorios
 DATA_DIR = Path("data")
-CACHE_DIR = DATA_DIR / "cache"
+# CACHE_DIR puede redirigirse (p. ej. el cálculo por lotes con --salida, ver utils/calculo_lote.py)
+CACHE_DIR = Path(os.environ.get("CACHE_DIR") or DATA_DIR / "cache")
 CABLES_PATH = DATA_DIR / "cables.json"
 
 # Crear directorio de cache si no existe
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 # Configuración de la aplicación
-import os
-
 APP_TITLE = "AGP - Análisis General de Postaciones v1.0"
 APP_PORT = int(os.environ.get("PORT", 8050))
 DEBUG_MODE = os.environ.get("DEBUG", "False").lower() == "true"
 
-# Configuración específica para producción
+# Producción (Render, instancia de 512 MB): el paralelismo en procesos e hilos es opcional
 PRODUCTION = os.environ.get("RENDER", "False").lower() == "true"
+
+# Formato de cache de resultados por estructura: "json" (archivos .calculoXXX.json)
+# o "binario" (contenedor comprimido .resultados.agpz, ver utils/cache_binario.py)
+CACHE_FORMATO = os.environ.get("CACHE_FORMATO", "json").lower()
+
+# Procesos para renderizar árboles de carga 2D (uno por hipótesis en paralelo).
+# 0 = automático (según CPUs y cantidad de hipótesis), 1 = secuencial en el proceso actual.
+# En producción es 1: cada proceso spawn importa matplotlib y plotly
+ARBOLES_2D_PROCESOS = int(os.environ.get("ARBOLES_2D_PROCESOS", 1 if PRODUCTION else 0))
+
+# Figuras Plotly en cache: arrays tipados (base64) y JSON comprimido con gzip
+# (ver utils/figuras_plotly.py). "false" deja el JSON compacto sin comprimir.
+FIGURAS_COMPRIMIR = os.environ.get("FIGURAS_COMPRIMIR", "True").lower() == "true"
+
+# Arranque: los motores de cálculo (numpy, pandas, matplotlib, plotly, OpenSees...) no se
+# importan al registrar vistas y callbacks. PRECARGA_MOTORES: "segundo_plano" (hilo tras el
+# arranque), "inicio" (bloqueante, comportamiento anterior) o "no" (primer uso).
+PRECARGA_MOTORES = os.environ.get("PRECARGA_MOTORES", "segundo_plano").lower()
+# Reporte de costo de importación por módulo al iniciar (cantidad de filas, 0 = desactivado)
+PERFIL_IMPORTACION = int(os.environ.get("PERFIL_IMPORTACION", 15))
+
+# dcc.Store "estructura-actual": el navegador guarda solo una referencia (token + versión) y
+# el diccionario queda en el servidor (LRU en memoria + data/sesiones/, ver utils/almacen_estructuras.py)
+ESTRUCTURA_EN_SERVIDOR = os.environ.get("ESTRUCTURA_EN_SERVIDOR", "True").lower() == "true"
+ALMACEN_ESTRUCTURAS_MEMORIA = int(os.environ.get("ALMACEN_ESTRUCTURAS_MEMORIA", 64))
+ALMACEN_ESTRUCTURAS_DIAS = float(os.environ.get("ALMACEN_ESTRUCTURAS_DIAS", 2))
+
+# Contextos de cálculo por sesión/trabajo (models/contexto_calculo.py): máximo por worker
+# y segundos de espera antes de usar un contexto temporal cuando están todos ocupados
+CONTEXTOS_CALCULO_MAX = int(os.environ.get("CONTEXTOS_CALCULO_MAX", 4))
+CONTEXTOS_CALCULO_ESPERA = float(os.environ.get("CONTEXTOS_CALCULO_ESPERA", 60))
+
+# Instrumentación de cálculos (utils/perfil_calculo.py): línea de tiempo por trabajo en
+# data/perfiles/ (visible en Consola). PERFIL_CALCULO_PROFILER: "no", "cprofile" o
+# "pyinstrument" (perfil del hilo del trabajo, con más costo). PERFILES_MAX: trabajos conservados
+PERFIL_CALCULO = os.environ.get("PERFIL_CALCULO", "True").lower() == "true"
+PERFIL_CALCULO_PROFILER = os.environ.get("PERFIL_CALCULO_PROFILER", "no").lower()
+PERFILES_MAX = int(os.environ.get("PERFILES_MAX", 30))
+
+# Etapas de una estructura (Calcular todo, familias): máximo de etapas independientes en
+# paralelo según el grafo de dependencias (utils/planificador_etapas.py). 1 = en secuencia
+# (por defecto en producción, donde Árboles, SPH y AEE juntos no entran en memoria)
+ETAPAS_PARALELAS = int(os.environ.get("ETAPAS_PARALELAS", 1 if PRODUCTION else 3))
+
+# Fundación Sulzberger: procesos para calcular en paralelo las hipótesis con fuerzas distintas.
+# 1 = secuencial (por defecto: cada hipótesis tarda milisegundos y lanzar procesos cuesta más),
+# 0 = según CPUs. Las hipótesis con las mismas fuerzas se calculan una sola vez en ambos casos
+FUNDACION_PROCESOS = int(os.environ.get("FUNDACION_PROCESOS", 1))
+
+# Fundación con ábaco precalculado por suelo y poste (utils/abaco_fundacion.py): cada hipótesis
+# arranca cerca del resultado y se verifica exacto. Para barridos (vano económico); puede
+# diferir en algunos incrementos del dimensionado completo, por eso está desactivado por defecto
+FUNDACION_ABACO = os.environ.get("FUNDACION_ABACO", "False").lower() == "true"
+# La etapa solo usa ábacos ya guardados; generarlos (15-30 s) queda para el cálculo por lotes
+# (calcular_lote.py --generar-abacos activa esta opción en sus procesos)
+FUNDACION_ABACO_GENERAR = os.environ.get("FUNDACION_ABACO_GENERAR", "False").lower() == "true"
+
+# Cálculo por lotes sin navegador (calcular_lote.py): procesos en paralelo, 0 = automático
+LOTE_PROCESOS = int(os.environ.get("LOTE_PROCESOS", 0))
+
+# Configuración específica para producción
 if PRODUCTION:
     # Configuraciones específicas para Render
     DEBUG_MODE = False
@@ -3,15 +3,16 @@ Controller para Analisis Estatico de Esfuerzos (AEE)
 """
 
 import dash
-from dash import Input, Output, State, no_update
+from dash import Input, Output, State, MATCH, html, no_update
+import math
 import threading
-import numpy as np
 
 def _make_serializable(data):
     """
     Recursively traverses a data structure and converts non-serializable
     numpy types to their serializable Python equivalents.
     """
+    import numpy as np
     if isinstance(data, dict):
         return {k: _make_serializable(v) for k, v in data.items()}
     elif isinstance(data, list):
@@ -131,7 +132,7 @@ def register_callbacks(app):
             # Ejecutar analisis
             resultados = ejecutar_analisis_aee(estructura_actual, calculo_dge, calculo_dme)
             
-            print(f"DEBUG: Analisis completado - {len(resultados.get('diagramas', {}))} diagramas generados")
+            print(f"DEBUG: Analisis completado - {len(resultados.get('diagramas', {}))} diagramas disponibles bajo demanda")
             
             # Guardar cache en background
             def guardar_async():
@@ -253,6 +254,38 @@ def register_callbacks(app):
             traceback.print_exc()
             return no_update, True, "Error", f"Error ploteando: {str(e)}", "danger", "danger"
 
+    @app.callback(
+        Output({"type": "aee-diagrama-contenedor", "hash": MATCH}, "children"),
+        Input({"type": "aee-selector-diagrama", "hash": MATCH}, "value"),
+        [State({"type": "aee-origen-diagrama", "hash": MATCH}, "data"),
+         State("estructura-actual", "data")],
+        prevent_initial_call=True
+    )
+    def mostrar_diagrama_aee(nombre_diagrama, nombre_estructura, estructura_actual):
+        """Renderiza bajo demanda el diagrama AEE seleccionado"""
+        if not nombre_diagrama:
+            raise dash.exceptions.PreventUpdate
+        
+        from utils import aee_diagramas
+        from components.vista_analisis_estatico import generar_diagrama_aee
+        
+        hash_params = dash.callback_context.triggered_id["hash"]
+        resultados = aee_diagramas.resultados_registrados(hash_params)
+        if resultados is None and nombre_estructura:
+            from utils.calculo_cache import CalculoCache
+            calculo_aee = CalculoCache.cargar_calculo_aee(nombre_estructura)
+            if calculo_aee and calculo_aee.get('resultados', {}).get('hash', calculo_aee.get('hash_parametros')) == hash_params:
+                resultados = calculo_aee['resultados']
+                resultados.setdefault('hash', hash_params)
+                aee_diagramas.registrar_resultados(resultados)
+        if resultados is None:
+            return html.P("Resultados AEE no disponibles; cargue el cache nuevamente.", className="text-muted")
+        
+        # En vistas de familia la estructura activa puede ser otra: usar sus parametros solo si coincide
+        if not estructura_actual or estructura_actual.get('TITULO') != nombre_estructura:
+            estructura_actual = None
+        return generar_diagrama_aee(resultados, nombre_diagrama, estructura_actual)
+
 def generar_resumen_comparativo(resultados, geometria):
     """Genera resumen comparativo con maximos por conexion"""
     import pandas as pd
@@ -318,8 +351,12 @@ def generar_resumen_comparativo(resultados, geometria):
     return df_resumen
 
 def ejecutar_analisis_aee(estructura_actual, calculo_dge, calculo_dme):
-    """Ejecuta analisis estatico de esfuerzos (unidades: daN, daN.m)"""
-    import matplotlib.pyplot as plt
+    """Ejecuta analisis estatico de esfuerzos (unidades: daN, daN.m)
+    
+    Los diagramas no se generan aqui: se registran en resultados['diagramas'] y se
+    renderizan bajo demanda desde los valores guardados (ver utils/aee_diagramas).
+    """
+    from utils.aee_diagramas import TIPOS_DIAGRAMA
     from utils.analisis_estatico import AnalizadorEstatico
     from utils.view_helpers import ViewHelpers
     from utils.calculo_cache import CalculoCache
@@ -394,6 +431,7 @@ def ejecutar_analisis_aee(estructura_actual, calculo_dge, calculo_dme):
     
     resultados = {
         'hash': hash_params,
+        'nombre_estructura': estructura_actual.get('TITULO', ''),
         'esfuerzos': {},
         'diagramas': {},
         'nodos_info': {},
@@ -426,7 +464,7 @@ def ejecutar_analisis_aee(estructura_actual, calculo_dge, calculo_dme):
         
         coord_i = geometria.nodos[nodo_i].coordenadas
         coord_j = geometria.nodos[nodo_j].coordenadas
-        longitud = float(np.linalg.norm(np.array(coord_j) - np.array(coord_i)))
+        longitud = float(math.dist(coord_j, coord_i))
         
         resultados['conexiones_info'].append({
             'Nodo Inicial': nodo_i,
@@ -437,18 +475,30 @@ def ejecutar_analisis_aee(estructura_actual, calculo_dge, calculo_dme):
     
     # Analizar cada hipotesis
     diagramas_activos = parametros_aee.get('DIAGRAMAS_ACTIVOS', {})
-    graficos_3d = parametros_aee.get('GRAFICOS_3D_AEE', True)
-    escala_graficos = parametros_aee.get('escala_graficos', 'logaritmica')
-    plots_interactivos = parametros_aee.get('plots_interactivos', True)
+    
+    # Parametros con los que se renderizan los diagramas bajo demanda
+    resultados['parametros_aee'] = {
+        'n_segmentar_conexion_corta': analizador.parametros.get('n_segmentar_conexion_corta'),
+        'n_segmentar_conexion_larga': analizador.parametros.get('n_segmentar_conexion_larga'),
+        'percentil_separacion_corta_larga': analizador.parametros.get('percentil_separacion_corta_larga'),
+        'GRAFICOS_3D_AEE': parametros_aee.get('GRAFICOS_3D_AEE', True),
+        'escala_graficos': parametros_aee.get('escala_graficos', 'logaritmica'),
+        'plots_interactivos': parametros_aee.get('plots_interactivos', True),
+        'DIAGRAMAS_ACTIVOS': dict(diagramas_activos)
+    }
+    resultados['parametros_aee'] = {k: v for k, v in resultados['parametros_aee'].items() if v is not None}
     
     for hip in hipotesis:
         print(f"  -> Analizando hipotesis: {hip}")
         
         try:
             esfuerzos = analizador.resolver_sistema(hip)
-            # Convertir recursivamente tipos numpy a serializables para JSON
-            esfuerzos_serializables = _make_serializable(esfuerzos)
-            resultados['esfuerzos'][hip] = esfuerzos_serializables
+            # Persistir solo resultados numéricos (valores por subnodo y reacciones);
+            # convertir recursivamente tipos numpy a serializables para JSON
+            resultados['esfuerzos'][hip] = _make_serializable({
+                'valores': esfuerzos.get('valores', {}),
+                'reacciones': esfuerzos.get('reacciones', {})
+            })
             
             # Generar DataFrame de resultados por elemento
             if 'resultados_por_elemento' in esfuerzos:
@@ -481,133 +531,11 @@ def ejecutar_analisis_aee(estructura_actual, calculo_dge, calculo_dme):
                     df_resultados = pd.DataFrame(filas)
                     resultados['esfuerzos'][hip]['df_resultados'] = df_resultados.to_dict(orient='split')
             
-            # Generar diagramas MQNT
-            if diagramas_activos.get('MQNT', True):
-                try:
-                    if plots_interactivos:
-                        # Generar figura Plotly interactiva
-                        fig = analizador.generar_diagrama_mqnt_interactivo(esfuerzos, hip, graficos_3d, escala_graficos)
-                        
-                        from pathlib import Path
-                        filename_png = f"AEE_MQNT_{hip}.{hash_params}.png"
-                        filename_json = f"AEE_MQNT_{hip}.{hash_params}.json"
-                        filepath_png = Path("data/cache") / filename_png
-                        filepath_json = Path("data/cache") / filename_json
-                        filepath_png.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        # Guardar PNG + JSON
-                        fig.write_image(str(filepath_png), width=1200, height=800)
-                        fig.write_json(str(filepath_json))
-                        
-                        resultados['diagramas'][f'MQNT_{hip}'] = filename_png
-                        print(f"✅ Diagrama MQNT interactivo guardado: {filename_png} + {filename_json}")
-                    else:
-                        # Generar figura matplotlib estática
-                        fig = analizador.generar_diagrama_mqnt(esfuerzos, hip, graficos_3d, escala_graficos)
-                        
-                        from pathlib import Path
-                        filename_png = f"AEE_MQNT_{hip}.{hash_params}.png"
-                        filepath_png = Path("data/cache") / filename_png
-                        filepath_png.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        # Guardar solo PNG
-                        fig.savefig(str(filepath_png), dpi=150, bbox_inches='tight')
-                        plt.close(fig)
-                        
-                        resultados['diagramas'][f'MQNT_{hip}'] = filename_png
-                        print(f"✅ Diagrama MQNT estático guardado: {filename_png}")
-                except Exception as e:
-                    print(f"❌ Error guardando MQNT para {hip}: {e}")
-                    import traceback
-                    traceback.print_exc()
-            
-            # Generar diagramas segun configuracion
-            if diagramas_activos.get('MRT', True):
-                valores_mrt = analizador.calcular_momento_resultante_total(esfuerzos)
-                valores_mrt_serializables = _make_serializable(valores_mrt)
-                resultados['diagramas'][f'MRT_{hip}'] = valores_mrt_serializables
-                
-                try:
-                    if plots_interactivos:
-                        # Generar figura Plotly interactiva
-                        if graficos_3d:
-                            fig = analizador.generar_diagrama_3d_interactivo(valores_mrt, 'MRT', hip, escala_graficos)
-                        else:
-                            fig = analizador.generar_diagrama_2d_interactivo(valores_mrt, 'MRT', hip, escala_graficos)
-                        
-                        from pathlib import Path
-                        filename_png = f"AEE_MRT_{hip}.{hash_params}.png"
-                        filename_json = f"AEE_MRT_{hip}.{hash_params}.json"
-                        filepath_png = Path("data/cache") / filename_png
-                        filepath_json = Path("data/cache") / filename_json
-                        filepath_png.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        # Guardar PNG + JSON
-                        fig.write_image(str(filepath_png), width=1200, height=600)
-                        fig.write_json(str(filepath_json))
-                        
-                        resultados['diagramas'][f'MRT_{hip}'] = filename_png
-                    else:
-                        # Generar figura matplotlib estática
-                        if graficos_3d:
-                            fig = analizador.generar_diagrama_3d(valores_mrt, 'MRT', hip, escala_graficos)
-                        else:
-                            fig = analizador.generar_diagrama_2d(valores_mrt, 'MRT', hip, escala_graficos)
-                        
-                        from pathlib import Path
-                        filename_png = f"AEE_MRT_{hip}.{hash_params}.png"
-                        filepath_png = Path("data/cache") / filename_png
-                        filepath_png.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        fig.savefig(str(filepath_png), dpi=150, bbox_inches='tight')
-                        plt.close(fig)
-                        resultados['diagramas'][f'MRT_{hip}'] = filename_png
-                except Exception as e:
-                    print(f"Error guardando MRT para {hip}: {e}")
+            # Diagramas: solo se registran; se renderizan bajo demanda (utils/aee_diagramas)
+            for tipo in TIPOS_DIAGRAMA:
+                if diagramas_activos.get(tipo, True):
+                    resultados['diagramas'][f'{tipo}_{hip}'] = f"AEE_{tipo}_{hip}.{hash_params}.png"
             
-            if diagramas_activos.get('MFE', True):
-                valores_mfe = analizador.calcular_momento_flector_equivalente(esfuerzos)
-                valores_mfe_serializables = _make_serializable(valores_mfe)
-                resultados['diagramas'][f'MFE_{hip}'] = valores_mfe_serializables
-                
-                try:
-                    if plots_interactivos:
-                        # Generar figura Plotly interactiva
-                        if graficos_3d:
-                            fig = analizador.generar_diagrama_3d_interactivo(valores_mfe, 'MFE', hip, escala_graficos)
-                        else:
-                            fig = analizador.generar_diagrama_2d_interactivo(valores_mfe, 'MFE', hip, escala_graficos)
-                        
-                        from pathlib import Path
-                        filename_png = f"AEE_MFE_{hip}.{hash_params}.png"
-                        filename_json = f"AEE_MFE_{hip}.{hash_params}.json"
-                        filepath_png = Path("data/cache") / filename_png
-                        filepath_json = Path("data/cache") / filename_json
-                        filepath_png.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        # Guardar PNG + JSON
-                        fig.write_image(str(filepath_png), width=1200, height=600)
-                        fig.write_json(str(filepath_json))
-                        
-                        resultados['diagramas'][f'MFE_{hip}'] = filename_png
-                    else:
-                        # Generar figura matplotlib estática
-                        if graficos_3d:
-                            fig = analizador.generar_diagrama_3d(valores_mfe, 'MFE', hip, escala_graficos)
-                        else:
-                            fig = analizador.generar_diagrama_2d(valores_mfe, 'MFE', hip, escala_graficos)
-                        
-                        from pathlib import Path
-                        filename_png = f"AEE_MFE_{hip}.{hash_params}.png"
-                        filepath_png = Path("data/cache") / filename_png
-                        filepath_png.parent.mkdir(parents=True, exist_ok=True)
-                        
-                        fig.savefig(str(filepath_png), dpi=150, bbox_inches='tight')
-                        plt.close(fig)
-                        resultados['diagramas'][f'MFE_{hip}'] = filename_png
-                except Exception as e:
-                    print(f"Error guardando MFE para {hip}: {e}")
-                
         except Exception as e:
             print(f"ERROR en hipotesis {hip}: {e}")
             continue
@@ -644,4 +572,7 @@ def ejecutar_analisis_aee(estructura_actual, calculo_dge, calculo_dme):
     
     print(f"DEBUG: Analisis AEE completado")
     
+    from utils import aee_diagramas
+    aee_diagramas.registrar_resultados(resultados)
+    
     return resultados
@@ -5,7 +5,6 @@ from dash import html, Input, Output, State
 import dash_bootstrap_components as dbc
 import base64
 from models.app_state import AppState
-from utils.arboles_carga import generar_arboles_carga
 from utils.calculo_cache import CalculoCache
 from config.app_config import CACHE_DIR
 
@@ -308,6 +307,7 @@ def register_callbacks(app):
                         print(f"⚠️ No hay cargas asignadas a los nodos")
             
             # Generar árboles
+            from utils.arboles_carga import generar_arboles_carga
             usar_3d = bool(adc_3d)
             resultado = generar_arboles_carga(
                 estructura_poo,
@@ -4,6 +4,7 @@ import dash
 from dash import Input, Output, State
 import dash_bootstrap_components as dbc
 from models.app_state import AppState
+from utils.perfil_calculo import medido, titulo_estructura
 
 
 def register_callbacks(app):
@@ -59,8 +60,9 @@ def register_callbacks(app):
          State("checklist-calculos", "value")],
         prevent_initial_call=True
     )
+    @medido("calcular_todo", tipo="estructura", titulo=lambda n_clicks, estructura_actual, *args: titulo_estructura(estructura_actual))
     def ejecutar_calculo_completo(n_clicks, estructura_actual, calculos_activos):
-        """Ejecuta todos los cálculos en secuencia reutilizando lógica de vistas"""
+        """Ejecuta todos los cálculos (independientes en paralelo) reutilizando lógica de vistas"""
         if not n_clicks:
             raise dash.exceptions.PreventUpdate
         
@@ -124,19 +126,22 @@ def register_callbacks(app):
                     True, "Advertencia", "AEE requiere DME", "warning", "warning"
                 )
             
+            # Etapas según el grafo de dependencias (independientes en paralelo, un error solo
+            # omite a sus dependientes); después se arman las vistas en el orden de siempre
+            from utils.planificador_etapas import ejecutar_etapas_estructura
+            from utils.calculo_cache import CalculoCache
+            if "cmc" in calculos_activos:
+                state.cargado_desde_cache = False
+            resultados_etapas = ejecutar_etapas_estructura(estructura_actual, state, calculos_activos)
+            
             # 1. CMC
             if "cmc" not in calculos_activos:
                 print("⏭️ CMC desactivado, saltando...")
             else:
-                from controllers.geometria_controller import ejecutar_calculo_cmc_automatico
                 from components.vista_calcular_todo import generar_resultados_cmc_lista
-                from utils.calculo_cache import CalculoCache
-                
-                state.cargado_desde_cache = False
                 
-                print("🔧 Ejecutando CMC...")
                 resultados.append(html.H3("1. CÁLCULO MECÁNICO DE CABLES (CMC)", className="mt-4"))
-                resultado_cmc = ejecutar_calculo_cmc_automatico(estructura_actual, state)
+                resultado_cmc = resultados_etapas["cmc"]
                 if resultado_cmc.get('exito'):
                     print("✅ CMC exitoso, cargando desde cache...")
                     calculo_cmc = CalculoCache.cargar_calculo_cmc(estructura_actual.get('TITULO', 'estructura'))
@@ -154,12 +159,10 @@ def register_callbacks(app):
             if "dge" not in calculos_activos:
                 print("⏭️ DGE desactivado, saltando...")
             else:
-                from controllers.geometria_controller import ejecutar_calculo_dge
                 from components.vista_diseno_geometrico import generar_resultados_dge
                 
-                print("🔧 Ejecutando DGE...")
                 resultados.append(html.H3("2. DISEÑO GEOMÉTRICO DE ESTRUCTURA (DGE)", className="mt-4"))
-                resultado_dge = ejecutar_calculo_dge(estructura_actual, state)
+                resultado_dge = resultados_etapas["dge"]
                 if resultado_dge.get('exito'):
                     print("✅ DGE exitoso, cargando desde cache...")
                     calculo_dge = CalculoCache.cargar_calculo_dge(estructura_actual.get('TITULO', 'estructura'))
@@ -181,12 +184,10 @@ def register_callbacks(app):
             if "dme" not in calculos_activos:
                 print("⏭️ DME desactivado, saltando...")
             else:
-                from controllers.ejecutar_calculos import ejecutar_calculo_dme
                 from components.vista_diseno_mecanico import generar_resultados_dme
                 
-                print("🔧 Ejecutando DME...")
                 resultados.append(html.H3("3. DISEÑO MECÁNICO DE ESTRUCTURA (DME)", className="mt-4"))
-                resultado_dme = ejecutar_calculo_dme(estructura_actual, state)
+                resultado_dme = resultados_etapas["dme"]
                 if resultado_dme.get('exito'):
                     print("✅ DME exitoso, cargando desde cache...")
                     calculo_dme = CalculoCache.cargar_calculo_dme(estructura_actual.get('TITULO', 'estructura'))
@@ -203,12 +204,10 @@ def register_callbacks(app):
             if "arboles" not in calculos_activos:
                 print("⏭️ Árboles desactivado, saltando...")
             else:
-                from controllers.ejecutar_calculos import ejecutar_calculo_arboles
                 from components.vista_arboles_carga import generar_resultados_arboles
                 
-                print("🔧 Ejecutando Árboles...")
                 resultados.append(html.H3("4. ÁRBOLES DE CARGA", className="mt-4"))
-                resultado_arboles = ejecutar_calculo_arboles(estructura_actual, state)
+                resultado_arboles = resultados_etapas["arboles"]
                 if resultado_arboles.get('exito'):
                     print("✅ Árboles exitoso, cargando desde cache...")
                     calculo_arboles = CalculoCache.cargar_calculo_arboles(estructura_actual.get('TITULO', 'estructura'))
@@ -225,12 +224,10 @@ def register_callbacks(app):
             if "sph" not in calculos_activos:
                 print("⏭️ SPH desactivado, saltando...")
             else:
-                from controllers.ejecutar_calculos import ejecutar_calculo_sph
                 from components.vista_seleccion_poste import _crear_area_resultados
                 
-                print("🔧 Ejecutando SPH...")
                 resultados.append(html.H3("5. SELECCIÓN DE POSTE DE HORMIGÓN (SPH)", className="mt-4"))
-                resultado_sph = ejecutar_calculo_sph(estructura_actual, state)
+                resultado_sph = resultados_etapas["sph"]
                 if resultado_sph.get('exito'):
                     print("✅ SPH exitoso, cargando desde cache...")
                     calculo_sph = CalculoCache.cargar_calculo_sph(estructura_actual.get('TITULO', 'estructura'))
@@ -247,11 +244,8 @@ def register_callbacks(app):
             if "fundacion" not in calculos_activos:
                 print("⏭️ Fundación desactivado, saltando...")
             else:
-                from controllers.ejecutar_calculos import ejecutar_calculo_fundacion
-                
-                print("🔧 Ejecutando Fundación...")
                 resultados.append(html.H3("6. FUNDACIÓN", className="mt-4"))
-                resultado_fundacion = ejecutar_calculo_fundacion(estructura_actual, state)
+                resultado_fundacion = resultados_etapas["fundacion"]
                 if resultado_fundacion.get('exito'):
                     print("✅ Fundación exitoso, cargando desde cache...")
                     calculo_fundacion = CalculoCache.cargar_calculo_fund(estructura_actual.get('TITULO', 'estructura'))
@@ -274,11 +268,8 @@ def register_callbacks(app):
             if "costeo" not in calculos_activos:
                 print("⏭️ Costeo desactivado, saltando...")
             else:
-                from controllers.ejecutar_calculos import ejecutar_calculo_costeo
-                
-                print("🔧 Ejecutando Costeo...")
                 resultados.append(html.H3("7. COSTEO", className="mt-4"))
-                resultado_costeo = ejecutar_calculo_costeo(estructura_actual, state)
+                resultado_costeo = resultados_etapas["costeo"]
                 if resultado_costeo.get('exito'):
                     print("✅ Costeo exitoso, cargando desde cache...")
                     calculo_costeo = CalculoCache.cargar_calculo_costeo(estructura_actual.get('TITULO', 'estructura'))
@@ -301,11 +292,8 @@ def register_callbacks(app):
             if "aee" not in calculos_activos:
                 print("⏭️ AEE desactivado, saltando...")
             else:
-                from controllers.ejecutar_calculos import ejecutar_calculo_aee
-                
-                print("🔧 Ejecutando AEE...")
                 resultados.append(html.H3("8. ANÁLISIS ESTÁTICO DE ESFUERZOS (AEE)", className="mt-4"))
-                resultado_aee = ejecutar_calculo_aee(estructura_actual, state)
+                resultado_aee = resultados_etapas["aee"]
                 if resultado_aee.get('exito'):
                     print("✅ AEE exitoso, cargando desde cache...")
                     calculo_aee = CalculoCache.cargar_calculo_aee(estructura_actual.get('TITULO', 'estructura'))
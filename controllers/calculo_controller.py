@@ -4,7 +4,6 @@ import dash
 from dash import html, dcc, Input, Output, State, ALL
 import dash_bootstrap_components as dbc
 from models.app_state import AppState
-from utils.plot_flechas import crear_grafico_flechas
 
 
 def register_callbacks(app):
@@ -252,6 +251,7 @@ def register_callbacks(app):
                 
                 if state.calculo_objetos.cable_conductor and state.calculo_objetos.cable_guardia:
                     try:
+                        from utils.plot_flechas import crear_grafico_flechas
                         figs = crear_grafico_flechas(
                             state.calculo_objetos.cable_conductor,
                             state.calculo_objetos.cable_guardia,
@@ -284,26 +284,29 @@ def register_callbacks(app):
                         from utils.view_helpers import ViewHelpers
                         import threading
                         nombre_estructura = estructura_actual.get('TITULO', 'estructura')
+                        # El hilo no hereda el contexto de cálculo de la sesión (contexto_actual()
+                        # sería el global): se captura el cálculo mecánico de esta sesión
+                        calculo_mecanico = state.calculo_mecanico
                         
                         def guardar_async():
                             # Guardar datos en cache con DataFrames completos
                             hash_params = CalculoCache.guardar_calculo_cmc(
                                 nombre_estructura, 
                                 estructura_actual, 
-                                state.calculo_mecanico.resultados_conductor,
-                                state.calculo_mecanico.resultados_guardia1,
-                                state.calculo_mecanico.df_cargas_totales,
+                                calculo_mecanico.resultados_conductor,
+                                calculo_mecanico.resultados_guardia1,
+                                calculo_mecanico.df_cargas_totales,
                                 fig_combinado,
                                 fig_conductor,
                                 fig_guardia1,
-                                resultados_guardia2=state.calculo_mecanico.resultados_guardia2,
+                                resultados_guardia2=calculo_mecanico.resultados_guardia2,
                                 console_output=console_output,
                                 df_conductor_html=df_conductor_cache.to_json(orient='split'),
                                 df_guardia1_html=df_guardia1_cache.to_json(orient='split'),
                                 df_guardia2_html=df_guardia2_cache.to_json(orient='split') if df_guardia2_cache is not None else None,
-                                memoria_conductor=state.calculo_mecanico.memoria_conductor,
-                                memoria_guardia1=state.calculo_mecanico.memoria_guardia1,
-                                memoria_guardia2=state.calculo_mecanico.memoria_guardia2
+                                memoria_conductor=calculo_mecanico.memoria_conductor,
+                                memoria_guardia1=calculo_mecanico.memoria_guardia1,
+                                memoria_guardia2=calculo_mecanico.memoria_guardia2
                             )
                             
                             # Guardar JSON interactivos
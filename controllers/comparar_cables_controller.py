@@ -6,11 +6,9 @@ from dash import Input, Output, State, callback_context, html, dcc
 import dash
 import dash_bootstrap_components as dbc
 from utils.comparar_cables_manager import ComparativaCablesManager
-from utils.cable_manager import CableManager
 from utils.calculo_cache import CalculoCache
 from components.vista_comparar_cables import crear_vista_comparar_cables, _crear_lista_cables
 import json
-import pandas as pd
 
 def registrar_callbacks_comparar_cables(app):
     """Registrar todos los callbacks de comparar cables"""
@@ -23,17 +21,9 @@ def registrar_callbacks_comparar_cables(app):
     def cargar_cables_disponibles(_):
         """Cargar lista de cables disponibles"""
         try:
-            # Cargar desde cables.json (incluye cables convertidos)
-            from config.app_config import DATA_DIR
-            cables_path = DATA_DIR / "cables.json"
-            if cables_path.exists():
-                with open(cables_path, 'r', encoding='utf-8') as f:
-                    cables_data = json.load(f)
-                cables = list(cables_data.keys())
-            else:
-                # Fallback a cable manager
-                cable_manager = CableManager()
-                cables = cable_manager.obtener_lista_cables()
+            # Biblioteca compartida (cables.json, incluye cables convertidos)
+            from utils.biblioteca_cables import BibliotecaCables
+            cables = list(BibliotecaCables.obtener_datos().keys())
             
             return [{"label": cable, "value": cable} for cable in sorted(cables)]
         except Exception as e:
@@ -535,6 +525,7 @@ def registrar_callbacks_comparar_cables(app):
                     # Crear tabla de resultados completa
                     try:
                         if resultado.get('dataframe_html'):
+                            import pandas as pd
                             df_data = json.loads(resultado['dataframe_html'])
                             df = pd.DataFrame(df_data['data'], columns=df_data['columns'])
                             tabla = dbc.Table.from_dataframe(df, striped=True, bordered=True, hover=True, size="sm")
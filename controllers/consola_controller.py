@@ -1,7 +1,8 @@
 """Controlador para vista de consola"""
 import dash
-from dash import Input, Output
+from dash import Input, Output, State, dcc
 from utils.console_capture import get_console_capture
+from utils.perfil_calculo import DIR_PERFILES, cargar_perfil, listar_perfiles
 
 def register_callbacks(app):
     """Registrar callbacks de consola"""
@@ -18,3 +19,49 @@ def register_callbacks(app):
             return capture.get_text()
         except:
             return dash.no_update
+    
+    @app.callback(
+        Output("consola-perfil-select", "options"),
+        Output("consola-perfil-select", "value"),
+        Input("btn-actualizar-consola", "n_clicks"),
+        State("consola-perfil-select", "value"),
+        prevent_initial_call=False
+    )
+    def actualizar_lista_perfiles(n_clicks, seleccionado):
+        """Lista de trabajos con línea de tiempo guardada (el más reciente primero)"""
+        perfiles = listar_perfiles()
+        opciones = [
+            {"label": f"{fecha}  {nombre}  ({duracion or 0:.2f} s)", "value": archivo}
+            for archivo, nombre, fecha, duracion in perfiles
+        ]
+        archivos = [archivo for archivo, *_ in perfiles]
+        if seleccionado not in archivos:
+            seleccionado = archivos[0] if archivos else None
+        return opciones, seleccionado
+    
+    @app.callback(
+        Output("consola-perfil-grafico", "figure"),
+        Output("consola-perfil-detalle", "children"),
+        Input("consola-perfil-select", "value"),
+        prevent_initial_call=False
+    )
+    def mostrar_perfil(archivo):
+        """Línea de tiempo y totales del trabajo seleccionado"""
+        from components.vista_consola import crear_figura_linea_tiempo, formatear_detalle_perfil
+        
+        perfil = cargar_perfil(archivo) if archivo else None
+        if perfil is None:
+            return {"data": [], "layout": {"template": "plotly_dark", "height": 300}}, "Sin perfiles de cálculo registrados"
+        return crear_figura_linea_tiempo(perfil), formatear_detalle_perfil(perfil)
+    
+    @app.callback(
+        Output("descarga-perfil", "data"),
+        Input("btn-descargar-perfil", "n_clicks"),
+        State("consola-perfil-select", "value"),
+        prevent_initial_call=True
+    )
+    def descargar_perfil(n_clicks, archivo):
+        """Descarga el JSON de la línea de tiempo seleccionada"""
+        if not n_clicks or not archivo or cargar_perfil(archivo) is None:
+            raise dash.exceptions.PreventUpdate
+        return dcc.send_file(str(DIR_PERFILES / archivo))
@@ -3,7 +3,6 @@ from dash import Input, Output, State
 import dash_bootstrap_components as dbc
 import threading
 from utils.calculo_cache import CalculoCache
-from utils.calculo_costeo import verificar_cadena_completa_costeo, ejecutar_cadena_completa_costeo, extraer_datos_para_costeo, calcular_costeo_completo
 from models.app_state import AppState
 from config.app_config import DATA_DIR
 
@@ -56,6 +55,8 @@ def registrar_callbacks_costeo(app):
                                               factor_terreno, adicional_estructura]):
                 return dash.no_update, True, "Error", "Faltan parámetros obligatorios", "danger", "danger"
             
+            from utils.calculo_costeo import verificar_cadena_completa_costeo, ejecutar_cadena_completa_costeo, extraer_datos_para_costeo, calcular_costeo_completo
+            
             # Verificar cadena completa de prerequisitos
             cadena_completa = verificar_cadena_completa_costeo(nombre_estructura, estructura_actual)
             
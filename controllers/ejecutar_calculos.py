@@ -1,5 +1,9 @@
 """Funciones ejecutables centralizadas para todos los cálculos"""
 
+from utils.perfil_calculo import medido, titulo_estructura
+
+
+@medido("dme", tipo="estructura", titulo=titulo_estructura)
 def ejecutar_calculo_dme(estructura_actual, state, generar_plots=True):
     """Ejecuta cálculo DME y retorna resultados"""
     try:
@@ -49,6 +53,7 @@ def ejecutar_calculo_dme(estructura_actual, state, generar_plots=True):
         return {"exito": False, "mensaje": str(e)}
 
 
+@medido("arboles", tipo="estructura", titulo=titulo_estructura)
 def ejecutar_calculo_arboles(estructura_actual, state, generar_plots=True):
     """Ejecuta cálculo de árboles de carga y retorna resultados"""
     try:
@@ -110,34 +115,32 @@ def ejecutar_calculo_arboles(estructura_actual, state, generar_plots=True):
         return {"exito": False, "mensaje": str(e)}
 
 
+@medido("sph", tipo="estructura", titulo=titulo_estructura)
 def ejecutar_calculo_sph(estructura_actual, state):
     """Ejecuta cálculo de selección de postes y retorna resultados"""
     try:
         from PostesHormigon import PostesHormigon
         from utils.calculo_cache import CalculoCache
-        import io, sys, hashlib, json
+        from utils.console_capture import capturar_salida
         
         estructura_geometria = state.calculo_objetos.estructura_geometria
         estructura_mecanica = state.calculo_objetos.estructura_mecanica
         
         postes = PostesHormigon()
-        old_stdout = sys.stdout
-        sys.stdout = buffer = io.StringIO()
-        
-        resultados_sph = postes.calcular_seleccion_postes(
-            geometria=estructura_geometria,
-            mecanica=estructura_mecanica,
-            FORZAR_N_POSTES=estructura_actual.get('FORZAR_N_POSTES', 0),
-            FORZAR_ORIENTACION=estructura_actual.get('FORZAR_ORIENTACION', 'No'),
-            ANCHO_CRUCETA=estructura_actual.get('ANCHO_CRUCETA', 0.2),
-            PRIORIDAD_DIMENSIONADO=estructura_actual.get('PRIORIDAD_DIMENSIONADO', 'longitud_total'),
-            AJUSTE_RO_POR_HT=estructura_actual.get('AJUSTE_RO_POR_HT', False),
-            KE_estructura_ensayada=estructura_actual.get('KE_estructura_ensayada', 1.0)
-        )
-        
-        postes.imprimir_desarrollo_seleccion_postes()
-        desarrollo_texto = buffer.getvalue()
-        sys.stdout = old_stdout
+        with capturar_salida() as buffer:
+            resultados_sph = postes.calcular_seleccion_postes(
+                geometria=estructura_geometria,
+                mecanica=estructura_mecanica,
+                FORZAR_N_POSTES=estructura_actual.get('FORZAR_N_POSTES', 0),
+                FORZAR_ORIENTACION=estructura_actual.get('FORZAR_ORIENTACION', 'No'),
+                ANCHO_CRUCETA=estructura_actual.get('ANCHO_CRUCETA', 0.2),
+                PRIORIDAD_DIMENSIONADO=estructura_actual.get('PRIORIDAD_DIMENSIONADO', 'longitud_total'),
+                AJUSTE_RO_POR_HT=estructura_actual.get('AJUSTE_RO_POR_HT', False),
+                KE_estructura_ensayada=estructura_actual.get('KE_estructura_ensayada', 1.0)
+            )
+            
+            postes.imprimir_desarrollo_seleccion_postes()
+            desarrollo_texto = buffer.getvalue()
         
         nombre_estructura = estructura_actual.get('TITULO', 'estructura')
         
@@ -155,6 +158,7 @@ def ejecutar_calculo_sph(estructura_actual, state):
         return {"exito": False, "mensaje": str(e)}
 
 
+@medido("fundacion", tipo="estructura", titulo=titulo_estructura)
 def ejecutar_calculo_fundacion(estructura_actual, state, generar_plots=True):
     """Ejecuta cálculo de fundación y retorna resultados"""
     try:
@@ -230,12 +234,28 @@ def ejecutar_calculo_fundacion(estructura_actual, state, generar_plots=True):
             parametros_calculo=parametros_calculo
         )
         
+        # Ábaco precalculado para el suelo y el poste (barridos de vano económico). En la
+        # aplicación solo se carga: generarlo supera el tiempo razonable de un callback
+        abaco = None
+        from config.app_config import FUNDACION_ABACO, FUNDACION_ABACO_GENERAR
+        if FUNDACION_ABACO:
+            from utils.abaco_fundacion import obtener_abaco
+            abaco = obtener_abaco(
+                parametros_suelo, parametros_calculo,
+                poste={'hl': parametros_estructura_completos['hl'], 'dc': parametros_estructura_completos['dc'],
+                       'n_postes': parametros_estructura_completos['n_postes']},
+                tipo_base=estructura_actual.get('tipo_base_fundacion', 'cuadrada'),
+                dimensiones=(dimensiones['tin'], dimensiones['ain'], dimensiones['bin']),
+                generar=FUNDACION_ABACO_GENERAR
+            )
+        
         # Ejecutar cálculo
         resultados = sulzberger.calcular_fundacion_multiples_hipotesis(
             tin=dimensiones['tin'],
             ain=dimensiones['ain'],
             bin=dimensiones['bin'],
-            tipo_base=estructura_actual.get('tipo_base_fundacion', 'cuadrada')
+            tipo_base=estructura_actual.get('tipo_base_fundacion', 'cuadrada'),
+            abaco=abaco
         )
         
         # Generar DataFrame y memoria
@@ -269,6 +289,8 @@ def ejecutar_calculo_fundacion(estructura_actual, state, generar_plots=True):
             'poste': parametros_poste,
             'dimensiones': dimensiones
         }
+        if abaco is not None:
+            parametros_cache['abaco'] = abaco.clave
         
         resultados_cache = {
             'resultados': resultados,
@@ -290,6 +312,7 @@ def ejecutar_calculo_fundacion(estructura_actual, state, generar_plots=True):
         return {"exito": False, "mensaje": str(e)}
 
 
+@medido("costeo", tipo="estructura", titulo=titulo_estructura)
 def ejecutar_calculo_costeo(estructura_actual, state):
     """Ejecuta cálculo de costeo y retorna resultados"""
     try:
@@ -338,6 +361,7 @@ def ejecutar_calculo_costeo(estructura_actual, state):
         return {"exito": False, "mensaje": str(e)}
 
 
+@medido("aee", tipo="estructura", titulo=titulo_estructura)
 def ejecutar_calculo_aee(estructura_actual, state):
     """Ejecuta el cálculo de Análisis Estático de Esfuerzos (AEE)"""
     try:
@@ -21,9 +21,10 @@ def register_callbacks(app):
         Output("contenido-principal", "children", allow_duplicate=True),
         Input("btn-cargar-db", "n_clicks"),
         State("select-estructura-db", "value"),
+        State("estructura-actual", "data"),
         prevent_initial_call=True
     )
-    def cargar_estructura_desde_db(n_clicks, nombre_estructura):
+    def cargar_estructura_desde_db(n_clicks, nombre_estructura, _estructura_anterior):
         if not nombre_estructura:
             return dash.no_update, True, "Error", "Seleccione una estructura", "danger", "danger", dash.no_update
         
@@ -142,9 +143,10 @@ def register_callbacks(app):
         Output("toast-notificacion", "color", allow_duplicate=True),
         Input("btn-crear-nueva-confirmar", "n_clicks"),
         State("input-nombre-nueva-estructura", "value"),
+        State("estructura-actual", "data"),
         prevent_initial_call=True
     )
-    def crear_nueva_estructura_callback(n_clicks, nombre):
+    def crear_nueva_estructura_callback(n_clicks, nombre, _estructura_anterior):
         if not nombre or not nombre.strip():
             return dash.no_update, True, "Error", "Ingrese un nombre válido", "danger", "danger"
         
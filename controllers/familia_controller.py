@@ -6,7 +6,6 @@ import dash
 from dash import Input, Output, State, no_update, html, dcc, ALL
 import dash_bootstrap_components as dbc
 from typing import Dict, List, Any, Optional
-import json
 import threading
 from pathlib import Path
 from datetime import datetime
@@ -18,6 +17,18 @@ from config.app_config import DATA_DIR
 from utils.calculo_cache import CalculoCache
 from utils.view_helpers import ViewHelpers
 
+
+def _url_descarga(ruta, filename):
+    """URL del reporte exportado a disco; el servidor lo envía por bloques y lo elimina (app.py)"""
+    from utils.html_streaming import publicar_descarga
+    return f"/descargar_reporte/{publicar_descarga(ruta, filename)}"
+
+def _campos_calculos_activos(calculos_activos):
+    """campos_por_tipo para cargar_calculo_familia: solo las etapas activas (None = todas)"""
+    if calculos_activos is None:
+        return None
+    return {calculo: None for calculo in calculos_activos}
+
 # ============================================================================
 # CALLBACKS PRINCIPALES
 # ============================================================================
@@ -497,9 +508,10 @@ def register_callbacks(app):
          Output("toast-notificacion", "children"),
          Output("toast-notificacion", "color")],
         Input("select-familia-existente", "value"),
+        State("estructura-actual", "data"),
         prevent_initial_call=True
     )
-    def cargar_familia_seleccionada(nombre_familia):
+    def cargar_familia_seleccionada(nombre_familia, _estructura_actual):
         """Carga familia seleccionada del dropdown"""
         if not nombre_familia:
             return no_update, no_update, no_update, False, "", "", "info"
@@ -528,10 +540,11 @@ def register_callbacks(app):
         Input("btn-guardar-familia", "n_clicks"),
         [State("input-nombre-familia", "value"),
          State("tabla-familia-original", "data"),
-         State("tabla-familia", "columns")],
+         State("tabla-familia", "columns"),
+         State("estructura-actual", "data")],
         prevent_initial_call=True
     )
-    def guardar_familia(n_clicks, nombre_familia, tabla_original, columnas):
+    def guardar_familia(n_clicks, nombre_familia, tabla_original, columnas, _estructura_actual):
         """Guarda familia con datos actuales de tabla ORIGINAL (completa)"""
         if n_clicks is None:
             raise dash.exceptions.PreventUpdate
@@ -572,10 +585,11 @@ def register_callbacks(app):
         Input("btn-guardar-como-familia", "n_clicks"),
         [State("input-nombre-familia", "value"),
          State("tabla-familia-original", "data"),
-         State("tabla-familia", "columns")],
+         State("tabla-familia", "columns"),
+         State("estructura-actual", "data")],
         prevent_initial_call=True
     )
-    def guardar_como_familia(n_clicks, nombre_familia, tabla_original, columnas):
+    def guardar_como_familia(n_clicks, nombre_familia, tabla_original, columnas, _estructura_actual):
         """Guarda como nueva familia con datos actuales de tabla ORIGINAL (completa)"""
         if n_clicks is None:
             raise dash.exceptions.PreventUpdate
@@ -899,8 +913,9 @@ def register_callbacks(app):
             if not nombre_familia:
                 return (no_update, True, "Error", "Debe especificar nombre de familia", "danger", "danger")
             
-            # Cargar cache
-            calculo_guardado = CalculoCache.cargar_calculo_familia(nombre_familia)
+            # Cargar cache (solo las etapas que muestra la vista)
+            calculo_guardado = CalculoCache.cargar_calculo_familia(
+                nombre_familia, campos_por_tipo=_campos_calculos_activos(calculos_activos))
             
             if not calculo_guardado:
                 return (no_update, True, "Advertencia", "Cache no disponible", "warning", "warning")
@@ -933,7 +948,7 @@ def register_callbacks(app):
 
     
     @app.callback(
-        Output("download-html-familia", "data"),
+        Output("iframe-descarga-html-familia", "src", allow_duplicate=True),
         Input("btn-descargar-html-familia", "n_clicks"),
         [State("input-nombre-familia", "value"),
          State("checklist-calculos-familia", "value")],
@@ -945,8 +960,9 @@ def register_callbacks(app):
             raise dash.exceptions.PreventUpdate
         
         try:
-            # Cargar cache de familia
-            calculo_guardado = CalculoCache.cargar_calculo_familia(nombre_familia)
+            # Cargar cache de familia (solo las etapas incluidas en el HTML)
+            calculo_guardado = CalculoCache.cargar_calculo_familia(
+                nombre_familia, campos_por_tipo=_campos_calculos_activos(calculos_activos))
             
             if not calculo_guardado:
                 return no_update
@@ -960,11 +976,11 @@ def register_callbacks(app):
             # Diagnostics: imprimir información básica para depuración
             print(f"ℹ️ descargar_html_familia: archivo_origen={calculo_guardado.get('archivo_origen')} resultados_keys={list(calculo_guardado.get('resultados', {}).keys())}")
             logger.debug(f"Descargando HTML familia='{nombre_familia}' checklist={checklist_dict} resultados_keys={list(calculo_guardado.get('resultados', {}).keys())}")
-            from utils.descargar_html import generar_html_familia
-            html_content = generar_html_familia(nombre_familia, calculo_guardado["resultados"], checklist_dict)
+            from utils.descargar_html_familia_completo import exportar_html_familia
+            ruta_html = exportar_html_familia(nombre_familia, calculo_guardado["resultados"], checklist_dict)
             
             # Retornar para descarga
-            return dict(content=html_content, filename=f"{nombre_familia}_familia.html")
+            return _url_descarga(ruta_html, f"{nombre_familia}_familia.html")
             
         except Exception as e:
             import logging
@@ -976,16 +992,17 @@ def register_callbacks(app):
         [Output("modal-descargar-html-familia", "is_open"),
          Output("chk-secciones-html-familia", "options"),
          Output("chk-secciones-html-familia", "value"),
-         Output("download-html-personalizado", "data"),
+         Output("iframe-descarga-html-familia", "src", allow_duplicate=True),
          Output("store-secciones-html-familia-options", "data")],
         [Input("btn-descargar-html-personalizado", "n_clicks"),
          Input("modal-descargar-html-familia-confirm", "n_clicks"),
          Input("modal-descargar-html-familia-cancel", "n_clicks")],
         [State("input-nombre-familia", "value"),
-         State("chk-secciones-html-familia", "value")],
+         State("chk-secciones-html-familia", "value"),
+         State("radio-formato-imagenes-html-familia", "value")],
         prevent_initial_call=True
     )
-    def manejar_modal_descarga_personalizada(n_open, n_confirm, n_cancel, nombre_familia, selected_keys):
+    def manejar_modal_descarga_personalizada(n_open, n_confirm, n_cancel, nombre_familia, selected_keys, modo_imagenes):
         """Abrir modal (cargar lista), cancelar o confirmar descarga. Evita callbacks duplicados sobre is_open."""
         ctx = dash.callback_context
         if not ctx.triggered:
@@ -995,11 +1012,12 @@ def register_callbacks(app):
         # Abrir modal y preparar checklist
         if trigger_id == "btn-descargar-html-personalizado":
             try:
-                calculo_guardado = CalculoCache.cargar_calculo_familia(nombre_familia)
+                from utils.descargar_html_familia_personalizado import CAMPOS_DETECCION_SECCIONES, listar_secciones_disponibles
+                calculo_guardado = CalculoCache.cargar_calculo_familia(
+                    nombre_familia, campos_por_tipo=CAMPOS_DETECCION_SECCIONES)
                 if not calculo_guardado:
                     return no_update, [], [], no_update, no_update
 
-                from utils.descargar_html_familia_personalizado import listar_secciones_disponibles
                 secciones = listar_secciones_disponibles(nombre_familia, calculo_guardado)
                 options = [{"label": s.label, "value": s.key} for s in secciones]
 
@@ -1039,13 +1057,17 @@ def register_callbacks(app):
         # Confirmar -> generar HTML y cerrar modal
         if trigger_id == "modal-descargar-html-familia-confirm":
             try:
-                calculo_guardado = CalculoCache.cargar_calculo_familia(nombre_familia)
+                from utils.descargar_html_familia_personalizado import campos_para_secciones, exportar_html_personalizado
+                calculo_guardado = CalculoCache.cargar_calculo_familia(
+                    nombre_familia, campos_por_tipo=campos_para_secciones(selected_keys or []))
                 if not calculo_guardado:
                     return False, no_update, no_update, no_update, no_update
 
-                from utils.descargar_html_familia_personalizado import construir_html_personalizado
-                html_content = construir_html_personalizado(nombre_familia, calculo_guardado, selected_keys or [])
-                return False, no_update, no_update, dict(content=html_content, filename=f"{nombre_familia}_familia_personalizado.html"), no_update
+                modo_imagenes = modo_imagenes or "embebido"
+                ruta_html = exportar_html_personalizado(nombre_familia, calculo_guardado, selected_keys or [], modo_imagenes=modo_imagenes)
+                extension = "zip" if modo_imagenes == "assets" else "html"
+                descarga = _url_descarga(ruta_html, f"{nombre_familia}_familia_personalizado.{extension}")
+                return False, no_update, no_update, descarga, no_update
             except Exception as e:
                 import logging
                 logger = logging.getLogger(__name__)
@@ -1115,12 +1137,8 @@ def register_callbacks(app):
             # Buscar opciones para el parámetro
             opciones = None
             if parametro in ["cable_conductor_id", "cable_guardia_id", "cable_guardia2_id"]:
-                try:
-                    with open("data/cables.json", "r", encoding="utf-8") as f:
-                        cables_data = json.load(f)
-                        opciones = list(cables_data.keys())
-                except:
-                    opciones = None
+                from utils.biblioteca_cables import BibliotecaCables
+                opciones = list(BibliotecaCables.obtener_datos().keys()) or None
             else:
                 opciones = ParametrosManager.obtener_opciones_parametro(parametro)
             
@@ -126,9 +126,10 @@ def register_callbacks(app):
         Output("toast-notificacion", "color", allow_duplicate=True),
         Input("upload-estructura", "contents"),
         State("upload-estructura", "filename"),
+        State("estructura-actual", "data"),
         prevent_initial_call=True
     )
-    def cargar_estructura_desde_upload(contents, filename):
+    def cargar_estructura_desde_upload(contents, filename, _estructura_anterior):
         if contents is None:
             raise dash.exceptions.PreventUpdate
         
@@ -1,9 +1,7 @@
 import dash
 from dash import Input, Output, State, callback_context, html
 import dash_bootstrap_components as dbc
-import pandas as pd
 import threading
-from utils.Sulzberger import Sulzberger
 from utils.calculo_cache import CalculoCache
 from utils.view_helpers import ViewHelpers
 from models.app_state import AppState
@@ -159,6 +157,7 @@ def registrar_callbacks_fundacion(app):
                 'hipotesis_fuerzas': parametros_estructura['hipotesis_fuerzas']
             }
             
+            from utils.Sulzberger import Sulzberger
             sulzberger = Sulzberger(
                 parametros_estructura=parametros_estructura_completos,
                 parametros_suelo=parametros_suelo,
@@ -485,44 +484,21 @@ def verificar_cache_cadena_completa(nombre_estructura, estructura_actual):
     """Verificar si existe cache válido de toda la cadena CMC→DGE→DME→SPH"""
     from utils.calculo_cache import CalculoCache
     
-    # Verificar CMC
-    calculo_cmc = CalculoCache.cargar_calculo_cmc(nombre_estructura)
-    if not calculo_cmc:
-        print(f"❌ DEBUG: No hay cache CMC")
-        return None
-    vigente_cmc, _ = CalculoCache.verificar_vigencia(calculo_cmc, estructura_actual)
-    if not vigente_cmc:
-        print(f"❌ DEBUG: Cache CMC no vigente")
-        return None
-    
-    # Verificar DGE
-    calculo_dge = CalculoCache.cargar_calculo_dge(nombre_estructura)
-    if not calculo_dge:
-        print(f"❌ DEBUG: No hay cache DGE")
-        return None
-    vigente_dge, _ = CalculoCache.verificar_vigencia(calculo_dge, estructura_actual)
-    if not vigente_dge:
-        print(f"❌ DEBUG: Cache DGE no vigente")
-        return None
-    
-    # Verificar DME
-    calculo_dme = CalculoCache.cargar_calculo_dme(nombre_estructura)
-    if not calculo_dme:
-        print(f"❌ DEBUG: No hay cache DME")
-        return None
-    vigente_dme, _ = CalculoCache.verificar_vigencia(calculo_dme, estructura_actual)
-    if not vigente_dme:
-        print(f"❌ DEBUG: Cache DME no vigente")
-        return None
+    # Verificar existencia y vigencia con el índice de metadatos (sin leer los cálculos)
+    for tipo in ['CMC', 'DGE', 'DME', 'SPH']:
+        meta = CalculoCache.metadatos_calculo(nombre_estructura, tipo)
+        if not meta:
+            print(f"❌ DEBUG: No hay cache {tipo}")
+            return None
+        vigente, _ = CalculoCache.verificar_vigencia(meta, estructura_actual)
+        if not vigente:
+            print(f"❌ DEBUG: Cache {tipo} no vigente")
+            return None
     
-    # Verificar SPH
-    calculo_sph = CalculoCache.cargar_calculo_sph(nombre_estructura)
-    if not calculo_sph:
-        print(f"❌ DEBUG: No hay cache SPH")
-        return None
-    vigente_sph, _ = CalculoCache.verificar_vigencia(calculo_sph, estructura_actual)
-    if not vigente_sph:
-        print(f"❌ DEBUG: Cache SPH no vigente")
+    # Solo DME y SPH aportan datos
+    calculo_dme = CalculoCache.cargar_campos(nombre_estructura, "DME", ['df_reacciones'])
+    calculo_sph = CalculoCache.cargar_campos(nombre_estructura, "SPH", ['resultados'])
+    if not calculo_dme or not calculo_sph:
         return None
     
     print(f"✅ DEBUG: Toda la cadena CMC→DGE→DME→SPH tiene cache válido")
@@ -599,8 +575,8 @@ def ejecutar_cadena_completa(nombre_estructura, estructura_actual):
         
         # Extraer parámetros desde los resultados de SPH
         from utils.calculo_cache import CalculoCache
-        calculo_sph = CalculoCache.cargar_calculo_sph(nombre_estructura)
-        calculo_dme = CalculoCache.cargar_calculo_dme(nombre_estructura)
+        calculo_sph = CalculoCache.cargar_campos(nombre_estructura, "SPH", ['resultados'])
+        calculo_dme = CalculoCache.cargar_campos(nombre_estructura, "DME", ['df_reacciones'])
         
         if not calculo_sph or not calculo_dme:
             print(f"❌ ERROR: No se pudo cargar cache después de ejecutar")
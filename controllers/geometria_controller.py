@@ -5,6 +5,7 @@ import json
 from dash import html, Input, Output, State, dcc
 import dash_bootstrap_components as dbc
 from models.app_state import AppState
+from utils.perfil_calculo import medido, titulo_estructura
 
 
 def aplicar_nodos_editados(estructura_geometria, nodos_editados_list, lib_cables=None):
@@ -20,6 +21,7 @@ def aplicar_nodos_editados(estructura_geometria, nodos_editados_list, lib_cables
     print(f"✅ Nodos editados aplicados: {len(nodos_editados_list)} nodos")
 
 
+@medido("dge", tipo="estructura", titulo=titulo_estructura)
 def ejecutar_calculo_dge(estructura_actual, state, generar_plots=True):
     """Ejecuta cálculo DGE y retorna resultados para mostrar"""
     try:
@@ -260,6 +262,7 @@ def ejecutar_calculo_dge(estructura_actual, state, generar_plots=True):
         return {"exito": False, "mensaje": str(e)}
 
 
+@medido("cmc", tipo="estructura", titulo=titulo_estructura)
 def ejecutar_calculo_cmc_automatico(estructura_actual, state, generar_plots=True):
     """Ejecuta cálculo CMC automáticamente con parámetros de estructura o familia"""
     try:
@@ -334,25 +337,25 @@ def ejecutar_calculo_cmc_automatico(estructura_actual, state, generar_plots=True
             "RELFLECHA_SIN_VIENTO": estructura_actual["RELFLECHA_SIN_VIENTO"]
         }
         
-        # Capturar output de consola
-        import io, sys
-        old_stdout = sys.stdout
-        sys.stdout = buffer = io.StringIO()
+        # Capturar output de consola (solo la de este hilo: otras etapas pueden correr en paralelo)
+        from utils.console_capture import capturar_salida
         
         # Ejecutar cálculo
-        try:
-            resultado = state.calculo_mecanico.calcular(params, estados_climaticos, restricciones_dict)
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            # Mostrar parámetros críticos para debug
-            print("💥 DEBUG EXCEPCIÓN CMC - params:", params)
-            print("💥 DEBUG EXCEPCIÓN CMC - estados_climaticos keys:", list(estados_climaticos.keys()))
-            sys.stdout = old_stdout
-            return {"exito": False, "mensaje": f"Error en cálculo: {str(e)}"}
-        
-        console_output = buffer.getvalue()
-        sys.stdout = old_stdout
+        with capturar_salida() as buffer:
+            try:
+                # En una familia, el cálculo de cables se comparte entre estructuras (utils/memo_cmc.py)
+                from models.contexto_calculo import contexto_actual
+                resultado = state.calculo_mecanico.calcular(params, estados_climaticos, restricciones_dict,
+                                                            memo=contexto_actual().memo_cmc)
+            except Exception as e:
+                import traceback
+                traceback.print_exc()
+                # Mostrar parámetros críticos para debug
+                print("💥 DEBUG EXCEPCIÓN CMC - params:", params)
+                print("💥 DEBUG EXCEPCIÓN CMC - estados_climaticos keys:", list(estados_climaticos.keys()))
+                return {"exito": False, "mensaje": f"Error en cálculo: {str(e)}"}
+            
+            console_output = buffer.getvalue()
         
         if resultado["exito"]:
             # Guardar en cache
@@ -21,9 +21,10 @@ def register_callbacks(app):
         Output("toast-notificacion", "children", allow_duplicate=True),
         Output("toast-notificacion", "color", allow_duplicate=True),
         Input({"type": "btn-cargar-estructura", "index": ALL}, "n_clicks"),
+        State("estructura-actual", "data"),
         prevent_initial_call=True
     )
-    def cargar_estructura_home(n_clicks):
+    def cargar_estructura_home(n_clicks, _estructura_anterior):
         ctx = callback_context
         if not ctx.triggered or not any(n_clicks):
             raise dash.exceptions.PreventUpdate
@@ -146,9 +147,10 @@ def register_callbacks(app):
         Input("btn-confirmar-duplicar", "n_clicks"),
         State("estructura-a-duplicar", "data"),
         State("input-nombre-duplicado", "value"),
+        State("estructura-actual", "data"),
         prevent_initial_call=True
     )
-    def confirmar_duplicar(n_clicks, estructura_origen, nuevo_nombre):
+    def confirmar_duplicar(n_clicks, estructura_origen, nuevo_nombre, _estructura_anterior):
         if not n_clicks or not estructura_origen or not nuevo_nombre:
             raise dash.exceptions.PreventUpdate
         
@@ -18,9 +18,10 @@ def register_callbacks(app):
         Input("btn-cargas-nodos-dme", "n_clicks"),
         Input("btn-cerrar-modal-cargas-nodos", "n_clicks"),
         State("modal-cargas-nodos", "is_open"),
+        State("estructura-actual", "data"),
         prevent_initial_call=True
     )
-    def toggle_modal_cargas_nodos(n_abrir, n_cerrar, is_open):
+    def toggle_modal_cargas_nodos(n_abrir, n_cerrar, is_open, _estructura_actual):
         ctx = dash.callback_context
         if not ctx.triggered:
             return is_open, dash.no_update
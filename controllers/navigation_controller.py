@@ -328,12 +328,11 @@ def register_callbacks(app):
             if not hipotesis_maestro:
                 print("❌ (NAV) ERROR FATAL: No se pudo cargar ninguna hipótesis.")
             
+            # Vigencia por el índice de metadatos: el cálculo solo se lee si se va a mostrar
             calculo_guardado = None
-            calculo_guardado = CalculoCache.cargar_calculo_dme(nombre_estructura)
-            if calculo_guardado:
-                vigente, _ = CalculoCache.verificar_vigencia(calculo_guardado, estructura_actual)
-                if not vigente:
-                    calculo_guardado = None
+            vigente, _ = CalculoCache.calculo_vigente(nombre_estructura, "DME", estructura_actual)
+            if vigente:
+                calculo_guardado = CalculoCache.cargar_calculo_dme(nombre_estructura)
             
             return crear_vista_diseno_mecanico(estructura_actual, calculo_guardado, hipotesis_maestro), badge_estructura, badge_familia
         
@@ -349,11 +348,9 @@ def register_callbacks(app):
             calculo_guardado = None
             if estructura_actual:
                 nombre_estructura = estructura_actual.get('TITULO', 'estructura')
-                calculo_guardado = CalculoCache.cargar_calculo_sph(nombre_estructura)
-                if calculo_guardado:
-                    vigente, _ = CalculoCache.verificar_vigencia(calculo_guardado, estructura_actual)
-                    if not vigente:
-                        calculo_guardado = None
+                vigente, _ = CalculoCache.calculo_vigente(nombre_estructura, "SPH", estructura_actual)
+                if vigente:
+                    calculo_guardado = CalculoCache.cargar_calculo_sph(nombre_estructura)
             return crear_vista_seleccion_poste(estructura_actual, calculo_guardado), badge_estructura, badge_familia
         
         elif trigger_id == "menu-fundacion":
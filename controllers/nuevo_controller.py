@@ -56,9 +56,10 @@ def register_callbacks(app):
         Output("toast-notificacion", "color", allow_duplicate=True),
         Input("upload-estructura-home", "contents"),
         State("upload-estructura-home", "filename"),
+        State("estructura-actual", "data"),
         prevent_initial_call=True
     )
-    def cargar_estructura_desde_upload_home(contents, filename):
+    def cargar_estructura_desde_upload_home(contents, filename, _estructura_anterior):
         if contents is None:
             raise dash.exceptions.PreventUpdate
         
@@ -2,16 +2,20 @@
 Controller para tabla de parámetros - callbacks y lógica de sincronización.
 """
 
-from dash import Input, Output, State, callback, dash, no_update, html, dcc, ALL, ctx
+from dash import Input, Output, State, dash, no_update, html, dcc, ALL, ctx
+from dash import callback as callback_dash
 import dash_bootstrap_components as dbc
 from typing import Dict, List, Any
-import json
 
 from utils.parametros_manager import ParametrosManager
 from utils.validadores_parametros import ValidadoresParametros
 from components.tabla_parametros import validar_tabla_parametros
 from models.app_state import AppState
 from components.pestanas_parametros import crear_tabla_estados_climaticos_ajuste
+from utils.almacen_estructuras import envolver_registro
+
+# "estructura-actual" viaja como referencia (ver utils/almacen_estructuras.py)
+callback = envolver_registro(callback_dash)
 
 @callback(
     [Output("tabla-parametros", "data", allow_duplicate=True),
@@ -344,14 +348,10 @@ def manejar_modal_parametro(active_cell, n_confirm, n_cancel, is_open, tabla_dat
         # Obtener opciones si es select
         opciones = ParametrosManager.obtener_opciones_parametro(parametro)
         
-        # Para cables, cargar opciones dinámicamente desde cables.json
+        # Para cables, cargar opciones dinámicamente desde la biblioteca de cables
         if parametro in ["cable_conductor_id", "cable_guardia_id", "cable_guardia2_id"] and not opciones:
-            try:
-                with open("data/cables.json", "r", encoding="utf-8") as f:
-                    cables_data = json.load(f)
-                    opciones = list(cables_data.keys())
-            except:
-                opciones = []
+            from utils.biblioteca_cables import BibliotecaCables
+            opciones = list(BibliotecaCables.obtener_datos().keys())
         
         if opciones and len(opciones) > 0:
             # Modal con botones para opciones
@@ -115,9 +115,10 @@ def register_callbacks(app):
          Output("toast-notificacion", "icon", allow_duplicate=True),
          Output("toast-notificacion", "color", allow_duplicate=True)],
         Input("vano-economico-select-familia", "value"),
+        State("estructura-actual", "data"),
         prevent_initial_call=True
     )
-    def cargar_familia_seleccionada(nombre_familia):
+    def cargar_familia_seleccionada(nombre_familia, _estructura_actual):
         """Cargar familia seleccionada"""
         if nombre_familia is None:
             raise dash.exceptions.PreventUpdate
@@ -148,11 +149,12 @@ def register_callbacks(app):
          Input("vano-economico-input-rr-cada-x-s", "value"),
          Input("vano-economico-input-cant-rr-manual", "value")],
         [State("vano-economico-input-min", "value"),
-         State("vano-economico-input-max", "value")]
+         State("vano-economico-input-max", "value"),
+         State("estructura-actual", "data")]
     )
     def actualizar_display_cantidades(longtraza, criterio_rr, 
                                      rr_cada_x_m, rr_cada_x_s, cant_rr_manual,
-                                     vano_min, vano_max):
+                                     vano_min, vano_max, _estructura_actual):
         """Actualizar display de cantidades calculadas con vano medio"""
         if vano_min is None or vano_max is None or longtraza is None:
             return html.P("Complete los campos para ver cantidades", className="text-muted")
@@ -208,11 +210,13 @@ def register_callbacks(app):
          State("vano-economico-input-rr-cada-x-m", "value"),
          State("vano-economico-input-rr-cada-x-s", "value"),
          State("vano-economico-input-cant-rr-manual", "value"),
-         State("vano-economico-switch-generar-plots", "value")],
+         State("vano-economico-switch-generar-plots", "value"),
+         State("estructura-actual", "data")],
         prevent_initial_call=True
     )
     def calcular_vano_economico(n_clicks, vano_min, vano_max, salto, longtraza,
-                               criterio_rr, rr_cada_x_m, rr_cada_x_s, cant_rr_manual, generar_plots):
+                               criterio_rr, rr_cada_x_m, rr_cada_x_s, cant_rr_manual, generar_plots,
+                               _estructura_actual):
         """Ejecutar cálculo de vano económico"""
         if n_clicks is None:
             raise dash.exceptions.PreventUpdate
@@ -267,15 +271,34 @@ def register_callbacks(app):
                    "No hay familia activa. Seleccione una familia primero.", "danger", "danger")
         
         try:
-            print(f"🚀 Iniciando cálculo de vano económico para familia: {nombre_familia}")
-            
-            # Ejecutar cálculo iterativo con generar_plots
             from utils.vano_economico_utils import calcular_vano_economico_iterativo, generar_vista_resultados_vano_economico
-            resultados = calcular_vano_economico_iterativo(
-                nombre_familia, vano_min, vano_max, salto,
-                longtraza, criterio_rr, 
-                rr_cada_x_m, rr_cada_x_s, cant_rr_manual, generar_plots
-            )
+            from utils.familia_manager import FamiliaManager
+            from utils.recosteo import hash_ingenieria_familia, puede_recostear, recostear_vano_economico
+            
+            familia_base = FamiliaManager.cargar_familia(nombre_familia)
+            calculo_guardado = CalculoCache.cargar_calculo_vano_economico(nombre_familia)
+            
+            if puede_recostear(calculo_guardado, familia_base, vano_min, vano_max, salto):
+                # Misma ingeniería y mismos vanos: solo cambian precios, traza o criterio RR
+                print(f"💲 Recosteo de vano económico para familia {nombre_familia} (sin recalcular etapas)")
+                precios = {datos.get("TITULO", nombre): datos.get("costeo", {})
+                           for nombre, datos in familia_base.get("estructuras", {}).items() if datos.get("costeo")}
+                resultados = recostear_vano_economico(
+                    calculo_guardado["resultados"], precios,
+                    longtraza=longtraza, criterio_rr=criterio_rr, rr_cada_x_m=rr_cada_x_m,
+                    rr_cada_x_s=rr_cada_x_s, cant_rr_manual=cant_rr_manual
+                )
+                mensaje = "Costos de vano económico recalculados (ingeniería desde cache)"
+            else:
+                print(f"🚀 Iniciando cálculo de vano económico para familia: {nombre_familia}")
+                
+                # Ejecutar cálculo iterativo con generar_plots
+                resultados = calcular_vano_economico_iterativo(
+                    nombre_familia, vano_min, vano_max, salto,
+                    longtraza, criterio_rr, 
+                    rr_cada_x_m, rr_cada_x_s, cant_rr_manual, generar_plots
+                )
+                mensaje = "Cálculo de vano económico completado"
             
             # Guardar en cache
             parametros = {
@@ -287,7 +310,8 @@ def register_callbacks(app):
                 "criterio_rr": criterio_rr,
                 "rr_cada_x_m": rr_cada_x_m,
                 "rr_cada_x_s": rr_cada_x_s,
-                "cant_rr_manual": cant_rr_manual
+                "cant_rr_manual": cant_rr_manual,
+                "hash_ingenieria": hash_ingenieria_familia(familia_base)
             }
             CalculoCache.guardar_calculo_vano_economico(nombre_familia, parametros, resultados)
             
@@ -295,7 +319,7 @@ def register_callbacks(app):
             vista_resultados = generar_vista_resultados_vano_economico(resultados)
             
             return (vista_resultados, 100, {"display": "block"}, True, "Éxito", 
-                   "Cálculo de vano económico completado", "success", "success")
+                   mensaje, "success", "success")
             
         except Exception as e:
             import traceback
@@ -313,9 +337,10 @@ def register_callbacks(app):
          Output("toast-notificacion", "icon", allow_duplicate=True),
          Output("toast-notificacion", "color", allow_duplicate=True)],
         Input("vano-economico-btn-cargar-cache", "n_clicks"),
+        State("estructura-actual", "data"),
         prevent_initial_call=True
     )
-    def cargar_cache_vano_economico(n_clicks):
+    def cargar_cache_vano_economico(n_clicks, _estructura_actual):
         """Cargar resultados desde cache"""
         if n_clicks is None:
             raise dash.exceptions.PreventUpdate
@@ -3,14 +3,21 @@
 from pathlib import Path
 from utils.estructura_manager import EstructuraManager
 from utils.cable_manager import CableManager
-from utils.calculo_objetos import CalculoObjetosAEA
-from utils.calculo_mecanico_cables import CalculoMecanicoCables
+from models.contexto_calculo import contexto_actual, contexto_del_hilo
 from config.app_config import DATA_DIR, CABLES_PATH, FAMILIA_STATE_FILE, ESTRUCTURA_STATE_FILE
 import json
 
 
 class AppState:
-    """Singleton para gestionar el estado global de la aplicación"""
+    """Singleton para gestionar el estado global de la aplicación
+    
+    Los objetos de cálculo (calculo_objetos, calculo_mecanico, cargado_desde_cache) y la
+    estructura y familia activas no son globales: pertenecen al contexto de cálculo de la
+    sesión o trabajo activo en el hilo (ver models/contexto_calculo.py). Fuera de un contexto
+    (layout inicial, scripts) se usan las últimas elegidas, persistidas en
+    estructura_state.json / familia_state.json, que también son el valor inicial de cada
+    sesión nueva.
+    """
     
     _instance = None
     
@@ -26,14 +33,96 @@ class AppState:
         
         self.estructura_manager = EstructuraManager(DATA_DIR)
         self.cable_manager = CableManager(CABLES_PATH)
-        self.calculo_objetos = CalculoObjetosAEA()
-        self.calculo_mecanico = CalculoMecanicoCables(self.calculo_objetos)
-        self.cargado_desde_cache = False
-        self._estructura_actual_titulo = self._cargar_estructura_activa_persistente()
-        self._familia_activa_nombre = self._cargar_familia_activa_persistente()
+        # Últimas elegidas (valor inicial de las sesiones nuevas y de los scripts)
+        self._estructura_defecto = self._cargar_estructura_activa_persistente()
+        self._familia_defecto = self._cargar_familia_activa_persistente()
         
         self._initialized = True
     
+    @property
+    def _estructura_actual_titulo(self):
+        contexto = contexto_del_hilo()
+        if contexto is not None and contexto.estructura_activa is not None:
+            return contexto.estructura_activa
+        return self._estructura_defecto
+    
+    @_estructura_actual_titulo.setter
+    def _estructura_actual_titulo(self, titulo):
+        contexto = contexto_del_hilo()
+        if contexto is not None:
+            contexto.estructura_activa = titulo
+        else:
+            self._estructura_defecto = titulo
+    
+    @property
+    def _familia_activa_nombre(self):
+        contexto = contexto_del_hilo()
+        if contexto is not None and contexto.familia_activa is not None:
+            return contexto.familia_activa
+        return self._familia_defecto
+    
+    @_familia_activa_nombre.setter
+    def _familia_activa_nombre(self, nombre):
+        contexto = contexto_del_hilo()
+        if contexto is not None:
+            contexto.familia_activa = nombre
+        else:
+            self._familia_defecto = nombre
+    
+    def activar_sesion(self, sesion, titulo_estructura=None):
+        """
+        Carga en el contexto del hilo la estructura y familia activas de la sesión
+
+        La llama el envoltorio de callbacks (utils/almacen_estructuras.py) dentro de
+        usar_contexto("sesion-<id>"). El estado se lee de data/sesiones/<sesion>.sesion.json
+        en cada callback, así lo ven todos los workers; una sesión nueva toma las últimas
+        elegidas y desde ahí no cambia aunque otra sesión elija otra estructura o familia.
+        """
+        from utils.almacen_estructuras import obtener_almacen
+        almacen = obtener_almacen()
+        estado = almacen.leer_estado_sesion(sesion)
+        if not estado:
+            estado = {"estructura_activa": self._estructura_defecto, "familia_activa": self._familia_defecto}
+            almacen.guardar_estado_sesion(sesion, estado)
+        contexto = contexto_actual()
+        contexto.sesion = sesion
+        # La referencia del Store tiene el TITULO de la estructura que muestra esa pestaña
+        contexto.estructura_activa = titulo_estructura or estado.get("estructura_activa")
+        contexto.familia_activa = estado.get("familia_activa")
+    
+    def _guardar_estado_sesion(self):
+        """Persiste la estructura/familia activas de la sesión del hilo (si hay una)"""
+        contexto = contexto_del_hilo()
+        if contexto is None or not contexto.sesion:
+            return False
+        from utils.almacen_estructuras import obtener_almacen
+        obtener_almacen().guardar_estado_sesion(contexto.sesion, {
+            "estructura_activa": contexto.estructura_activa,
+            "familia_activa": contexto.familia_activa,
+        })
+        return True
+    
+    def _elegida_por_usuario(self):
+        """Fuera de un trabajo (sesión del navegador o script) la elección es también la última elegida"""
+        contexto = contexto_del_hilo()
+        return contexto is None or bool(contexto.sesion)
+    
+    @property
+    def calculo_objetos(self):
+        return contexto_actual().calculo_objetos
+    
+    @property
+    def calculo_mecanico(self):
+        return contexto_actual().calculo_mecanico
+    
+    @property
+    def cargado_desde_cache(self):
+        return contexto_actual().cargado_desde_cache
+    
+    @cargado_desde_cache.setter
+    def cargado_desde_cache(self, valor):
+        contexto_actual().cargado_desde_cache = valor
+    
     def cargar_estructura_actual(self):
         """Cargar la estructura actual o la plantilla por defecto"""
         try:
@@ -69,7 +158,10 @@ class AppState:
             # Asegurar que la estructura_data contenga el TITULO efectivo
             estructura_data['TITULO'] = titulo
             self._estructura_actual_titulo = titulo
-            self._guardar_estructura_activa_persistente(titulo)
+            self._guardar_estado_sesion()
+            if self._elegida_por_usuario():
+                self._estructura_defecto = titulo
+                self._guardar_estructura_activa_persistente(titulo)
             
             ruta_actual = self.get_estructura_actual_path()
             self.estructura_manager.guardar_estructura(estructura_data, ruta_actual)
@@ -79,7 +171,10 @@ class AppState:
     def set_familia_activa(self, nombre_familia):
         """Establecer la familia activa y persistir"""
         self._familia_activa_nombre = nombre_familia
-        self._guardar_familia_activa_persistente(nombre_familia)
+        self._guardar_estado_sesion()
+        if self._elegida_por_usuario():
+            self._familia_defecto = nombre_familia
+            self._guardar_familia_activa_persistente(nombre_familia)
         print(f"✅ Familia activa: {nombre_familia}")
     
     def get_familia_activa(self):
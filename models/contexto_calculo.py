@@ -0,0 +1,194 @@
+"""Contextos de cálculo por sesión o trabajo (reemplazan los objetos de cálculo globales de AppState)"""
+
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from collections import OrderedDict
+
+from config.app_config import CONTEXTOS_CALCULO_MAX, CONTEXTOS_CALCULO_ESPERA
+
+
+class ContextoCalculo:
+    """Objetos de cálculo (cables, cadena, estructura, CMC) y estructura/familia activas de una sesión o trabajo"""
+
+    def __init__(self, clave=None):
+        self.clave = clave
+        self.cargado_desde_cache = False
+        # Sesión del navegador (id de la referencia de "estructura-actual"), None en trabajos
+        self.sesion = None
+        # Título de la estructura y nombre de la familia activas; None = sin definir en este
+        # contexto (se usa la última elegida, ver models/app_state.py)
+        self.estructura_activa = None
+        self.familia_activa = None
+        self.ultimo_uso = time.monotonic()
+        self._calculo_objetos = None
+        self._calculo_mecanico = None
+        # MemoCMC del trabajo (familia) que comparte el cálculo de cables entre estructuras
+        self.memo_cmc = None
+
+    @property
+    def calculo_objetos(self):
+        if self._calculo_objetos is None:
+            from utils.calculo_objetos import CalculoObjetosAEA
+            self._calculo_objetos = CalculoObjetosAEA()
+        return self._calculo_objetos
+
+    @property
+    def calculo_mecanico(self):
+        if self._calculo_mecanico is None:
+            from utils.calculo_mecanico_cables import CalculoMecanicoCables
+            self._calculo_mecanico = CalculoMecanicoCables(self.calculo_objetos)
+        return self._calculo_mecanico
+
+    def reiniciar(self, clave):
+        """Reutiliza el contexto para otra sesión: los objetos se recrean al primer uso"""
+        self.clave = clave
+        self.cargado_desde_cache = False
+        self.sesion = None
+        self.estructura_activa = None
+        self.familia_activa = None
+        self._calculo_objetos = None
+        self._calculo_mecanico = None
+        self.memo_cmc = None
+
+
+class PoolContextos:
+    """
+    Pool acotado de contextos de cálculo
+
+    Cada clave (sesión del navegador o trabajo de familia) tiene su contexto; los callbacks
+    simultáneos de una misma sesión lo comparten, como antes compartían el global. Un
+    contexto en uso nunca se entrega a otra clave. Los libres se conservan para su clave
+    (objetos ya creados) y se reciclan, del menos usado al más usado, cuando otra clave
+    necesita uno y se alcanzó el máximo. Si todos están en uso se espera; pasado el tiempo
+    de espera se crea un contexto temporal fuera del pool para no bloquear.
+    """
+
+    def __init__(self, maximo=None, espera=None):
+        self.maximo = maximo or CONTEXTOS_CALCULO_MAX
+        self.espera = CONTEXTOS_CALCULO_ESPERA if espera is None else espera
+        self._libres = OrderedDict()  # clave -> contexto (orden LRU)
+        self._ocupados = {}           # clave -> [contexto, usos]
+        self._condicion = threading.Condition()
+
+    @property
+    def total(self):
+        return len(self._libres) + len(self._ocupados)
+
+    def _tomar(self, clave):
+        if clave in self._libres:
+            return self._libres.pop(clave)
+        if self.total < self.maximo:
+            return ContextoCalculo(clave)
+        if self._libres:
+            _, contexto = self._libres.popitem(last=False)
+            print(f"♻️ Contexto de cálculo reciclado: {contexto.clave} -> {clave}")
+            contexto.reiniciar(clave)
+            return contexto
+        return None
+
+    def adquirir(self, clave):
+        """Contexto de `clave` (espera si el pool está lleno y todos los contextos en uso)"""
+        limite = time.monotonic() + self.espera
+        with self._condicion:
+            while True:
+                if clave in self._ocupados:
+                    entrada = self._ocupados[clave]
+                    entrada[1] += 1
+                    return entrada[0]
+                contexto = self._tomar(clave)
+                if contexto is not None:
+                    self._ocupados[clave] = [contexto, 1]
+                    contexto.ultimo_uso = time.monotonic()
+                    return contexto
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                self._condicion.wait(restante)
+        print(f"⚠️ Pool de contextos de cálculo ocupado ({self.maximo}), contexto temporal para {clave}")
+        return ContextoCalculo(clave)
+
+    def liberar(self, contexto):
+        with self._condicion:
+            entrada = self._ocupados.get(contexto.clave)
+            if entrada is not None and entrada[0] is contexto:
+                entrada[1] -= 1
+                if entrada[1] == 0:
+                    del self._ocupados[contexto.clave]
+                    self._libres[contexto.clave] = contexto
+                    while self.total > self.maximo and self._libres:
+                        self._libres.popitem(last=False)
+            self._condicion.notify_all()
+
+    def descartar(self, clave):
+        """Termina explícitamente la vida de un contexto libre (p. ej. al cerrar un trabajo)"""
+        with self._condicion:
+            self._libres.pop(clave, None)
+            self._condicion.notify_all()
+
+
+_pool = PoolContextos()
+_contexto_global = ContextoCalculo("global")
+_local = threading.local()
+
+
+def obtener_pool():
+    return _pool
+
+
+def contexto_actual():
+    """Contexto del hilo actual; fuera de `usar_contexto` es el contexto global del proceso"""
+    return getattr(_local, "contexto", None) or _contexto_global
+
+
+def contexto_del_hilo():
+    """Contexto activado con `usar_contexto`/`activar` en el hilo actual, o None"""
+    return getattr(_local, "contexto", None)
+
+
+@contextmanager
+def usar_contexto(clave=None, descartar_al_salir=False):
+    """
+    Activa un contexto de cálculo para el hilo actual
+
+    Args:
+        clave: sesión o trabajo; None crea una clave única (trabajo aislado)
+        descartar_al_salir: no conservar el contexto en el pool al terminar
+    """
+    clave = clave or f"trabajo-{uuid.uuid4().hex[:8]}"
+    anterior = getattr(_local, "contexto", None)
+    if anterior is not None and anterior.clave == clave:
+        yield anterior
+        return
+    contexto = _pool.adquirir(clave)
+    if anterior is not None:
+        # Un trabajo lanzado desde una sesión parte de su estructura y familia activas
+        if contexto.estructura_activa is None:
+            contexto.estructura_activa = anterior.estructura_activa
+        if contexto.familia_activa is None:
+            contexto.familia_activa = anterior.familia_activa
+    _local.contexto = contexto
+    try:
+        yield contexto
+    finally:
+        _local.contexto = anterior
+        _pool.liberar(contexto)
+        if descartar_al_salir:
+            _pool.descartar(clave)
+
+
+@contextmanager
+def activar(contexto):
+    """
+    Usa en el hilo actual un contexto ya adquirido por otro hilo del mismo trabajo
+
+    No pasa por el pool: el hilo que lo adquirió lo conserva hasta que terminan sus hilos
+    auxiliares (p. ej. etapas en paralelo de utils/planificador_etapas.py).
+    """
+    anterior = getattr(_local, "contexto", None)
+    _local.contexto = contexto
+    try:
+        yield contexto
+    finally:
+        _local.contexto = anterior
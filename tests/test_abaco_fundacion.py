@@ -0,0 +1,77 @@
+import numpy as np
+
+import utils.cache_binario as cache_binario
+from utils.abaco_fundacion import AbacoFundacion, obtener_abaco
+from utils.Sulzberger import Sulzberger
+
+
+SUELO = Sulzberger()._get_default_suelo()
+CALCULO = Sulzberger()._get_default_calculo()
+POSTE = {'hl': 13.5, 'dc': 0.31, 'n_postes': 1}
+GRILLA = {
+    'Gp': np.linspace(0, 3000, 3),
+    'Tiro_x': np.linspace(0, 2000, 3),
+    'Tiro_y': np.linspace(0, 2000, 3),
+    'he': np.array([1.5, 2.0]),
+}
+
+
+def _sulzberger(hipotesis):
+    return Sulzberger(parametros_estructura=dict(POSTE, Gp=1500, h=15.0, he=1.5, hipotesis_fuerzas=hipotesis),
+                      parametros_suelo=dict(SUELO), parametros_calculo=dict(CALCULO))
+
+
+def test_abaco_se_guarda_y_se_reutiliza(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(cache_binario, 'CACHE_DIR', tmp_path)
+    abaco = obtener_abaco(SUELO, CALCULO, POSTE, grilla=GRILLA)
+    assert 'Generando ábaco' in capsys.readouterr().out
+    assert list(tmp_path.glob('abacos/fundacion_*.npz'))
+
+    cargado = obtener_abaco(SUELO, CALCULO, POSTE, grilla=GRILLA)
+    assert 'Generando ábaco' not in capsys.readouterr().out
+    assert cargado.clave == abaco.clave and cargado.poste == POSTE
+    for nombre in ('t', 'a', 'b', 'volumen', 'convergencia'):
+        assert np.array_equal(cargado.tablas[nombre], abaco.tablas[nombre], equal_nan=True)
+
+    # Otro suelo: otro ábaco
+    otro = obtener_abaco(dict(SUELO, sigma_adm=40000.0), CALCULO, POSTE, grilla=GRILLA)
+    assert otro.clave != abaco.clave
+    capsys.readouterr()
+
+    # La etapa de la aplicación solo carga: sin ábaco guardado no lo genera
+    assert obtener_abaco(dict(SUELO, sigma_adm=30000.0), CALCULO, POSTE, grilla=GRILLA, generar=False) is None
+    assert 'Generando ábaco' not in capsys.readouterr().out
+    assert obtener_abaco(SUELO, CALCULO, POSTE, grilla=GRILLA, generar=False).clave == abaco.clave
+
+
+def test_abaco_en_un_nodo_coincide_con_el_calculo(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_binario, 'CACHE_DIR', tmp_path)
+    abaco = AbacoFundacion.generar(SUELO, CALCULO, POSTE, grilla=GRILLA)
+    s = _sulzberger([])
+    s.configurar_estructura(1500, 1000, 1000, 0.0, 15.0, 13.5, 1.5, 0.31)
+    exacto = s.calcular_fundacion()
+
+    consulta = abaco.consultar(1500, 1000, 1000, 1.5)
+    for nombre in ('t', 'a', 'b', 'volumen'):
+        assert np.isclose(consulta[nombre], exacto[nombre])
+    assert abaco.consultar(1500, 5000, 1000, 1.5) is None
+    assert abaco.inicio(dict(POSTE, hl=12.0, Gp=1500, Tiro_x=1000, Tiro_y=1000, he=1.5)) is None
+
+
+def test_hipotesis_con_abaco_verifican_y_arrancan_cerca(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_binario, 'CACHE_DIR', tmp_path)
+    abaco = AbacoFundacion.generar(SUELO, CALCULO, POSTE, grilla=GRILLA)
+    hipotesis = [{'hipotesis': 'A', 'Tiro_x': 1200.0, 'Tiro_y': 300.0, 'Tiro_z': -200.0},
+                 {'hipotesis': 'B', 'Tiro_x': 600.0, 'Tiro_y': 1700.0, 'Tiro_z': 0.0},
+                 {'hipotesis': 'C', 'Tiro_x': 9000.0, 'Tiro_y': 0.0, 'Tiro_z': 0.0}]  # fuera de la grilla
+
+    completo = _sulzberger(hipotesis).calcular_fundacion_multiples_hipotesis()['todas_hipotesis']
+    con_abaco = _sulzberger(hipotesis).calcular_fundacion_multiples_hipotesis(abaco=abaco)['todas_hipotesis']
+
+    for ref, res in zip(completo, con_abaco):
+        assert res['convergencia']
+        assert res['FSt'] >= CALCULO['FS'] and res['FSl'] >= CALCULO['FS']
+        assert res['iteraciones'] <= ref['iteraciones']
+        assert np.isclose(res['volumen'], ref['volumen'], rtol=0.1)
+    assert con_abaco[0]['iteraciones'] < completo[0]['iteraciones']
+    assert con_abaco[2] == completo[2]
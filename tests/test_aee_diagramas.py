@@ -0,0 +1,55 @@
+import numpy as np
+
+from utils import aee_diagramas
+
+
+def _resultados():
+    vals = [10.0, 2.0, 3.0, 4.0, 0, 0, 0, 0, 0, 0]
+    return {
+        'hash': 'abc123',
+        'nodos_info': {'BASE': {'x': 0, 'y': 0, 'z': 0, 'tipo': 'base'}, 'TOP': {'x': 0, 'y': 0, 'z': 10, 'tipo': 'x'}},
+        'conexiones_info': [{'Nodo Inicial': 'BASE', 'Nodo Final': 'TOP', 'Longitud [m]': '10.00', 'Tipo': 'columna'}],
+        'esfuerzos': {'HIP_A0': {'valores': {'BASE_TOP_0_i': vals}, 'reacciones': {}}},
+        'parametros_aee': {'escala_graficos': 'lineal', 'GRAFICOS_3D_AEE': False, 'plots_interactivos': False,
+                           'DIAGRAMAS_ACTIVOS': {'MQNT': True, 'MRT': True, 'MFE': False}},
+    }
+
+
+def test_listar_y_separar_diagramas():
+    resultados = _resultados()
+    assert aee_diagramas.listar_diagramas(resultados) == ['MQNT_HIP_A0', 'MRT_HIP_A0']
+    assert aee_diagramas.separar_nombre_diagrama('MRT_HIP_A0') == ('MRT', 'HIP_A0')
+
+
+def test_momentos_desde_valores_guardados():
+    esfuerzos = aee_diagramas._esfuerzos_hipotesis(_resultados(), 'HIP_A0')
+    assert aee_diagramas.calcular_momento_resultante_total(esfuerzos)['valores']['BASE_TOP_0_i'] == 5.0
+    assert aee_diagramas.calcular_momento_flector_equivalente(esfuerzos)['valores']['BASE_TOP_0_i'] == 3.0
+
+
+def test_nombre_archivo_por_variante():
+    resultados = _resultados()
+    guardadas = aee_diagramas.opciones_diagrama(resultados)
+    assert aee_diagramas.nombre_archivo_diagrama(resultados, 'MRT_HIP_A0', guardadas) == 'AEE_MRT_HIP_A0.abc123.png'
+    otra = aee_diagramas.opciones_diagrama(resultados, escala='logaritmica', graficos_3d=True)
+    assert aee_diagramas.nombre_archivo_diagrama(resultados, 'MRT_HIP_A0', otra) == 'AEE_MRT_HIP_A0.abc123.logaritmica_3d.png'
+
+
+def test_asegurar_png_renderiza_una_vez(tmp_path, monkeypatch):
+    monkeypatch.setattr(aee_diagramas, 'CACHE_DIR', tmp_path)
+    llamadas = []
+
+    class _Figura:
+        def savefig(self, ruta, **kwargs):
+            llamadas.append(ruta)
+            open(ruta, 'wb').write(b'png')
+
+    monkeypatch.setattr(aee_diagramas, 'construir_figura', lambda *a, **k: _Figura())
+    monkeypatch.setattr('matplotlib.pyplot.close', lambda fig: None)
+    resultados = _resultados()
+
+    assert aee_diagramas.asegurar_png(resultados, 'MRT_HIP_A0') == 'AEE_MRT_HIP_A0.abc123.png'
+    assert aee_diagramas.asegurar_png(resultados, 'MRT_HIP_A0') == 'AEE_MRT_HIP_A0.abc123.png'
+    assert len(llamadas) == 1
+    assert aee_diagramas.invalidar('abc123') == 1
+    assert not any(tmp_path.iterdir())
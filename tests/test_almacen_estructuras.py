@@ -0,0 +1,95 @@
+from dash import Input, Output, State
+
+from utils import almacen_estructuras
+from utils.almacen_estructuras import AlmacenEstructuras, CLAVE_REF, es_referencia
+
+
+def _estructura(**cambios):
+    estructura = {'TITULO': 'S1', 'L_vano': 400, 'nodos_editados': [{'nombre': 'C1', 'z': 10.0}]}
+    estructura.update(cambios)
+    return estructura
+
+
+def test_guardar_y_resolver_devuelve_copias(tmp_path):
+    almacen = AlmacenEstructuras(tmp_path, max_memoria=4)
+    ref = almacen.guardar(_estructura())
+    assert ref['id'] == 'S1' and ref['version'] == 1
+
+    copia = almacen.resolver(ref)
+    copia['nodos_editados'][0]['z'] = 99.0
+    assert almacen.resolver(ref)['nodos_editados'][0]['z'] == 10.0
+
+
+def test_version_y_cambios_respecto_de_la_anterior(tmp_path):
+    almacen = AlmacenEstructuras(tmp_path)
+    ref1 = almacen.guardar(_estructura())
+    ref2 = almacen.guardar(_estructura(L_vano=450), ref1)
+    assert ref2['version'] == 2
+    assert ref2['cambios'] == ['L_vano']
+    assert ref2[CLAVE_REF] != ref1[CLAVE_REF]
+    assert ref2['sesion'] == ref1['sesion']
+    # Sin cambios se reutiliza la misma referencia
+    assert almacen.guardar(_estructura(L_vano=450), ref2) == ref2
+
+
+def test_otro_worker_lee_desde_disco(tmp_path):
+    ref = AlmacenEstructuras(tmp_path, max_memoria=1).guardar(_estructura())
+    otro = AlmacenEstructuras(tmp_path)
+    assert otro.resolver(ref) == _estructura()
+
+
+def test_envolver_registro_resuelve_y_guarda(tmp_path, monkeypatch):
+    monkeypatch.setattr(almacen_estructuras, '_almacen', AlmacenEstructuras(tmp_path))
+    monkeypatch.setattr(almacen_estructuras, 'ESTRUCTURA_EN_SERVIDOR', True)
+    registradas = []
+
+    def registrar(*args, **kwargs):
+        return lambda funcion: registradas.append(funcion) or funcion
+
+    callback = almacen_estructuras.envolver_registro(registrar)
+
+    @callback(
+        [Output('estructura-actual', 'data', allow_duplicate=True), Output('toast', 'is_open')],
+        Input('btn', 'n_clicks'),
+        State('estructura-actual', 'data'),
+    )
+    def actualizar(n_clicks, estructura_actual):
+        estructura_actual['L_vano'] = 500
+        return estructura_actual, True
+
+    ref = almacen_estructuras.referenciar(_estructura())
+    nueva_ref, abierto = registradas[0](1, ref)
+    assert abierto is True
+    assert es_referencia(nueva_ref) and nueva_ref['version'] == 2
+    assert almacen_estructuras.obtener_almacen().resolver(nueva_ref)['L_vano'] == 500
+    assert almacen_estructuras.obtener_almacen().resolver(ref)['L_vano'] == 400
+
+
+def test_callbacks_sin_store_no_se_envuelven(monkeypatch):
+    monkeypatch.setattr(almacen_estructuras, 'ESTRUCTURA_EN_SERVIDOR', True)
+
+    def funcion(n):
+        return n
+
+    def registrar(*args, **kwargs):
+        return lambda f: f
+
+    callback = almacen_estructuras.envolver_registro(registrar)
+    assert callback(Output('x', 'children'), Input('btn', 'n_clicks'))(funcion) is funcion
+
+
+def test_purga_periodica_al_guardar(tmp_path, monkeypatch):
+    import os
+    almacen = AlmacenEstructuras(tmp_path, dias_retencion=1)
+    almacen.guardar(_estructura())
+    vieja = tmp_path / 'vieja.json'
+    vieja.write_text('{}', encoding='utf-8')
+    os.utime(vieja, (0, 0))
+
+    # Dentro del intervalo no se vuelve a recorrer el directorio
+    almacen.guardar(_estructura(L_vano=1))
+    assert vieja.exists()
+
+    monkeypatch.setattr(almacen_estructuras, 'INTERVALO_PURGA_S', 0)
+    almacen.guardar(_estructura(L_vano=2))
+    assert not vieja.exists()
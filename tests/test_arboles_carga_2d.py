@@ -0,0 +1,21 @@
+from utils.arboles_carga import RenderizadorArboles2D, calcular_rangos_ejes_2d, renderizar_arboles_2d
+
+
+def test_renderizador_2d_reutiliza_capa_estatica(tmp_path):
+    nodes = {'BASE': (0.0, 0.0, 0.0), 'TOP': (0.0, 0.0, 12.0), 'C1_R': (1.0, 0.0, 10.0), 'HG1': (0.0, 0.0, 12.0)}
+    reacciones = {k: 1.0 for k in ('Reaccion_Fx_daN', 'Reaccion_Fy_daN', 'Reaccion_Fz_daN', 'Reaccion_Mx_daN_m',
+                                   'Reaccion_My_daN_m', 'Reaccion_Mz_daN_m', 'Tiro_resultante_daN')}
+    capa = dict(nodes_key=nodes, rangos=calcular_rangos_ejes_2d(nodes, 0.5), grosor_linea=3.5, escala_flecha=1.8,
+                fontsize_flechas=9, fontsize_nodos=8, mostrar_nodos=True, tipo_estructura='Suspensión')
+    trabajos = [{'hipotesis': f'HIP_A{i}_X', 'cargas': {'C1_R': [10.0 * (i + 1), 0.0, -50.0]}, 'nodos_con_cargas': ['C1_R'],
+                 'reacciones': reacciones, 'ruta': str(tmp_path / f'h{i}.png'), 'nombre': f'h{i}.png'} for i in range(3)]
+
+    renderizador = RenderizadorArboles2D(**capa)
+    n_estaticos = len(renderizador.ax.get_children())
+    renderizador.renderizar(trabajos[0])
+    assert len(renderizador.ax.get_children()) == n_estaticos
+    renderizador.cerrar()
+
+    resultado = renderizar_arboles_2d(capa, trabajos, procesos=1)
+    assert [r['hipotesis'] for r in resultado] == ['HIP_A0_X', 'HIP_A1_X', 'HIP_A2_X']
+    assert all((tmp_path / f'h{i}.png').stat().st_size > 0 for i in range(3))
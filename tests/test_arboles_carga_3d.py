@@ -0,0 +1,29 @@
+import plotly.graph_objects as go
+
+from utils.arboles_carga import dibujar_flechas_desde_dataframe, _flechas_3d_desde_cargas
+
+
+NODES = {'C1': (1.0, 0.0, 10.0), 'C2': (-1.0, 0.0, 10.0), 'HG1': (0.0, 0.0, 12.0)}
+CARGAS = {'C1': [100.0, 50.0, -200.0], 'C2': [100.0, 0.0, -200.0], 'HG1': [0.0, 30.0, -80.0]}
+
+
+def test_trazas_consolidadas_por_componente():
+    fig = go.Figure()
+    dibujar_flechas_desde_dataframe(fig, CARGAS, NODES, 'HIP_A0_EMR', consolidar_trazas=True)
+    assert len(fig.data) == 9  # 3 componentes x (línea, cono, texto)
+
+    legado = go.Figure()
+    dibujar_flechas_desde_dataframe(legado, CARGAS, NODES, 'HIP_A0_EMR', consolidar_trazas=False)
+    assert len(legado.data) == 3 * 7
+
+    textos = [t for t in fig.data if t.name.endswith('_text')]
+    assert sum(len(t.text) for t in textos) == 7
+    linea_z = next(t for t in fig.data if t.name == 'flecha_HIP_A0_EMR_z_line')
+    assert list(linea_z.x).count(None) == 2  # 3 segmentos
+
+
+def test_etiquetas_superpuestas_se_desplazan():
+    nodes = {'A': (0.0, 0.0, 5.0), 'B': (0.0, 0.0, 5.0), 'C': (0.0, 0.0, 5.0)}
+    cargas = {n: [0.0, 0.0, -100.0] for n in nodes}
+    xs = sorted(f['texto'][0] for f in _flechas_3d_desde_cargas(cargas, nodes))
+    assert xs == [0.0, 0.6, 1.2]
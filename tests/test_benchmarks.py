@@ -0,0 +1,71 @@
+from benchmarks.ejecutar_benchmarks import Instrumentacion, armar_casos, combinar_repeticiones, comparar_con_linea_base
+
+
+class _Calculadora:
+    @staticmethod
+    def hash(valor):
+        return valor * 2
+
+    def sumar(self, a, b):
+        return a + b
+
+
+def test_instrumentacion_cuenta_y_restaura():
+    instrumentacion = Instrumentacion()
+    assert instrumentacion.envolver(f"{__name__}:_Calculadora.hash")
+    assert instrumentacion.envolver(f"{__name__}:_Calculadora.sumar", etiqueta="sumar", medir=True)
+    assert not instrumentacion.envolver(f"{__name__}:_Calculadora.inexistente")
+
+    calculadora = _Calculadora()
+    assert _Calculadora.hash(3) == 6
+    assert calculadora.hash(1) == 2
+    assert calculadora.sumar(1, 2) == 3
+
+    assert instrumentacion.metricas["_Calculadora.hash"] == {"llamadas": 2}
+    assert instrumentacion.metricas["sumar"]["llamadas"] == 1
+    assert instrumentacion.metricas["sumar"]["tiempo_s"] >= 0
+
+    instrumentacion.restaurar()
+    assert isinstance(_Calculadora.__dict__["hash"], staticmethod)
+    assert not hasattr(_Calculadora.__dict__["hash"].__func__, "__wrapped__")
+    assert not hasattr(_Calculadora.sumar, "__wrapped__")
+
+
+def _caso(tiempo, rss=500.0, llamadas=10, costo=1000.0, exito=True):
+    return {"exito": exito, "tiempo_s": tiempo, "rss_pico_mb": rss,
+            "llamadas": {"Cable_AEA._calcular_estado": llamadas},
+            "etapas": {"cmc": {"tiempo_s": tiempo / 2, "llamadas": 2}},
+            "resultado": {"costo_global": costo}}
+
+
+def test_comparar_con_linea_base_detecta_regresiones():
+    base = {"casos": {"familia:A": _caso(10.0), "familia:B": _caso(0.02)}}
+
+    # Dentro del umbral, y diferencias absolutas chicas, no son regresión
+    actuales = {"familia:A": _caso(11.0, rss=550.0, costo=1000.0 + 1e-7), "familia:B": _caso(0.06)}
+    assert comparar_con_linea_base(actuales, base, umbral=0.2) == []
+
+    actuales = {"familia:A": _caso(13.0, rss=700.0, llamadas=20, costo=1200.0), "familia:B": _caso(0.02, exito=False)}
+    regresiones = {(r["caso"], r["metrica"]) for r in comparar_con_linea_base(actuales, base, umbral=0.2)}
+    assert regresiones == {
+        ("familia:A", "tiempo_s"), ("familia:A", "rss_pico_mb"), ("familia:A", "etapa:cmc"),
+        ("familia:A", "llamadas:Cable_AEA._calcular_estado"), ("familia:A", "resultado"),
+        ("familia:B", "exito"),
+    }
+
+
+def test_armar_casos_vano_y_comparativa_solo_en_referencia():
+    casos = armar_casos(["A", "B"], ["familia", "vano_economico", "comparativa_cables"], "B")
+    assert casos == ["familia:A", "familia:B", "vano_economico:B", "comparativa_cables:B"]
+
+
+def test_repeticiones_usan_la_mediana():
+    combinado = combinar_repeticiones([_caso(3.0, rss=250.0), _caso(6.5, rss=260.0), _caso(3.2, rss=255.0)])
+    assert combinado["tiempo_s"] == 3.2 and combinado["rss_pico_mb"] == 255.0
+    assert combinado["etapas"]["cmc"] == {"tiempo_s": 1.6, "llamadas": 2}
+    assert combinado["repeticiones"] == 3 and combinado["tiempos_s"] == [3.0, 6.5, 3.2]
+    # Una medición atípica no es regresión contra la línea base
+    assert comparar_con_linea_base({"familia:A": combinado}, {"casos": {"familia:A": _caso(3.0)}}) == []
+
+    assert combinar_repeticiones([_caso(3.0), _caso(3.0, exito=False)])["exito"] is False
+
@@ -0,0 +1,57 @@
+import copy
+import json
+import os
+import pickle
+
+from utils.biblioteca_cables import BibliotecaCables
+
+
+CABLE_ACSS = {
+    "tipo": "ACSS", "material": "AlAc", "seccion_total_mm2": 300.0, "diametro_total_mm": 22.0,
+    "peso_unitario_dan_m": 1.0, "coeficiente_dilatacion_1_c": 1.9e-05,
+    "modulo_elasticidad_dan_mm2": 7000.0, "carga_rotura_minima_dan": 9000.0,
+    "seccion_acero_mm2": 50.0, "modulo_elasticidad_acero_dan_mm2": 19000.0,
+    "coeficiente_dilatacion_acero_1_c": 1.15e-05,
+}
+VIENTO_BASE = {'V': 38.9, 't_hielo': 0.01, 'exp': 'C', 'clase': 'C', 'Zc': 10.0, 'Cf': 1.0, 'L_vano': 300}
+
+
+def _usar_archivo(tmp_path, monkeypatch, datos):
+    ruta = tmp_path / "cables.json"
+    ruta.write_text(json.dumps(datos), encoding="utf-8")
+    monkeypatch.setattr(BibliotecaCables, "CABLES_PATH", ruta)
+    BibliotecaCables.invalidar()
+    return ruta
+
+
+def test_prototipo_acss_compartido_e_instancias_independientes(tmp_path, monkeypatch):
+    _usar_archivo(tmp_path, monkeypatch, {"ACSS 300": CABLE_ACSS})
+
+    prototipo = BibliotecaCables.obtener_prototipo("ACSS 300")
+    assert BibliotecaCables.obtener_prototipo("ACSS 300") is prototipo
+    # Sustitución de valores de acero aplicada una sola vez en el prototipo
+    assert prototipo.propiedades["seccion_total_mm2"] == 50.0
+    assert prototipo.mecanicas["modulo_elasticidad_dan_mm2"] == 19000.0
+
+    cable_a = BibliotecaCables.crear_cable("ACSS 300", dict(VIENTO_BASE))
+    cable_b = BibliotecaCables.crear_cable("ACSS 300", dict(VIENTO_BASE, L_vano=200))
+    assert cable_a is not cable_b
+    assert cable_a.seccion_mm2 == 50.0
+    assert cable_a.L_vanopeso == 300 and cable_b.L_vanopeso == 200
+    # Cada instancia tiene sus propiedades: se copia y viaja a procesos como antes
+    assert cable_a.propiedades is not prototipo.propiedades
+    assert copy.deepcopy(cable_a).propiedades == cable_a.propiedades
+    assert pickle.loads(pickle.dumps(cable_b)).L_vanopeso == 200
+    BibliotecaCables.invalidar()
+
+
+def test_recarga_si_cambia_mtime(tmp_path, monkeypatch):
+    ruta = _usar_archivo(tmp_path, monkeypatch, {"ACSS 300": CABLE_ACSS})
+    assert list(BibliotecaCables.obtener_datos()) == ["ACSS 300"]
+
+    ruta.write_text(json.dumps({"Otro": CABLE_ACSS}), encoding="utf-8")
+    mtime = ruta.stat().st_mtime_ns + 10_000_000
+    os.utime(ruta, ns=(mtime, mtime))
+
+    assert list(BibliotecaCables.obtener_datos()) == ["Otro"]
+    BibliotecaCables.invalidar()
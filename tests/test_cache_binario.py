@@ -0,0 +1,80 @@
+import pandas as pd
+
+from config import app_config
+import utils.cache_binario as cache_binario
+import utils.calculo_cache as calculo_cache
+from utils.calculo_cache import CalculoCache
+from utils.cache_binario import CacheBinario
+
+
+def _datos_cmc():
+    df = pd.DataFrame({
+        'Hipótesis': [f'H{i}' for i in range(20)],
+        'Fx': [float(i) * 1.5 for i in range(20)],
+        'Fy': list(range(20)),
+    })
+    return {
+        'resultados_conductor': {'I': {'tiro_daN': 1234.5, 'flecha_vertical_m': 5.2}},
+        'df_cargas_totales': df.to_dict(),
+        'df_conductor_html': '<table>' + '<tr><td>x</td></tr>' * 500 + '</table>',
+        'console_output': 'línea\n' * 1000,
+        'serie': [0.5 * i for i in range(100)],
+        'matriz': [[1, 2, 3]] * 30,
+    }
+
+
+def _usar_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_binario, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(calculo_cache, 'CACHE_DIR', tmp_path)
+
+
+def test_binario_equivale_a_json(tmp_path, monkeypatch):
+    _usar_cache_dir(tmp_path, monkeypatch)
+    datos = _datos_cmc()
+
+    monkeypatch.setattr(app_config, 'CACHE_FORMATO', 'json')
+    CalculoCache._escribir_calculo('Estr_A', 'CMC', datos)
+    desde_json = CalculoCache._leer_calculo('Estr_A', 'CMC')
+
+    monkeypatch.setattr(app_config, 'CACHE_FORMATO', 'binario')
+    CalculoCache._escribir_calculo('Estr_A', 'CMC', datos)
+    # El JSON anterior se elimina al escribir en formato binario
+    assert not (tmp_path / 'Estr_A.calculoCMC.json').exists()
+    desde_binario = CalculoCache._leer_calculo('Estr_A', 'CMC')
+
+    assert desde_binario == desde_json
+
+
+def test_binario_carga_parcial_y_etapas_independientes(tmp_path, monkeypatch):
+    _usar_cache_dir(tmp_path, monkeypatch)
+    monkeypatch.setattr(app_config, 'CACHE_FORMATO', 'binario')
+
+    CalculoCache._escribir_calculo('Estr_B', 'CMC', _datos_cmc())
+    CalculoCache._escribir_calculo('Estr_B', 'SPH', {'resultados': {'poste': 'X'}})
+
+    parcial = CalculoCache.cargar_campos('Estr_B', 'CMC', ['resultados_conductor'])
+    assert list(parcial) == ['resultados_conductor']
+    assert CacheBinario.existe('Estr_B', 'SPH')
+
+    CacheBinario.eliminar('Estr_B', 'SPH')
+    assert not CacheBinario.existe('Estr_B', 'SPH')
+    assert CacheBinario.existe('Estr_B', 'CMC')
+
+
+def test_familia_carga_solo_etapas_y_campos_pedidos(tmp_path, monkeypatch):
+    import json
+    from utils.descargar_html_familia_personalizado import campos_para_secciones
+
+    _usar_cache_dir(tmp_path, monkeypatch)
+    monkeypatch.setattr(app_config, 'CACHE_FORMATO', 'binario')
+    CalculoCache._escribir_calculo('Estr_C', 'CMC', _datos_cmc())
+    CalculoCache._escribir_calculo('Estr_C', 'SPH', {'resultados': {'poste': 'X'}, 'desarrollo_texto': 'y' * 5000})
+    refs = {'cmc': 'Estr_C.calculoCMC.json', 'sph': 'Estr_C.calculoSPH.json'}
+    (tmp_path / 'Fam.calculoFAMILIA.json').write_text(
+        json.dumps({'estructuras': {'E1': {'titulo': 'Estr_C', 'cache_refs': refs}}}), encoding='utf-8')
+
+    calculo = CalculoCache.cargar_calculo_familia('Fam', campos_por_tipo={'sph': ['resultados']})
+    assert calculo['resultados']['resultados_estructuras']['E1']['resultados'] == {'sph': {'resultados': {'poste': 'X'}}}
+
+    assert campos_para_secciones(['cmc', 'dge.nodos', 'Estr 1:sph']) == {'cmc': None, 'dge': None, 'sph': None}
+    assert campos_para_secciones(['familia:resumen', 'cmc']) is None
@@ -0,0 +1,56 @@
+import pytest
+
+from utils.calculo_lote import descubrir_entradas, ejecutar_archivo, resumir_familia
+
+
+def test_descubrir_entradas_archivos_y_directorios(tmp_path):
+    (tmp_path / "S1.estructura.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "PSJ.familia.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "plantilla.estructura.json").write_text("{}", encoding="utf-8")
+    (tmp_path / "notas.txt").write_text("", encoding="utf-8")
+
+    entradas = descubrir_entradas([tmp_path, tmp_path / "S1.estructura.json"])
+    assert [(tipo, ruta.name) for tipo, ruta in entradas] == [
+        ("familia", "PSJ.familia.json"), ("estructura", "S1.estructura.json")]
+
+    with pytest.raises(ValueError):
+        descubrir_entradas([tmp_path / "notas.txt"])
+    with pytest.raises(ValueError):
+        descubrir_entradas([tmp_path / "inexistente.familia.json"])
+
+
+def test_resumir_familia_costos_estados_y_errores():
+    resultado = {
+        "exito": True,
+        "resultados_estructuras": {
+            "S1": {"titulo": "S1", "cantidad": 10, "costo_individual": 1500.0,
+                   "resultados": {"cmc": {"estado_determinante_conductor": "III",
+                                          "estado_determinante_guardia1": "V"},
+                                  "costeo": {}}},
+            "T1": {"titulo": "T1", "cantidad": 2, "error": "Error DME: sin hipótesis"},
+        },
+        "costeo_global": {"costo_global": 15000.0},
+    }
+    totales = {"estructura S1": {"llamadas": 1, "segundos": 12.5}}
+
+    resumen = resumir_familia("PSJ", resultado, totales)
+
+    assert resumen["exito"] is False
+    assert resumen["costo_global"] == 15000.0
+    s1, t1 = resumen["estructuras"]
+    assert s1 == {"titulo": "S1", "cantidad": 10, "exito": True, "costo": 1500.0,
+                  "estados_determinantes": {"conductor": "III", "guardia1": "V"}, "duracion_s": 12.5}
+    assert t1["exito"] is False and "DME" in t1["error"]
+
+
+def test_ejecutar_archivo_captura_errores(tmp_path):
+    ruta = tmp_path / "roto.estructura.json"
+    ruta.write_text("{no es json", encoding="utf-8")
+
+    resumen = ejecutar_archivo("estructura", str(ruta), {"etapas": ["cmc"], "generar_plots": False,
+                                                         "dir_logs": str(tmp_path)})
+
+    assert resumen["exito"] is False
+    assert resumen["archivo"] == str(ruta)
+    assert "JSONDecodeError" in resumen["error"]
+    assert (tmp_path / "roto.estructura.json.log").exists()
@@ -0,0 +1,98 @@
+import threading
+
+from models import contexto_calculo
+from models.contexto_calculo import PoolContextos, contexto_actual, usar_contexto
+
+
+def test_misma_clave_reutiliza_contexto():
+    pool = PoolContextos(maximo=2, espera=0)
+    a = pool.adquirir('s1')
+    assert pool.adquirir('s1') is a
+    pool.liberar(a)
+    pool.liberar(a)
+    assert pool.adquirir('s1') is a
+
+
+def test_pool_acotado_recicla_el_menos_usado():
+    pool = PoolContextos(maximo=2, espera=0)
+    for clave in ('s1', 's2'):
+        pool.liberar(pool.adquirir(clave))
+    c3 = pool.adquirir('s3')
+    assert c3.clave == 's3'
+    assert pool.total == 2
+    assert 's1' not in pool._libres and 's2' in pool._libres
+
+
+def test_pool_lleno_y_en_uso_da_contexto_temporal():
+    pool = PoolContextos(maximo=1, espera=0)
+    ocupado = pool.adquirir('s1')
+    temporal = pool.adquirir('s2')
+    assert temporal is not ocupado
+    pool.liberar(temporal)
+    assert pool.total == 1
+
+
+def test_contexto_por_hilo(monkeypatch):
+    monkeypatch.setattr(contexto_calculo, '_pool', PoolContextos(maximo=4, espera=0))
+    vistos = {}
+    barrera = threading.Barrier(2)
+
+    def trabajar(clave):
+        with usar_contexto(clave):
+            barrera.wait()
+            vistos[clave] = contexto_actual()
+
+    hilos = [threading.Thread(target=trabajar, args=(c,)) for c in ('sesion-a', 'sesion-b')]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+
+    assert vistos['sesion-a'] is not vistos['sesion-b']
+    assert vistos['sesion-a'].clave == 'sesion-a'
+    assert contexto_actual().clave == 'global'
+
+
+def test_app_state_delega_en_el_contexto_activo(monkeypatch):
+    from models.app_state import AppState
+    monkeypatch.setattr(contexto_calculo, '_pool', PoolContextos(maximo=4, espera=0))
+    state = AppState()
+    with usar_contexto('sesion-x', descartar_al_salir=True) as contexto:
+        state.cargado_desde_cache = True
+        assert contexto.cargado_desde_cache is True
+    assert contexto_actual().cargado_desde_cache is False
+
+
+def test_familia_activa_por_sesion(tmp_path, monkeypatch):
+    import models.app_state as app_state
+    from models.app_state import AppState
+    from utils import almacen_estructuras
+    from utils.almacen_estructuras import AlmacenEstructuras
+    monkeypatch.setattr(contexto_calculo, '_pool', PoolContextos(maximo=4, espera=0))
+    monkeypatch.setattr(almacen_estructuras, '_almacen', AlmacenEstructuras(tmp_path))
+    monkeypatch.setattr(app_state, 'FAMILIA_STATE_FILE', tmp_path / 'familia_state.json')
+    state = AppState()
+    monkeypatch.setattr(state, '_familia_defecto', 'Fam_inicial')
+
+    with usar_contexto('sesion-a'):
+        state.activar_sesion('a')
+    with usar_contexto('sesion-b'):
+        state.activar_sesion('b')
+        state.set_familia_activa('Fam_B')
+
+    # La elección de B no cambia la familia de A, ni en otro worker (contexto nuevo)
+    with usar_contexto('sesion-a'):
+        state.activar_sesion('a')
+        assert state.get_familia_activa() == 'Fam_inicial'
+    monkeypatch.setattr(contexto_calculo, '_pool', PoolContextos(maximo=4, espera=0))
+    with usar_contexto('sesion-b'):
+        state.activar_sesion('b', 'Estr_B')
+        assert state.get_familia_activa() == 'Fam_B'
+        assert state._estructura_actual_titulo == 'Estr_B'
+        # Un trabajo lanzado desde la sesión parte de su familia y no la persiste
+        with usar_contexto('familia-Fam_B-E1', descartar_al_salir=True):
+            assert state.get_familia_activa() == 'Fam_B'
+            state.set_familia_activa('Fam_trabajo')
+        assert state.get_familia_activa() == 'Fam_B'
+    # Fuera de una sesión: la última elegida por un usuario, para pestañas nuevas
+    assert state.get_familia_activa() == 'Fam_B'
@@ -0,0 +1,59 @@
+import pytest
+
+from config import app_config
+import utils.cache_binario as cache_binario
+import utils.calculo_cache as calculo_cache
+from utils.calculo_cache import CalculoCache
+
+
+def _usar_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_binario, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(calculo_cache, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(app_config, 'CACHE_FORMATO', 'json')
+
+
+def _estructura(titulo, cantidad=1, L_vano=400):
+    return {"TITULO": titulo, "cantidad": cantidad, "L_vano": L_vano, "cable_conductor_id": "AlAc 435/55"}
+
+
+def test_replicar_calculos_deja_el_cache_vigente(tmp_path, monkeypatch):
+    _usar_cache_dir(tmp_path, monkeypatch)
+    origen, destino = _estructura("S1"), _estructura("S1 bis", cantidad=4)
+    CalculoCache._escribir_calculo("S1", "SPH", {
+        "hash_parametros": CalculoCache.calcular_hash(origen), "resultados": {"Rc_adopt": 1800}})
+
+    copiados = CalculoCache.replicar_calculos("S1", "S1 bis", origen, destino, ["SPH", "FUND"])
+
+    assert list(copiados) == ["SPH"]
+    assert CalculoCache.cargar_calculo_sph("S1 bis")["resultados"] == {"Rc_adopt": 1800}
+    assert CalculoCache.calculo_vigente("S1 bis", "SPH", destino)[0]
+    assert CalculoCache.calculo_vigente("S1", "SPH", origen)[0]
+
+
+def test_familia_calcula_una_vez_las_estructuras_iguales(tmp_path, monkeypatch):
+    logica = pytest.importorskip("utils.calcular_familia_logica_encadenada")
+    _usar_cache_dir(tmp_path, monkeypatch)
+    calculadas = []
+
+    def secuencia(datos, titulo, generar_plots=True, calculos_activos=None):
+        calculadas.append(titulo)
+        CalculoCache._escribir_calculo(titulo, "COSTEO", {
+            "hash_parametros": CalculoCache.calcular_hash(datos),
+            "resultados": {"resumen_costos": {"costo_total": datos["L_vano"] * 10.0}}})
+        return {"exito": True, "resultados": {"costeo": CalculoCache.cargar_calculo_costeo(titulo)},
+                "costo_total": datos["L_vano"] * 10.0}
+
+    monkeypatch.setattr(logica, "_ejecutar_secuencia_estructura", secuencia)
+    familia = {"nombre_familia": "F", "estructuras": {
+        "Estructura_1": _estructura("S1"),
+        "Estructura_2": _estructura("S2", cantidad=3),
+        "Estructura_3": _estructura("S3", L_vano=450),
+    }}
+
+    resultado = logica.ejecutar_calculo_familia_completa(familia, generar_plots=False, calculos_activos=["costeo"])
+
+    assert calculadas == ["S1", "S3"]
+    estructuras = resultado["resultados_estructuras"]
+    assert estructuras["Estructura_2"]["costo_individual"] == 4000.0
+    assert estructuras["Estructura_2"]["cantidad"] == 3
+    assert CalculoCache.calculo_vigente("S2", "COSTEO", familia["estructuras"]["Estructura_2"])[0]
@@ -0,0 +1,68 @@
+import gzip
+import json
+
+import numpy as np
+
+from utils import figuras_plotly
+
+
+def _figura():
+    return {
+        'data': [{
+            'type': 'scatter',
+            'x': [0.0, 1.5, None, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0],
+            'y': list(range(9)),
+            'z': [[1.0] * 8, [2.0] * 8],
+            'name': 'flecha',
+            'text': ['a'] * 9,
+            'marker': {'color': [1, 2]},
+        }],
+        'layout': {'title': {'text': 'Ñandú'}, 'xaxis': {'range': [0, 10]}},
+    }
+
+
+def test_compactar_codifica_solo_arrays_numericos_largos():
+    traza = figuras_plotly.compactar_figura(_figura())['data'][0]
+    assert traza['x']['dtype'] == 'f8'
+    assert traza['y']['dtype'] == 'i1'
+    assert traza['z']['shape'] == '2, 8'
+    assert traza['text'] == ['a'] * 9
+    assert traza['marker']['color'] == [1, 2]
+
+
+def test_ida_y_vuelta_conserva_huecos_y_valores():
+    figura = _figura()
+    expandida = figuras_plotly.expandir_figura(figuras_plotly.compactar_figura(figura))
+    assert expandida == figura
+
+
+def test_codificar_array_elige_entero_mas_chico():
+    assert figuras_plotly.codificar_array(np.array([0, 300] * 4))['dtype'] == 'i2'
+    assert figuras_plotly.codificar_array(np.array([0, 70000] * 4))['dtype'] == 'i4'
+
+
+def test_guardar_y_cargar_comprimido(tmp_path):
+    ruta = figuras_plotly.guardar_figura(_figura(), tmp_path / 'F.abc.json', comprimir=True)
+    assert ruta.read_bytes()[:2] == b'\x1f\x8b'
+    cargada = figuras_plotly.cargar_figura(ruta)
+    assert cargada['layout']['title']['text'] == 'Ñandú'
+    assert cargada['data'][0]['x']['dtype'] == 'f8'
+    assert figuras_plotly.cargar_figura(ruta) is cargada
+
+
+def test_cargar_json_anterior(tmp_path):
+    ruta = tmp_path / 'Viejo.abc.json'
+    ruta.write_text(json.dumps(_figura()), encoding='utf-8')
+    assert figuras_plotly.cargar_figura(ruta) == _figura()
+    assert figuras_plotly.cargar_figura(tmp_path / 'no_existe.json') is None
+
+
+def test_guardar_reemplaza_memo(tmp_path):
+    ruta = tmp_path / 'F.abc.json'
+    figuras_plotly.guardar_figura(_figura(), ruta, comprimir=False)
+    figuras_plotly.cargar_figura(ruta)
+    otra = _figura()
+    otra['layout']['title']['text'] = 'otro'
+    figuras_plotly.guardar_figura(otra, ruta, comprimir=False)
+    assert json.loads(ruta.read_text(encoding='utf-8'))['layout']['title']['text'] == 'otro'
+    assert figuras_plotly.cargar_figura(ruta)['layout']['title']['text'] == 'otro'
@@ -0,0 +1,99 @@
+import base64
+import re
+
+import utils.view_helpers as view_helpers
+from utils import html_streaming
+from utils.descargar_html_familia_completo import generar_html_familia, exportar_html_familia
+from utils.view_helpers import ViewHelpers
+
+
+def _sin_timestamp(html):
+    return re.sub(r"Generado: [0-9: -]+", "", html)
+
+
+def test_marcador_reemplazado_por_base64(tmp_path, monkeypatch):
+    monkeypatch.setattr(view_helpers, 'CACHE_DIR', tmp_path)
+    contenido = bytes(range(256)) * 3000  # varios bloques de lectura
+    (tmp_path / 'img.png').write_bytes(contenido)
+
+    def secciones():
+        img = ViewHelpers.cargar_imagen_base64('img.png')
+        assert img.startswith('@@AGP_IMG_STREAM:')
+        yield f'<img src="data:image/png;base64,{img}">'
+
+    ruta = html_streaming.exportar_secciones(secciones, ruta_destino=tmp_path / 'out.html')
+    esperado = base64.b64encode(contenido).decode()
+    assert ruta.read_text(encoding='utf-8') == f'<img src="data:image/png;base64,{esperado}">'
+
+    # Fuera del modo streaming se devuelve el base64 completo
+    assert ViewHelpers.cargar_imagen_base64('img.png') == esperado
+
+
+def test_exportar_familia_igual_a_generar():
+    resultados = {"resultados_estructuras": {"E1": {"titulo": "Estr 1"}, "E2": {"titulo": "E2", "error": "x"}}}
+    en_memoria = generar_html_familia("Fam", resultados)
+    ruta = exportar_html_familia("Fam", resultados, modo_imagenes=html_streaming.MODO_EMBEBIDO)
+    try:
+        assert _sin_timestamp(ruta.read_text(encoding='utf-8')) == _sin_timestamp(en_memoria)
+    finally:
+        ruta.unlink()
+
+
+def _secciones_con_repetidas(ruta_a, ruta_b):
+    def secciones():
+        yield "<html><body>"
+        for ruta in (ruta_a, ruta_b, ruta_a):
+            yield f'<img src="data:image/png;base64,{html_streaming.marcador_imagen(ruta)}">'
+        yield "</body></html>"
+    return secciones
+
+
+def test_modo_compartido_emite_cada_imagen_una_vez(tmp_path):
+    (tmp_path / 'a.png').write_bytes(b'imagen-a' * 1000)
+    (tmp_path / 'copia_a.png').write_bytes(b'imagen-a' * 1000)  # mismo contenido, otro nombre
+    fabrica = _secciones_con_repetidas(tmp_path / 'a.png', tmp_path / 'copia_a.png')
+
+    ruta = html_streaming.exportar_secciones(fabrica, ruta_destino=tmp_path / 'out.html',
+                                             modo_imagenes=html_streaming.MODO_COMPARTIDO)
+    html = ruta.read_text(encoding='utf-8')
+    b64 = base64.b64encode(b'imagen-a' * 1000).decode()
+    assert html.count(b64) == 1
+    assert html.count('src="data:,agp-img-') == 3
+    assert html.index(b64) < html.index('</body>')
+
+
+def test_modo_assets_genera_zip(tmp_path):
+    import zipfile
+    (tmp_path / 'a.png').write_bytes(b'A' * 500)
+    (tmp_path / 'b.png').write_bytes(b'B' * 500)
+    fabrica = _secciones_con_repetidas(tmp_path / 'a.png', tmp_path / 'b.png')
+
+    ruta = html_streaming.exportar_secciones(fabrica, modo_imagenes=html_streaming.MODO_ASSETS)
+    try:
+        assert ruta.suffix == '.zip'
+        with zipfile.ZipFile(ruta) as zf:
+            assets = sorted(n for n in zf.namelist() if n.startswith('assets/'))
+            html = zf.read('index.html').decode('utf-8')
+            assert len(assets) == 2
+            assert 'base64' not in html
+            for nombre in assets:
+                assert f'src="{nombre}"' in html
+            assert {zf.read(n) for n in assets} == {b'A' * 500, b'B' * 500}
+    finally:
+        ruta.unlink()
+
+
+def test_descarga_publicada_por_token(tmp_path, monkeypatch):
+    monkeypatch.setattr(html_streaming, 'DIRECTORIO_DESCARGAS', tmp_path / 'descargas')
+    origen = tmp_path / 'reporte.html'
+    origen.write_bytes(b'x' * (html_streaming.TAMANO_BLOQUE + 10))
+
+    token = html_streaming.publicar_descarga(origen, 'Familia Ñ_familia.html')
+    assert not origen.exists()
+    ruta, nombre = html_streaming.abrir_descarga(token)
+    assert nombre == 'Familia Ñ_familia.html'
+
+    bloques = list(html_streaming.iterar_bloques_archivo(ruta, eliminar_al_terminar=True))
+    assert [len(b) for b in bloques] == [html_streaming.TAMANO_BLOQUE, 10]
+    assert html_streaming.abrir_descarga(token) is None
+    assert html_streaming.abrir_descarga('../etc') is None
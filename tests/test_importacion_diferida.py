@@ -0,0 +1,42 @@
+import sys
+
+from utils.importacion_diferida import ModuloDiferido, PerfilImportacion, importar_diferido, precargar_motores
+
+
+def test_modulo_diferido_importa_en_primer_uso(tmp_path, monkeypatch):
+    (tmp_path / 'modulo_pesado_prueba.py').write_text('VALOR = 42\n', encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop('modulo_pesado_prueba', None)
+
+    modulo = importar_diferido('modulo_pesado_prueba')
+    assert isinstance(modulo, ModuloDiferido)
+    assert 'modulo_pesado_prueba' not in sys.modules
+    assert modulo.VALOR == 42
+    assert 'modulo_pesado_prueba' in sys.modules
+    assert importar_diferido('modulo_pesado_prueba') is sys.modules['modulo_pesado_prueba']
+
+
+def test_perfil_importacion_mide_total_y_propio(tmp_path, monkeypatch):
+    (tmp_path / 'perfil_hijo.py').write_text('import time\ntime.sleep(0.02)\n', encoding='utf-8')
+    (tmp_path / 'perfil_padre.py').write_text('import perfil_hijo\n', encoding='utf-8')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for nombre in ('perfil_hijo', 'perfil_padre'):
+        sys.modules.pop(nombre, None)
+
+    perfil = PerfilImportacion().iniciar()
+    import perfil_padre  # noqa: F401
+    perfil.detener()
+
+    total_padre, propio_padre = perfil.tiempos['perfil_padre']
+    total_hijo, _ = perfil.tiempos['perfil_hijo']
+    assert total_hijo >= 0.02
+    assert total_padre >= total_hijo
+    assert propio_padre < total_hijo
+    assert perfil not in sys.meta_path
+    # El loader original queda restaurado en el módulo
+    assert type(sys.modules['perfil_padre'].__loader__).__name__ != '_CargadorCronometrado'
+    assert 'perfil_padre' in perfil.reporte(limite=5)
+
+
+def test_precarga_desactivada():
+    assert precargar_motores('no') is None
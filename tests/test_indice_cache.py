@@ -0,0 +1,80 @@
+import json
+import os
+
+from config import app_config
+import utils.cache_binario as cache_binario
+import utils.calculo_cache as calculo_cache
+import utils.indice_cache as indice_cache
+from utils.calculo_cache import CalculoCache
+
+
+ESTRUCTURA = {"TITULO": "Estr A", "L_vano": 400}
+
+
+def _usar_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_binario, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(calculo_cache, 'CACHE_DIR', tmp_path)
+
+
+def _datos_sph():
+    return {
+        "hash_parametros": CalculoCache.calcular_hash(ESTRUCTURA),
+        "fecha_calculo": "2026-01-01T00:00:00",
+        "resultados": {"config_seleccionada": "Monoposte", "Rc_adopt": 1800,
+                       "dimensiones": {"Ht_comercial": 15.0}},
+        "desarrollo_texto": "x" * 5000,
+    }
+
+
+def test_indice_responde_sin_leer_el_calculo(tmp_path, monkeypatch):
+    _usar_cache_dir(tmp_path, monkeypatch)
+    monkeypatch.setattr(app_config, 'CACHE_FORMATO', 'json')
+    CalculoCache._escribir_calculo('Estr_A', 'SPH', _datos_sph())
+
+    def no_leer(*args, **kwargs):
+        raise AssertionError("no debe leer el cálculo completo")
+    monkeypatch.setattr(CalculoCache, '_leer_calculo', staticmethod(no_leer))
+
+    meta = CalculoCache.metadatos_calculo('Estr A', 'SPH')
+    assert meta["formato"] == "json" and meta["bytes"] > 5000
+    assert meta["resumen"] == {"config_seleccionada": "Monoposte", "Rc_adopt": 1800, "Ht_comercial": 15.0}
+    assert CalculoCache.existe_calculo('Estr A', 'SPH')
+    assert CalculoCache.calculo_vigente('Estr A', 'SPH', ESTRUCTURA)[0]
+    assert not CalculoCache.calculo_vigente('Estr A', 'SPH', {**ESTRUCTURA, "L_vano": 450})[0]
+
+
+def test_indice_se_reconstruye_si_el_calculo_cambio_o_falta(tmp_path, monkeypatch):
+    _usar_cache_dir(tmp_path, monkeypatch)
+    monkeypatch.setattr(app_config, 'CACHE_FORMATO', 'json')
+    CalculoCache._escribir_calculo('Estr_A', 'SPH', _datos_sph())
+
+    # Cálculo reemplazado por fuera de CalculoCache: el índice ya no vale
+    archivo = tmp_path / "Estr_A.calculoSPH.json"
+    datos = json.loads(archivo.read_text(encoding="utf-8"))
+    datos["resultados"]["Rc_adopt"] = 2100
+    archivo.write_text(json.dumps(datos), encoding="utf-8")
+    assert indice_cache.leer('Estr_A', 'SPH') is None
+    assert CalculoCache.metadatos_calculo('Estr_A', 'SPH')["resumen"]["Rc_adopt"] == 2100
+    assert indice_cache.leer('Estr_A', 'SPH') is not None
+
+    # Cálculo borrado: el índice huérfano no cuenta
+    os.remove(archivo)
+    assert not CalculoCache.existe_calculo('Estr_A', 'SPH')
+
+    CalculoCache._escribir_calculo('Estr_A', 'SPH', _datos_sph())
+    CalculoCache.eliminar_cache_estructura('Estr_A')
+    assert not list(tmp_path.glob("*.meta.json"))
+
+
+def test_indice_con_contenedor_binario(tmp_path, monkeypatch):
+    _usar_cache_dir(tmp_path, monkeypatch)
+    monkeypatch.setattr(app_config, 'CACHE_FORMATO', 'binario')
+    datos = {"hash_parametros": "abc", "fecha_calculo": "2026-01-01T00:00:00",
+             "resultados": {"resumen_costos": {"costo_total": 12500.0}}}
+    CalculoCache._escribir_calculo('Estr_A', 'COSTEO', datos)
+
+    meta = indice_cache.leer('Estr_A', 'COSTEO')
+    assert meta["formato"] == "binario"
+    assert meta["resumen"] == {"costo_total": 12500.0}
+    assert CalculoCache.existe_calculo('Estr_A', 'COSTEO')
+    assert not CalculoCache.existe_calculo('Estr_A', 'FUND')
@@ -0,0 +1,57 @@
+from utils.memo_cmc import MemoCMC
+
+
+class CableFalso:
+    """Cable mínimo con la interfaz de Cable_AEA que usa el memo"""
+
+    def __init__(self, nombre="AlAc 435/55", seccion_mm2=490.0):
+        self.nombre = nombre
+        self.seccion_mm2 = seccion_mm2
+        self.H_PIQANTERIOR = 0.0
+        self._tabla_estados = None
+        self._tabla_estados_clave = None
+        self.catenarias_cache = {}
+        self.llamadas = 0
+
+    def calculo_mecanico(self, vano, estados_climaticos, **kwargs):
+        self.llamadas += 1
+        self._tabla_estados = {e: {"G": 1.5} for e in estados_climaticos}
+        self._tabla_estados_clave = (vano,)
+        self.catenarias_cache = {e: {"x": [0, vano]} for e in estados_climaticos}
+        resultados = {e: {"flecha_vertical_m": vano / 100} for e in estados_climaticos}
+        return None, resultados, "I", "memoria"
+
+
+ESTADOS = {"I": {"temperatura": 35}, "II": {"temperatura": -5}}
+
+
+def test_memo_reutiliza_el_calculo_en_otro_cable_igual():
+    memo = MemoCMC()
+    cable_1, cable_2 = CableFalso(), CableFalso()
+
+    _, resultados_1, _, _ = memo.resolver(cable_1, vano=400, estados_climaticos=ESTADOS, objetivo="FlechaMin")
+    resultados_1["I"]["flecha_vertical_m"] = 99  # no debe alterar lo memorizado
+    _, resultados_2, limitante, memoria = memo.resolver(cable_2, vano=400, estados_climaticos=ESTADOS, objetivo="FlechaMin")
+
+    assert (cable_1.llamadas, cable_2.llamadas) == (1, 0)
+    assert resultados_2["I"]["flecha_vertical_m"] == 4.0
+    assert (limitante, memoria) == ("I", "memoria")
+    # El cable que reutiliza queda en el mismo estado que si hubiera calculado
+    assert cable_2._tabla_estados == {"I": {"G": 1.5}, "II": {"G": 1.5}}
+    assert cable_2._tabla_estados_clave == (400,)
+    assert cable_2.catenarias_cache["II"] == {"x": [0, 400]}
+    assert (memo.calculos, memo.aciertos) == (1, 1)
+
+
+def test_memo_recalcula_si_cambia_el_cable_o_el_vano():
+    memo = MemoCMC()
+    memo.resolver(CableFalso(), vano=400, estados_climaticos=ESTADOS)
+    otro_vano, otra_seccion, desnivel = CableFalso(), CableFalso(seccion_mm2=300.0), CableFalso()
+    desnivel.H_PIQANTERIOR = 5.0
+
+    memo.resolver(otro_vano, vano=450, estados_climaticos=ESTADOS)
+    memo.resolver(otra_seccion, vano=400, estados_climaticos=ESTADOS)
+    memo.resolver(desnivel, vano=400, estados_climaticos=ESTADOS)
+
+    assert (otro_vano.llamadas, otra_seccion.llamadas, desnivel.llamadas) == (1, 1, 1)
+    assert (memo.calculos, memo.aciertos) == (4, 0)
@@ -0,0 +1,74 @@
+import time
+
+from utils import perfil_calculo
+from utils.perfil_calculo import cargar_perfil, contar, etapa, listar_perfiles, medido, trabajo
+
+
+@medido("dme", tipo="estructura", titulo=perfil_calculo.titulo_estructura)
+def _calculo_dme(estructura_actual):
+    with etapa("dme.sub", hipotesis="A0"):
+        contar("iteraciones", 3)
+        time.sleep(0.01)
+    contar("iteraciones")
+    return "ok"
+
+
+def test_sin_trabajo_no_registra(tmp_path, monkeypatch):
+    monkeypatch.setattr(perfil_calculo, "DIR_PERFILES", tmp_path)
+    with etapa("suelta"):
+        contar("nada")
+    assert perfil_calculo.linea_actual() is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_trabajo_anidado_guarda_linea_de_tiempo(tmp_path, monkeypatch):
+    monkeypatch.setattr(perfil_calculo, "DIR_PERFILES", tmp_path)
+
+    with trabajo("familia F", tipo="familia") as linea:
+        for titulo in ("S1", "S2"):
+            with etapa(f"estructura {titulo}"):
+                assert _calculo_dme({"TITULO": titulo}) == "ok"
+    assert perfil_calculo.linea_actual() is None
+
+    [(archivo, nombre, _, duracion)] = listar_perfiles()
+    assert nombre == "familia F" and duracion >= 0.02
+    perfil = cargar_perfil(archivo)
+    niveles = [(e["nombre"], e["nivel"]) for e in perfil["eventos"]]
+    assert niveles[:3] == [("estructura S1", 0), ("dme", 1), ("dme.sub", 2)]
+    assert perfil["totales"]["dme"]["llamadas"] == 2
+    assert perfil["contadores"] == {"iteraciones": 8}
+    assert perfil["eventos"][2]["datos"] == {"hipotesis": "A0"}
+    assert linea.duracion == perfil["duracion"]
+
+
+def test_etapa_suelta_abre_su_trabajo_y_perfil_cprofile(tmp_path, monkeypatch):
+    monkeypatch.setattr(perfil_calculo, "DIR_PERFILES", tmp_path)
+    monkeypatch.setattr(perfil_calculo, "PERFIL_CALCULO_PROFILER", "cprofile")
+
+    _calculo_dme({"TITULO": "S9"})
+
+    [(archivo, nombre, _, _)] = listar_perfiles()
+    perfil = cargar_perfil(archivo)
+    assert nombre == "dme S9"
+    assert perfil["archivo_perfil"].endswith(".prof")
+    assert (tmp_path / perfil["archivo_perfil"]).exists()
+    assert "_calculo_dme" in perfil["perfil"]
+
+
+def test_error_queda_registrado_y_se_purgan_antiguos(tmp_path, monkeypatch):
+    monkeypatch.setattr(perfil_calculo, "DIR_PERFILES", tmp_path)
+    monkeypatch.setattr(perfil_calculo, "PERFILES_MAX", 2)
+
+    for i in range(3):
+        try:
+            with trabajo(f"t{i}"), etapa("falla"):
+                raise ValueError("x")
+        except ValueError:
+            pass
+
+    perfiles = listar_perfiles()
+    assert [nombre for _, nombre, _, _ in perfiles] == ["t2", "t1"]
+    perfil = cargar_perfil(perfiles[0][0])
+    assert perfil["error"] == "ValueError: x"
+    assert perfil["eventos"][0]["error"] == "ValueError: x"
+    assert cargar_perfil("../otro.json") is None
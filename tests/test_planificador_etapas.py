@@ -0,0 +1,101 @@
+import threading
+
+from models.contexto_calculo import contexto_actual, usar_contexto
+from utils.console_capture import capturar_salida
+from utils import perfil_calculo
+from utils.perfil_calculo import etapa, trabajo
+from utils.planificador_etapas import dependencias_etapas, ejecutar_grafo
+
+
+def test_dependencias_etapas_ignora_desactivadas():
+    deps = dependencias_etapas(["dme", "arboles", "sph", "fundacion", "aee"])
+    assert deps["dme"] == []
+    assert deps["arboles"] == ["dme"] and deps["sph"] == ["dme"]
+    assert sorted(deps["fundacion"]) == ["dme", "sph"]
+    assert deps["aee"] == ["dme"]
+
+
+def test_grafo_paralelo_y_fallas_solo_a_dependientes():
+    # B y C solo pueden terminar si corren a la vez
+    barrera = threading.Barrier(2, timeout=5)
+    orden = []
+
+    def tarea(nombre, exito=True, esperar=False):
+        def ejecutar():
+            if esperar:
+                barrera.wait()
+            orden.append(nombre)
+            return {"exito": exito, "mensaje": nombre}
+        return ejecutar
+
+    tareas = {
+        "A": tarea("A"),
+        "B": tarea("B", esperar=True),
+        "C": tarea("C", exito=False, esperar=True),
+        "D": tarea("D"),
+        "E": tarea("E"),
+    }
+    dependencias = {"B": ["A"], "C": ["A"], "D": ["C"], "E": ["B", "Z"]}
+
+    resultados = ejecutar_grafo(tareas, dependencias, max_paralelas=3)
+
+    assert list(resultados) == ["A", "B", "C", "D", "E"]
+    assert resultados["B"]["exito"] and resultados["E"]["exito"]
+    assert resultados["C"]["exito"] is False
+    assert resultados["D"]["omitida"] and "C" in resultados["D"]["mensaje"]
+    assert "D" not in orden and orden[0] == "A"
+
+
+def test_grafo_secuencial_respeta_orden_y_excepciones():
+    orden = []
+
+    def falla():
+        raise RuntimeError("sin datos")
+
+    tareas = {"A": lambda: orden.append("A") or {"exito": True}, "B": falla,
+              "C": lambda: orden.append("C") or {"exito": True}}
+    resultados = ejecutar_grafo(tareas, {"C": ["A"]}, max_paralelas=1)
+
+    assert orden == ["A", "C"]
+    assert resultados["B"] == {"exito": False, "mensaje": "sin datos"}
+
+
+def test_hilos_heredan_contexto_y_linea_de_tiempo(tmp_path, monkeypatch):
+    monkeypatch.setattr(perfil_calculo, "DIR_PERFILES", tmp_path)
+    vistos = {}
+
+    def tarea(nombre):
+        def ejecutar():
+            with etapa(nombre):
+                vistos[nombre] = contexto_actual()
+            return {"exito": True}
+        return ejecutar
+
+    with usar_contexto("trabajo-planificador", descartar_al_salir=True) as contexto, \
+            trabajo("planificador", tipo="prueba") as linea:
+        with etapa("estructura"):
+            ejecutar_grafo({"a": tarea("a"), "b": tarea("b")}, {}, max_paralelas=2)
+
+    assert vistos == {"a": contexto, "b": contexto}
+    if linea is not None:
+        eventos = {e["nombre"]: e for e in linea.eventos}
+        assert eventos["a"]["nivel"] == eventos["b"]["nivel"] == 1
+        assert "hilo" in eventos["a"]
+
+
+def test_capturar_salida_solo_del_hilo_actual(capsys):
+    listo = threading.Event()
+
+    def otro_hilo():
+        listo.wait(5)
+        print("de otro hilo")
+
+    hilo = threading.Thread(target=otro_hilo)
+    hilo.start()
+    with capturar_salida() as buffer:
+        print("propio")
+        listo.set()
+        hilo.join()
+
+    assert buffer.getvalue() == "propio\n"
+    assert "de otro hilo" in capsys.readouterr().out
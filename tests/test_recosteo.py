@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from utils.calculo_costeo import calcular_costeo_completo, cantidades_costeo, coeficientes_costeo
+from utils.recosteo import (cantidades_vanos, costos_vano_economico, hash_ingenieria_familia,
+                            recostear_vano_economico)
+from utils.vano_economico_utils import _calcular_costo_tipo, calcular_cantidades
+
+PRECIOS = {"postes": {"coef_a": 250.0}, "fundaciones": {"precio_m3_hormigon": 300.0, "factor_hierro": 1.1},
+           "montaje": {"precio_por_estructura": 4000.0, "factor_terreno": 1.2}, "adicional_estructura": 150}
+
+
+def _datos(n_postes=1, longitud=15.0, resistencia=1800, volumen=3.5):
+    return {"n_postes": n_postes, "longitud_total_m": longitud, "resistencia_dan": resistencia,
+            "cantidad_crucetas": 3, "cantidad_mensulas": 1, "cantidad_vinculos": 0,
+            "volumen_hormigon_m3": volumen}
+
+
+@pytest.mark.parametrize("precios", [{}, PRECIOS])
+def test_formula_lineal_igual_a_calcular_costeo_completo(precios):
+    datos = _datos(n_postes=2)
+    esperado = calcular_costeo_completo(datos, precios)["resumen_costos"]["costo_total"]
+    assert np.dot(cantidades_costeo(datos), coeficientes_costeo(precios)) == pytest.approx(esperado)
+
+
+@pytest.mark.parametrize("criterio", ["Distancia", "Suspensiones", "Manual"])
+def test_cantidades_vectorizadas_iguales_a_calcular_cantidades(criterio):
+    vanos = [300, 350, 400, 433.3]
+    calculadas = cantidades_vanos(vanos, 12000, criterio, 3000, 7, 4, cant_ra=2)
+    for v, vano in enumerate(vanos):
+        esperadas = calcular_cantidades(12000, vano, criterio, 3000, 7, 4, 2)
+        assert {c: int(valores[v]) for c, valores in calculadas.items()} == esperadas
+
+
+def _resultados_vano_economico():
+    estructuras = {
+        "E_S": {"TITULO": "S", "TIPO_ESTRUCTURA": "Suspensión Recta", "alpha": 0, "costeo": PRECIOS},
+        "E_RR": {"TITULO": "RR", "TIPO_ESTRUCTURA": "Retención", "alpha": 0, "costeo": PRECIOS},
+        "E_T": {"TITULO": "T", "TIPO_ESTRUCTURA": "Terminal", "alpha": 0, "costeo": PRECIOS},
+    }
+    resultados = {"vanos": [300, 400], "longtraza": 12000, "criterio_rr": "Distancia", "resultados": {}}
+    for vano in resultados["vanos"]:
+        cantidades = calcular_cantidades(12000, vano, "Distancia", 3000, 7, 4, 0)
+        datos_costeo = {t: {"datos_estructura": _datos(resistencia=1000 + vano * i), "parametros_precios": {}}
+                        for i, t in enumerate(["S", "RR", "T"], start=1)}
+        costos = {t: calcular_costeo_completo(d["datos_estructura"], {})["resumen_costos"]["costo_total"]
+                  for t, d in datos_costeo.items()}
+        # Claves de texto: así quedan los vanos al leer el cache JSON
+        resultados["resultados"][str(vano)] = {
+            "costo_global": sum(costos.values()),
+            "costeo_detalle": {"costos_individuales": costos},
+            "cantidades": cantidades,
+            "familia_modificada": {"estructuras": estructuras},
+            "datos_costeo": datos_costeo,
+        }
+    return resultados
+
+
+def test_recostear_vano_economico_con_nuevos_precios_y_traza():
+    resultados = _resultados_vano_economico()
+    nuevo = recostear_vano_economico(resultados, PRECIOS, longtraza=15000, criterio_rr="Suspensiones",
+                                     rr_cada_x_m=3000, rr_cada_x_s=7, cant_rr_manual=4)
+
+    for vano in (300, 400):
+        resultado_vano = nuevo["resultados"][vano]
+        assert resultado_vano["cantidades"] == calcular_cantidades(15000, vano, "Suspensiones", 3000, 7, 4, 0)
+        datos = resultados["resultados"][str(vano)]["datos_costeo"]["RR"]["datos_estructura"]
+        esperado = calcular_costeo_completo(datos, PRECIOS)["resumen_costos"]["costo_total"]
+        assert resultado_vano["costeo_detalle"]["costos_individuales"]["RR"] == pytest.approx(esperado)
+    assert nuevo["longtraza"] == 15000
+    # El cache original no se modifica
+    assert resultados["resultados"]["300"]["cantidades"]["cant_S"] == 40
+
+
+def test_curvas_para_varios_escenarios_coinciden_con_las_vistas():
+    resultados = _resultados_vano_economico()
+    escenarios = [None, PRECIOS, {"RR": {"adicional_estructura": 1000}}]
+    curvas = costos_vano_economico(resultados, escenarios)
+
+    assert curvas["costos_individuales"].shape == (3, 2, 3)
+    for s, escenario in enumerate(escenarios):
+        nuevo = recostear_vano_economico(resultados, escenario)
+        for v, vano in enumerate(curvas["vanos"]):
+            total_vistas = sum(_calcular_costo_tipo(nuevo["resultados"][vano], t) for t in ("S", "RR", "RA", "T"))
+            assert curvas["costos_totales"][s, v] == pytest.approx(total_vistas)
+
+
+def test_hash_ingenieria_ignora_precios_y_cantidades():
+    familia = {"nombre_familia": "F", "estructuras": {"E1": {"TITULO": "A", "L_vano": 400, "cantidad": 2, "costeo": {}}}}
+    otra = {"nombre_familia": "F", "estructuras": {"E1": {"TITULO": "A", "L_vano": 400, "cantidad": 9, "costeo": PRECIOS}}}
+    assert hash_ingenieria_familia(familia) == hash_ingenieria_familia(otra)
+    otra["estructuras"]["E1"]["L_vano"] = 450
+    assert hash_ingenieria_familia(familia) != hash_ingenieria_familia(otra)
+
+
+def test_recostear_familia_actualiza_costos_y_costeo_global():
+    from utils.recosteo import recostear_familia
+    datos = _datos()
+    resultado = {"resultados_estructuras": {
+        "E1": {"titulo": "A", "cantidad": 3, "costo_individual": 1.0,
+               "resultados": {"costeo": {"resultados": {"datos_estructura": datos, "parametros_precios": {}}}}},
+        "E2": {"titulo": "B", "cantidad": 1, "error": "falló SPH"},
+    }}
+    nuevo = recostear_familia(resultado, PRECIOS)
+    esperado = calcular_costeo_completo(datos, PRECIOS)["resumen_costos"]["costo_total"]
+    assert nuevo["resultados_estructuras"]["E1"]["costo_individual"] == pytest.approx(esperado)
+    assert nuevo["costeo_global"]["costo_global"] == pytest.approx(3 * esperado)
+    assert resultado["resultados_estructuras"]["E1"]["costo_individual"] == 1.0
@@ -0,0 +1,57 @@
+import random
+
+from utils.Sulzberger import Sulzberger
+
+
+def _hipotesis():
+    random.seed(3)
+    hipotesis = [{'hipotesis': f'H{i}', 'Tiro_x': round(random.uniform(200, 3000), 1),
+                  'Tiro_y': round(random.uniform(0, 2000), 1), 'Tiro_z': round(random.uniform(-3000, 500), 1)}
+                 for i in range(8)]
+    # Pares simétricos: mismas fuerzas en valor absoluto
+    hipotesis += [dict(h, hipotesis=f"{h['hipotesis']}b") for h in hipotesis[:4]]
+    return hipotesis
+
+
+def _sulzberger():
+    return Sulzberger(parametros_estructura={'Gp': 1500, 'h': 15.0, 'hl': 13.5, 'he': 1.5, 'dc': 0.31,
+                                             'n_postes': 1, 'hipotesis_fuerzas': _hipotesis()})
+
+
+def _referencia():
+    """Cálculo independiente hipótesis por hipótesis (comportamiento anterior)"""
+    resultados = []
+    for h in _hipotesis():
+        s = _sulzberger()
+        s.parametros_estructura['Gp_base'] = 1500
+        s.configurar_estructura(1500, h['Tiro_x'], h['Tiro_y'], h['Tiro_z'], 15.0, 13.5, 1.5, 0.31)
+        resultados.append(dict(s.calcular_fundacion(), hipotesis=h['hipotesis']))
+    return resultados
+
+
+def _comparables(resultados):
+    claves = ('hipotesis', 'a', 'b', 't', 'volumen', 'FSt', 'FSl', 'iteraciones')
+    return [{k: r[k] for k in claves} for r in resultados]
+
+
+def test_hipotesis_repetidas_se_calculan_una_vez(capsys):
+    s = _sulzberger()
+    resultados = s.calcular_fundacion_multiples_hipotesis(procesos=1)
+    assert _comparables(resultados['todas_hipotesis']) == _comparables(_referencia())
+    assert capsys.readouterr().out.count('fundación reutilizada') == 4
+
+    volumenes = [r['volumen'] for r in resultados['todas_hipotesis']]
+    assert resultados['hipotesis_dimensionante'] == resultados['todas_hipotesis'][volumenes.index(max(volumenes))]['hipotesis']
+    assert s.obtener_dataframe_todas_hipotesis()['Dimensionante'].tolist().count('🟡') == 1
+
+
+def test_hipotesis_en_procesos_identicas_al_secuencial():
+    secuencial = _sulzberger()
+    esperado = secuencial.calcular_fundacion_multiples_hipotesis(procesos=1)
+    paralelo = _sulzberger()
+    resultado = paralelo.calcular_fundacion_multiples_hipotesis(procesos=2)
+
+    assert resultado['todas_hipotesis'] == esperado['todas_hipotesis']
+    assert resultado['hipotesis_dimensionante'] == esperado['hipotesis_dimensionante']
+    assert paralelo.memoria_calculo == secuencial.memoria_calculo
+    assert paralelo.parametros_estructura == secuencial.parametros_estructura
@@ -0,0 +1,45 @@
+from CalculoCables import Cable_AEA
+
+
+PROPIEDADES = {
+    'seccion_total_mm2': 72.23, 'diametro_total_mm': 11.0, 'peso_unitario_dan_m': 0.6,
+    'coeficiente_dilatacion_1_c': 1.1e-05, 'modulo_elasticidad_dan_mm2': 20000.0,
+    'carga_rotura_minima_dan': 7000.0,
+}
+VIENTO_BASE = {'V': 38.9, 't_hielo': 0.01, 'exp': 'C', 'clase': 'C', 'Zc': 10.0, 'Cf': 1.0, 'L_vano': 300}
+PARAMETROS_VIENTO = {'exposicion': 'C', 'clase': 'C', 'Zc': 10.0, 'Cf': 1.0}
+ESTADOS = {
+    'I': {'temperatura': 35, 'descripcion': 'Tmáx', 'viento_velocidad': 0, 'espesor_hielo': 0},
+    'II': {'temperatura': -20, 'descripcion': 'Tmín', 'viento_velocidad': 0, 'espesor_hielo': 0},
+    'III': {'temperatura': 10, 'descripcion': 'Vmáx', 'viento_velocidad': 38.9, 'espesor_hielo': 0},
+    'IV': {'temperatura': -5, 'descripcion': 'Vmed', 'viento_velocidad': 15.56, 'espesor_hielo': 0.01},
+}
+
+
+def _cable():
+    return Cable_AEA('Ac 70', 'Ac 70', dict(PROPIEDADES), 'ACERO', dict(VIENTO_BASE))
+
+
+def test_tabla_estados_se_reutiliza_y_coincide_con_calculo_directo():
+    cable = _cable()
+    tabla = cable.construir_tabla_estados(300, ESTADOS, PARAMETROS_VIENTO)
+    # Misma clave -> mismo objeto (memoizado)
+    assert cable.construir_tabla_estados(300, ESTADOS, PARAMETROS_VIENTO) is tabla
+
+    for estado_id, estado_data in ESTADOS.items():
+        con_tabla = cable._calcular_estado(300, estado_data, 5.0, 35, PARAMETROS_VIENTO, cargas=tabla[estado_id])
+        sin_tabla = cable._calcular_estado(300, estado_data, 5.0, 35, PARAMETROS_VIENTO)
+        assert con_tabla == sin_tabla
+
+
+def test_tabla_estados_se_invalida():
+    cable = _cable()
+    tabla = cable.construir_tabla_estados(300, ESTADOS, PARAMETROS_VIENTO)
+
+    # Cambiar el vano genera una tabla nueva
+    tabla_otro_vano = cable.construir_tabla_estados(250, ESTADOS, PARAMETROS_VIENTO)
+    assert tabla_otro_vano is not tabla
+
+    # Recalcular el viento base invalida la tabla
+    cable._calcular_cache_vientos(dict(VIENTO_BASE, V=30.0))
+    assert cable._tabla_estados is None
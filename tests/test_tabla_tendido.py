@@ -0,0 +1,66 @@
+import numpy as np
+
+from CalculoCables import Cable_AEA
+from utils.tabla_tendido import crear_grafico_tabla_tendido, tabla_tendido_a_dataframe
+
+
+PROPIEDADES = {
+    'seccion_total_mm2': 72.23, 'diametro_total_mm': 11.0, 'peso_unitario_dan_m': 0.6,
+    'coeficiente_dilatacion_1_c': 1.1e-05, 'modulo_elasticidad_dan_mm2': 20000.0,
+    'carga_rotura_minima_dan': 7000.0,
+}
+VIENTO_BASE = {'V': 38.9, 't_hielo': 0.01, 'exp': 'C', 'clase': 'C', 'Zc': 10.0, 'Cf': 1.0, 'L_vano': 300}
+PARAMETROS_VIENTO = {'exposicion': 'C', 'clase': 'C', 'Zc': 10.0, 'Cf': 1.0}
+ESTADOS = [
+    {'nombre': 'Peso propio'},
+    {'nombre': 'Hielo', 'espesor_hielo': 0.01},
+    {'nombre': 'Viento', 'viento_velocidad': 25.0},
+]
+VANOS = [150, 250, 300, 400]
+TEMPERATURAS = [-20, -5, 10, 25, 50]
+
+
+def _cable():
+    return Cable_AEA('Ac 70', 'Ac 70', dict(PROPIEDADES), 'ACERO', dict(VIENTO_BASE))
+
+
+def test_tabla_tendido_vanos_aislados_coincide_con_calculo_escalar():
+    cable = _cable()
+    tabla = cable.tabla_tendido(VANOS, TEMPERATURAS, {'tension_daN_mm2': 8.0, 'temperatura_C': 16},
+                                estados=ESTADOS, parametros_viento=PARAMETROS_VIENTO)
+    assert tabla['tension_daN_mm2'].shape == (len(ESTADOS), len(TEMPERATURAS), len(VANOS))
+
+    for i, estado in enumerate(ESTADOS):
+        for k, temperatura in enumerate(TEMPERATURAS):
+            for j, vano in enumerate(VANOS):
+                estado_data = {'temperatura': temperatura, 'descripcion': estado['nombre'],
+                               'viento_velocidad': estado.get('viento_velocidad', 0),
+                               'espesor_hielo': estado.get('espesor_hielo', 0)}
+                escalar = cable._calcular_estado(vano, estado_data, 8.0, 16, PARAMETROS_VIENTO)
+                for campo in ('tension_daN_mm2', 'tiro_daN', 'flecha_vertical_m',
+                              'flecha_resultante_m', 'porcentaje_rotura'):
+                    assert np.isclose(tabla[campo][i, k, j], escalar[campo], rtol=1e-7)
+
+
+def test_tabla_tendido_vano_regulador():
+    cable = _cable()
+    tabla = cable.tabla_tendido(VANOS, TEMPERATURAS, {'tension_daN_mm2': 8.0, 'temperatura_C': 16},
+                                vano_regulador=280)
+    tension = tabla['tension_daN_mm2'][0]
+
+    # Misma tensión en todos los vanos del tramo, igual a la del vano regulador aislado
+    assert np.allclose(tension, tension[:, :1])
+    aislado = cable.tabla_tendido([280], TEMPERATURAS, {'tension_daN_mm2': 8.0, 'temperatura_C': 16})
+    assert np.allclose(tension[:, 0], aislado['tension_daN_mm2'][0, :, 0])
+    # Más frío, más tensión
+    assert np.all(np.diff(tension[:, 0]) < 0)
+
+    # Con tensión común la flecha escala con L²
+    flecha = tabla['flecha_vertical_m'][0]
+    assert np.allclose(flecha / np.asarray(VANOS)**2, flecha[:, :1] / VANOS[0]**2)
+
+    df = tabla_tendido_a_dataframe(tabla)
+    assert len(df) == len(TEMPERATURAS) * len(VANOS)
+    assert set(df['Vano [m]']) == set(VANOS)
+    fig = crear_grafico_tabla_tendido(tabla)
+    assert len(fig.data) == len(VANOS)
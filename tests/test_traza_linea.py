@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from CalculoCables import Cable_AEA
+from utils.traza_linea import calcular_traza, disenos_familia, piquetes_desde_dataframe, verificar_traza
+
+
+PROPIEDADES = {
+    'seccion_total_mm2': 72.23, 'diametro_total_mm': 11.0, 'peso_unitario_dan_m': 0.6,
+    'coeficiente_dilatacion_1_c': 1.1e-05, 'modulo_elasticidad_dan_mm2': 20000.0,
+    'carga_rotura_minima_dan': 7000.0,
+}
+VIENTO_BASE = {'V': 38.9, 't_hielo': 0.01, 'exp': 'C', 'clase': 'C', 'Zc': 10.0, 'Cf': 1.0, 'L_vano': 300}
+PARAMETROS_VIENTO = {'exposicion': 'C', 'clase': 'C', 'Zc': 10.0, 'Cf': 1.0}
+ESTADOS = {
+    '1': {'temperatura': 35, 'descripcion': 'Tmáx', 'viento_velocidad': 0, 'espesor_hielo': 0},
+    '2': {'temperatura': -20, 'descripcion': 'Tmín', 'viento_velocidad': 0, 'espesor_hielo': 0},
+    '3': {'temperatura': 10, 'descripcion': 'Vmáx', 'viento_velocidad': 38.9, 'espesor_hielo': 0},
+    '4': {'temperatura': -5, 'descripcion': 'Vmed', 'viento_velocidad': 15.56, 'espesor_hielo': 0.01},
+}
+ESTADO_BASICO = {'tension_daN_mm2': 8.0, 'temperatura_C': 16}
+ESTRUCTURAS = {
+    'S': {'TITULO': 'S', 'TIPO_ESTRUCTURA': 'Suspensión Recta', 'L_vano': 300, 'alpha': 0},
+    'RA': {'TITULO': 'RA', 'TIPO_ESTRUCTURA': 'Retención / Angular', 'L_vano': 300, 'alpha': 30},
+    'T': {'TITULO': 'T', 'TIPO_ESTRUCTURA': 'Terminal', 'L_vano': 300, 'alpha': 0},
+}
+TRAZA = pd.DataFrame({
+    'Piquete': ['P1', 'P2', 'P3', 'P4', 'P5', 'P6'],
+    'Progresiva [m]': [0, 280, 560, 900, 1150, 1400],
+    'Cota [m]': [0, 0, 0, 0, 0, 0],
+    'Ángulo [°]': [0, 0, 0, 20, 0, 0],
+    'Estructura': ['T', 'S', 'S', 'RA', 'S', 'T'],
+    'Retención': [True, False, False, True, False, True],
+})
+
+
+def _cable():
+    return Cable_AEA('Ac 70', 'Ac 70', dict(PROPIEDADES), 'ACERO', dict(VIENTO_BASE))
+
+
+def test_traza_tramos_reguladores_y_cargas():
+    cable = _cable()
+    traza = calcular_traza(piquetes_desde_dataframe(TRAZA), cable, ESTADOS, ESTADO_BASICO, PARAMETROS_VIENTO)
+
+    assert list(traza['tramo']) == [0, 0, 0, 1, 1]
+    assert np.allclose(traza['vanos_reguladores'][0], np.sqrt((280**3 * 2 + 340**3) / 900))
+    assert np.allclose(traza['vanos_reguladores'][1], np.sqrt((250**3 * 2) / 500))
+
+    # Tensión de cada tramo = estado escalar en el vano regulador
+    for i, (estado_id, estado) in enumerate(ESTADOS.items()):
+        for tramo, regulador in enumerate(traza['vanos_reguladores']):
+            escalar = cable._calcular_estado(regulador, estado, 8.0, 16, PARAMETROS_VIENTO)
+            assert np.isclose(traza['tension_tramos_daN_mm2'][i, tramo], escalar['tension_daN_mm2'])
+
+    # Terreno plano: vano peso = vano viento; extremos con medio vano y tiro completo
+    assert np.allclose(traza['vano_viento_m'], [140, 280, 310, 295, 250, 125])
+    assert np.allclose(traza['vano_peso_m'], traza['vano_viento_m'][None, :])
+    tiro_final = traza['tension_tramos_daN_mm2'][:, 1] * cable.seccion_mm2
+    assert np.allclose(traza['carga_longitudinal_daN'][:, -1], tiro_final)
+    assert np.allclose(traza['carga_longitudinal_daN'][:, 1:3], 0)
+
+
+def test_traza_desnivel_y_verificacion_contra_diseno():
+    cable = _cable()
+    piquetes = piquetes_desde_dataframe(TRAZA)
+    piquetes[2]['cota'] = 40.0  # P3 en una loma: recibe más peso, sus vecinos menos
+    traza = calcular_traza(piquetes, cable, ESTADOS, ESTADO_BASICO, PARAMETROS_VIENTO)
+    assert np.all(traza['vano_peso_m'][:, 2] > traza['vano_viento_m'][2])
+    assert np.all(traza['vano_peso_m'][:, 1] < traza['vano_viento_m'][1])
+
+    disenos = disenos_familia(ESTRUCTURAS, cable, ESTADOS, ESTADO_BASICO, PARAMETROS_VIENTO)
+    assert disenos['S']['carga_longitudinal_daN'] == 0
+    assert disenos['T']['carga_longitudinal_daN'] > 0
+
+    # Tolerancia: el vano regulador del primer tramo (305 m) supera apenas el de diseño
+    df = verificar_traza(traza, disenos, tolerancia=0.01)
+    excede = dict(zip(df['Piquete'], df['Excede']))
+    # P3: vano viento 310 > 300 y peso extra por la loma
+    assert excede['P3'] and 'vano viento' in df.set_index('Piquete').loc['P3', 'Observaciones']
+    assert not excede['P2'] and not excede['P5'] and not excede['P1']
@@ -0,0 +1,54 @@
+import numpy as np
+
+from CalculoCables import Cable_AEA
+from ListarCargas import ListadorCargas
+
+
+PROPIEDADES = {
+    'seccion_total_mm2': 72.23, 'diametro_total_mm': 11.0, 'peso_unitario_dan_m': 0.6,
+    'coeficiente_dilatacion_1_c': 1.1e-05, 'modulo_elasticidad_dan_mm2': 20000.0,
+    'carga_rotura_minima_dan': 7000.0,
+}
+VIENTO_BASE = {'V': 38.9, 't_hielo': 0.01, 'exp': 'C', 'clase': 'C', 'Zc': 10.0, 'Cf': 1.0, 'L_vano': 300}
+RESULTADOS = {
+    'I': {'tiro_daN': 800.0, 'peso_total_daN_m': 0.6},
+    'II': {'tiro_daN': 1600.0, 'peso_total_daN_m': 0.6},
+    'IV': {'tiro_daN': 1400.0, 'peso_total_daN_m': 1.1},
+}
+
+
+def _cable(**desnivel):
+    return Cable_AEA('Ac 70', 'Ac 70', dict(PROPIEDADES), 'ACERO', dict(VIENTO_BASE, **desnivel))
+
+
+def test_vano_peso_sin_desnivel_es_el_vano():
+    cable = _cable(VANO_DESNIVELADO=True)
+    assert cable.calcular_vanos_peso(RESULTADOS, 300) == {'I': 300.0, 'II': 300.0, 'IV': 300.0}
+
+    # Con el desnivel desactivado se ignoran las cotas de los piquetes
+    cable = _cable(VANO_DESNIVELADO=False, H_PIQANTERIOR=20.0, H_PIQPOSTERIOR=-5.0)
+    assert cable.calcular_vanos_peso(RESULTADOS, 300, vano_anterior=280, vano_posterior=320) == \
+        {'I': 300.0, 'II': 300.0, 'IV': 300.0}
+
+
+def test_vano_peso_coincide_con_vertices_de_catenarias():
+    cable = _cable(VANO_DESNIVELADO=True, H_PIQANTERIOR=25.0, H_PIQPOSTERIOR=-10.0)
+    vanos_peso = cable.calcular_vanos_peso(RESULTADOS, 300)
+
+    for estado_id, res in RESULTADOS.items():
+        anterior = cable._calcular_catenaria(res, 300, 25.0, 'anterior', definicion=10)
+        posterior = cable._calcular_catenaria(res, 300, -10.0, 'posterior', definicion=10)
+        esperado = posterior['x_min'] - anterior['x_min']
+        assert np.isclose(vanos_peso[estado_id], esperado, atol=1e-6)
+
+    # Piquetes vecinos más altos: a mayor tiro, menor vano peso
+    cable = _cable(VANO_DESNIVELADO=True, H_PIQANTERIOR=15.0, H_PIQPOSTERIOR=15.0)
+    vanos_peso = cable.calcular_vanos_peso(RESULTADOS, 300)
+    assert vanos_peso['II'] < vanos_peso['I'] < 300
+
+
+def test_listado_de_cargas_usa_el_mayor_vano_peso():
+    listador = object.__new__(ListadorCargas)
+    listador.L_vano = 300
+    assert listador._vano_peso({'I': {'tiro_daN': 800.0}}) == 300
+    assert listador._vano_peso({'I': {'vano_peso_m': 310.0}, 'II': {'vano_peso_m': 290.0}}) == 310.0
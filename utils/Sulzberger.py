@@ -1,6 +1,22 @@
+import contextlib
+import io
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import numpy as np
 import pandas as pd
-import math
+
+
+def _calcular_fuerzas_en_proceso(trabajo):
+    """Una combinación de fuerzas en un proceso aparte: (resultados, memoria_calculo)"""
+    sulzberger = Sulzberger(trabajo['estructura'], trabajo['suelo'], trabajo['calculo'])
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultado = sulzberger._calcular_fuerzas(trabajo['Tiro_x'], trabajo['Tiro_y'], trabajo['Tiro_z'],
+                                                 *trabajo['dimensiones'], abaco=trabajo['abaco'])
+    return resultado, sulzberger.memoria_calculo
 
 class Sulzberger:
     """
@@ -318,9 +334,72 @@ class Sulzberger:
         self.memoria_calculo.append(mensaje)
         print(mensaje)
     
-    def calcular_fundacion_multiples_hipotesis(self, tin=1.7, ain=1.3, bin=1.3, tipo_base='Rombica'):
+    def _configurar_fuerzas(self, Tiro_x, Tiro_y, Tiro_z):
+        """Configura las fuerzas de una hipótesis sobre Gp_base"""
+        self.configurar_estructura(
+            Gp=self.parametros_estructura.get('Gp_base', self.parametros_estructura.get('Gp', 0)),
+            Tiro_x=Tiro_x,
+            Tiro_y=Tiro_y,
+            Tiro_z=Tiro_z,
+            h=self.parametros_estructura.get('h', 15.0),
+            hl=self.parametros_estructura.get('hl', 13.5),
+            he=self.parametros_estructura.get('he', 1.5),
+            dc=self.parametros_estructura.get('dc', 0.31),
+            n_postes=self.parametros_estructura.get('n_postes', 1)
+        )
+    
+    def _calcular_fuerzas(self, Tiro_x, Tiro_y, Tiro_z, tin, ain, bin, tipo_base, abaco=None):
+        """
+        Calcula la fundación de una hipótesis; con ábaco (utils/abaco_fundacion.py) la
+        iteración arranca en los mínimos de la celda que contiene el punto
+        """
+        self._configurar_fuerzas(Tiro_x, Tiro_y, Tiro_z)
+        inicio = abaco.inicio(self.parametros_estructura) if abaco is not None else None
+        if inicio:
+            tin, ain, bin = max(tin, inicio[0]), max(ain, inicio[1]), max(bin, inicio[2])
+        return self.calcular_fundacion(tin, ain, bin, tipo_base)
+    
+    def _precalcular_en_procesos(self, fuerzas, dimensiones, procesos, abaco=None):
+        """
+        Calcula en paralelo las combinaciones de fuerzas distintas
+        
+        Returns:
+            dict: {(Tiro_x, Tiro_y, Tiro_z): (resultados, memoria_calculo)}; vacío si el
+                pool no está disponible (se sigue en secuencial)
+        """
+        base = {
+            'estructura': dict(self.parametros_estructura, hipotesis_fuerzas=[]),
+            'suelo': self.parametros_suelo,
+            'calculo': self.parametros_calculo,
+            'dimensiones': dimensiones,
+            'abaco': abaco,
+        }
+        trabajos = [dict(base, Tiro_x=x, Tiro_y=y, Tiro_z=z) for x, y, z in fuerzas]
+        try:
+            # 'spawn': no heredar hilos del servidor Dash (igual que los árboles 2D)
+            contexto = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=min(procesos, len(trabajos)), mp_context=contexto) as pool:
+                return dict(zip(fuerzas, pool.map(_calcular_fuerzas_en_proceso, trabajos)))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"⚠️ Fundación en paralelo no disponible ({e}), se continúa en secuencial")
+            return {}
+    
+    def calcular_fundacion_multiples_hipotesis(self, tin=1.7, ain=1.3, bin=1.3, tipo_base='Rombica', procesos=None,
+                                               abaco=None):
         """
         Calcular fundación para todas las hipótesis y retornar la de mayor volumen
+        
+        Las hipótesis con las mismas fuerzas (Tiro_x, Tiro_y, Tiro_z), frecuentes porque los
+        tiros llegan en valor absoluto desde DME, se calculan una sola vez. Con procesos > 1
+        las combinaciones distintas se calculan en paralelo antes del recorrido. En todos los
+        casos todas_hipotesis, la hipótesis dimensionante y la memoria son las del cálculo
+        secuencial.
+        
+        Args:
+            procesos: procesos en paralelo (None = config.app_config.FUNDACION_PROCESOS,
+                0 = según CPUs, 1 = secuencial en el proceso actual)
+            abaco: AbacoFundacion opcional; cada hipótesis arranca la iteración cerca del
+                resultado y la verifica con calcular_fundacion (ver utils/abaco_fundacion.py)
         """
         self.memoria_calculo = []
         self._log(f"=== CÁLCULO FUNDACIÓN SULZBERGER - MÚTIPLES HIPÓTESIS ===")
@@ -354,6 +433,18 @@ class Sulzberger:
         max_volumen = 0
         resultado_final = None
         
+        # Combinaciones de fuerzas distintas, en el orden de aparición
+        fuerzas = list(dict.fromkeys((h['Tiro_x'], h['Tiro_y'], h['Tiro_z']) for h in hipotesis_fuerzas))
+        if procesos is None:
+            from config.app_config import FUNDACION_PROCESOS
+            procesos = FUNDACION_PROCESOS
+        if procesos <= 0:
+            procesos = os.cpu_count() or 1
+        precalculadas = {}
+        if procesos > 1 and len(fuerzas) > 1:
+            precalculadas = self._precalcular_en_procesos(fuerzas, (tin, ain, bin, tipo_base), procesos, abaco)
+        calculadas = {}  # fuerzas -> (hipótesis, resultados, memoria)
+        
         for hip_data in hipotesis_fuerzas:
             hipotesis = hip_data['hipotesis']
             Tiro_x = hip_data['Tiro_x']
@@ -375,21 +466,25 @@ class Sulzberger:
                 Gp_efectivo = Gp_base + peso_adicional  # Suma algebraica (será negativo)
                 self._log(f"Peso efectivo: Gp_base={Gp_base:.0f} kg + Fz={peso_adicional:.0f} kg = {Gp_efectivo:.0f} kg")
             
-            # Configurar estructura con parámetros completos
-            self.configurar_estructura(
-                Gp=Gp_base,
-                Tiro_x=Tiro_x,
-                Tiro_y=Tiro_y,
-                Tiro_z=Tiro_z,
-                h=self.parametros_estructura.get('h', 15.0),
-                hl=self.parametros_estructura.get('hl', 13.5),
-                he=self.parametros_estructura.get('he', 1.5),
-                dc=self.parametros_estructura.get('dc', 0.31),
-                n_postes=self.parametros_estructura.get('n_postes', 1)
-            )
+            # Calcular fundación para esta hipótesis (una vez por combinación de fuerzas)
+            clave = (Tiro_x, Tiro_y, Tiro_z)
+            if clave in calculadas:
+                hipotesis_origen, resultado, memoria = calculadas[clave]
+                self._configurar_fuerzas(Tiro_x, Tiro_y, Tiro_z)
+                print(f"♻️ Hipótesis {hipotesis}: mismas fuerzas que {hipotesis_origen}, fundación reutilizada")
+                self.memoria_calculo = list(memoria)
+                resultado_hip = self.resultados = dict(resultado)
+            elif clave in precalculadas:
+                resultado, memoria = precalculadas[clave]
+                self._configurar_fuerzas(Tiro_x, Tiro_y, Tiro_z)
+                self.memoria_calculo = []
+                for linea in memoria:
+                    self._log(linea)
+                resultado_hip = self.resultados = dict(resultado)
+            else:
+                resultado_hip = self._calcular_fuerzas(Tiro_x, Tiro_y, Tiro_z, tin, ain, bin, tipo_base, abaco)
+            calculadas.setdefault(clave, (hipotesis, dict(resultado_hip), list(self.memoria_calculo)))
             
-            # Calcular fundación para esta hipótesis
-            resultado_hip = self.calcular_fundacion(tin, ain, bin, tipo_base)
             resultado_hip['hipotesis'] = hipotesis
             resultado_hip['Tiro_x_input'] = Tiro_x
             resultado_hip['Tiro_y_input'] = Tiro_y
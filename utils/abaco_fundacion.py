@@ -0,0 +1,190 @@
+"""
+Ábacos de fundación Sulzberger precalculados
+
+Para un suelo, unos parámetros de cálculo y un poste del catálogo (hl, dc, n_postes) el
+resultado de Sulzberger depende de (Gp efectivo, Tiro_x, Tiro_y, he). El ábaco lo
+precalcula sobre una grilla de esos cuatro ejes y lo guarda comprimido en
+CACHE_DIR/abacos/fundacion_{clave}.npz (la clave es el hash de todo lo que no es eje).
+
+Al dimensionar una hipótesis con ábaco (Sulzberger.calcular_fundacion_multiples_hipotesis(
+abaco=...)) la celda de la grilla que contiene el punto da el arranque de la iteración:
+el mínimo de t, a y b en sus 16 vértices. calcular_fundacion hace desde ahí la verificación
+exacta y solo los pocos pasos que faltan. El resultado cumple todas las verificaciones,
+pero como la iteración no arranca en las dimensiones iniciales puede diferir en algunos
+incrementos del dimensionado completo. Fuera de la grilla, o si algún vértice no
+convergió, se usa el cálculo completo.
+
+Generar un ábaco con la grilla por defecto lleva del orden de 15-30 s, así que la etapa de
+fundación de la aplicación solo carga ábacos existentes (obtener_abaco(..., generar=False)).
+Se generan fuera del servidor, con el cálculo por lotes: calcular_lote.py --generar-abacos.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+
+import utils.cache_binario as cache_binario
+from utils.console_capture import capturar_salida
+from utils.perfil_calculo import contar
+
+VERSION_ABACO = 1
+EJES = ("Gp", "Tiro_x", "Tiro_y", "he")
+TABLAS = ("t", "a", "b", "volumen")
+GRILLA_DEFECTO = {
+    "Gp": np.linspace(0, 24000, 13),       # kg (efectivo, con Fz)
+    "Tiro_x": np.linspace(0, 8000, 11),    # daN
+    "Tiro_y": np.linspace(0, 8000, 11),    # daN
+    "he": np.linspace(1.0, 3.0, 5),        # m
+}
+
+
+def clave_abaco(parametros_suelo, parametros_calculo, poste, tipo_base, dimensiones, grilla):
+    datos = {
+        "version": VERSION_ABACO,
+        "suelo": parametros_suelo,
+        "calculo": parametros_calculo,
+        "poste": poste,
+        "tipo_base": tipo_base,
+        "dimensiones": list(dimensiones),
+        "grilla": {eje: np.asarray(grilla[eje], dtype=float).round(6).tolist() for eje in EJES},
+    }
+    texto = json.dumps(datos, sort_keys=True, default=str)
+    return hashlib.md5(texto.encode()).hexdigest()
+
+
+def ruta_abaco(clave):
+    return cache_binario.CACHE_DIR / "abacos" / f"fundacion_{clave}.npz"
+
+
+class AbacoFundacion:
+    """Tablas t, a, b, volumen y convergencia sobre la grilla (Gp, Tiro_x, Tiro_y, he)"""
+
+    def __init__(self, ejes, tablas, poste, clave):
+        self.ejes = {eje: np.asarray(ejes[eje], dtype=float) for eje in EJES}
+        self.tablas = tablas
+        self.poste = poste
+        self.clave = clave
+
+    @classmethod
+    def generar(cls, parametros_suelo, parametros_calculo, poste, tipo_base='Rombica',
+                dimensiones=(1.7, 1.3, 1.3), grilla=None):
+        """
+        Dimensiona cada punto de la grilla con Sulzberger.calcular_fundacion
+
+        Args:
+            poste (dict): hl, dc, n_postes del poste del catálogo
+            dimensiones (tuple): tin, ain, bin iniciales
+            grilla (dict, optional): valores de cada eje (por defecto GRILLA_DEFECTO)
+        """
+        from utils.Sulzberger import Sulzberger
+
+        grilla = {eje: np.asarray((grilla or GRILLA_DEFECTO)[eje], dtype=float) for eje in EJES}
+        forma = tuple(len(grilla[eje]) for eje in EJES)
+        tablas = {nombre: np.full(forma, np.nan) for nombre in TABLAS}
+        tablas["convergencia"] = np.zeros(forma, dtype=bool)
+        print(f"📐 Generando ábaco de fundación: {int(np.prod(forma))} puntos {forma}")
+
+        sulzberger = Sulzberger(parametros_suelo=dict(parametros_suelo), parametros_calculo=dict(parametros_calculo))
+        for indice in np.ndindex(*forma):
+            Gp, Tiro_x, Tiro_y, he = (grilla[eje][i] for eje, i in zip(EJES, indice))
+            sulzberger.configurar_estructura(Gp=Gp, Tiro_x=Tiro_x, Tiro_y=Tiro_y, Tiro_z=0.0,
+                                             h=poste["hl"] + he, hl=poste["hl"], he=he,
+                                             dc=poste["dc"], n_postes=poste.get("n_postes", 1))
+            try:
+                with capturar_salida():
+                    resultado = sulzberger.calcular_fundacion(*dimensiones, tipo_base)
+            except (ValueError, TypeError, ZeroDivisionError, OverflowError):
+                continue
+            for nombre in TABLAS:
+                tablas[nombre][indice] = resultado[nombre]
+            tablas["convergencia"][indice] = resultado["convergencia"]
+
+        clave = clave_abaco(parametros_suelo, parametros_calculo, poste, tipo_base, dimensiones, grilla)
+        return cls(grilla, tablas, dict(poste), clave)
+
+    def guardar(self, ruta=None):
+        ruta = ruta or ruta_abaco(self.clave)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(ruta, **{f"eje_{eje}": valores for eje, valores in self.ejes.items()},
+                            **self.tablas, poste=json.dumps(self.poste), clave=self.clave)
+        return ruta
+
+    @classmethod
+    def cargar(cls, ruta):
+        with np.load(ruta) as datos:
+            ejes = {eje: datos[f"eje_{eje}"] for eje in EJES}
+            tablas = {nombre: datos[nombre] for nombre in (*TABLAS, "convergencia")}
+            return cls(ejes, tablas, json.loads(str(datos["poste"])), str(datos["clave"]))
+
+    def _celda(self, punto):
+        """Slices de los vértices de la celda que contiene el punto, o None si está afuera"""
+        celda = []
+        for eje in EJES:
+            valores = self.ejes[eje]
+            x = punto[eje]
+            if not valores[0] <= x <= valores[-1]:
+                return None
+            i = int(np.clip(np.searchsorted(valores, x, side="right") - 1, 0, len(valores) - 2))
+            celda.append(slice(i, i + 2))
+        return tuple(celda)
+
+    def consultar(self, Gp, Tiro_x, Tiro_y, he):
+        """
+        Interpolación multilineal de t, a, b y volumen en el punto, y arranque para la
+        verificación exacta (mínimos de la celda); None fuera de la grilla o sin convergencia
+        """
+        punto = {"Gp": Gp, "Tiro_x": Tiro_x, "Tiro_y": Tiro_y, "he": he}
+        celda = self._celda(punto)
+        if celda is None or not self.tablas["convergencia"][celda].all():
+            return None
+
+        # Pesos multilineales de los 16 vértices
+        pesos = np.ones((2,) * len(EJES))
+        for k, eje in enumerate(EJES):
+            x0, x1 = self.ejes[eje][celda[k]]
+            u = (punto[eje] - x0) / (x1 - x0)
+            forma = [1] * len(EJES)
+            forma[k] = 2
+            pesos = pesos * np.array([1 - u, u]).reshape(forma)
+
+        consulta = {nombre: float((self.tablas[nombre][celda] * pesos).sum()) for nombre in TABLAS}
+        consulta["inicio"] = tuple(float(self.tablas[nombre][celda].min()) for nombre in ("t", "a", "b"))
+        return consulta
+
+    def corresponde(self, parametros_estructura):
+        """El ábaco es del poste de la estructura (hl, dc, n_postes)"""
+        return all(np.isclose(parametros_estructura.get(k, np.nan), self.poste.get(k, np.nan))
+                   for k in ("hl", "dc", "n_postes"))
+
+    def inicio(self, parametros_estructura):
+        """Dimensiones de arranque para la estructura configurada, o None si no aplica"""
+        if not self.corresponde(parametros_estructura):
+            return None
+        consulta = self.consultar(parametros_estructura["Gp"], parametros_estructura["Tiro_x"],
+                                  parametros_estructura["Tiro_y"], parametros_estructura["he"])
+        contar("fundacion.abaco_aciertos" if consulta else "fundacion.abaco_fuera_de_grilla")
+        return consulta["inicio"] if consulta else None
+
+
+def obtener_abaco(parametros_suelo, parametros_calculo, poste, tipo_base='Rombica',
+                  dimensiones=(1.7, 1.3, 1.3), grilla=None, generar=True):
+    """
+    Ábaco guardado para estos parámetros, o lo genera y lo guarda
+
+    Con generar=False (etapa de la aplicación) devuelve None si no hay un ábaco guardado.
+    """
+    grilla = grilla or GRILLA_DEFECTO
+    ruta = ruta_abaco(clave_abaco(parametros_suelo, parametros_calculo, poste, tipo_base, dimensiones, grilla))
+    if ruta.exists():
+        try:
+            return AbacoFundacion.cargar(ruta)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"⚠️ Ábaco de fundación ilegible ({e})")
+    if not generar:
+        print("ℹ️ Sin ábaco de fundación para este suelo y poste, se usa el cálculo completo "
+              "(generarlo con calcular_lote.py --generar-abacos)")
+        return None
+    abaco = AbacoFundacion.generar(parametros_suelo, parametros_calculo, poste, tipo_base, dimensiones, grilla)
+    print(f"💾 Ábaco de fundación guardado: {abaco.guardar(ruta).name}")
+    return abaco
@@ -0,0 +1,252 @@
+"""
+Diagramas AEE bajo demanda
+
+El análisis AEE persiste solo resultados numéricos (valores por subnodo y reacciones por
+hipótesis, más nodos y conexiones). Cada diagrama (hipótesis, tipo MQNT/MRT/MFE, escala)
+se renderiza recién cuando la vista o el reporte lo piden, y se memoriza por hash de
+resultados: en disco (PNG/JSON en cache, mismos nombres que antes) y en memoria (figuras
+Plotly recientes).
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from config.app_config import CACHE_DIR
+
+TIPOS_DIAGRAMA = ('MQNT', 'MRT', 'MFE')
+
+# Parámetros de segmentación por defecto (mismos que la vista AEE)
+PARAMETROS_SEGMENTACION_DEFAULT = {
+    'n_segmentar_conexion_corta': 10,
+    'n_segmentar_conexion_larga': 30,
+    'percentil_separacion_corta_larga': 50
+}
+
+_MAX_FIGURAS_MEMO = 32
+_MAX_RESULTADOS_REGISTRADOS = 16
+
+_lock = threading.Lock()
+_figuras_memo = OrderedDict()          # clave de diagrama -> dict de figura Plotly
+_resultados_registrados = OrderedDict()  # hash -> resultados AEE
+
+
+class _NodoAEE:
+    __slots__ = ('coordenadas',)
+
+    def __init__(self, coordenadas):
+        self.coordenadas = coordenadas
+
+
+class GeometriaAEE:
+    """Geometría mínima para los ploteos AEE (nodos con coordenadas) desde resultados['nodos_info']"""
+
+    def __init__(self, nodos_info):
+        self.nodos = {
+            nombre: _NodoAEE((float(info['x']), float(info['y']), float(info['z'])))
+            for nombre, info in nodos_info.items()
+        }
+
+
+def calcular_momento_resultante_total(esfuerzos):
+    """MRT = sqrt(M^2 + T^2) por subnodo"""
+    mrt = {}
+    for nodo, vals in esfuerzos.get('valores', {}).items():
+        if len(vals) >= 10:
+            M, T = vals[2], vals[3]
+            mrt[nodo] = float(np.sqrt(M**2 + T**2))
+    return {'valores': mrt, 'reacciones': esfuerzos.get('reacciones', {})}
+
+
+def calcular_momento_flector_equivalente(esfuerzos):
+    """MFE = M por subnodo"""
+    mfe = {}
+    for nodo, vals in esfuerzos.get('valores', {}).items():
+        if len(vals) >= 10:
+            mfe[nodo] = float(vals[2])
+    return {'valores': mfe, 'reacciones': esfuerzos.get('reacciones', {})}
+
+
+def separar_nombre_diagrama(nombre_diagrama):
+    """'MQNT_HIP_A0' -> ('MQNT', 'HIP_A0')"""
+    tipo, _, hipotesis = nombre_diagrama.partition('_')
+    if tipo not in TIPOS_DIAGRAMA or not hipotesis:
+        raise ValueError(f"Nombre de diagrama AEE inválido: {nombre_diagrama}")
+    return tipo, hipotesis
+
+
+def listar_diagramas(resultados):
+    """Nombres de diagramas disponibles ('MQNT_<hip>', ...) en orden de hipótesis"""
+    diagramas = resultados.get('diagramas') or {}
+    if diagramas:
+        return list(diagramas.keys())
+    activos = (resultados.get('parametros_aee') or {}).get('DIAGRAMAS_ACTIVOS', {})
+    return [f"{tipo}_{hip}" for hip in resultados.get('esfuerzos', {})
+            for tipo in TIPOS_DIAGRAMA if activos.get(tipo, True)]
+
+
+def opciones_diagrama(resultados, escala=None, graficos_3d=None, interactivo=None, parametros_aee=None):
+    """Opciones de ploteo: las guardadas con el análisis, salvo las indicadas explícitamente"""
+    params = dict(parametros_aee or {})
+    params.update(resultados.get('parametros_aee') or {})
+    return {
+        'escala': escala if escala is not None else params.get('escala_graficos', 'logaritmica'),
+        'graficos_3d': bool(graficos_3d if graficos_3d is not None else params.get('GRAFICOS_3D_AEE', True)),
+        'interactivo': bool(interactivo if interactivo is not None else params.get('plots_interactivos', True))
+    }
+
+
+def nombre_archivo_diagrama(resultados, nombre_diagrama, opciones, extension='png', parametros_aee=None):
+    """Nombre en cache; la escala y vista guardadas con el análisis usan el nombre histórico"""
+    hash_params = resultados.get('hash', '')
+    guardadas = opciones_diagrama(resultados, parametros_aee=parametros_aee)
+    if (opciones['escala'], opciones['graficos_3d']) == (guardadas['escala'], guardadas['graficos_3d']):
+        return f"AEE_{nombre_diagrama}.{hash_params}.{extension}"
+    variante = f"{opciones['escala']}_{'3d' if opciones['graficos_3d'] else '2d'}"
+    return f"AEE_{nombre_diagrama}.{hash_params}.{variante}.{extension}"
+
+
+def registrar_resultados(resultados):
+    """Recuerda los resultados por hash para que los callbacks rendericen sin releer el cache"""
+    hash_params = resultados.get('hash')
+    if not hash_params:
+        return
+    with _lock:
+        _resultados_registrados[hash_params] = resultados
+        _resultados_registrados.move_to_end(hash_params)
+        while len(_resultados_registrados) > _MAX_RESULTADOS_REGISTRADOS:
+            _resultados_registrados.popitem(last=False)
+
+
+def resultados_registrados(hash_params):
+    with _lock:
+        return _resultados_registrados.get(hash_params)
+
+
+def invalidar(hash_params):
+    """Descarta figuras memorizadas y archivos de diagramas de un hash de resultados"""
+    with _lock:
+        for clave in [c for c in _figuras_memo if c[0] == hash_params]:
+            del _figuras_memo[clave]
+    eliminados = 0
+    for archivo in list(CACHE_DIR.glob(f"AEE_*.{hash_params}.png")) + \
+                   list(CACHE_DIR.glob(f"AEE_*.{hash_params}.json")) + \
+                   list(CACHE_DIR.glob(f"AEE_*.{hash_params}.*_[23]d.*")):
+        try:
+            archivo.unlink()
+            eliminados += 1
+        except OSError:
+            pass
+    return eliminados
+
+
+def _esfuerzos_hipotesis(resultados, hipotesis):
+    datos = resultados.get('esfuerzos', {}).get(hipotesis)
+    if not datos:
+        raise KeyError(f"No hay esfuerzos AEE para la hipótesis {hipotesis}")
+    return {
+        'valores': {k: np.asarray(v, dtype=float) for k, v in datos.get('valores', {}).items()},
+        'reacciones': datos.get('reacciones', {})
+    }
+
+
+def _contexto_ploteo(resultados, parametros_aee=None):
+    geometria = GeometriaAEE(resultados.get('nodos_info', {}))
+    conexiones = [(c['Nodo Inicial'], c['Nodo Final']) for c in resultados.get('conexiones_info', [])]
+    parametros = dict(PARAMETROS_SEGMENTACION_DEFAULT)
+    parametros.update(parametros_aee or {})
+    parametros.update(resultados.get('parametros_aee') or {})
+    return geometria, conexiones, parametros
+
+
+def construir_figura(resultados, nombre_diagrama, opciones, parametros_aee=None):
+    """Renderiza el diagrama (Plotly si opciones['interactivo'], si no matplotlib)"""
+    tipo, hipotesis = separar_nombre_diagrama(nombre_diagrama)
+    esfuerzos = _esfuerzos_hipotesis(resultados, hipotesis)
+    geometria, conexiones, parametros = _contexto_ploteo(resultados, parametros_aee)
+    escala, graficos_3d = opciones['escala'], opciones['graficos_3d']
+
+    if tipo == 'MQNT':
+        datos = esfuerzos
+    elif tipo == 'MRT':
+        datos = calcular_momento_resultante_total(esfuerzos)
+    else:
+        datos = calcular_momento_flector_equivalente(esfuerzos)
+    args = (geometria, conexiones, datos['valores'], datos['reacciones'], parametros)
+
+    from utils import analisis_estatico_plots as plots
+    if opciones['interactivo']:
+        if tipo == 'MQNT':
+            return plots.generar_diagrama_mqnt_plotly(*args, hipotesis, graficos_3d, escala)
+        if graficos_3d:
+            return plots.generar_diagrama_plotly_3d(*args, tipo, hipotesis, escala)
+        return plots.generar_diagrama_plotly_2d(*args, tipo, hipotesis, escala)
+
+    if tipo == 'MQNT':
+        return plots.generar_diagrama_mqnt_matplotlib(*args, hipotesis, graficos_3d, escala)
+    if graficos_3d:
+        return plots.generar_diagrama_matplotlib_3d(*args, tipo, hipotesis, escala)
+    return plots.generar_diagrama_matplotlib_2d(*args, tipo, hipotesis, escala)
+
+
+def obtener_figura(resultados, nombre_diagrama, escala=None, graficos_3d=None, parametros_aee=None):
+    """
+    Figura Plotly (dict) del diagrama, renderizada bajo demanda
+
+    Se busca en memoria, luego el JSON en cache; si no existe se renderiza y se guarda.
+    """
+    from utils.figuras_plotly import cargar_figura, guardar_figura
+    opciones = opciones_diagrama(resultados, escala, graficos_3d, True, parametros_aee)
+    clave = (resultados.get('hash', ''), nombre_diagrama, opciones['escala'], opciones['graficos_3d'])
+    with _lock:
+        if clave in _figuras_memo:
+            _figuras_memo.move_to_end(clave)
+            return _figuras_memo[clave]
+
+    ruta_json = CACHE_DIR / nombre_archivo_diagrama(resultados, nombre_diagrama, opciones, 'json', parametros_aee)
+    fig_dict = None
+    try:
+        fig_dict = cargar_figura(ruta_json)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ JSON de diagrama AEE ilegible, se regenera: {e}")
+    if fig_dict is None:
+        fig = construir_figura(resultados, nombre_diagrama, opciones, parametros_aee)
+        fig_dict = cargar_figura(guardar_figura(fig, ruta_json))
+        print(f"✅ Diagrama AEE renderizado bajo demanda: {ruta_json.name}")
+
+    with _lock:
+        _figuras_memo[clave] = fig_dict
+        while len(_figuras_memo) > _MAX_FIGURAS_MEMO:
+            _figuras_memo.popitem(last=False)
+    return fig_dict
+
+
+def asegurar_png(resultados, nombre_diagrama, escala=None, graficos_3d=None, interactivo=None, parametros_aee=None):
+    """
+    Garantiza el PNG del diagrama en cache (renderizándolo si falta)
+
+    Returns:
+        str: nombre de archivo en CACHE_DIR, o None si no se pudo generar
+    """
+    opciones = opciones_diagrama(resultados, escala, graficos_3d, interactivo, parametros_aee)
+    nombre_png = nombre_archivo_diagrama(resultados, nombre_diagrama, opciones, 'png', parametros_aee)
+    ruta_png = CACHE_DIR / nombre_png
+    if ruta_png.exists():
+        return nombre_png
+    try:
+        if opciones['interactivo']:
+            import plotly.graph_objects as go
+            from utils.figuras_plotly import expandir_figura, exportar_png
+            fig = go.Figure(expandir_figura(obtener_figura(resultados, nombre_diagrama, opciones['escala'], opciones['graficos_3d'], parametros_aee)))
+            alto = 800 if nombre_diagrama.startswith('MQNT') else 600
+            exportar_png(fig, ruta_png, width=1200, height=alto)
+        else:
+            import matplotlib.pyplot as plt
+            fig = construir_figura(resultados, nombre_diagrama, opciones, parametros_aee)
+            fig.savefig(str(ruta_png), dpi=150, bbox_inches='tight')
+            plt.close(fig)
+        return nombre_png
+    except Exception as e:
+        print(f"❌ Error renderizando diagrama AEE {nombre_diagrama}: {e}")
+        return None
@@ -0,0 +1,308 @@
+"""
+Almacén del lado del servidor para el dcc.Store "estructura-actual"
+
+El Store llevaba el diccionario completo de la estructura, que viajaba al navegador y
+volvía en cada callback que lo usa como State/Output (unos 70). Ahora el Store solo guarda
+una referencia chica:
+
+    {"__estructura_ref__": "<token>", "id": "<TITULO>", "version": 7, "cambios": ["L_vano"],
+     "sesion": "<id de sesión>"}
+
+y el diccionario queda en el servidor: un LRU en memoria más un archivo por versión en
+data/sesiones/, para que lo lean los otros workers de gunicorn y para sobrevivir a la
+expulsión del LRU. Cada versión es inmutable (un token nuevo por escritura), así que dos
+sesiones que parten de la misma referencia no se pisan.
+
+Los callbacks no cambian: `instalar(app)` envuelve `app.callback` y `envolver_registro`
+hace lo mismo con `dash.callback`. Antes de llamar a la función se resuelven las
+referencias de "estructura-actual" (cada callback recibe su propia copia). Al volver, los
+diccionarios que van a "estructura-actual" se guardan y se reemplazan por su referencia.
+Además, la función corre dentro del contexto de cálculo de la sesión de la referencia
+(models/contexto_calculo.py), así que cada navegador tiene sus propios objetos de cálculo y
+su propia estructura y familia activas (guardadas en data/sesiones/<sesion>.sesion.json para
+los otros workers, ver AppState.activar_sesion).
+"""
+
+import functools
+from contextlib import nullcontext
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from config.app_config import (
+    DATA_DIR, ESTRUCTURA_EN_SERVIDOR, ALMACEN_ESTRUCTURAS_MEMORIA, ALMACEN_ESTRUCTURAS_DIAS
+)
+
+ID_STORE = "estructura-actual"
+PROPIEDAD_STORE = "data"
+CLAVE_REF = "__estructura_ref__"
+MAX_CAMBIOS_INFORMADOS = 20
+# Cada cuánto se revisan las versiones viejas en disco al guardar (el proceso vive días en producción)
+INTERVALO_PURGA_S = 600
+
+
+def es_referencia(valor):
+    return isinstance(valor, dict) and CLAVE_REF in valor
+
+
+def _copiar(valor):
+    """Copia profunda de datos JSON (más rápida que copy.deepcopy)"""
+    if isinstance(valor, dict):
+        return {k: _copiar(v) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [_copiar(v) for v in valor]
+    return valor
+
+
+def _a_json(valor):
+    """Tipos numpy que puedan quedar en la estructura (Dash también los serializaba)"""
+    if hasattr(valor, "tolist"):
+        return valor.tolist()
+    return str(valor)
+
+
+def _claves_cambiadas(anterior, nueva):
+    claves = set(anterior) | set(nueva)
+    return sorted(k for k in claves if anterior.get(k, CLAVE_REF) != nueva.get(k, CLAVE_REF))
+
+
+class AlmacenEstructuras:
+    """Versiones inmutables de estructuras: LRU en memoria + un JSON por versión en disco"""
+
+    def __init__(self, directorio=None, max_memoria=None, dias_retencion=None):
+        self.directorio = directorio or DATA_DIR / "sesiones"
+        self.max_memoria = max_memoria or ALMACEN_ESTRUCTURAS_MEMORIA
+        self.dias_retencion = ALMACEN_ESTRUCTURAS_DIAS if dias_retencion is None else dias_retencion
+        self._memoria = OrderedDict()  # token -> (estructura, referencia)
+        self._lock = threading.Lock()
+        self._ultima_purga = 0.0
+
+    def _ruta(self, token):
+        return self.directorio / f"{token}.json"
+
+    def _recordar(self, token, estructura, referencia):
+        with self._lock:
+            self._memoria[token] = (estructura, referencia)
+            self._memoria.move_to_end(token)
+            while len(self._memoria) > self.max_memoria:
+                self._memoria.popitem(last=False)
+
+    def _leer(self, token):
+        """(estructura, referencia) guardadas, o None si el token no existe"""
+        with self._lock:
+            if token in self._memoria:
+                self._memoria.move_to_end(token)
+                return self._memoria[token]
+        ruta = self._ruta(token)
+        try:
+            contenido = json.loads(ruta.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        entrada = (contenido["estructura"], contenido["referencia"])
+        self._recordar(token, *entrada)
+        return entrada
+
+    def _ruta_sesion(self, sesion):
+        return self.directorio / f"{sesion}.sesion.json"
+
+    def leer_estado_sesion(self, sesion):
+        """Estado de la sesión (estructura y familia activas), o {} si no hay"""
+        try:
+            return json.loads(self._ruta_sesion(sesion).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def guardar_estado_sesion(self, sesion, estado):
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        ruta = self._ruta_sesion(sesion)
+        temporal = ruta.with_name(f"{ruta.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporal.write_text(json.dumps(estado, ensure_ascii=False), encoding="utf-8")
+        os.replace(temporal, ruta)
+
+    def purgar_antiguos(self):
+        """Borra versiones en disco más viejas que dias_retencion"""
+        if not self.directorio.exists():
+            return 0
+        limite = time.time() - self.dias_retencion * 86400
+        borrados = 0
+        for archivo in self.directorio.glob("*.json"):
+            try:
+                if archivo.stat().st_mtime < limite:
+                    archivo.unlink()
+                    borrados += 1
+            except OSError:
+                pass
+        return borrados
+
+    def guardar(self, estructura, referencia_anterior=None):
+        """
+        Guarda una versión de la estructura y devuelve su referencia
+
+        Si no cambió respecto de `referencia_anterior` se devuelve esa misma referencia.
+        """
+        anterior = self._leer(referencia_anterior[CLAVE_REF]) if es_referencia(referencia_anterior) else None
+        if anterior is not None:
+            cambios = _claves_cambiadas(anterior[0], estructura)
+            if not cambios:
+                return anterior[1]
+            version = anterior[1].get("version", 0) + 1
+            sesion = anterior[1].get("sesion") or uuid.uuid4().hex
+        else:
+            cambios = sorted(estructura)
+            version = 1
+            sesion = uuid.uuid4().hex
+
+        estructura = _copiar(estructura)
+        token = uuid.uuid4().hex
+        referencia = {
+            CLAVE_REF: token,
+            "id": estructura.get("TITULO"),
+            "version": version,
+            "cambios": cambios[:MAX_CAMBIOS_INFORMADOS],
+            "sesion": sesion
+        }
+        ahora = time.time()
+        if ahora - self._ultima_purga >= INTERVALO_PURGA_S:
+            self._ultima_purga = ahora
+            self.purgar_antiguos()
+        # Escritura atómica: otro worker puede estar leyendo la referencia enseguida
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        ruta = self._ruta(token)
+        temporal = ruta.with_suffix(".tmp")
+        temporal.write_text(
+            json.dumps({"estructura": estructura, "referencia": referencia}, ensure_ascii=False, separators=(",", ":"), default=_a_json),
+            encoding="utf-8"
+        )
+        os.replace(temporal, ruta)
+        self._recordar(token, estructura, referencia)
+        return referencia
+
+    def resolver(self, valor):
+        """Referencia -> copia de la estructura; cualquier otro valor se devuelve igual"""
+        if not es_referencia(valor):
+            return valor
+        entrada = self._leer(valor[CLAVE_REF])
+        if entrada is None:
+            # Versión purgada o de otra instalación: se usa la estructura activa en disco
+            print(f"⚠️ Referencia de estructura desconocida ({valor.get('id')} v{valor.get('version')}), se recarga la estructura activa")
+            from models.app_state import AppState
+            return AppState().cargar_estructura_actual()
+        return _copiar(entrada[0])
+
+
+_almacen = AlmacenEstructuras()
+
+
+def obtener_almacen():
+    return _almacen
+
+
+def referenciar(estructura):
+    """Valor inicial del Store: la referencia (o el dict si el almacén está desactivado)"""
+    if not ESTRUCTURA_EN_SERVIDOR or not isinstance(estructura, dict):
+        return estructura
+    return _almacen.guardar(estructura)
+
+
+def _es_store(dependencia):
+    return dependencia.component_id == ID_STORE and dependencia.component_property == PROPIEDAD_STORE
+
+
+def _dependencias(args, kwargs):
+    """(outputs, inputs + states en orden de argumentos, salida_unica)"""
+    from dash.dependencies import Input, Output, State
+
+    outputs, inputs, states = [], [], []
+
+    def recorrer(obj):
+        if isinstance(obj, (list, tuple)):
+            for item in obj:
+                recorrer(item)
+        elif isinstance(obj, Output):
+            outputs.append(obj)
+        elif isinstance(obj, Input):
+            inputs.append(obj)
+        elif isinstance(obj, State):
+            states.append(obj)
+
+    for arg in args:
+        recorrer(arg)
+    for clave in ("output", "inputs", "state"):
+        recorrer(kwargs.get(clave, []))
+
+    primer_output = kwargs.get("output", next((a for a in args if isinstance(a, (Output, list, tuple))), None))
+    salida_unica = isinstance(primer_output, Output) and len(outputs) == 1
+    return outputs, inputs + states, salida_unica
+
+
+def _envolver_funcion(funcion, posiciones_entrada, posiciones_salida, salida_unica):
+    @functools.wraps(funcion)
+    def envuelta(*args, **kwargs):
+        args = list(args)
+        referencia_entrada = None
+        for pos in posiciones_entrada:
+            if pos < len(args) and es_referencia(args[pos]):
+                referencia_entrada = referencia_entrada or args[pos]
+                args[pos] = _almacen.resolver(args[pos])
+
+        sesion = referencia_entrada.get("sesion") if referencia_entrada else None
+        if sesion:
+            from models.contexto_calculo import usar_contexto
+            contexto = usar_contexto(f"sesion-{sesion}")
+        else:
+            contexto = nullcontext()
+        with contexto:
+            if sesion:
+                from models.app_state import AppState
+                AppState().activar_sesion(sesion, referencia_entrada.get("id"))
+            resultado = funcion(*args, **kwargs)
+
+        if salida_unica:
+            if isinstance(resultado, dict) and not es_referencia(resultado):
+                return _almacen.guardar(resultado, referencia_entrada)
+            return resultado
+        if not isinstance(resultado, (list, tuple)):
+            return resultado
+        resultado = list(resultado)
+        for pos in posiciones_salida:
+            valor = resultado[pos] if pos < len(resultado) else None
+            if isinstance(valor, dict) and not es_referencia(valor):
+                resultado[pos] = _almacen.guardar(valor, referencia_entrada)
+        return resultado
+
+    return envuelta
+
+
+def envolver_registro(registrar):
+    """
+    Envuelve un registrador de callbacks (app.callback o dash.callback)
+
+    Los callbacks que no usan "estructura-actual" se registran sin cambios.
+    """
+    if not ESTRUCTURA_EN_SERVIDOR:
+        return registrar
+
+    @functools.wraps(registrar)
+    def callback(*args, **kwargs):
+        decorador = registrar(*args, **kwargs)
+        outputs, entradas, salida_unica = _dependencias(args, kwargs)
+        posiciones_entrada = [i for i, dep in enumerate(entradas) if _es_store(dep)]
+        posiciones_salida = [i for i, dep in enumerate(outputs) if _es_store(dep)]
+        if not posiciones_entrada and not posiciones_salida:
+            return decorador
+
+        def registrar_funcion(funcion):
+            return decorador(_envolver_funcion(funcion, posiciones_entrada, posiciones_salida, salida_unica))
+        return registrar_funcion
+
+    return callback
+
+
+def instalar(app):
+    """Hace que app.callback resuelva/guarde "estructura-actual" en el servidor"""
+    if ESTRUCTURA_EN_SERVIDOR:
+        app.callback = envolver_registro(app.callback)
+    return app
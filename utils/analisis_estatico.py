@@ -7,6 +7,7 @@ import numpy as np
 import openseespy.opensees as ops
 import logging
 from typing import Dict, List, Tuple, Optional
+from utils.perfil_calculo import contar, etapa, medido
 
 # Importar funciones de plotting
 from utils.analisis_estatico_plots import (
@@ -107,6 +108,7 @@ class AnalizadorEstatico:
         
         return []
     
+    @medido("aee.resolver")
     def resolver_sistema(self, hipotesis_nombre: str) -> Dict:
         """Resuelve sistema usando OpenSeesPy con subdivisión de elementos"""
         
@@ -361,21 +363,23 @@ class AnalizadorEstatico:
         ops.integrator('LoadControl', 1.0)
         ops.analysis('Static')
         
-        try:
-            resultado = ops.analyze(1)
-            if resultado != 0:
-                logger.info("🔄 Reintentando con Newton...")
-                ops.algorithm('Newton')
+        with etapa("aee.opensees", hipotesis=hipotesis_nombre):
+            try:
                 resultado = ops.analyze(1)
+                if resultado != 0:
+                    logger.info("🔄 Reintentando con Newton...")
+                    contar("aee.reintentos_newton")
+                    ops.algorithm('Newton')
+                    resultado = ops.analyze(1)
             
-            if resultado != 0:
-                logger.error("Análisis no convergió después de reintentos")
-                raise RuntimeError("Análisis no convergió después de reintentos")
+                if resultado != 0:
+                    logger.error("Análisis no convergió después de reintentos")
+                    raise RuntimeError("Análisis no convergió después de reintentos")
             
-            logger.info("✅ Análisis convergió")
-        except Exception as e:
-            logger.error(f"❌ Error en análisis: {e}", exc_info=True)
-            raise
+                logger.info("✅ Análisis convergió")
+            except Exception as e:
+                logger.error(f"❌ Error en análisis: {e}", exc_info=True)
+                raise
         
         # PASO 4: EXTRAER RESULTADOS Y TRANSFORMAR A EJES GLOBALES
         valores_subnodos = {}
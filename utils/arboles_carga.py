@@ -7,7 +7,12 @@ matplotlib.use('Agg')
 from pathlib import Path
 import hashlib
 import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from config.app_config import CACHE_DIR
+from utils.figuras_plotly import guardar_figura
 import plotly.graph_objects as go
 
 
@@ -126,7 +131,7 @@ def generar_arboles_carga(estructura_mecanica, estructura_actual, zoom=0.5, esca
                 fig.write_image(str(ruta_imagen), width=1200, height=900)
                 nombre_json = nombre_archivo.replace('.png', '.json')
                 ruta_json = CACHE_DIR / nombre_json
-                fig.write_json(str(ruta_json))
+                guardar_figura(fig, ruta_json)
                 
                 imagenes_generadas.append({
                     'hipotesis': 'Interactivo 3D',
@@ -151,6 +156,8 @@ def generar_arboles_carga(estructura_mecanica, estructura_actual, zoom=0.5, esca
             }
         
         # Generar imagen para cada hipótesis (solo 2D)
+        titulo_sanitizado = titulo.replace('\n', '_').replace('/', '_').replace('\\', '_').replace(':', '_').replace('*', '_').replace('?', '_').replace('"', '_').replace('<', '_').replace('>', '_').replace('|', '_')
+        trabajos = []
         for hipotesis_nombre in todas_hipotesis:
             # Filtrar hipótesis C2 si mostrar_sismo es False
             if not mostrar_sismo and '_C2_' in hipotesis_nombre:
@@ -179,75 +186,34 @@ def generar_arboles_carga(estructura_mecanica, estructura_actual, zoom=0.5, esca
             if hipotesis_nombre not in resultados_reacciones:
                 continue
             
-            datos_reacciones = resultados_reacciones[hipotesis_nombre]
-            
-            # Crear figura 2D o 3D según configuración
-            if usar_3d:
-                fig = generar_arbol_3d(nodes_key, cargas_hipotesis, datos_reacciones, 
-                                      hipotesis_nombre, estructura_actual, escala_flecha)
-            else:
-                fig, ax = plt.subplots(figsize=(12, 10))
-            
-            if not usar_3d:
-                # Dibujar estructura (todos los elementos en negro)
-                dibujar_estructura_2d(ax, nodes_key, grosor_linea)
-                
-                # Dibujar flechas de cargas
-                dibujar_flechas_2d(ax, cargas_hipotesis, nodes_key, rangos, escala_flecha, fontsize_flechas)
-                
-                # Panel de reacciones
-                dibujar_panel_reacciones_2d(ax, datos_reacciones, rangos)
-                
-                # Etiquetas de nodos si está activado
-                if mostrar_nodos:
-                    dibujar_etiquetas_nodos_2d(ax, nodos_con_cargas_lista, nodes_key, fontsize_nodos)
-                
-                # Configurar ejes
-                ax.set_xlim(rangos['x_min'], rangos['x_max'])
-                ax.set_ylim(rangos['z_min'], rangos['z_max'])
-                ax.set_aspect('equal')
-                ax.grid(True, alpha=0.3)
-                ax.set_xlabel('X (m)')
-                ax.set_ylabel('Z (m)')
-                
-                # Título mejorado: Hip. XX / Descripción / Tipo estructura
-                codigo_hip = hipotesis_nombre.split('_')[-2] if '_' in hipotesis_nombre else hipotesis_nombre
-                descripcion_hip = hipotesis_nombre.split('_')[-1] if '_' in hipotesis_nombre else ''
-                tipo_estructura = estructura_actual.get('TIPO_ESTRUCTURA', '')
-                
-                titulo_grafico = f"Hip. {codigo_hip}\n{descripcion_hip}\n{tipo_estructura}"
-                ax.set_title(titulo_grafico, fontsize=12, fontweight='bold')
-                
-                # Leyenda
-                from matplotlib.patches import Patch
-                legend_elements = [
-                    Patch(facecolor='red', label='Fuerza X Transversal'),
-                    Patch(facecolor='blue', label='Fuerza Z Vertical'),
-                    Patch(facecolor='green', label='Fuerza Y Longitudinal')
-                ]
-                ax.legend(handles=legend_elements, loc='upper right')
-            
             # Guardar imagen (sanitizar nombre de archivo)
-            titulo_sanitizado = titulo.replace('\n', '_').replace('/', '_').replace('\\', '_').replace(':', '_').replace('*', '_').replace('?', '_').replace('"', '_').replace('<', '_').replace('>', '_').replace('|', '_')
             nombre_archivo = f"{titulo_sanitizado}.arbolcarga.{hash_estructura}.{hipotesis_nombre.replace(' ', '_')}.png"
-            ruta_imagen = CACHE_DIR / nombre_archivo
-            
-            if usar_3d:
-                fig.write_image(str(ruta_imagen), width=1200, height=900)
-                # Guardar también JSON para interactividad
-                nombre_json = nombre_archivo.replace('.png', '.json')
-                ruta_json = CACHE_DIR / nombre_json
-                fig.write_json(str(ruta_json))
-            else:
-                fig.savefig(ruta_imagen, dpi=150, bbox_inches='tight', facecolor='white')
-                plt.close(fig)
-            
-            imagenes_generadas.append({
+            trabajos.append({
                 'hipotesis': hipotesis_nombre,
-                'ruta': ruta_imagen,
+                'cargas': cargas_hipotesis,
+                'nodos_con_cargas': nodos_con_cargas_lista,
+                'reacciones': dict(resultados_reacciones[hipotesis_nombre]),
+                'ruta': str(CACHE_DIR / nombre_archivo),
                 'nombre': nombre_archivo
             })
         
+        capa_estatica = {
+            'nodes_key': {nombre: tuple(coords) for nombre, coords in nodes_key.items()},
+            'rangos': rangos,
+            'grosor_linea': grosor_linea,
+            'escala_flecha': escala_flecha,
+            'fontsize_flechas': fontsize_flechas,
+            'fontsize_nodos': fontsize_nodos,
+            'mostrar_nodos': mostrar_nodos,
+            'tipo_estructura': estructura_actual.get('TIPO_ESTRUCTURA', '')
+        }
+        for trabajo in renderizar_arboles_2d(capa_estatica, trabajos):
+            imagenes_generadas.append({
+                'hipotesis': trabajo['hipotesis'],
+                'ruta': Path(trabajo['ruta']),
+                'nombre': trabajo['nombre']
+            })
+        
         if not imagenes_generadas:
             return {
                 'exito': False,
@@ -267,6 +233,133 @@ def generar_arboles_carga(estructura_mecanica, estructura_actual, zoom=0.5, esca
         }
 
 
+class RenderizadorArboles2D:
+    """Figura 2D reutilizable: la estructura, ejes y leyenda se dibujan una sola vez
+    
+    Por cada hipótesis solo se agregan flechas, etiquetas, panel de reacciones y título;
+    después de guardar la imagen esos artistas se eliminan y la figura queda lista para la siguiente.
+    """
+    
+    def __init__(self, nodes_key, rangos, grosor_linea, escala_flecha, fontsize_flechas,
+                 fontsize_nodos, mostrar_nodos, tipo_estructura):
+        self.nodes_key = nodes_key
+        self.rangos = rangos
+        self.escala_flecha = escala_flecha
+        self.fontsize_flechas = fontsize_flechas
+        self.fontsize_nodos = fontsize_nodos
+        self.mostrar_nodos = mostrar_nodos
+        self.tipo_estructura = tipo_estructura
+        
+        self.fig, self.ax = plt.subplots(figsize=(12, 10))
+        ax = self.ax
+        
+        # Dibujar estructura (todos los elementos en negro)
+        dibujar_estructura_2d(ax, nodes_key, grosor_linea)
+        
+        # Configurar ejes (fijar límites desactiva el autoescalado al agregar flechas)
+        ax.set_xlim(rangos['x_min'], rangos['x_max'])
+        ax.set_ylim(rangos['z_min'], rangos['z_max'])
+        ax.set_aspect('equal')
+        ax.grid(True, alpha=0.3)
+        ax.set_xlabel('X (m)')
+        ax.set_ylabel('Z (m)')
+        
+        # Leyenda
+        from matplotlib.patches import Patch
+        legend_elements = [
+            Patch(facecolor='red', label='Fuerza X Transversal'),
+            Patch(facecolor='blue', label='Fuerza Z Vertical'),
+            Patch(facecolor='green', label='Fuerza Y Longitudinal')
+        ]
+        ax.legend(handles=legend_elements, loc='upper right')
+        
+        self._artistas_estaticos = set(ax.get_children())
+    
+    def renderizar(self, trabajo):
+        """Dibuja una hipótesis, guarda el PNG en trabajo['ruta'] y limpia la capa dinámica"""
+        ax = self.ax
+        hipotesis_nombre = trabajo['hipotesis']
+        try:
+            # Dibujar flechas de cargas
+            dibujar_flechas_2d(ax, trabajo['cargas'], self.nodes_key, self.rangos, self.escala_flecha, self.fontsize_flechas)
+            
+            # Panel de reacciones
+            dibujar_panel_reacciones_2d(ax, trabajo['reacciones'], self.rangos)
+            
+            # Etiquetas de nodos si está activado
+            if self.mostrar_nodos:
+                dibujar_etiquetas_nodos_2d(ax, trabajo['nodos_con_cargas'], self.nodes_key, self.fontsize_nodos)
+            
+            # Título mejorado: Hip. XX / Descripción / Tipo estructura
+            codigo_hip = hipotesis_nombre.split('_')[-2] if '_' in hipotesis_nombre else hipotesis_nombre
+            descripcion_hip = hipotesis_nombre.split('_')[-1] if '_' in hipotesis_nombre else ''
+            titulo_grafico = f"Hip. {codigo_hip}\n{descripcion_hip}\n{self.tipo_estructura}"
+            ax.set_title(titulo_grafico, fontsize=12, fontweight='bold')
+            
+            self.fig.savefig(trabajo['ruta'], dpi=150, bbox_inches='tight', facecolor='white')
+        finally:
+            for artista in ax.get_children():
+                if artista not in self._artistas_estaticos:
+                    artista.remove()
+        return {'hipotesis': hipotesis_nombre, 'ruta': trabajo['ruta'], 'nombre': trabajo['nombre']}
+    
+    def cerrar(self):
+        plt.close(self.fig)
+
+
+# Renderizador propio de cada proceso del pool (se crea en el inicializador)
+_renderizador_proceso = None
+
+
+def _inicializar_proceso_arboles_2d(capa_estatica):
+    global _renderizador_proceso
+    matplotlib.use('Agg')
+    _renderizador_proceso = RenderizadorArboles2D(**capa_estatica)
+
+
+def _renderizar_en_proceso(trabajo):
+    return _renderizador_proceso.renderizar(trabajo)
+
+
+def renderizar_arboles_2d(capa_estatica, trabajos, procesos=None):
+    """
+    Renderiza los árboles 2D de varias hipótesis sobre la misma capa estática
+    
+    Args:
+        capa_estatica: kwargs de RenderizadorArboles2D
+        trabajos: lista de dicts con hipotesis, cargas, nodos_con_cargas, reacciones, ruta, nombre
+        procesos: cantidad de procesos (None = config.app_config.ARBOLES_2D_PROCESOS, 0 = automático)
+    
+    Returns:
+        list: dicts {hipotesis, ruta, nombre} de los trabajos renderizados, en el mismo orden
+    """
+    if not trabajos:
+        return []
+    if procesos is None:
+        from config.app_config import ARBOLES_2D_PROCESOS
+        procesos = ARBOLES_2D_PROCESOS
+    if procesos <= 0:
+        procesos = min(os.cpu_count() or 1, 4)
+    procesos = min(procesos, len(trabajos))
+    
+    if procesos > 1:
+        try:
+            # 'spawn': no heredar hilos del servidor Dash ni el estado de pyplot del proceso padre
+            contexto = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto,
+                                     initializer=_inicializar_proceso_arboles_2d,
+                                     initargs=(capa_estatica,)) as pool:
+                return list(pool.map(_renderizar_en_proceso, trabajos))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"⚠️ Renderizado 2D en paralelo no disponible ({e}), se continúa en secuencial")
+    
+    renderizador = RenderizadorArboles2D(**capa_estatica)
+    try:
+        return [renderizador.renderizar(trabajo) for trabajo in trabajos]
+    finally:
+        renderizador.cerrar()
+
+
 def calcular_rangos_ejes_2d(nodes_key, zoom_factor):
     """Calcula rangos de ejes para visualización 2D"""
     x_coords = [coord[0] for coord in nodes_key.values()]
@@ -628,8 +721,12 @@ def dibujar_etiquetas_nodos_2d(ax, nodos_con_cargas, nodes_key, fontsize=8):
                bbox=dict(boxstyle="round,pad=0.2", facecolor="yellow", alpha=0.7, edgecolor='black'))
 
 
-def generar_arbol_3d_interactivo(nodes_key, todas_cargas_hipotesis, resultados_reacciones, estructura_actual, estructura_geometria=None):
-    """Genera gráfico 3D interactivo con selector de hipótesis usando datos del dataframe"""
+def generar_arbol_3d_interactivo(nodes_key, todas_cargas_hipotesis, resultados_reacciones, estructura_actual, estructura_geometria=None,
+                                 consolidar_trazas=True):
+    """Genera gráfico 3D interactivo con selector de hipótesis usando datos del dataframe
+    
+    consolidar_trazas: agrupa las flechas en 3 trazas por (hipótesis, componente) en lugar de 3 por flecha
+    """
     fig = go.Figure()
     
     COLORES = {
@@ -719,7 +816,8 @@ def generar_arbol_3d_interactivo(nodes_key, todas_cargas_hipotesis, resultados_r
     lista_hipotesis = list(todas_cargas_hipotesis.keys())
     for idx, hipotesis_nombre in enumerate(lista_hipotesis):
         visible = (idx == 0)  # Solo la primera hipótesis visible inicialmente
-        dibujar_flechas_desde_dataframe(fig, todas_cargas_hipotesis[hipotesis_nombre], nodes_key, hipotesis_nombre, visible)
+        dibujar_flechas_desde_dataframe(fig, todas_cargas_hipotesis[hipotesis_nombre], nodes_key, hipotesis_nombre, visible,
+                                        consolidar_trazas=consolidar_trazas)
     
     # Crear botones para selector de hipótesis
     buttons = []
@@ -730,12 +828,13 @@ def generar_arbol_3d_interactivo(nodes_key, todas_cargas_hipotesis, resultados_r
     traces_flechas = []
     
     for i, trace in enumerate(fig.data):
-        if (hasattr(trace, 'name') and 
+        # Las líneas de flecha también son 'lines' sin leyenda: clasificarlas antes que los fijos
+        if hasattr(trace, 'name') and trace.name and trace.name.startswith('flecha_'):
+            traces_flechas.append(i)
+        elif (hasattr(trace, 'name') and 
             (trace.name in ['Conductores', 'Guardias', 'Estructura', 'Otros', 'Terreno'] or
              (hasattr(trace, 'showlegend') and trace.showlegend == False and hasattr(trace, 'mode') and trace.mode == 'lines'))):
             traces_fijos.append(i)
-        elif hasattr(trace, 'name') and trace.name and trace.name.startswith('flecha_'):
-            traces_flechas.append(i)
     
     for idx, hipotesis_nombre in enumerate(lista_hipotesis):
         visibility = [False] * len(fig.data)  # Inicializar todo como oculto
@@ -747,7 +846,7 @@ def generar_arbol_3d_interactivo(nodes_key, todas_cargas_hipotesis, resultados_r
         # Solo mostrar flechas de la hipótesis seleccionada
         for trace_idx in traces_flechas:
             trace = fig.data[trace_idx]
-            if hasattr(trace, 'name') and f'flecha_{hipotesis_nombre}_' in trace.name:
+            if hasattr(trace, 'name') and trace.name.startswith(f'flecha_{hipotesis_nombre}_'):
                 visibility[trace_idx] = True
         
         codigo_hip = hipotesis_nombre.split('_')[-2] if '_' in hipotesis_nombre else hipotesis_nombre
@@ -1119,17 +1218,28 @@ def dibujar_lineas_estructura_3d(fig, nodes_key, estructura_geometria=None):
                         ))
 
 
-def dibujar_flechas_desde_dataframe(fig, cargas_hipotesis, nodes_key, hipotesis_nombre, visible=True):
-    """Dibuja flechas usando exactamente los valores del dataframe con desplazamiento solo para posiciones exactamente iguales"""
-    colores = {'x': 'red', 'y': 'green', 'z': 'blue'}
-    nombres = {'x': 'Fx Transversal', 'y': 'Fy Longitudinal', 'z': 'Fz Vertical'}
+def _flechas_3d_desde_cargas(cargas_hipotesis, nodes_key):
+    """Geometría de las flechas 3D de una hipótesis (una por componente no nula de cada nodo)
+    
+    Las etiquetas con posición exactamente igual se desplazan en X de a 0.6 m. Las posiciones
+    ocupadas se indexan en una grilla de 0.01 m, así el desplazamiento es O(n) en total.
+    
+    Returns:
+        list[dict]: nodo, comp, fuerza, inicio/fin de la línea, vector del cono y posición de la etiqueta
+    """
     TAMANO_MAX_FLECHA_3D = 2.0
     TAMANO_MIN_PORCENTAJE = 0.25
+    PASO_DESPLAZAMIENTO = 0.6
     
     # Encontrar magnitud máxima
-    max_fuerza = max(abs(val) for carga in cargas_hipotesis.values() for val in carga if val != 0) or 1
-    posiciones_etiquetas = []
+    max_fuerza = max((abs(val) for carga in cargas_hipotesis.values() for val in carga if val != 0), default=0) or 1
+    ocupadas = set()
+    siguiente_desplazamiento = {}
+    
+    def _celda(x, y, z):
+        return (round(x * 100), round(y * 100), round(z * 100))
     
+    flechas = []
     for nombre_nodo, carga in cargas_hipotesis.items():
         if nombre_nodo not in nodes_key or not any(abs(val) > 0.01 for val in carga):
             continue
@@ -1142,7 +1252,6 @@ def dibujar_flechas_desde_dataframe(fig, cargas_hipotesis, nodes_key, hipotesis_
             if abs(fuerza) < 0.01:
                 continue
             
-            color = colores[comp]
             ratio = abs(fuerza) / max_fuerza
             magnitud = (TAMANO_MIN_PORCENTAJE + ratio * (1 - TAMANO_MIN_PORCENTAJE)) * TAMANO_MAX_FLECHA_3D
             direccion = 1 if fuerza > 0 else -1
@@ -1157,55 +1266,97 @@ def dibujar_flechas_desde_dataframe(fig, cargas_hipotesis, nodes_key, hipotesis_
                 x1, y1, z1 = x0, y0, z0 + direccion * magnitud
                 u, v, w = 0, 0, direccion * 0.2
             
-            # Línea de flecha
-            fig.add_trace(go.Scatter3d(
-                x=[x0, x1], y=[y0, y1], z=[z0, z1],
-                mode='lines',
-                line=dict(color=color, width=6),
-                showlegend=False,
-                visible=visible,
-                name=f'flecha_{hipotesis_nombre}_{comp}_{nombre_nodo}_line',
-                hovertemplate=f'<b>{nombre_nodo}</b><br>{nombres[comp]}: {abs(fuerza):.1f} daN<extra></extra>'
-            ))
-            
-            # Cono de flecha
-            fig.add_trace(go.Cone(
-                x=[x1], y=[y1], z=[z1],
-                u=[u], v=[v], w=[w],
-                colorscale=[[0, color], [1, color]],
-                showscale=False,
-                sizemode='absolute',
-                sizeref=0.15,
-                showlegend=False,
-                visible=visible,
-                name=f'flecha_{hipotesis_nombre}_{comp}_{nombre_nodo}_cone',
-                hoverinfo='skip'
-            ))
-            
             # Etiqueta de magnitud con desplazamiento solo para posiciones exactamente iguales
-            x_text = (x0 + x1) / 2
+            x_base = (x0 + x1) / 2
             y_text = (y0 + y1) / 2
             z_text = (z0 + z1) / 2
+            base = _celda(x_base, y_text, z_text)
+            desplazamiento = siguiente_desplazamiento.get(base, 0)
+            while _celda(x_base + desplazamiento, y_text, z_text) in ocupadas:
+                desplazamiento += PASO_DESPLAZAMIENTO
+            x_text = x_base + desplazamiento
+            ocupadas.add(_celda(x_text, y_text, z_text))
+            siguiente_desplazamiento[base] = desplazamiento + PASO_DESPLAZAMIENTO
             
-            # Desplazar solo si posición exactamente igual
-            desplazamiento = 0
-            while any(abs(x_text - pos[0]) < 0.01 and abs(y_text - pos[1]) < 0.01 and abs(z_text - pos[2]) < 0.01 
-                     for pos in posiciones_etiquetas):
-                desplazamiento += 0.6
-                x_text = (x0 + x1) / 2 + desplazamiento
-            
-            posiciones_etiquetas.append((x_text, y_text, z_text))
-            
-            fig.add_trace(go.Scatter3d(
-                x=[x_text], y=[y_text], z=[z_text],
-                mode='text',
-                text=[f'{abs(fuerza):.1f}'],
-                textfont=dict(size=10, color=color),
-                showlegend=False,
-                visible=visible,
-                name=f'flecha_{hipotesis_nombre}_{comp}_{nombre_nodo}_text',
-                hoverinfo='skip'
-            ))
+            flechas.append({
+                'nodo': nombre_nodo, 'comp': comp, 'fuerza': fuerza,
+                'inicio': (x0, y0, z0), 'fin': (x1, y1, z1), 'vector': (u, v, w),
+                'texto': (x_text, y_text, z_text)
+            })
+    return flechas
+
+
+def dibujar_flechas_desde_dataframe(fig, cargas_hipotesis, nodes_key, hipotesis_nombre, visible=True, consolidar_trazas=True):
+    """Dibuja flechas usando exactamente los valores del dataframe con desplazamiento solo para posiciones exactamente iguales
+    
+    Con consolidar_trazas=True se agregan tres trazas (línea, cono, texto) por componente de la
+    hipótesis, con segmentos separados por None. Con False, tres trazas por cada flecha.
+    """
+    colores = {'x': 'red', 'y': 'green', 'z': 'blue'}
+    nombres = {'x': 'Fx Transversal', 'y': 'Fy Longitudinal', 'z': 'Fz Vertical'}
+    flechas = _flechas_3d_desde_cargas(cargas_hipotesis, nodes_key)
+    
+    if not consolidar_trazas:
+        for flecha in flechas:
+            _agregar_trazas_flecha(fig, [flecha], colores[flecha['comp']], nombres[flecha['comp']],
+                                   f"flecha_{hipotesis_nombre}_{flecha['comp']}_{flecha['nodo']}", visible)
+        return
+    
+    for comp in ('x', 'y', 'z'):
+        flechas_comp = [f for f in flechas if f['comp'] == comp]
+        if flechas_comp:
+            _agregar_trazas_flecha(fig, flechas_comp, colores[comp], nombres[comp],
+                                   f"flecha_{hipotesis_nombre}_{comp}", visible)
+
+
+def _agregar_trazas_flecha(fig, flechas, color, nombre_comp, prefijo, visible):
+    """Agrega línea, cono y texto para un grupo de flechas del mismo color"""
+    xs, ys, zs, hover = [], [], [], []
+    for flecha in flechas:
+        (x0, y0, z0), (x1, y1, z1) = flecha['inicio'], flecha['fin']
+        texto_hover = f"<b>{flecha['nodo']}</b><br>{nombre_comp}: {abs(flecha['fuerza']):.1f} daN"
+        xs += [x0, x1, None]
+        ys += [y0, y1, None]
+        zs += [z0, z1, None]
+        hover += [texto_hover, texto_hover, None]
+    
+    # Línea de flecha
+    fig.add_trace(go.Scatter3d(
+        x=xs[:-1], y=ys[:-1], z=zs[:-1],
+        mode='lines',
+        line=dict(color=color, width=6),
+        text=hover[:-1],
+        showlegend=False,
+        visible=visible,
+        name=f'{prefijo}_line',
+        hovertemplate='%{text}<extra></extra>'
+    ))
+    
+    # Cono de flecha
+    fig.add_trace(go.Cone(
+        x=[f['fin'][0] for f in flechas], y=[f['fin'][1] for f in flechas], z=[f['fin'][2] for f in flechas],
+        u=[f['vector'][0] for f in flechas], v=[f['vector'][1] for f in flechas], w=[f['vector'][2] for f in flechas],
+        colorscale=[[0, color], [1, color]],
+        showscale=False,
+        sizemode='absolute',
+        sizeref=0.15,
+        showlegend=False,
+        visible=visible,
+        name=f'{prefijo}_cone',
+        hoverinfo='skip'
+    ))
+    
+    # Etiqueta de magnitud
+    fig.add_trace(go.Scatter3d(
+        x=[f['texto'][0] for f in flechas], y=[f['texto'][1] for f in flechas], z=[f['texto'][2] for f in flechas],
+        mode='text',
+        text=[f"{abs(f['fuerza']):.1f}" for f in flechas],
+        textfont=dict(size=10, color=color),
+        showlegend=False,
+        visible=visible,
+        name=f'{prefijo}_text',
+        hoverinfo='skip'
+    ))
 
 
 def dibujar_flechas_3d(fig, cargas_hipotesis, nodes_key, escala):
@@ -0,0 +1,162 @@
+"""
+Biblioteca de cables compartida por todo el proceso
+
+Mantiene en memoria los datos de cables.json (recargados solo si cambia la fecha de
+modificación del archivo) y prototipos inmutables de Cable_AEA con la sustitución de
+valores de acero para ACSS ya aplicada. Cada cálculo obtiene instancias propias con
+Cable_AEA.desde_prototipo, sin volver a leer el JSON ni a convertir propiedades.
+"""
+
+import copy
+import json
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+from DatosCables import datos_cables
+from config.app_config import CABLES_PATH
+
+
+PrototipoCable = namedtuple("PrototipoCable", ["id", "nombre", "tipocable", "propiedades", "mecanicas"])
+
+
+def preparar_propiedades_cable(propiedades_originales, tipo_cable, verbose=True):
+    """Prepara las propiedades del cable, usando valores de acero para ACSS"""
+    propiedades = dict(propiedades_originales)
+
+    if "ACSS" in tipo_cable:
+        if verbose:
+            print(f"🔧 Detectado cable ACSS: {tipo_cable}")
+
+        # Verificar que existan los valores de acero requeridos
+        valores_faltantes = []
+        if propiedades.get("seccion_acero_mm2") is None:
+            valores_faltantes.append("seccion_acero_mm2")
+        if propiedades.get("modulo_elasticidad_acero_dan_mm2") is None:
+            valores_faltantes.append("modulo_elasticidad_acero_dan_mm2")
+        if propiedades.get("coeficiente_dilatacion_acero_1_c") is None:
+            valores_faltantes.append("coeficiente_dilatacion_acero_1_c")
+
+        if valores_faltantes:
+            print(f"ERROR: Cable ACSS '{tipo_cable}' - Faltan valores de acero: {', '.join(valores_faltantes)}")
+        else:
+            if verbose:
+                # Mostrar valores antes del cambio
+                print(f"   Valores originales:")
+                print(f"     Sección: {propiedades['seccion_total_mm2']} mm²")
+                print(f"     Módulo E: {propiedades['modulo_elasticidad_dan_mm2']} daN/mm²")
+                print(f"     Coef. dil: {propiedades['coeficiente_dilatacion_1_c']} 1/°C")
+
+            # Reemplazar valores normales con valores de acero para ACSS
+            propiedades["seccion_total_mm2"] = propiedades["seccion_acero_mm2"]
+            propiedades["modulo_elasticidad_dan_mm2"] = propiedades["modulo_elasticidad_acero_dan_mm2"]
+            propiedades["coeficiente_dilatacion_1_c"] = propiedades["coeficiente_dilatacion_acero_1_c"]
+
+            if verbose:
+                # Mostrar valores después del cambio
+                print(f"   Valores de acero aplicados:")
+                print(f"     Sección: {propiedades['seccion_total_mm2']} mm² (acero)")
+                print(f"     Módulo E: {propiedades['modulo_elasticidad_dan_mm2']} daN/mm² (acero)")
+                print(f"     Coef. dil: {propiedades['coeficiente_dilatacion_1_c']} 1/°C (acero)")
+
+    return propiedades
+
+
+class BibliotecaCables:
+    """Cache de proceso para datos y prototipos de cables"""
+
+    CABLES_PATH = CABLES_PATH
+
+    _lock = threading.RLock()
+    _datos = None
+    _mtime = None
+    _prototipos = {}
+
+    @classmethod
+    def _mtime_actual(cls):
+        try:
+            return cls.CABLES_PATH.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    @classmethod
+    def _recargar_si_cambio(cls):
+        """Recarga cables.json si cambió su fecha de modificación (llamar con lock tomado)"""
+        mtime = cls._mtime_actual()
+        if cls._datos is not None and mtime == cls._mtime:
+            return
+
+        datos = datos_cables
+        if mtime is not None:
+            try:
+                with open(cls.CABLES_PATH, 'r', encoding='utf-8') as f:
+                    datos = json.load(f)
+            except Exception as e:
+                print(f"Error cargando cables.json, usando DatosCables.py: {e}")
+
+        cls._datos = MappingProxyType(datos)
+        cls._mtime = mtime
+        cls._prototipos = {}
+
+    @classmethod
+    def obtener_datos(cls):
+        """Datos de cables de solo lectura {cable_id: propiedades}"""
+        with cls._lock:
+            cls._recargar_si_cambio()
+            return cls._datos
+
+    @classmethod
+    def obtener_datos_copia(cls):
+        """Copia mutable de los datos de cables (para edición)"""
+        return copy.deepcopy(dict(cls.obtener_datos()))
+
+    @classmethod
+    def existe(cls, cable_id):
+        return cable_id in cls.obtener_datos()
+
+    @classmethod
+    def obtener_prototipo(cls, cable_id):
+        """
+        Prototipo inmutable del cable, construido una sola vez por versión de cables.json
+
+        Raises:
+            ValueError: si el cable no existe en la biblioteca
+        """
+        with cls._lock:
+            cls._recargar_si_cambio()
+            prototipo = cls._prototipos.get(cable_id)
+            if prototipo is not None:
+                return prototipo
+
+            if cable_id not in cls._datos:
+                raise ValueError(f"Cable '{cable_id}' no encontrado")
+
+            datos = cls._datos[cable_id]
+            tipocable = datos.get("tipo", "ACSR")
+            propiedades = preparar_propiedades_cable(datos, tipocable)
+            from CalculoCables import Cable_AEA
+            prototipo = PrototipoCable(
+                id=cable_id,
+                nombre=cable_id,
+                tipocable=tipocable,
+                propiedades=MappingProxyType(propiedades),
+                mecanicas=MappingProxyType(
+                    Cable_AEA.leer_propiedades_mecanicas(cable_id, propiedades, tipocable)
+                )
+            )
+            cls._prototipos[cable_id] = prototipo
+            return prototipo
+
+    @classmethod
+    def crear_cable(cls, cable_id, viento_base_params):
+        """Crea una instancia Cable_AEA independiente para un cálculo"""
+        from CalculoCables import Cable_AEA
+        return Cable_AEA.desde_prototipo(cls.obtener_prototipo(cable_id), viento_base_params)
+
+    @classmethod
+    def invalidar(cls):
+        """Fuerza la recarga en el próximo acceso (p. ej. tras guardar cables.json)"""
+        with cls._lock:
+            cls._datos = None
+            cls._mtime = None
+            cls._prototipos = {}
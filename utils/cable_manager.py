@@ -5,6 +5,7 @@ Gestor de datos de cables
 import json
 from pathlib import Path
 from typing import Dict, Any, List
+from utils.biblioteca_cables import BibliotecaCables
 
 class CableManager:
     def __init__(self, cables_path: Path):
@@ -13,6 +14,9 @@ class CableManager:
     
     def cargar_cables(self) -> Dict[str, Any]:
         """Cargar datos de cables desde archivo JSON"""
+        # El archivo principal se lee desde la biblioteca compartida (cache por mtime)
+        if Path(self.cables_path) == Path(BibliotecaCables.CABLES_PATH) and Path(self.cables_path).exists():
+            return BibliotecaCables.obtener_datos_copia()
         try:
             with open(self.cables_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
@@ -37,6 +41,7 @@ class CableManager:
         """Guardar datos de cables en archivo JSON"""
         with open(self.cables_path, 'w', encoding='utf-8') as f:
             json.dump(self.cables_data, f, indent=2, ensure_ascii=False)
+        BibliotecaCables.invalidar()
     
     def agregar_cable(self, cable_id: str, datos_cable: Dict[str, Any]):
         """Agregar un nuevo cable"""
@@ -0,0 +1,251 @@
+"""
+Formato binario compacto para resultados cacheados de estructuras
+
+Un único contenedor comprimido por estructura (`{nombre}.resultados.agpz`, formato ZIP)
+con una carpeta por etapa de cálculo (CMC, DGE, DME, ...):
+
+    CMC/meta.json          Campos chicos en JSON compacto (sin indentar)
+    CMC/blobs/0003.txt     Textos largos (memorias, consola, tablas HTML), lectura diferida
+    CMC/arrays/0001.npy    Listas numéricas y columnas de tablas como arrays numpy
+
+El cargador permite pedir solo algunos campos de primer nivel; los blobs y arrays
+de los campos no pedidos no se leen ni se descomprimen.
+"""
+
+import io
+import json
+import os
+import threading
+import zipfile
+
+from config.app_config import CACHE_DIR
+from utils.importacion_diferida import importar_diferido
+
+np = importar_diferido("numpy")
+
+
+EXTENSION_CONTENEDOR = ".resultados.agpz"
+
+# Umbrales para separar valores del meta.json
+LARGO_MIN_BLOB = 2048      # caracteres
+LARGO_MIN_ARRAY = 16       # elementos
+
+_REF = "__ref__"
+_TABLA = "__tabla__"
+
+
+class CacheBinario:
+    """Lectura/escritura de etapas en el contenedor binario por estructura"""
+
+    _lock = threading.RLock()
+
+    @staticmethod
+    def ruta_contenedor(nombre_estructura):
+        nombre_estructura = nombre_estructura.replace(' ', '_')
+        return CACHE_DIR / f"{nombre_estructura}{EXTENSION_CONTENEDOR}"
+
+    @staticmethod
+    def existe(nombre_estructura, tipo):
+        """Indica si la etapa `tipo` está guardada en el contenedor (solo lee el índice ZIP)"""
+        ruta = CacheBinario.ruta_contenedor(nombre_estructura)
+        if not ruta.exists():
+            return False
+        try:
+            with zipfile.ZipFile(ruta) as zf:
+                return f"{tipo}/meta.json" in zf.namelist()
+        except zipfile.BadZipFile:
+            return False
+
+    @staticmethod
+    def guardar(nombre_estructura, tipo, calculo_data):
+        """Guarda (o reemplaza) una etapa en el contenedor de la estructura"""
+        # Normalizar igual que el cache JSON (claves str, default=str) para que
+        # los datos leídos sean idénticos en ambos formatos
+        datos = json.loads(json.dumps(calculo_data, ensure_ascii=False, default=str))
+
+        entradas = {}
+        meta = _Codificador(tipo, entradas).codificar(datos)
+        entradas[f"{tipo}/meta.json"] = json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+        CacheBinario._reescribir(nombre_estructura, tipo, entradas)
+
+    @staticmethod
+    def eliminar(nombre_estructura, tipo=None):
+        """Elimina una etapa del contenedor (o el contenedor completo si tipo es None)"""
+        ruta = CacheBinario.ruta_contenedor(nombre_estructura)
+        if not ruta.exists():
+            return
+        if tipo is None:
+            ruta.unlink()
+            return
+        CacheBinario._reescribir(nombre_estructura, tipo, {})
+
+    @staticmethod
+    def _reescribir(nombre_estructura, tipo, entradas_nuevas):
+        ruta = CacheBinario.ruta_contenedor(nombre_estructura)
+        prefijo = f"{tipo}/"
+        with CacheBinario._lock:
+            # Temporal único por proceso e hilo: el lock solo protege dentro del proceso
+            tmp = ruta.with_name(f"{ruta.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            with zipfile.ZipFile(tmp, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=6) as destino:
+                # Copiar el resto de las etapas sin recomprimir
+                if ruta.exists():
+                    try:
+                        with zipfile.ZipFile(ruta) as origen:
+                            for info in origen.infolist():
+                                if not info.filename.startswith(prefijo):
+                                    destino.writestr(info, origen.read(info.filename))
+                    except zipfile.BadZipFile:
+                        print(f"⚠️ Contenedor dañado, se regenera: {ruta.name}")
+                for nombre, contenido in entradas_nuevas.items():
+                    destino.writestr(nombre, contenido)
+            os.replace(tmp, ruta)
+
+    @staticmethod
+    def listar_campos(nombre_estructura, tipo):
+        """Campos de primer nivel disponibles para una etapa"""
+        meta = CacheBinario._leer_meta(nombre_estructura, tipo)
+        return list(meta.keys()) if meta is not None else []
+
+    @staticmethod
+    def cargar(nombre_estructura, tipo, campos=None):
+        """
+        Carga una etapa del contenedor
+
+        Args:
+            nombre_estructura (str): Título de la estructura
+            tipo (str): Etapa ('CMC', 'DGE', 'DME', 'SPH', 'ARBOLES', 'FUND', 'COSTEO', 'AEE', 'TODO')
+            campos (list, optional): Campos de primer nivel a cargar. None = todos
+
+        Returns:
+            dict o None si la etapa no existe
+        """
+        ruta = CacheBinario.ruta_contenedor(nombre_estructura)
+        if not ruta.exists():
+            return None
+        try:
+            with zipfile.ZipFile(ruta) as zf:
+                try:
+                    meta = json.loads(zf.read(f"{tipo}/meta.json").decode('utf-8'))
+                except KeyError:
+                    return None
+                if campos is not None:
+                    meta = {k: meta[k] for k in campos if k in meta}
+                return _decodificar(meta, zf)
+        except zipfile.BadZipFile:
+            print(f"⚠️ Contenedor dañado: {ruta.name}")
+            return None
+
+    @staticmethod
+    def _leer_meta(nombre_estructura, tipo):
+        ruta = CacheBinario.ruta_contenedor(nombre_estructura)
+        if not ruta.exists():
+            return None
+        try:
+            with zipfile.ZipFile(ruta) as zf:
+                return json.loads(zf.read(f"{tipo}/meta.json").decode('utf-8'))
+        except (KeyError, zipfile.BadZipFile):
+            return None
+
+
+class _Codificador:
+    """Separa textos largos, listas numéricas y tablas del meta.json"""
+
+    def __init__(self, tipo, entradas):
+        self.tipo = tipo
+        self.entradas = entradas
+        self.contador = 0
+
+    def _nombre(self, carpeta, extension):
+        self.contador += 1
+        return f"{self.tipo}/{carpeta}/{self.contador:04d}.{extension}"
+
+    def codificar(self, valor):
+        if isinstance(valor, str):
+            if len(valor) >= LARGO_MIN_BLOB:
+                nombre = self._nombre("blobs", "txt")
+                self.entradas[nombre] = valor.encode('utf-8')
+                return {_REF: nombre}
+            return valor
+
+        if isinstance(valor, list):
+            array = _como_array(valor)
+            if array is not None:
+                return self._guardar_array(array)
+            return [self.codificar(v) for v in valor]
+
+        if isinstance(valor, dict):
+            tabla = self._codificar_tabla(valor)
+            if tabla is not None:
+                return tabla
+            return {k: self.codificar(v) for k, v in valor.items()}
+
+        return valor
+
+    def _guardar_array(self, array):
+        nombre = self._nombre("arrays", "npy")
+        buffer = io.BytesIO()
+        np.save(buffer, array, allow_pickle=False)
+        self.entradas[nombre] = buffer.getvalue()
+        return {_REF: nombre}
+
+    def _codificar_tabla(self, valor):
+        """Tablas {columna: {indice: valor}} (DataFrame.to_dict()) en formato columnar"""
+        if len(valor) < 2 or not all(isinstance(v, dict) and v for v in valor.values()):
+            return None
+        columnas = list(valor.values())
+        indice = list(columnas[0].keys())
+        if len(indice) < 2:
+            return None
+        for columna in columnas:
+            if list(columna.keys()) != indice:
+                return None
+            if any(isinstance(v, (dict, list)) for v in columna.values()):
+                return None
+        return {_TABLA: {
+            "indice": indice,
+            "columnas": {nombre: self.codificar(list(columna.values())) for nombre, columna in valor.items()}
+        }}
+
+
+def _como_array(valores):
+    """Convierte listas numéricas homogéneas (1D o 2D rectangulares) a ndarray, o None"""
+    if not valores:
+        return None
+    if all(isinstance(v, list) for v in valores):
+        ancho = len(valores[0])
+        if ancho == 0 or any(len(fila) != ancho for fila in valores):
+            return None
+        if len(valores) * ancho < LARGO_MIN_ARRAY:
+            return None
+        planos = [v for fila in valores for v in fila]
+    else:
+        if len(valores) < LARGO_MIN_ARRAY:
+            return None
+        planos = valores
+
+    tipo = type(planos[0])
+    if tipo not in (int, float) or any(type(v) is not tipo for v in planos):
+        return None
+    return np.array(valores, dtype=np.float64 if tipo is float else np.int64)
+
+
+def _decodificar(valor, zf):
+    if isinstance(valor, dict):
+        if _REF in valor and len(valor) == 1:
+            nombre = valor[_REF]
+            contenido = zf.read(nombre)
+            if nombre.endswith(".npy"):
+                return np.load(io.BytesIO(contenido), allow_pickle=False).tolist()
+            return contenido.decode('utf-8')
+        if _TABLA in valor and len(valor) == 1:
+            tabla = valor[_TABLA]
+            indice = tabla["indice"]
+            return {
+                nombre: dict(zip(indice, _decodificar(columna, zf)))
+                for nombre, columna in tabla["columnas"].items()
+            }
+        return {k: _decodificar(v, zf) for k, v in valor.items()}
+    if isinstance(valor, list):
+        return [_decodificar(v, zf) for v in valor]
+    return valor
@@ -9,9 +9,26 @@ from pathlib import Path
 from typing import Dict, List, Tuple
 import plotly.graph_objects as go
 from models.app_state import AppState
+from models.contexto_calculo import usar_contexto
 from config.app_config import DATA_DIR
 from utils.calculo_cache import CalculoCache
+from utils.perfil_calculo import medido, etapa
 
+# Campos de una estructura que no cambian ningún cálculo: las estructuras de la familia
+# que solo difieren en ellos se calculan una vez
+CAMPOS_SIN_CALCULO = ("TITULO", "cantidad", "fecha_creacion", "fecha_modificacion", "version")
+# Clave en calculos_activos -> tipo de cache
+TIPOS_CACHE = {
+    "cmc": "CMC", "dge": "DGE", "dme": "DME", "arboles": "ARBOLES", "sph": "SPH",
+    "fundacion": "FUND", "costeo": "COSTEO", "aee": "AEE",
+}
+
+
+def clave_calculo_estructura(datos_estructura: Dict) -> str:
+    """Hash de los datos de una estructura que intervienen en el cálculo"""
+    return CalculoCache.calcular_hash({k: v for k, v in datos_estructura.items() if k not in CAMPOS_SIN_CALCULO})
+
+@medido("familia", tipo="familia", titulo=lambda familia_data, *args, **kwargs: (familia_data or {}).get("nombre_familia"))
 def ejecutar_calculo_familia_completa(familia_data: Dict, generar_plots: bool = True, calculos_activos: List[str] = None) -> Dict:
     """
     Ejecuta cálculo completo para toda la familia
@@ -38,6 +55,11 @@ def ejecutar_calculo_familia_completa(familia_data: Dict, generar_plots: bool =
     estructuras = familia_data.get("estructuras", {})
     resultados_familia = {}
     costos_individuales = {}
+    # clave_calculo_estructura -> (titulo, datos, resultado) de la primera estructura calculada
+    calculadas = {}
+    # Cálculo de cables compartido: mismas entradas de CMC en distintas estructuras
+    from utils.memo_cmc import MemoCMC
+    memo_cmc = MemoCMC()
     
     # Procesar cada estructura
     for nombre_estr, datos_estr in estructuras.items():
@@ -89,8 +111,21 @@ def ejecutar_calculo_familia_completa(familia_data: Dict, generar_plots: bool =
         print(f"   📋 DEBUG FINAL - mc_servidumbre: {datos_estr.get('mc_servidumbre', 'NO EXISTE')}")
         print(f"   📋 DEBUG FINAL - plot_servidumbre: {datos_estr.get('plot_servidumbre', 'NO EXISTE')}")
         
-        # Ejecutar secuencia completa para esta estructura
-        resultado_estr = _ejecutar_secuencia_estructura(datos_estr, titulo, generar_plots, calculos_activos)
+        # Ejecutar secuencia completa para esta estructura, salvo que otra de la familia
+        # tenga los mismos datos de cálculo: en ese caso se replican sus resultados
+        clave = clave_calculo_estructura(datos_estr)
+        if clave in calculadas:
+            titulo_origen, datos_origen, resultado_origen = calculadas[clave]
+            print(f"   ♻️ Mismos datos de cálculo que {titulo_origen}: se reutilizan sus resultados")
+            with etapa(f"estructura {titulo} (replicada)"):
+                resultado_estr = _replicar_resultado_estructura(
+                    titulo_origen, datos_origen, resultado_origen, titulo, datos_estr, calculos_activos)
+        else:
+            # Contexto de cálculo propio del trabajo: no pisa los objetos de la sesión del usuario
+            with usar_contexto(f"familia-{nombre_familia}-{titulo}", descartar_al_salir=True) as contexto, etapa(f"estructura {titulo}"):
+                contexto.memo_cmc = memo_cmc
+                resultado_estr = _ejecutar_secuencia_estructura(datos_estr, titulo, generar_plots, calculos_activos)
+            calculadas[clave] = (titulo, datos_estr, resultado_estr)
         
         if resultado_estr["exito"]:
             costo_individual = resultado_estr.get("costo_total", 0)
@@ -111,6 +146,8 @@ def ejecutar_calculo_familia_completa(familia_data: Dict, generar_plots: bool =
                 "error": resultado_estr["mensaje"]
             }
     
+    print(f"🧮 CMC de familia {nombre_familia}: {memo_cmc.resumen()}")
+    
     # Generar costeo global de familia
     costeo_global = _generar_costeo_familia(resultados_familia)
     
@@ -121,6 +158,31 @@ def ejecutar_calculo_familia_completa(familia_data: Dict, generar_plots: bool =
         "graficos_familia": _generar_graficos_familia(resultados_familia)
     }
 
+def _replicar_resultado_estructura(titulo_origen: str, datos_origen: Dict, resultado_origen: Dict,
+                                   titulo: str, datos_estructura: Dict, calculos_activos: List[str]) -> Dict:
+    """
+    Resultado de una estructura con los mismos datos de cálculo que otra ya calculada
+
+    Copia el cache de las etapas activas al título de la estructura (con su propio hash,
+    para que las vistas lo encuentren vigente); si la original falló, informa el mismo error.
+    """
+    if not resultado_origen.get("exito"):
+        return dict(resultado_origen)
+    try:
+        tipos = [TIPOS_CACHE[c] for c in calculos_activos if c in TIPOS_CACHE]
+        copiados = CalculoCache.replicar_calculos(titulo_origen, titulo, datos_origen, datos_estructura, tipos)
+        resultados = {c: copiados.get(TIPOS_CACHE[c]) for c in resultado_origen.get("resultados", {})}
+        return {
+            "exito": True,
+            "resultados": resultados,
+            "costo_total": resultado_origen.get("costo_total", 0),
+            "replicado_de": titulo_origen,
+        }
+    except Exception as e:
+        import traceback
+        print(f"❌ Error replicando resultados de {titulo_origen} en {titulo}: {traceback.format_exc()}")
+        return {"exito": False, "mensaje": f"Error replicando resultados: {str(e)}"}
+
 def _cargar_familia(nombre_familia: str) -> Dict:
     """Cargar datos de familia desde archivo"""
     try:
@@ -133,8 +195,8 @@ def _cargar_familia(nombre_familia: str) -> Dict:
 
 def _ejecutar_secuencia_estructura(datos_estructura: Dict, titulo: str, generar_plots: bool = True, calculos_activos: List[str] = None) -> Dict:
     """
-    Ejecuta secuencia completa CMC>DGE>DME>Árboles>SPH>Fundación>Costeo>AEE
-    para una estructura individual creando archivos temporales completos
+    Ejecuta las etapas CMC>DGE>DME>Árboles>SPH>Fundación>Costeo>AEE (independientes en
+    paralelo) para una estructura individual creando archivos temporales completos
     """
     if calculos_activos is None:
         calculos_activos = ["cmc", "dge", "dme", "arboles", "sph", "fundacion", "costeo", "aee"]
@@ -174,95 +236,37 @@ def _ejecutar_secuencia_estructura(datos_estructura: Dict, titulo: str, generar_
         costo_total = 0
         
         try:
-            # 1. CMC
-            if "cmc" in calculos_activos:
-                from controllers.geometria_controller import ejecutar_calculo_cmc_automatico
-                resultado_cmc = ejecutar_calculo_cmc_automatico(datos_estructura, state, generar_plots)
-                if resultado_cmc.get('exito'):
-                    resultados["cmc"] = CalculoCache.cargar_calculo_cmc(titulo)
-                    print(f"✅ CMC completado para {titulo}")
-                else:
-                    return {"exito": False, "mensaje": f"Error CMC: {resultado_cmc.get('mensaje')}"}
+            # Etapas según el grafo de dependencias: las independientes corren en paralelo
+            # (Árboles ‖ SPH ‖ AEE después de DME) y un error solo omite a sus dependientes
+            from utils.planificador_etapas import ejecutar_etapas_estructura, NOMBRES
+            resultados_etapas = ejecutar_etapas_estructura(datos_estructura, state, calculos_activos, generar_plots)
             
-            # 2. DGE
-            if "dge" in calculos_activos:
-                from controllers.geometria_controller import ejecutar_calculo_dge
-                resultado_dge = ejecutar_calculo_dge(datos_estructura, state, generar_plots)
-                if resultado_dge.get('exito'):
-                    resultados["dge"] = CalculoCache.cargar_calculo_dge(titulo)
-                    print(f"✅ DGE completado para {titulo}")
-                else:
-                    return {"exito": False, "mensaje": f"Error DGE: {resultado_dge.get('mensaje')}"}
-            
-            # 3. DME
-            if "dme" in calculos_activos:
-                from controllers.ejecutar_calculos import ejecutar_calculo_dme
-                resultado_dme = ejecutar_calculo_dme(datos_estructura, state, generar_plots)
-                if resultado_dme.get('exito'):
-                    resultados["dme"] = CalculoCache.cargar_calculo_dme(titulo)
-                    print(f"✅ DME completado para {titulo}")
-                else:
-                    return {"exito": False, "mensaje": f"Error DME: {resultado_dme.get('mensaje')}"}
-            
-            # 4. Árboles
-            if "arboles" in calculos_activos:
-                from controllers.ejecutar_calculos import ejecutar_calculo_arboles
-                resultado_arboles = ejecutar_calculo_arboles(datos_estructura, state, generar_plots)
-                if resultado_arboles.get('exito'):
-                    resultados["arboles"] = CalculoCache.cargar_calculo_arboles(titulo)
-                    print(f"✅ Árboles completado para {titulo}")
-                else:
-                    return {"exito": False, "mensaje": f"Error Árboles: {resultado_arboles.get('mensaje')}"}
-            
-            # 5. SPH
-            if "sph" in calculos_activos:
-                from controllers.ejecutar_calculos import ejecutar_calculo_sph
-                resultado_sph = ejecutar_calculo_sph(datos_estructura, state)
-                if resultado_sph.get('exito'):
-                    resultados["sph"] = CalculoCache.cargar_calculo_sph(titulo)
-                    print(f"✅ SPH completado para {titulo}")
-                else:
-                    return {"exito": False, "mensaje": f"Error SPH: {resultado_sph.get('mensaje')}"}
-            
-            # 6. Fundación
-            if "fundacion" in calculos_activos:
-                from controllers.ejecutar_calculos import ejecutar_calculo_fundacion
-                resultado_fundacion = ejecutar_calculo_fundacion(datos_estructura, state, generar_plots)
-                if resultado_fundacion.get('exito'):
-                    resultados["fundacion"] = CalculoCache.cargar_calculo_fund(titulo)
-                    print(f"✅ Fundación completado para {titulo}")
-                else:
-                    return {"exito": False, "mensaje": f"Error Fundación: {resultado_fundacion.get('mensaje')}"}
-            
-            # 7. Costeo
-            if "costeo" in calculos_activos:
-                from controllers.ejecutar_calculos import ejecutar_calculo_costeo
-                resultado_costeo = ejecutar_calculo_costeo(datos_estructura, state)
-                
-                if resultado_costeo.get('exito'):
-                    calculo_costeo = CalculoCache.cargar_calculo_costeo(titulo)
-                    resultados["costeo"] = calculo_costeo
-                    
-                    # Extraer costo total desde resultado_costeo (tiene el valor correcto)
-                    if resultado_costeo.get('resultados') and 'resumen_costos' in resultado_costeo['resultados']:
-                        costo_total = float(resultado_costeo['resultados']['resumen_costos'].get('costo_total', 0))
-                        print(f"   ✅ Costeo completado para {titulo}: {costo_total:.2f} UM")
-                    else:
-                        costo_total = 0
-                        print(f"   ⚠️ Costeo sin resumen_costos para {titulo}")
-                else:
-                    print(f"   ❌ Error Costeo para {titulo}: {resultado_costeo.get('mensaje')}")
-                    return {"exito": False, "mensaje": f"Error Costeo: {resultado_costeo.get('mensaje')}"}
+            cargar_cache = {
+                "cmc": CalculoCache.cargar_calculo_cmc,
+                "dge": CalculoCache.cargar_calculo_dge,
+                "dme": CalculoCache.cargar_calculo_dme,
+                "arboles": CalculoCache.cargar_calculo_arboles,
+                "sph": CalculoCache.cargar_calculo_sph,
+                "fundacion": CalculoCache.cargar_calculo_fund,
+                "costeo": CalculoCache.cargar_calculo_costeo,
+                "aee": CalculoCache.cargar_calculo_aee,
+            }
+            for clave, resultado_etapa in resultados_etapas.items():
+                if not resultado_etapa.get('exito'):
+                    print(f"   ❌ Error {NOMBRES[clave]} para {titulo}: {resultado_etapa.get('mensaje')}")
+                    return {"exito": False, "mensaje": f"Error {NOMBRES[clave]}: {resultado_etapa.get('mensaje')}"}
+                resultados[clave] = cargar_cache[clave](titulo)
+                print(f"✅ {NOMBRES[clave]} completado para {titulo}")
             
-            # 8. AEE
-            if "aee" in calculos_activos:
-                from controllers.ejecutar_calculos import ejecutar_calculo_aee
-                resultado_aee = ejecutar_calculo_aee(datos_estructura, state)
-                if resultado_aee.get('exito'):
-                    resultados["aee"] = CalculoCache.cargar_calculo_aee(titulo)
-                    print(f"✅ AEE completado para {titulo}")
+            # Extraer costo total desde resultado del costeo (tiene el valor correcto)
+            if "costeo" in resultados_etapas:
+                resultado_costeo = resultados_etapas["costeo"]
+                if resultado_costeo.get('resultados') and 'resumen_costos' in resultado_costeo['resultados']:
+                    costo_total = float(resultado_costeo['resultados']['resumen_costos'].get('costo_total', 0))
+                    print(f"   ✅ Costeo completado para {titulo}: {costo_total:.2f} UM")
                 else:
-                    return {"exito": False, "mensaje": f"Error AEE: {resultado_aee.get('mensaje')}"}
+                    costo_total = 0
+                    print(f"   ⚠️ Costeo sin resumen_costos para {titulo}")
             
             return {
                 "exito": True,
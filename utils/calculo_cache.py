@@ -2,9 +2,16 @@
 
 import json
 import hashlib
+import os
+import threading
 from pathlib import Path
 from datetime import datetime
+from config import app_config
 from config.app_config import CACHE_DIR, DATA_DIR
+from utils.cache_binario import CacheBinario
+from utils import indice_cache
+from utils.figuras_plotly import guardar_figura, exportar_png
+from utils.perfil_calculo import medido
 import glob
 import re
 
@@ -22,6 +29,85 @@ class CalculoCache:
         data_str = json.dumps(params_relevantes, sort_keys=True)
         return hashlib.md5(data_str.encode()).hexdigest()
     
+    @staticmethod
+    def _usar_formato_binario():
+        return app_config.CACHE_FORMATO == "binario"
+    
+    @staticmethod
+    @medido("cache.escritura")
+    def _escribir_calculo(nombre_estructura, tipo, calculo_data, default=None):
+        """Escribe el cache de una etapa en el formato configurado (CACHE_FORMATO)"""
+        archivo = CACHE_DIR / f"{nombre_estructura}.calculo{tipo}.json"
+        if CalculoCache._usar_formato_binario():
+            CacheBinario.guardar(nombre_estructura, tipo, calculo_data)
+            # Evitar que quede un JSON anterior desactualizado
+            if archivo.exists():
+                archivo.unlink()
+            indice_cache.registrar(nombre_estructura, tipo, calculo_data)
+            return CacheBinario.ruta_contenedor(nombre_estructura)
+        
+        # Escritura atómica: otra etapa en paralelo puede estar leyendo el mismo cache
+        temporal = archivo.with_name(f"{archivo.name}.{threading.get_ident()}.tmp")
+        temporal.write_text(json.dumps(calculo_data, indent=2, ensure_ascii=False, default=default), encoding="utf-8")
+        os.replace(temporal, archivo)
+        if CacheBinario.ruta_contenedor(nombre_estructura).exists():
+            CacheBinario.eliminar(nombre_estructura, tipo)
+        indice_cache.registrar(nombre_estructura, tipo, calculo_data)
+        return archivo
+    
+    @staticmethod
+    @medido("cache.lectura")
+    def _leer_calculo(nombre_estructura, tipo, campos=None):
+        """
+        Lee el cache de una etapa desde JSON o desde el contenedor binario
+        
+        Args:
+            campos (list, optional): Campos de primer nivel a devolver. En formato
+                binario solo se leen esos campos; en JSON se filtra tras parsear.
+        """
+        nombre_estructura = nombre_estructura.replace(' ', '_')
+        archivo = CACHE_DIR / f"{nombre_estructura}.calculo{tipo}.json"
+        if archivo.exists():
+            datos = json.loads(archivo.read_text(encoding="utf-8"))
+            if campos is not None:
+                datos = {k: datos[k] for k in campos if k in datos}
+            return datos
+        return CacheBinario.cargar(nombre_estructura, tipo, campos=campos)
+    
+    @staticmethod
+    def cargar_campos(nombre_estructura, tipo, campos):
+        """Carga solo algunos campos del cache de una etapa (p. ej. para una vista)"""
+        return CalculoCache._leer_calculo(nombre_estructura, tipo, campos=campos)
+    
+    @staticmethod
+    def metadatos_calculo(nombre_estructura, tipo):
+        """
+        Metadatos de una etapa sin leer el cálculo completo (ver utils/indice_cache.py)
+        
+        Returns:
+            dict con hash_parametros, fecha_calculo, formato, bytes y resumen, o None si la
+            etapa no está en cache
+        """
+        meta = indice_cache.leer(nombre_estructura, tipo)
+        if meta is not None:
+            return meta
+        # Cache anterior al índice o reemplazado por fuera: se lee una vez y se reconstruye
+        calculo = CalculoCache._leer_calculo(nombre_estructura, tipo)
+        if calculo is None:
+            return None
+        return indice_cache.registrar(nombre_estructura, tipo, calculo)
+    
+    @staticmethod
+    def existe_calculo(nombre_estructura, tipo):
+        """Indica si la etapa está en cache (consulta el índice)"""
+        return CalculoCache.metadatos_calculo(nombre_estructura, tipo) is not None
+    
+    @staticmethod
+    def calculo_vigente(nombre_estructura, tipo, estructura_actual):
+        """Como verificar_vigencia, pero con el hash del índice en lugar del cálculo completo"""
+        meta = CalculoCache.metadatos_calculo(nombre_estructura, tipo)
+        return CalculoCache.verificar_vigencia(meta, estructura_actual)
+    
     @staticmethod
     def guardar_calculo_cmc(nombre_estructura, estructura_data, resultados_conductor, resultados_guardia, df_cargas_totales, fig_combinado=None, fig_conductor=None, fig_guardia=None, fig_guardia2=None, resultados_guardia2=None, console_output=None, df_conductor_html=None, df_guardia1_html=None, df_guardia2_html=None, memoria_conductor=None, memoria_guardia1=None, memoria_guardia2=None):
         """Guarda resultados de Cálculo Mecánico de Cables"""
@@ -39,14 +125,14 @@ class CalculoCache:
                 # PNG para exportar
                 img_path = CACHE_DIR / f"CMC_{nombre}.{hash_params}.png"
                 try:
-                    fig.write_image(str(img_path), width=1200, height=600)
+                    exportar_png(fig, img_path, width=1200, height=600)
                 except Exception as e:
                     print(f"Advertencia: No se pudo guardar PNG {nombre}: {e}")
                 
                 # JSON para interactividad
                 json_path = CACHE_DIR / f"CMC_{nombre}.{hash_params}.json"
                 try:
-                    fig.write_json(str(json_path))
+                    guardar_figura(fig, json_path)
                     imagenes_guardadas.append(nombre)
                 except Exception as e:
                     print(f"Advertencia: No se pudo guardar JSON {nombre}: {e}")
@@ -83,19 +169,14 @@ class CalculoCache:
             "memoria_guardia2": memoria_guardia2
         }
         
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoCMC.json"
-        archivo.write_text(json.dumps(calculo_data, indent=2, ensure_ascii=False), encoding="utf-8")
+        archivo = CalculoCache._escribir_calculo(nombre_estructura, "CMC", calculo_data)
         return hash_params
     
     @staticmethod
     def cargar_calculo_cmc(nombre_estructura):
         """Carga resultados de Cálculo Mecánico de Cables"""
         nombre_estructura = nombre_estructura.replace(' ', '_')
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoCMC.json"
-        if not archivo.exists():
-            return None
-        
-        return json.loads(archivo.read_text(encoding="utf-8"))
+        return CalculoCache._leer_calculo(nombre_estructura, "CMC")
     
     @staticmethod
     def guardar_calculo_dge(nombre_estructura, estructura_data, dimensiones, nodes_key, fig_estructura, fig_cabezal, fig_nodos=None, memoria_calculo=None, conexiones=None, servidumbre_data=None, fig_servidumbre=None, plscadd_csv=None):
@@ -108,22 +189,18 @@ class CalculoCache:
             if fig_estructura:
                 # PNG para exportar
                 png_path = CACHE_DIR / f"Estructura.{hash_params}.png"
-                fig_estructura.write_image(str(png_path), width=1200, height=800)
+                exportar_png(fig_estructura, png_path, width=1200, height=800)
                 # JSON para interactividad
                 json_path = CACHE_DIR / f"Estructura.{hash_params}.json"
-                fig_dict = fig_estructura.to_dict()
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(fig_dict, f, ensure_ascii=False)
+                guardar_figura(fig_estructura, json_path)
             
             if fig_cabezal:
                 # PNG para exportar
                 png_path = CACHE_DIR / f"Cabezal.{hash_params}.png"
-                fig_cabezal.write_image(str(png_path), width=1200, height=800)
+                exportar_png(fig_cabezal, png_path, width=1200, height=800)
                 # JSON para interactividad
                 json_path = CACHE_DIR / f"Cabezal.{hash_params}.json"
-                fig_dict = fig_cabezal.to_dict()
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(fig_dict, f, ensure_ascii=False)
+                guardar_figura(fig_cabezal, json_path)
         except Exception as e:
             print(f"Advertencia: No se pudieron guardar imágenes Plotly DGE: {e}")
         
@@ -132,16 +209,14 @@ class CalculoCache:
             try:
                 # PNG para exportar
                 png_path = CACHE_DIR / f"Nodos.{hash_params}.png"
-                fig_nodos.write_image(str(png_path), width=1200, height=800)
+                exportar_png(fig_nodos, png_path, width=1200, height=800)
             except Exception as e:
                 print(f"Advertencia: No se pudo guardar PNG de nodos: {e}")
             
             try:
-                # JSON para interactividad - guardar manualmente con encoding UTF-8
+                # JSON para interactividad (arrays tipados, ver utils/figuras_plotly.py)
                 json_path = CACHE_DIR / f"Nodos.{hash_params}.json"
-                fig_dict = fig_nodos.to_dict()
-                with open(json_path, 'w', encoding='utf-8') as f:
-                    json.dump(fig_dict, f, ensure_ascii=False)
+                guardar_figura(fig_nodos, json_path)
                 print(f"✅ Gráfico 3D de nodos guardado: Nodos.{hash_params}.json")
             except Exception as e:
                 print(f"Advertencia: No se pudo guardar JSON de nodos: {e}")
@@ -150,10 +225,10 @@ class CalculoCache:
         if fig_servidumbre:
             try:
                 png_path = CACHE_DIR / f"Servidumbre.{hash_params}.png"
-                fig_servidumbre.write_image(str(png_path), width=1200, height=800)
+                exportar_png(fig_servidumbre, png_path, width=1200, height=800)
                 
                 json_path = CACHE_DIR / f"Servidumbre.{hash_params}.json"
-                fig_servidumbre.write_json(str(json_path))
+                guardar_figura(fig_servidumbre, json_path)
                 print(f"✅ Gráfico servidumbre guardado: PNG + JSON")
             except Exception as e:
                 print(f"Advertencia: No se pudo guardar gráfico servidumbre: {e}")
@@ -186,19 +261,14 @@ class CalculoCache:
             "plscadd_csv": plscadd_csv
         }
         
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoDGE.json"
-        archivo.write_text(json.dumps(calculo_data, indent=2, ensure_ascii=False), encoding="utf-8")
+        archivo = CalculoCache._escribir_calculo(nombre_estructura, "DGE", calculo_data)
         return hash_params
     
     @staticmethod
     def cargar_calculo_dge(nombre_estructura):
         """Carga resultados de Diseño Geométrico de Estructura"""
         nombre_estructura = nombre_estructura.replace(' ', '_')
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoDGE.json"
-        if not archivo.exists():
-            return None
-        
-        return json.loads(archivo.read_text(encoding="utf-8"))
+        return CalculoCache._leer_calculo(nombre_estructura, "DGE")
     
     @staticmethod
     def guardar_calculo_dme(nombre_estructura, estructura_data, df_reacciones, fig_polar, fig_barras):
@@ -254,19 +324,14 @@ class CalculoCache:
             "hipotesis_activa": estructura_data.get('HIPOTESIS_ACTIVA') if estructura_data else None
         }
         
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoDME.json"
-        archivo.write_text(json.dumps(calculo_data, indent=2, ensure_ascii=False), encoding="utf-8")
+        archivo = CalculoCache._escribir_calculo(nombre_estructura, "DME", calculo_data)
         return hash_params
     
     @staticmethod
     def cargar_calculo_dme(nombre_estructura):
         """Carga resultados de Diseño Mecánico de Estructura"""
         nombre_estructura = nombre_estructura.replace(' ', '_')
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoDME.json"
-        if not archivo.exists():
-            return None
-        
-        return json.loads(archivo.read_text(encoding="utf-8"))
+        return CalculoCache._leer_calculo(nombre_estructura, "DME")
     
     @staticmethod
     def guardar_calculo_sph(nombre_estructura, estructura_data, resultados, desarrollo_texto):
@@ -281,18 +346,14 @@ class CalculoCache:
             "desarrollo_texto": desarrollo_texto
         }
         
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoSPH.json"
-        archivo.write_text(json.dumps(calculo_data, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+        archivo = CalculoCache._escribir_calculo(nombre_estructura, "SPH", calculo_data, default=str)
         return hash_params
     
     @staticmethod
     def cargar_calculo_sph(nombre_estructura):
         """Carga resultados de Selección de Postes de Hormigón"""
         nombre_estructura = nombre_estructura.replace(' ', '_')
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoSPH.json"
-        if not archivo.exists():
-            return None
-        return json.loads(archivo.read_text(encoding="utf-8"))
+        return CalculoCache._leer_calculo(nombre_estructura, "SPH")
     
     @staticmethod
     def guardar_calculo_arboles(nombre_estructura, estructura_data, imagenes_generadas, df_cargas_completo=None, config_arboles=None):
@@ -324,8 +385,7 @@ class CalculoCache:
             "config_arboles": config_arboles
         }
         
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoARBOLES.json"
-        archivo.write_text(json.dumps(calculo_data, indent=2, ensure_ascii=False), encoding="utf-8")
+        archivo = CalculoCache._escribir_calculo(nombre_estructura, "ARBOLES", calculo_data)
         print(f"✅ Cache árboles guardado: {archivo.name}")
         return hash_params
     
@@ -333,10 +393,7 @@ class CalculoCache:
     def cargar_calculo_arboles(nombre_estructura):
         """Carga resultados de Árboles de Carga"""
         nombre_estructura = nombre_estructura.replace(' ', '_')
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoARBOLES.json"
-        if not archivo.exists():
-            return None
-        return json.loads(archivo.read_text(encoding="utf-8"))
+        return CalculoCache._leer_calculo(nombre_estructura, "ARBOLES")
     
     @staticmethod
     def verificar_vigencia(calculo_guardado, estructura_actual):
@@ -364,18 +421,14 @@ class CalculoCache:
             "resultados": resultados_completos
         }
         
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoTODO.json"
-        archivo.write_text(json.dumps(calculo_data, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+        archivo = CalculoCache._escribir_calculo(nombre_estructura, "TODO", calculo_data, default=str)
         return hash_params
     
     @staticmethod
     def cargar_calculo_todo(nombre_estructura):
         """Carga resultados de Calcular Todo"""
         nombre_estructura = nombre_estructura.replace(' ', '_')
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoTODO.json"
-        if not archivo.exists():
-            return None
-        return json.loads(archivo.read_text(encoding="utf-8"))
+        return CalculoCache._leer_calculo(nombre_estructura, "TODO")
     
     @staticmethod
     def guardar_calculo_comparar_cmc(nombre_comparativa, parametros_comparativa, resultados_cables):
@@ -414,11 +467,11 @@ class CalculoCache:
                             
                             # Guardar como JSON para interactividad
                             json_path = CACHE_DIR / f"CC_{cable_safe}_{grafico_safe}.{hash_params}.json"
-                            fig.write_json(str(json_path))
+                            guardar_figura(fig, json_path)
                             
                             # También PNG para exportar
                             png_path = CACHE_DIR / f"CC_{cable_safe}_{grafico_safe}.{hash_params}.png"
-                            fig.write_image(str(png_path), width=1200, height=600)
+                            exportar_png(fig, png_path, width=1200, height=600)
                             
                             if cable_nombre not in graficos_guardados:
                                 graficos_guardados[cable_nombre] = {}
@@ -437,14 +490,14 @@ class CalculoCache:
                 # Guardar gráfico de flechas
                 json_path_flechas = CACHE_DIR / f"CC_Flechas.{hash_params}.json"
                 png_path_flechas = CACHE_DIR / f"CC_Flechas.{hash_params}.png"
-                fig_flechas.write_json(str(json_path_flechas))
-                fig_flechas.write_image(str(png_path_flechas), width=1200, height=600)
+                guardar_figura(fig_flechas, json_path_flechas)
+                exportar_png(fig_flechas, png_path_flechas, width=1200, height=600)
                 
                 # Guardar gráfico de tiros
                 json_path_tiros = CACHE_DIR / f"CC_Tiros.{hash_params}.json"
                 png_path_tiros = CACHE_DIR / f"CC_Tiros.{hash_params}.png"
-                fig_tiros.write_json(str(json_path_tiros))
-                fig_tiros.write_image(str(png_path_tiros), width=1200, height=600)
+                guardar_figura(fig_tiros, json_path_tiros)
+                exportar_png(fig_tiros, png_path_tiros, width=1200, height=600)
                 
                 graficos_guardados["comparativo"] = {
                     "flechas": {
@@ -498,11 +551,11 @@ class CalculoCache:
             try:
                 # PNG para exportar
                 png_path = CACHE_DIR / f"FUND_3D.{hash_params}.png"
-                fig_3d.write_image(str(png_path), width=1200, height=800)
+                exportar_png(fig_3d, png_path, width=1200, height=800)
                 
                 # JSON para interactividad
                 json_path = CACHE_DIR / f"FUND_3D.{hash_params}.json"
-                fig_3d.write_json(str(json_path))
+                guardar_figura(fig_3d, json_path)
                 
                 print(f"✅ Gráfico 3D fundación guardado: PNG + JSON")
             except Exception as e:
@@ -516,18 +569,14 @@ class CalculoCache:
             "imagen_3d": f"FUND_3D.{hash_params}.json" if fig_3d else None
         }
         
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoFUND.json"
-        archivo.write_text(json.dumps(calculo_data, indent=2, ensure_ascii=False), encoding="utf-8")
+        archivo = CalculoCache._escribir_calculo(nombre_estructura, "FUND", calculo_data)
         return hash_params
     
     @staticmethod
     def cargar_calculo_fund(nombre_estructura):
         """Carga resultados de Cálculo de Fundaciones"""
         nombre_estructura = nombre_estructura.replace(' ', '_')
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoFUND.json"
-        if not archivo.exists():
-            return None
-        return json.loads(archivo.read_text(encoding="utf-8"))
+        return CalculoCache._leer_calculo(nombre_estructura, "FUND")
     
     @staticmethod
     def guardar_calculo_costeo(nombre_estructura, estructura_data, parametros_precios, resultados):
@@ -544,19 +593,43 @@ class CalculoCache:
             "resultados": resultados
         }
         
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoCOSTEO.json"
-        archivo.write_text(json.dumps(calculo_data, indent=2, ensure_ascii=False), encoding="utf-8")
+        archivo = CalculoCache._escribir_calculo(nombre_estructura, "COSTEO", calculo_data)
         return hash_params
     
     @staticmethod
     def cargar_calculo_costeo(nombre_estructura):
         """Carga resultados de Cálculo de Costeo"""
         nombre_estructura = nombre_estructura.replace(' ', '_')
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoCOSTEO.json"
-        if not archivo.exists():
-            return None
-        return json.loads(archivo.read_text(encoding="utf-8"))
-    
+        return CalculoCache._leer_calculo(nombre_estructura, "COSTEO")
+
+    @staticmethod
+    def replicar_calculos(origen, destino, estructura_origen, estructura_destino, tipos):
+        """
+        Copia el cache de las etapas `tipos` de una estructura a otra con los mismos datos
+        de cálculo (p. ej. misma estructura con otro TITULO o cantidad dentro de una familia)
+
+        El hash de parámetros se reescribe con el de la estructura destino para que el cache
+        copiado quede vigente. Las figuras no se duplican: siguen apuntando a los archivos
+        del origen.
+
+        Returns:
+            dict: {tipo: datos copiados}; las etapas sin cache en el origen no se incluyen
+        """
+        origen = origen.replace(' ', '_')
+        destino = destino.replace(' ', '_')
+        hash_origen = CalculoCache.calcular_hash(estructura_origen)
+        hash_destino = CalculoCache.calcular_hash(estructura_destino)
+        copiados = {}
+        for tipo in tipos:
+            datos = CalculoCache._leer_calculo(origen, tipo)
+            if datos is None:
+                continue
+            if datos.get("hash_parametros") == hash_origen:
+                datos["hash_parametros"] = hash_destino
+            CalculoCache._escribir_calculo(destino, tipo, datos, default=str)
+            copiados[tipo] = datos
+        return copiados
+
     @staticmethod
     def eliminar_cache_estructura(nombre_estructura):
         """Elimina todos los archivos de cache de una estructura"""
@@ -568,6 +641,12 @@ class CalculoCache:
             if archivo.exists():
                 archivo.unlink()
                 eliminados.append(tipo)
+            elif CacheBinario.existe(nombre_estructura, tipo):
+                eliminados.append(tipo)
+        
+        # Contenedor binario de la estructura (si existe) e índice de metadatos
+        CacheBinario.eliminar(nombre_estructura)
+        indice_cache.eliminar(nombre_estructura)
         
         # Eliminar imágenes asociadas
         patrones = [
@@ -730,12 +809,16 @@ class CalculoCache:
         return hash_params
     
     @staticmethod
-    def cargar_calculo_familia(nombre_familia):
+    def cargar_calculo_familia(nombre_familia, campos_por_tipo=None):
         """Carga cache de familia y reconstruye desde caches individuales.
 
         Búsqueda tolerant: acepta diferencias en mayúsculas/minúsculas y en
         espacios/underscores en el nombre de la familia para evitar que la UI
         haga fallar la carga por variaciones en el formato del nombre.
+
+        `campos_por_tipo` ({tipo: [campos] o None}) limita las etapas y campos
+        cargados por estructura; con el formato binario los campos no pedidos
+        no se leen de disco.
         """
         # Normalizar candidate (intentar reemplazar espacios por underscores)
         nombre_candidato = str(nombre_familia).replace(' ', '_')
@@ -778,14 +861,20 @@ class CalculoCache:
             # Cargar caches individuales referenciadas
             resultados = {}
             for tipo, archivo_ref in datos.get("cache_refs", {}).items():
-                archivo_cache = CACHE_DIR / archivo_ref
-                if archivo_cache.exists():
-                    try:
-                        resultados[tipo] = json.loads(archivo_cache.read_text(encoding="utf-8"))
-                    except Exception as e:
-                        print(f"⚠️ No se pudo leer {archivo_cache.name}: {e}")
-                        # continuar (no frenar la reconstrucción)
-                        continue
+                if campos_por_tipo is not None and tipo not in campos_por_tipo:
+                    continue
+                # Referencia "{titulo}.calculo{TIPO}.json": puede estar en JSON o en el contenedor binario
+                nombre_ref, _, sufijo = archivo_ref.rpartition('.calculo')
+                tipo_cache = sufijo[:-len('.json')] if sufijo.endswith('.json') else sufijo
+                campos = campos_por_tipo.get(tipo) if campos_por_tipo is not None else None
+                try:
+                    datos_cache = CalculoCache._leer_calculo(nombre_ref, tipo_cache, campos=campos)
+                except Exception as e:
+                    print(f"⚠️ No se pudo leer {archivo_ref}: {e}")
+                    # continuar (no frenar la reconstrucción)
+                    continue
+                if datos_cache is not None:
+                    resultados[tipo] = datos_cache
                 else:
                     # Informar que faltan caches individuales pero no cancelar
                     print(f"⚠️ Falta cache individual: {archivo_ref}")
@@ -934,8 +1023,7 @@ class CalculoCache:
         except Exception as e:
             print(f"⚠️ No se pudo reconstruir diagramas desde PNGs: {e}")
         
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoAEE.json"
-        archivo.write_text(json.dumps(calculo_data, indent=2, ensure_ascii=False), encoding="utf-8")
+        archivo = CalculoCache._escribir_calculo(nombre_estructura, "AEE", calculo_data)
         print(f"✅ Cache AEE guardado: {archivo.name}")
         return hash_params
     
@@ -943,7 +1031,4 @@ class CalculoCache:
     def cargar_calculo_aee(nombre_estructura):
         """Carga resultados de Análisis Estático de Esfuerzos (AEE)"""
         nombre_estructura = nombre_estructura.replace(' ', '_')
-        archivo = CACHE_DIR / f"{nombre_estructura}.calculoAEE.json"
-        if not archivo.exists():
-            return None
-        return json.loads(archivo.read_text(encoding="utf-8"))
+        return CalculoCache._leer_calculo(nombre_estructura, "AEE")
@@ -14,6 +14,7 @@ class CalculoCMCSoloConductor:
         self.calculo_objetos = calculo_objetos
         self.df_conductor = None
         self.resultados_conductor = None
+        self.memoria_conductor = None
         self.console_output = ""
     
     def calcular_solo_conductor(self, params, estados_climaticos, restricciones=None):
@@ -58,7 +59,7 @@ class CalculoCMCSoloConductor:
             parametros_viento = {"exposicion": exposicion, "clase": clase, "Zc": Zco, "Cf": Cf_cable, "L_vano": L_vano}
             
             # Calcular solo conductor
-            self.df_conductor, self.resultados_conductor, estado_limitante_cond = \
+            self.df_conductor, self.resultados_conductor, estado_limitante_cond, self.memoria_conductor = \
                 self.calculo_objetos.cable_conductor.calculo_mecanico(
                     vano=L_vano,
                     estados_climaticos=estados_climaticos,
@@ -6,22 +6,13 @@ from utils.calculo_cache import CalculoCache
 def verificar_cadena_completa_costeo(nombre_estructura, estructura_actual):
     """Verificar si existe cache válido de toda la cadena CMC→DGE→DME→SPH→Fundaciones"""
     
-    # Verificar cada componente
-    componentes = ['CMC', 'DGE', 'DME', 'SPH', 'FUND']
-    metodos_carga = [
-        CalculoCache.cargar_calculo_cmc,
-        CalculoCache.cargar_calculo_dge,
-        CalculoCache.cargar_calculo_dme,
-        CalculoCache.cargar_calculo_sph,
-        CalculoCache.cargar_calculo_fund
-    ]
-    
-    for componente, metodo_carga in zip(componentes, metodos_carga):
-        calculo = metodo_carga(nombre_estructura)
-        if not calculo:
+    # Verificar cada componente (índice de metadatos: no se leen los cálculos completos)
+    for componente in ['CMC', 'DGE', 'DME', 'SPH', 'FUND']:
+        meta = CalculoCache.metadatos_calculo(nombre_estructura, componente)
+        if not meta:
             print(f"❌ No hay cache {componente}")
             return None
-        vigente, _ = CalculoCache.verificar_vigencia(calculo, estructura_actual)
+        vigente, _ = CalculoCache.verificar_vigencia(meta, estructura_actual)
         if not vigente:
             print(f"❌ Cache {componente} no vigente")
             return None
@@ -65,21 +56,21 @@ def extraer_datos_para_costeo(nombre_estructura):
     """Extraer datos necesarios desde cache SPH, DGE y Fundaciones"""
     
     # Cargar datos desde SPH
-    calculo_sph = CalculoCache.cargar_calculo_sph(nombre_estructura)
+    calculo_sph = CalculoCache.cargar_campos(nombre_estructura, "SPH", ['resultados', 'desarrollo_texto'])
     if not calculo_sph:
         raise ValueError("No hay cache SPH disponible")
     
     resultados_sph = calculo_sph.get('resultados', {})
     
     # Cargar datos desde DGE para accesorios
-    calculo_dge = CalculoCache.cargar_calculo_dge(nombre_estructura)
+    calculo_dge = CalculoCache.cargar_campos(nombre_estructura, "DGE", ['resultados', 'conexiones', 'nodes_key', 'dimensiones'])
     if not calculo_dge:
         raise ValueError("No hay cache DGE disponible")
     
     resultados_dge = calculo_dge.get('resultados', {})
     
     # Cargar datos desde Fundaciones
-    calculo_fund = CalculoCache.cargar_calculo_fund(nombre_estructura)
+    calculo_fund = CalculoCache.cargar_campos(nombre_estructura, "FUND", ['resultados'])
     if not calculo_fund:
         raise ValueError("No hay cache Fundaciones disponible")
     
@@ -301,4 +292,42 @@ def calcular_costeo_completo(datos_estructura, parametros_precios, tension_kv=22
     }
     
     print(f"✅ Costeo calculado - Total: {costo_total:,.0f} UM")
-    return resultados
\ No newline at end of file
+    return resultados
+
+# Términos de la fórmula de calcular_costeo_completo: costo_total = cantidades · coeficientes
+TERMINOS_COSTEO = ("longitud_postes_m", "resistencia_postes_dan", "postes", "crucetas",
+                   "mensulas", "vinculos", "volumen_hormigon_m3", "estructura")
+
+
+def cantidades_costeo(datos_estructura):
+    """Cantidades de ingeniería de una estructura en el orden de TERMINOS_COSTEO"""
+    n_postes = datos_estructura['n_postes']
+    return [
+        n_postes * datos_estructura['longitud_total_m'],
+        n_postes * datos_estructura['resistencia_dan'],
+        n_postes,
+        datos_estructura['cantidad_crucetas'],
+        datos_estructura['cantidad_mensulas'],
+        datos_estructura['cantidad_vinculos'],
+        datos_estructura['volumen_hormigon_m3'],
+        1,
+    ]
+
+
+def coeficientes_costeo(parametros_precios):
+    """Precios en el orden de TERMINOS_COSTEO (mismos valores por defecto que calcular_costeo_completo)"""
+    postes = parametros_precios.get('postes', {})
+    accesorios = parametros_precios.get('accesorios', {})
+    fundaciones = parametros_precios.get('fundaciones', {})
+    montaje = parametros_precios.get('montaje', {})
+    return [
+        postes.get('coef_a', 267.9232),
+        postes.get('coef_b', 1.5149),
+        postes.get('coef_c', -2662.3376),
+        accesorios.get('crucetas', 580.0),
+        accesorios.get('mensulas', 320.0),
+        accesorios.get('vinculos', 320.0),
+        fundaciones.get('precio_m3_hormigon', 250.0) * fundaciones.get('factor_hierro', 1.2),
+        montaje.get('precio_por_estructura', 5000.0) * montaje.get('factor_terreno', 1.0)
+        + parametros_precios.get('adicional_estructura', 0),
+    ]
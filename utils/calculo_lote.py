@@ -0,0 +1,340 @@
+"""
+Cálculo por lotes sin navegador: estructuras y familias desde archivos
+
+Toma archivos .estructura.json / .familia.json (o directorios con ellos), ejecuta las
+etapas pedidas en un pool de procesos y deja los resultados en el cache (data/cache, donde
+los ve la aplicación) o en un directorio de salida. Devuelve un resumen JSON por archivo:
+costos, estados determinantes de CMC, tiempos por etapa y errores. Pensado para recálculos
+nocturnos y barridos de parámetros, sin sesión de navegador ni el timeout de gunicorn.
+
+Cada proceso trabaja sobre una copia propia de data/ (sin cache ni sesiones): los archivos
+temporales por TITULO y data/estructura_state.json del usuario no se pisan. Solo el cache
+(variable CACHE_DIR) y las líneas de tiempo (data/perfiles/) apuntan al destino real.
+
+Uso:
+    python calcular_lote.py data/PSJ_prueba.familia.json
+    python calcular_lote.py data/ --etapas cmc dge dme --procesos 4 --salida resultados_lote
+    python calcular_lote.py estructuras/*.estructura.json --sin-graficos --resumen resumen.json
+    python calcular_lote.py data/ --etapas fundacion --generar-abacos
+"""
+
+# Sin imports de config/ ni de los motores a nivel de módulo: los procesos hijos (spawn)
+# importan este módulo antes de que el inicializador fije el directorio de trabajo y CACHE_DIR.
+import argparse
+import atexit
+import contextlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+import multiprocessing
+
+RAIZ = Path(__file__).resolve().parents[1]
+ETAPAS = ["cmc", "dge", "dme", "arboles", "sph", "fundacion", "costeo", "aee"]
+EXTENSIONES = {".estructura.json": "estructura", ".familia.json": "familia"}
+# Archivos de data/ que no son estructuras a calcular
+EXCLUIDOS = {"plantilla.estructura.json"}
+ESTADOS_DETERMINANTES = ("estado_determinante_conductor", "estado_determinante_guardia1", "estado_determinante_guardia2")
+
+
+# ---------------------------------------------------------------------------------------
+# Entradas y resumen (sin dependencias, usado también por los tests)
+# ---------------------------------------------------------------------------------------
+
+def tipo_archivo(ruta):
+    """"estructura", "familia" o None según la extensión"""
+    nombre = Path(ruta).name
+    for extension, tipo in EXTENSIONES.items():
+        if nombre.endswith(extension):
+            return tipo
+    return None
+
+
+def descubrir_entradas(rutas):
+    """
+    [(tipo, Path)] a calcular a partir de archivos y directorios
+
+    Los directorios se recorren sin recursión. Un archivo con otra extensión es un error.
+    """
+    entradas, vistos = [], set()
+    for ruta in rutas:
+        ruta = Path(ruta)
+        if ruta.is_dir():
+            candidatos = sorted(p for p in ruta.iterdir()
+                                if p.is_file() and tipo_archivo(p) and p.name not in EXCLUIDOS)
+        elif ruta.is_file():
+            if not tipo_archivo(ruta):
+                raise ValueError(f"No es .estructura.json ni .familia.json: {ruta}")
+            candidatos = [ruta]
+        else:
+            raise ValueError(f"No existe: {ruta}")
+        for candidato in candidatos:
+            clave = candidato.resolve()
+            if clave not in vistos:
+                vistos.add(clave)
+                entradas.append((tipo_archivo(candidato), candidato))
+    return entradas
+
+
+def _numero(valor):
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def _segundos_etapas(totales, prefijo=""):
+    """{etapa: segundos} de los totales de una línea de tiempo ({nombre: {"segundos": s}})"""
+    return {e: round(totales[prefijo + e]["segundos"], 3) for e in ETAPAS if prefijo + e in totales}
+
+
+def resumir_estructura(titulo, resultado, cantidad=1, totales=None):
+    """Resumen de una estructura a partir del resultado de _ejecutar_secuencia_estructura"""
+    totales = totales or {}
+    resumen = {"titulo": titulo, "cantidad": cantidad, "exito": bool(resultado.get("exito"))}
+    if not resumen["exito"]:
+        resumen["error"] = resultado.get("mensaje") or resultado.get("error")
+        return resumen
+    resultados = resultado.get("resultados") or {}
+    costo = _numero(resultado.get("costo_total", resultado.get("costo_individual")))
+    if "costeo" in resultados or costo:
+        resumen["costo"] = costo
+    cmc = resultados.get("cmc") or {}
+    estados = {clave.replace("estado_determinante_", ""): cmc[clave]
+               for clave in ESTADOS_DETERMINANTES if cmc.get(clave)}
+    if estados:
+        resumen["estados_determinantes"] = estados
+    fin = f"estructura {titulo}"
+    if fin in totales:
+        resumen["duracion_s"] = round(totales[fin]["segundos"], 3)
+    return resumen
+
+
+def resumir_familia(nombre, resultado, totales=None):
+    """Resumen de una familia a partir del resultado de ejecutar_calculo_familia_completa"""
+    if not resultado.get("exito"):
+        return {"familia": nombre, "exito": False, "error": resultado.get("mensaje"), "estructuras": []}
+    estructuras = []
+    for datos in (resultado.get("resultados_estructuras") or {}).values():
+        if "error" in datos:
+            estructuras.append({"titulo": datos.get("titulo"), "cantidad": datos.get("cantidad", 1),
+                                "exito": False, "error": datos["error"]})
+        else:
+            estructuras.append(resumir_estructura(datos.get("titulo"), {"exito": True, **datos},
+                                                  datos.get("cantidad", 1), totales))
+    costeo = resultado.get("costeo_global") or {}
+    return {
+        "familia": nombre,
+        "exito": all(e["exito"] for e in estructuras),
+        "costo_global": _numero(costeo.get("costo_global")),
+        "estructuras": estructuras,
+    }
+
+
+def _slug(texto):
+    return re.sub(r"[^\w.-]+", "_", str(texto)).strip("_")[:80] or "lote"
+
+
+# ---------------------------------------------------------------------------------------
+# Proceso hijo
+# ---------------------------------------------------------------------------------------
+
+_espacio = None
+
+
+def _limpiar_espacio():
+    if _espacio is not None:
+        os.chdir(RAIZ)
+        shutil.rmtree(_espacio, ignore_errors=True)
+
+
+def _iniciar_worker(dir_perfiles):
+    """Copia privada de data/ como directorio de trabajo del proceso"""
+    global _espacio
+    _espacio = Path(tempfile.mkdtemp(prefix="agp_lote_"))
+    shutil.copytree(RAIZ / "data", _espacio / "data",
+                    ignore=shutil.ignore_patterns("cache", "sesiones", "perfiles", "ARCHIVO"))
+    os.chdir(_espacio)
+    if str(RAIZ) not in sys.path:
+        sys.path.insert(0, str(RAIZ))
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    atexit.register(_limpiar_espacio)
+
+    import utils.perfil_calculo as perfil_calculo
+    perfil_calculo.DIR_PERFILES = Path(dir_perfiles)
+
+
+def _calcular(tipo, ruta, opciones):
+    from models.contexto_calculo import usar_contexto
+    from utils.perfil_calculo import trabajo
+
+    datos = json.loads(Path(ruta).read_text(encoding="utf-8"))
+    etapas = opciones["etapas"]
+    generar_plots = opciones["generar_plots"]
+
+    if tipo == "familia":
+        from utils.calcular_familia_logica_encadenada import ejecutar_calculo_familia_completa
+        nombre = datos.get("nombre_familia") or Path(ruta).name[:-len(".familia.json")]
+        with trabajo(f"lote familia {nombre}", tipo="lote", archivo=str(ruta)) as linea:
+            resultado = ejecutar_calculo_familia_completa(datos, generar_plots, etapas)
+        totales = linea.a_dict()["totales"] if linea is not None else {}
+        resumen = resumir_familia(nombre, resultado, totales)
+    else:
+        from utils.calcular_familia_logica_encadenada import _ejecutar_secuencia_estructura
+        titulo = datos.get("TITULO") or Path(ruta).name[:-len(".estructura.json")]
+        datos["TITULO"] = titulo
+        with trabajo(f"lote estructura {titulo}", tipo="lote", archivo=str(ruta)) as linea, \
+                usar_contexto(f"lote-{titulo}", descartar_al_salir=True):
+            resultado = _ejecutar_secuencia_estructura(datos, titulo, generar_plots, etapas)
+        totales = linea.a_dict()["totales"] if linea is not None else {}
+        resumen = resumir_estructura(titulo, resultado, datos.get("cantidad", 1), totales)
+        resumen = {"estructuras": [resumen], "exito": resumen["exito"]}
+
+    resumen["etapas_s"] = _segundos_etapas(totales)
+    return resumen
+
+
+def ejecutar_archivo(tipo, ruta, opciones):
+    """Calcula un archivo en el proceso actual y devuelve su resumen (nunca lanza)"""
+    inicio = time.perf_counter()
+    log = opciones.get("dir_logs")
+    destino = open(Path(log) / f"{_slug(Path(ruta).name)}.log", "w", encoding="utf-8") if log else open(os.devnull, "w")
+    try:
+        with destino, contextlib.redirect_stdout(destino):
+            resumen = _calcular(tipo, ruta, opciones)
+    except Exception as e:
+        resumen = {"exito": False, "error": f"{type(e).__name__}: {e}", "traceback": traceback.format_exc()}
+    return {"archivo": str(ruta), "tipo": tipo, **resumen, "duracion_s": round(time.perf_counter() - inicio, 3)}
+
+
+# ---------------------------------------------------------------------------------------
+# Proceso principal
+# ---------------------------------------------------------------------------------------
+
+def ejecutar_lote(entradas, etapas=None, procesos=0, salida=None, generar_plots=True, progreso=None,
+                  generar_abacos=False):
+    """
+    Calcula las entradas [(tipo, ruta)] en un pool de procesos
+
+    Args:
+        etapas: subconjunto de ETAPAS (None = todas)
+        procesos: procesos en paralelo (0 = LOTE_PROCESOS o automático)
+        salida: directorio con cache/, perfiles/, logs/; None = data/cache y data/perfiles
+        progreso: función(resumen_archivo) llamada al terminar cada archivo
+        generar_abacos: la fundación usa ábacos y genera los que falten (utils/abaco_fundacion.py)
+    Returns:
+        dict con el resumen del lote
+    """
+    etapas = [e for e in ETAPAS if e in (etapas or ETAPAS)]
+    if salida is not None:
+        salida = Path(salida).resolve()
+        dir_cache, dir_perfiles, dir_logs = salida / "cache", salida / "perfiles", salida / "logs"
+        dir_logs.mkdir(parents=True, exist_ok=True)
+    else:
+        dir_cache, dir_perfiles, dir_logs = RAIZ / "data" / "cache", RAIZ / "data" / "perfiles", None
+    dir_cache.mkdir(parents=True, exist_ok=True)
+
+    if not procesos:
+        procesos = int(os.environ.get("LOTE_PROCESOS", 0)) or os.cpu_count() or 1
+    procesos = max(1, min(procesos, len(entradas) or 1))
+    opciones = {"etapas": etapas, "generar_plots": generar_plots, "dir_logs": str(dir_logs) if dir_logs else None}
+
+    inicio = time.perf_counter()
+    resultados = []
+    # Los hijos heredan CACHE_DIR (y las opciones del ábaco) del entorno al importarse config/app_config.py
+    entorno = {"CACHE_DIR": str(dir_cache)}
+    if generar_abacos:
+        entorno.update(FUNDACION_ABACO="true", FUNDACION_ABACO_GENERAR="true")
+    entorno_anterior = {clave: os.environ.get(clave) for clave in entorno}
+    os.environ.update(entorno)
+    try:
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_iniciar_worker, initargs=(str(dir_perfiles),)) as pool:
+            futuros = {pool.submit(ejecutar_archivo, tipo, str(ruta), opciones): (tipo, ruta) for tipo, ruta in entradas}
+            for futuro in as_completed(futuros):
+                tipo, ruta = futuros[futuro]
+                try:
+                    resumen = futuro.result()
+                except Exception as e:
+                    # Proceso hijo caído (memoria, señal): el resto del lote sigue
+                    resumen = {"archivo": str(ruta), "tipo": tipo, "exito": False, "error": f"{type(e).__name__}: {e}"}
+                resultados.append(resumen)
+                if progreso:
+                    progreso(resumen)
+    finally:
+        for clave, valor in entorno_anterior.items():
+            if valor is None:
+                os.environ.pop(clave, None)
+            else:
+                os.environ[clave] = valor
+
+    orden = {str(ruta): i for i, (_, ruta) in enumerate(entradas)}
+    resultados.sort(key=lambda r: orden.get(r["archivo"], len(orden)))
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "etapas": etapas,
+        "procesos": procesos,
+        "generar_plots": generar_plots,
+        "cache": str(dir_cache),
+        "duracion_s": round(time.perf_counter() - inicio, 3),
+        "exitosos": sum(1 for r in resultados if r.get("exito")),
+        "fallidos": sum(1 for r in resultados if not r.get("exito")),
+        "archivos": resultados,
+    }
+
+
+def _linea_progreso(resumen):
+    costo = resumen.get("costo_global")
+    if costo is None and len(resumen.get("estructuras", [])) == 1:
+        costo = resumen["estructuras"][0].get("costo")
+    detalle = f", costo {costo:.0f} UM" if costo is not None else ""
+    error = f" | {resumen['error']}" if resumen.get("error") else ""
+    fallidas = [e["titulo"] for e in resumen.get("estructuras", []) if not e.get("exito")]
+    if fallidas:
+        error += f" | fallaron: {', '.join(map(str, fallidas))}"
+    return f"{'✅' if resumen.get('exito') else '❌'} {Path(resumen['archivo']).name}: {resumen.get('duracion_s', 0):.1f} s{detalle}{error}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cálculo por lotes de estructuras y familias sin navegador")
+    parser.add_argument("rutas", nargs="+", help="Archivos .estructura.json / .familia.json o directorios")
+    parser.add_argument("--etapas", nargs="+", choices=ETAPAS, default=ETAPAS, help="Etapas a ejecutar (por defecto todas)")
+    parser.add_argument("--procesos", type=int, default=0, help="Procesos en paralelo (0 = automático)")
+    parser.add_argument("--salida", type=Path, help="Directorio de salida (cache/, perfiles/, logs/, resumen.json); "
+                                                    "sin él los resultados van a data/cache")
+    parser.add_argument("--resumen", type=Path, help="Archivo del resumen JSON (por defecto <salida>/resumen.json o stdout)")
+    parser.add_argument("--sin-graficos", action="store_true", help="No generar figuras (más rápido)")
+    parser.add_argument("--generar-abacos", action="store_true",
+                        help="Generar los ábacos de fundación que falten (la aplicación solo los carga)")
+    args = parser.parse_args(argv)
+
+    try:
+        entradas = descubrir_entradas(args.rutas)
+    except ValueError as e:
+        parser.error(str(e))
+    if not entradas:
+        parser.error("No se encontraron archivos .estructura.json ni .familia.json")
+
+    print(f"🚀 Lote: {len(entradas)} archivos, etapas {', '.join(args.etapas)}", file=sys.stderr)
+    resumen = ejecutar_lote(entradas, args.etapas, args.procesos, args.salida, not args.sin_graficos,
+                            progreso=lambda r: print(f"   {_linea_progreso(r)}", file=sys.stderr, flush=True),
+                            generar_abacos=args.generar_abacos)
+    print(f"🏁 Lote terminado en {resumen['duracion_s']:.1f} s: {resumen['exitosos']} exitosos, "
+          f"{resumen['fallidos']} fallidos", file=sys.stderr)
+
+    texto = json.dumps(resumen, indent=2, ensure_ascii=False, default=str)
+    destino = args.resumen or (args.salida / "resumen.json" if args.salida else None)
+    if destino:
+        destino.parent.mkdir(parents=True, exist_ok=True)
+        destino.write_text(texto, encoding="utf-8")
+        print(f"💾 Resumen: {destino}", file=sys.stderr)
+    else:
+        print(texto)
+    return 1 if resumen["fallidos"] else 0
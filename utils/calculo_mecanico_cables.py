@@ -19,8 +19,15 @@ class CalculoMecanicoCables:
         self.resultados_guardia2 = None
         self.df_cargas_totales = None
     
-    def calcular(self, params, estados_climaticos, restricciones=None):
-        """Realizar cálculo mecánico completo"""
+    def calcular(self, params, estados_climaticos, restricciones=None, memo=None):
+        """
+        Realizar cálculo mecánico completo
+        
+        Args:
+            memo: MemoCMC opcional (utils/memo_cmc.py) para reutilizar el cálculo de cables
+                ya resuelto con los mismos datos en otra estructura de la familia
+        """
+        resolver = memo.resolver if memo is not None else (lambda cable, **argumentos: cable.calculo_mecanico(**argumentos))
         
         if not self.calculo_objetos.cable_conductor or not self.calculo_objetos.cable_guardia:
             return {"exito": False, "mensaje": "Debe crear los objetos Cable primero"}
@@ -74,7 +81,8 @@ class CalculoMecanicoCables:
             
             # Calcular conductor
             self.df_conductor, self.resultados_conductor, estado_limitante_cond, self.memoria_conductor = \
-                self.calculo_objetos.cable_conductor.calculo_mecanico(
+                resolver(
+                    self.calculo_objetos.cable_conductor,
                     vano=L_vano,
                     estados_climaticos=estados_climaticos,
                     parametros_viento=parametros_viento,
@@ -114,7 +122,8 @@ class CalculoMecanicoCables:
             flecha_max_guardia = flecha_max_conductor * RELFLECHA_MAX_GUARDIA
             
             self.df_guardia1, self.resultados_guardia1, estado_limitante_guard1, self.memoria_guardia1 = \
-                self.calculo_objetos.cable_guardia.calculo_mecanico(
+                resolver(
+                    self.calculo_objetos.cable_guardia,
                     vano=L_vano,
                     estados_climaticos=estados_climaticos,
                     parametros_viento=parametros_viento_guardia,
@@ -139,7 +148,8 @@ class CalculoMecanicoCables:
             # Calcular guardia 2 si existe
             if self.calculo_objetos.cable_guardia2:
                 self.df_guardia2, self.resultados_guardia2, estado_limitante_guard2, self.memoria_guardia2 = \
-                    self.calculo_objetos.cable_guardia2.calculo_mecanico(
+                    resolver(
+                        self.calculo_objetos.cable_guardia2,
                         vano=L_vano,
                         estados_climaticos=estados_climaticos,
                         parametros_viento=parametros_viento_guardia,
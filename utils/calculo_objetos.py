@@ -2,10 +2,8 @@
 Módulo para creación de objetos Cable, Cadena y Estructura según AEA-95301
 """
 
-from CalculoCables import Cable_AEA, Elemento_AEA, LibCables
-from DatosCables import datos_cables
-import json
-from config.app_config import DATA_DIR
+from CalculoCables import Elemento_AEA, LibCables
+from utils.biblioteca_cables import BibliotecaCables, preparar_propiedades_cable
 
 
 class CalculoObjetosAEA:
@@ -22,58 +20,19 @@ class CalculoObjetosAEA:
         self.estructura_geometria = None
         self.estructura_mecanica = None
         self.estructura_graficos = None
-        self.DATOS_CABLES = self._cargar_datos_cables()
+    
+    @property
+    def DATOS_CABLES(self):
+        """Datos de cables (biblioteca compartida, recargada si cambia cables.json)"""
+        return BibliotecaCables.obtener_datos()
     
     def _cargar_datos_cables(self):
         """Cargar datos de cables desde cables.json"""
-        try:
-            cables_path = DATA_DIR / "cables.json"
-            if cables_path.exists():
-                with open(cables_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                return datos_cables
-        except Exception as e:
-            print(f"Error cargando cables.json, usando DatosCables.py: {e}")
-            return datos_cables
+        return BibliotecaCables.obtener_datos()
     
     def _preparar_propiedades_cable(self, propiedades_originales, tipo_cable):
         """Prepara las propiedades del cable, usando valores de acero para ACSS"""
-        propiedades = propiedades_originales.copy()
-        
-        if "ACSS" in tipo_cable:
-            print(f"🔧 Detectado cable ACSS: {tipo_cable}")
-            
-            # Verificar que existan los valores de acero requeridos
-            valores_faltantes = []
-            if propiedades.get("seccion_acero_mm2") is None:
-                valores_faltantes.append("seccion_acero_mm2")
-            if propiedades.get("modulo_elasticidad_acero_dan_mm2") is None:
-                valores_faltantes.append("modulo_elasticidad_acero_dan_mm2")
-            if propiedades.get("coeficiente_dilatacion_acero_1_c") is None:
-                valores_faltantes.append("coeficiente_dilatacion_acero_1_c")
-            
-            if valores_faltantes:
-                print(f"ERROR: Cable ACSS '{tipo_cable}' - Faltan valores de acero: {', '.join(valores_faltantes)}")
-            else:
-                # Mostrar valores antes del cambio
-                print(f"   Valores originales:")
-                print(f"     Sección: {propiedades['seccion_total_mm2']} mm²")
-                print(f"     Módulo E: {propiedades['modulo_elasticidad_dan_mm2']} daN/mm²")
-                print(f"     Coef. dil: {propiedades['coeficiente_dilatacion_1_c']} 1/°C")
-                
-                # Reemplazar valores normales con valores de acero para ACSS
-                propiedades["seccion_total_mm2"] = propiedades["seccion_acero_mm2"]
-                propiedades["modulo_elasticidad_dan_mm2"] = propiedades["modulo_elasticidad_acero_dan_mm2"]
-                propiedades["coeficiente_dilatacion_1_c"] = propiedades["coeficiente_dilatacion_acero_1_c"]
-                
-                # Mostrar valores después del cambio
-                print(f"   Valores de acero aplicados:")
-                print(f"     Sección: {propiedades['seccion_total_mm2']} mm² (acero)")
-                print(f"     Módulo E: {propiedades['modulo_elasticidad_dan_mm2']} daN/mm² (acero)")
-                print(f"     Coef. dil: {propiedades['coeficiente_dilatacion_1_c']} 1/°C (acero)")
-        
-        return propiedades
+        return preparar_propiedades_cable(propiedades_originales, tipo_cable)
     
     def crear_objetos_cable(self, estructura_config):
         """Crear objetos Cable según configuración de estructura"""
@@ -112,53 +71,18 @@ class CalculoObjetosAEA:
             
             self.lib_cables = LibCables()
             
-            # Preparar propiedades para conductor (usar valores de acero si es ACSS)
-            propiedades_conductor = self._preparar_propiedades_cable(
-                self.DATOS_CABLES[cable_conductor_id],
-                self.DATOS_CABLES[cable_conductor_id].get("tipo", "ACSR")
-            )
-            
-            self.cable_conductor = Cable_AEA(
-                id_cable=cable_conductor_id,
-                nombre=cable_conductor_id,
-                propiedades=propiedades_conductor,
-                tipocable=self.DATOS_CABLES[cable_conductor_id].get("tipo", "ACSR"),
-                viento_base_params=viento_base_params_conductor
-            )
+            # Instancia de cálculo desde el prototipo compartido (ACSS ya resuelto)
+            self.cable_conductor = BibliotecaCables.crear_cable(cable_conductor_id, viento_base_params_conductor)
             self.lib_cables.agregar_cable(self.cable_conductor)
             
-            # Preparar propiedades para guardia 1 (usar valores de acero si es ACSS)
-            propiedades_guardia1 = self._preparar_propiedades_cable(
-                self.DATOS_CABLES[cable_guardia_id],
-                self.DATOS_CABLES[cable_guardia_id].get("tipo", "ACSR")
-            )
-            
             # Cable guardia 1 (derecha, HG1)
-            self.cable_guardia1 = Cable_AEA(
-                id_cable=cable_guardia_id,
-                nombre=cable_guardia_id,
-                propiedades=propiedades_guardia1,
-                tipocable=self.DATOS_CABLES[cable_guardia_id].get("tipo", "ACSR"),
-                viento_base_params=viento_base_params_guardia
-            )
+            self.cable_guardia1 = BibliotecaCables.crear_cable(cable_guardia_id, viento_base_params_guardia)
             self.lib_cables.agregar_cable(self.cable_guardia1)
             self.cable_guardia = self.cable_guardia1  # Compatibilidad
             
             # Si hay 2 cables de guardia y se especifica el segundo
             if cant_hg == 2 and cable_guardia2_id:
-                # Preparar propiedades para guardia 2 (usar valores de acero si es ACSS)
-                propiedades_guardia2 = self._preparar_propiedades_cable(
-                    self.DATOS_CABLES[cable_guardia2_id],
-                    self.DATOS_CABLES[cable_guardia2_id].get("tipo", "ACSR")
-                )
-                
-                self.cable_guardia2 = Cable_AEA(
-                    id_cable=cable_guardia2_id,
-                    nombre=cable_guardia2_id,
-                    propiedades=propiedades_guardia2,
-                    tipocable=self.DATOS_CABLES[cable_guardia2_id].get("tipo", "ACSR"),
-                    viento_base_params=viento_base_params_guardia
-                )
+                self.cable_guardia2 = BibliotecaCables.crear_cable(cable_guardia2_id, viento_base_params_guardia)
                 self.lib_cables.agregar_cable(self.cable_guardia2)
                 
                 return {
@@ -245,19 +169,8 @@ class CalculoObjetosAEA:
             
             self.lib_cables = LibCables()
             
-            # Preparar propiedades para conductor (usar valores de acero si es ACSS)
-            propiedades_conductor = self._preparar_propiedades_cable(
-                self.DATOS_CABLES[cable_conductor_id],
-                self.DATOS_CABLES[cable_conductor_id].get("tipo", "ACSR")
-            )
-            
-            self.cable_conductor = Cable_AEA(
-                id_cable=cable_conductor_id,
-                nombre=cable_conductor_id,
-                propiedades=propiedades_conductor,
-                tipocable=self.DATOS_CABLES[cable_conductor_id].get("tipo", "ACSR"),
-                viento_base_params=viento_base_params_conductor
-            )
+            # Instancia de cálculo desde el prototipo compartido (ACSS ya resuelto)
+            self.cable_conductor = BibliotecaCables.crear_cable(cable_conductor_id, viento_base_params_conductor)
             self.lib_cables.agregar_cable(self.cable_conductor)
             
             return {
@@ -1,7 +1,8 @@
 """Captura global de output de consola"""
 import sys
+from contextlib import contextmanager
 from io import StringIO
-from threading import Lock
+from threading import Lock, local
 
 class ConsoleCapture:
     """Captura persistente de stdout/stderr desde inicio de app"""
@@ -62,3 +63,44 @@ _console_capture = ConsoleCapture()
 def get_console_capture():
     """Obtener instancia global de captura"""
     return _console_capture
+
+
+class _SalidaPorHilo:
+    """stdout que desvía a un buffer lo que imprimen los hilos que están capturando"""
+
+    def __init__(self, destino):
+        self.destino = destino
+
+    def write(self, text):
+        buffer = getattr(_captura_hilo, "buffer", None)
+        return (self.destino if buffer is None else buffer).write(text)
+
+    def flush(self):
+        self.destino.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.destino, name)
+
+
+_captura_hilo = local()
+_lock_instalacion = Lock()
+
+
+@contextmanager
+def capturar_salida():
+    """
+    Captura lo que imprime el hilo actual (los demás hilos siguen escribiendo en consola)
+
+    Reemplaza a `sys.stdout = buffer = io.StringIO()` en cálculos que pueden correr en
+    paralelo: cambiar sys.stdout mezcla la salida de todos los hilos y, al restaurarlo en
+    otro orden, deja la consola apuntando al buffer de otro cálculo.
+    """
+    with _lock_instalacion:
+        if not isinstance(sys.stdout, _SalidaPorHilo):
+            sys.stdout = _SalidaPorHilo(sys.stdout)
+    anterior = getattr(_captura_hilo, "buffer", None)
+    buffer = _captura_hilo.buffer = StringIO()
+    try:
+        yield buffer
+    finally:
+        _captura_hilo.buffer = anterior
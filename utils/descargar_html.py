@@ -3,7 +3,6 @@
 from datetime import datetime
 import pandas as pd
 import base64
-import json
 from io import StringIO
 from pathlib import Path
 import logging
@@ -641,15 +640,9 @@ def generar_seccion_tabla_comparativa(cache_data):
     
     if cables_calculados and dataframes:
         try:
-            # Cargar propiedades de cables desde cables.json
-            from config.app_config import DATA_DIR
-            cables_path = DATA_DIR / "cables.json"
-            
-            propiedades_cables = {}
-            if cables_path.exists():
-                with open(cables_path, 'r', encoding='utf-8') as f:
-                    cables_data = json.load(f)
-                    propiedades_cables = cables_data
+            # Propiedades de cables desde la biblioteca compartida
+            from utils.biblioteca_cables import BibliotecaCables
+            propiedades_cables = BibliotecaCables.obtener_datos()
             
             # Crear tabla HTML
             html.append('<table class="table table-striped table-bordered">')
@@ -949,13 +942,16 @@ def generar_seccion_aee(calculo_aee, estructura_actual):
         html.append('<h5>Reacciones en Base por Hipotesis</h5>')
         html.append(df_reacciones.to_html(classes='table table-striped table-bordered table-sm'))
     
-    # Diagramas (PNG)
+    # Diagramas (PNG, renderizados bajo demanda si no están en cache)
     diagramas = resultados.get('diagramas', {})
     if diagramas and hash_params:
+        from utils import aee_diagramas
+        resultados.setdefault('hash', hash_params)
+        parametros_aee = (estructura_actual or {}).get('AnalisisEstaticoEsfuerzos', {})
         html.append('<h5>Diagramas de Esfuerzos</h5>')
-        for nombre_diagrama in diagramas.keys():
-            img_filename = f"AEE_{nombre_diagrama}.{hash_params}.png"
-            img_str = ViewHelpers.cargar_imagen_base64(img_filename)
+        for nombre_diagrama in aee_diagramas.listar_diagramas(resultados):
+            img_filename = aee_diagramas.asegurar_png(resultados, nombre_diagrama, parametros_aee=parametros_aee)
+            img_str = ViewHelpers.cargar_imagen_base64(img_filename) if img_filename else None
             if img_str:
                 html.append(f'<h6>{nombre_diagrama.replace("_", " ")}</h6>')
                 html.append(f'<img src="data:image/png;base64,{img_str}" alt="{nombre_diagrama}">')
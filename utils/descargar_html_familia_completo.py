@@ -170,8 +170,11 @@ def generar_indice_familia(nombre_familia, resultados_familia, checklist_activo=
     html.append('</ul></div>')
     return '\n'.join(html)
 
-def generar_html_familia(nombre_familia, resultados_familia, checklist_activo=None):
-    """Genera HTML completo para familia de estructuras
+def iterar_html_familia(nombre_familia, resultados_familia, checklist_activo=None):
+    """Genera el HTML de la familia por partes (cabecera, secciones, pie)
+    
+    Cada estructura se renderiza recién cuando se consume su parte, de modo que
+    utils/html_streaming puede escribir el reporte a disco sin armarlo completo en memoria.
     
     Args:
         nombre_familia: Nombre de la familia
@@ -194,54 +197,85 @@ def generar_html_familia(nombre_familia, resultados_familia, checklist_activo=No
         logger.debug(f"Logo no encontrado o error cargando logo: {e}")
         logo_html = ''
 
-    indice = generar_indice_familia(nombre_familia, resultados_familia, checklist_activo)
-    secciones = [indice]
-    secciones.append(generar_seccion_resumen_familia(nombre_familia, resultados_familia))
+    yield _cabecera_html_familia(nombre_familia, logo_html, timestamp)
+    for i, seccion in enumerate(_iterar_secciones_familia(nombre_familia, resultados_familia, checklist_activo)):
+        # Mismo resultado que "\n".join(secciones)
+        yield seccion if i == 0 else "\n" + seccion
+    yield _PIE_HTML_FAMILIA
+
+
+def generar_html_familia(nombre_familia, resultados_familia, checklist_activo=None):
+    """Genera HTML completo para familia de estructuras
+    
+    Args:
+        nombre_familia: Nombre de la familia
+        resultados_familia: Resultados de cálculos
+        checklist_activo: Dict con secciones activas {"cmc": True, "dge": True, ...}
+    """
+    return "".join(iterar_html_familia(nombre_familia, resultados_familia, checklist_activo))
+
+
+def exportar_html_familia(nombre_familia, resultados_familia, checklist_activo=None, ruta_destino=None,
+                          modo_imagenes="embebido"):
+    """Escribe el HTML de la familia en disco en streaming y retorna la ruta (temporal si no se indica)
+    
+    modo_imagenes: "embebido", "compartido" (cada imagen distinta una sola vez) o "assets" (zip)
+    """
+    from utils import html_streaming
+    return html_streaming.exportar_secciones(
+        lambda: iterar_html_familia(nombre_familia, resultados_familia, checklist_activo),
+        ruta_destino=ruta_destino,
+        modo_imagenes=modo_imagenes
+    )
+
+
+def _iterar_secciones_familia(nombre_familia, resultados_familia, checklist_activo):
+    """Secciones del cuerpo del reporte (índice, resumen, estructuras, costeo)"""
+    yield generar_indice_familia(nombre_familia, resultados_familia, checklist_activo)
+    yield generar_seccion_resumen_familia(nombre_familia, resultados_familia)
     
     estructuras = resultados_familia.get("resultados_estructuras", {})
     familia_safe = nombre_familia.replace(' ', '_').replace('/', '_')
     if estructuras:
-        secciones.append(f'<div class="accordion" id="accordion_{familia_safe}">')
-
-    # Construir el contenido final e insertar logo si existe (logo_html)
-    contenido_html = "\n".join(secciones)
+        yield f'<div class="accordion" id="accordion_{familia_safe}">'
 
     for nombre_estr, datos_estr in estructuras.items():
         titulo = datos_estr.get("titulo", nombre_estr)
         titulo_id = titulo.replace(" ", "_").replace("/", "_")
         # Accordion item por estructura
-        secciones.append(f'''<div class="accordion-item">
+        yield f'''<div class="accordion-item">
   <h2 class="accordion-header" id="heading_{titulo_id}">
     <button class="accordion-button" type="button" data-bs-toggle="collapse" data-bs-target="#collapse_{titulo_id}" aria-expanded="true" aria-controls="collapse_{titulo_id}">
       Estructura: {titulo}
     </button>
   </h2>
   <div id="collapse_{titulo_id}" class="accordion-collapse collapse show" aria-labelledby="heading_{titulo_id}">
-    <div class="accordion-body">''')
+    <div class="accordion-body">'''
 
         if "error" in datos_estr:
-            secciones.append(f'<div class="alert alert-danger">Error: {datos_estr["error"]}</div>')
+            yield f'<div class="alert alert-danger">Error: {datos_estr["error"]}</div>'
         else:
             try:
                 logger.debug(f"Generando secciones para estructura: {titulo} (id: {titulo_id})")
-                secciones.append(generar_seccion_estructura_familia(datos_estr, titulo_id, checklist_activo))
+                seccion = generar_seccion_estructura_familia(datos_estr, titulo_id, checklist_activo)
             except Exception as e:
                 import traceback
                 logger.exception(f"Error generando secciones para estructura {titulo}: {e}\n{traceback.format_exc()}")
-                secciones.append(f'<div class="alert alert-danger">Error generando secciones de {titulo}: {e}</div>')
+                seccion = f'<div class="alert alert-danger">Error generando secciones de {titulo}: {e}</div>'
+            yield seccion
 
-        secciones.append('</div></div></div>')
+        yield '</div></div></div>'
 
     if estructuras:
-        secciones.append('</div>')
+        yield '</div>'
     
     costeo_global = resultados_familia.get("costeo_global", {})
     if costeo_global and (checklist_activo is None or checklist_activo.get("costeo", True)):
-        secciones.append(generar_seccion_costeo_familia(costeo_global, estructuras))
+        yield generar_seccion_costeo_familia(costeo_global, estructuras)
         logger.debug(f"Se agregó sección Costeo Global para familia '{nombre_familia}' con {len(estructuras)} estructuras")
-    
-    contenido_html = "\n".join(secciones)
-    
+
+
+def _cabecera_html_familia(nombre_familia, logo_html, timestamp):
     return f"""<!DOCTYPE html>
 <html lang="es">
 <head>
@@ -303,7 +337,10 @@ def generar_html_familia(nombre_familia, resultados_familia, checklist_activo=No
         <h1>{logo_html} Familia de Estructuras - {nombre_familia}</h1>
         <p class="timestamp">Generado: {timestamp}</p>
         <hr>
-        {contenido_html}
+        """
+
+
+_PIE_HTML_FAMILIA = f"""
     </div>
     <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
     <script>
@@ -4,10 +4,13 @@ Ofrece:
 - listar_secciones_disponibles(nombre_familia, resultados_familia)
 - construir_html_personalizado(nombre_familia, resultados_familia, selected_keys) -> str (HTML)
 
-Política: siempre embebemos figuras como base64. No usamos rutas relativas externas.
+- exportar_html_personalizado(...) -> Path (HTML o zip escrito en streaming)
+
+Política: en el HTML las figuras van embebidas como base64 (sin rutas relativas externas);
+solo el modo "assets" de exportar_html_personalizado genera un zip con assets/ relativos.
 """
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator
 from datetime import datetime
 import logging
 import pandas as pd
@@ -138,6 +141,28 @@ def _collect_sections_for_structure(nombre_estr: str, datos_estr: Dict[str, Any]
     return secciones
 
 
+# Campos de cada etapa que listar_secciones_disponibles consulta (carga parcial del cache)
+CAMPOS_DETECCION_SECCIONES = {
+    'cmc': ['hash_parametros'],
+    'dge': ['hash_parametros', 'dimensiones', 'nodes_key', 'plscadd_csv', 'servidumbre', 'memoria_calculo'],
+    'dme': ['hash_parametros', 'resumen_ejecutivo', 'resumen', 'texto_resumen', 'resumen_html', 'df_reacciones_html'],
+    'arboles': ['hash_parametros', 'df_resumen_html', 'imagenes'],
+    'sph': ['hash_parametros'],
+    'fundacion': ['hash_parametros'],
+    'aee': ['hash_parametros'],
+}
+
+
+def campos_para_secciones(selected_keys: List[str]) -> Optional[Dict[str, Any]]:
+    """campos_por_tipo para CalculoCache.cargar_calculo_familia con las etapas de las secciones elegidas.
+
+    El resumen de familia recorre todas las etapas: en ese caso devuelve None (cargar todo).
+    """
+    if "familia:resumen" in selected_keys:
+        return None
+    return {clave.rpartition(':')[2].split('.')[0]: None for clave in selected_keys}
+
+
 def listar_secciones_disponibles(nombre_familia: str, resultados_familia: Dict[str, Any]) -> List[SectionDescriptor]:
     """Devuelve lista de SectionDescriptor representando secciones y subsecciones disponibles en la familia.
 
@@ -632,6 +657,19 @@ def _render_arboles_parcial(calculo_arboles: Dict[str, Any], include_subkeys: Li
 def construir_html_personalizado(nombre_familia: str, resultados_familia: Dict[str, Any], selected_keys: List[str]) -> str:
     """Construye el HTML para la familia incluyendo solo las secciones seleccionadas.
 
+    Args:
+        nombre_familia: nombre de la familia
+        resultados_familia: dict con resultados (como usa generar_html_familia)
+        selected_keys: lista de keys seleccionadas (por ejemplo: "Estr.1:cmc", "Estr.1:dge.dimensiones")
+    """
+    html_final = "".join(iterar_html_personalizado(nombre_familia, resultados_familia, selected_keys))
+    logger.debug(f"HTML personalizado generado para '{nombre_familia}' (longitud={len(html_final)})")
+    return html_final
+
+
+def iterar_html_personalizado(nombre_familia: str, resultados_familia: Dict[str, Any], selected_keys: List[str]) -> Iterator[str]:
+    """Genera el HTML personalizado por partes (cabecera, secciones, pie) para exportar en streaming.
+
     Args:
         nombre_familia: nombre de la familia
         resultados_familia: dict con resultados (como usa generar_html_familia)
@@ -639,7 +677,6 @@ def construir_html_personalizado(nombre_familia: str, resultados_familia: Dict[s
     """
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     logger.debug(f"Construir HTML personalizado para familia='{nombre_familia}' seleccionadas={selected_keys}")
-    total_included = []  # recoger secciones realmente incluidas durante la generación
 
     # Cabecera y estilos idénticos a generar_html_familia para mantener formato
     # Intentar cargar logo embebido (logo_distrocuyo.png)
@@ -696,7 +733,30 @@ def construir_html_personalizado(nombre_familia: str, resultados_familia: Dict[s
         <hr>
 """.format(nombre=nombre_familia, ts=timestamp, logo_html=logo_html)
 
-    secciones_html = []
+    yield head
+    for i, seccion in enumerate(_iterar_secciones_personalizado(nombre_familia, resultados_familia, selected_keys)):
+        yield seccion if i == 0 else "\n" + seccion
+    yield _PIE_HTML_PERSONALIZADO
+
+
+def exportar_html_personalizado(nombre_familia: str, resultados_familia: Dict[str, Any], selected_keys: List[str], ruta_destino=None,
+                                modo_imagenes: str = "embebido"):
+    """Escribe el HTML personalizado en disco en streaming y retorna la ruta (temporal si no se indica).
+
+    modo_imagenes: "embebido", "compartido" (cada imagen distinta una sola vez) o "assets" (zip)
+    """
+    from utils import html_streaming
+    return html_streaming.exportar_secciones(
+        lambda: iterar_html_personalizado(nombre_familia, resultados_familia, selected_keys),
+        ruta_destino=ruta_destino,
+        modo_imagenes=modo_imagenes
+    )
+
+
+def _iterar_secciones_personalizado(nombre_familia, resultados_familia, selected_keys):
+    """Secciones seleccionadas del cuerpo del reporte, en orden"""
+    total_included = []  # recoger secciones realmente incluidas durante la generación
+
 
     # Normalizar entrada: aceptar dict directo (con 'resultados_estructuras') o formato completo de cache con 'resultados' envolviendo
     normalized_resultados = resultados_familia
@@ -739,35 +799,37 @@ def construir_html_personalizado(nombre_familia: str, resultados_familia: Dict[s
     familia_safe = nombre_familia.replace(' ', '_').replace('/', '_')
 
     # Insertar índice siempre, basado en checklist_por_estructura
+    idx_html = None
     try:
         idx_html = generar_indice_familia(nombre_familia, normalized_resultados, checklist_activo=checklist_por_estructura)
-        secciones_html.append(idx_html)
         logger.debug("Índice insertado en HTML personalizado")
     except Exception as e:
         logger.exception(f"Error generando índice para familia '{nombre_familia}': {e}")
+    if idx_html is not None:
+        yield idx_html
 
     # Resumen (incluir solo si fue explícitamente seleccionado)
     # Usamos 'normalized_resultados' para soportar tanto el formato en memoria como el formato cache (envoltorio 'resultados')
     if "familia:resumen" in selected_keys:
-        secciones_html.append(generar_seccion_resumen_familia(nombre_familia, normalized_resultados))
+        yield generar_seccion_resumen_familia(nombre_familia, normalized_resultados)
         logger.debug("Incluir sección: familia:resumen")
         total_included.append("familia:resumen")
 
     if estructuras:
         logger.debug(f"Familia '{nombre_familia}' tiene {len(estructuras)} estructuras: {list(estructuras.keys())}")
-        secciones_html.append(f'<div class="accordion" id="accordion_{familia_safe}">')
+        yield f'<div class="accordion" id="accordion_{familia_safe}">'
 
     for nombre_estr, datos_estr in estructuras.items():
         titulo = datos_estr.get("titulo", nombre_estr)
         titulo_id = titulo.replace(" ", "_").replace("/", "_")
-        secciones_html.append(f'''<div class="accordion-item">
+        yield f'''<div class="accordion-item">
   <h2 class="accordion-header" id="heading_{titulo_id}">
     <button class="accordion-button" type="button" data-bs-toggle="collapse" data-bs-target="#collapse_{titulo_id}" aria-expanded="true" aria-controls="collapse_{titulo_id}">
       Estructura: {titulo}
     </button>
   </h2>
   <div id="collapse_{titulo_id}" class="accordion-collapse collapse show" aria-labelledby="heading_{titulo_id}">
-    <div class="accordion-body">''')
+    <div class="accordion-body">'''
 
         resultados = datos_estr.get("resultados", {})
 
@@ -777,7 +839,7 @@ def construir_html_personalizado(nombre_familia: str, resultados_familia: Dict[s
         # CMC
         if 'cmc' in selected_keys or any(k == f"{nombre_estr}:cmc" for k in selected_keys):
             if resultados.get('cmc'):
-                secciones_html.append(_render_cmc_parcial(resultados['cmc'], selected_keys))
+                yield _render_cmc_parcial(resultados['cmc'], selected_keys)
                 logger.debug(f"Estructura {nombre_estr}: incluir cmc")
                 total_included.append(f"{nombre_estr}:cmc")
 
@@ -808,13 +870,13 @@ def construir_html_personalizado(nombre_familia: str, resultados_familia: Dict[s
 
             if subkeys is None:
                 # incluir DGE completo
-                secciones_html.append(generar_seccion_dge(dge, id_prefix=titulo_id))
+                yield generar_seccion_dge(dge, id_prefix=titulo_id)
                 logger.debug(f"Estructura {nombre_estr}: incluir DGE completo")
                 total_included.append(f"{nombre_estr}:dge")
             else:
                 dge_subs = list(subkeys)
                 if dge_subs:
-                    secciones_html.append(_render_dge_parcial(dge, dge_subs, id_prefix=titulo_id))
+                    yield _render_dge_parcial(dge, dge_subs, id_prefix=titulo_id)
                     for s in dge_subs:
                         logger.debug(f"Estructura {nombre_estr}: incluir dge.{s}")
                         total_included.append(f"{nombre_estr}:dge.{s}")
@@ -834,12 +896,12 @@ def construir_html_personalizado(nombre_familia: str, resultados_familia: Dict[s
                     dme_subs.add(sub.split('.',1)[1])
         if dme_selected:
             if resultados.get('dme'):
-                secciones_html.append(generar_seccion_dme(resultados['dme'], id_prefix=titulo_id))
+                yield generar_seccion_dme(resultados['dme'], id_prefix=titulo_id)
                 logger.debug(f"Estructura {nombre_estr}: incluir dme")
                 total_included.append(f"{nombre_estr}:dme")
         else:
             if dme_subs and resultados.get('dme'):
-                secciones_html.append(_render_dme_parcial(resultados['dme'], list(dme_subs), id_prefix=titulo_id))
+                yield _render_dme_parcial(resultados['dme'], list(dme_subs), id_prefix=titulo_id)
                 for s in dme_subs:
                     logger.debug(f"Estructura {nombre_estr}: incluir dme.{s}")
                     total_included.append(f"{nombre_estr}:dme.{s}")
@@ -860,12 +922,12 @@ def construir_html_personalizado(nombre_familia: str, resultados_familia: Dict[s
 
         if arboles_selected:
             if resultados.get('arboles'):
-                secciones_html.append(generar_seccion_arboles(resultados['arboles']))
+                yield generar_seccion_arboles(resultados['arboles'])
                 logger.debug(f"Estructura {nombre_estr}: incluir arboles completo")
                 total_included.append(f"{nombre_estr}:arboles")
         else:
             if arboles_subs and resultados.get('arboles'):
-                secciones_html.append(_render_arboles_parcial(resultados['arboles'], list(arboles_subs), id_prefix=titulo_id))
+                yield _render_arboles_parcial(resultados['arboles'], list(arboles_subs), id_prefix=titulo_id)
                 for s in arboles_subs:
                     logger.debug(f"Estructura {nombre_estr}: incluir arboles.{s}")
                     total_included.append(f"{nombre_estr}:arboles.{s}")
@@ -873,27 +935,27 @@ def construir_html_personalizado(nombre_familia: str, resultados_familia: Dict[s
         # SPH
         if 'sph' in selected_keys or any(k == f"{nombre_estr}:sph" for k in selected_keys):
             if resultados.get('sph'):
-                secciones_html.append(generar_seccion_sph(resultados['sph']))
+                yield generar_seccion_sph(resultados['sph'])
                 logger.debug(f"Estructura {nombre_estr}: incluir sph")
                 total_included.append(f"{nombre_estr}:sph")
 
         # Fundacion
         if 'fundacion' in selected_keys or any(k == f"{nombre_estr}:fundacion" for k in selected_keys):
             if resultados.get('fundacion'):
-                secciones_html.append(generar_seccion_fund(resultados['fundacion']))
+                yield generar_seccion_fund(resultados['fundacion'])
                 logger.debug(f"Estructura {nombre_estr}: incluir fundacion")
                 total_included.append(f"{nombre_estr}:fundacion")
 
         # AEE
         if 'aee' in selected_keys or any(k == f"{nombre_estr}:aee" for k in selected_keys):
             if resultados.get('aee'):
-                secciones_html.append(generar_seccion_aee(resultados['aee'], datos_estr.get('estructura', {})))
+                yield generar_seccion_aee(resultados['aee'], datos_estr.get('estructura', {}))
                 logger.debug(f"Estructura {nombre_estr}: incluir aee")
                 total_included.append(f"{nombre_estr}:aee")
-        secciones_html.append('</div></div></div>')
+        yield '</div></div></div>'
 
     if estructuras:
-        secciones_html.append('</div>')
+        yield '</div>'
 
     # Registrar resumen de secciones incluidas
     logger.debug(f"Secciones incluidas totales: {total_included}")
@@ -902,11 +964,12 @@ def construir_html_personalizado(nombre_familia: str, resultados_familia: Dict[s
     if "familia:costeo" in selected_keys or any(k.startswith("familia:costeo") for k in selected_keys):
         if costeo_global:
             from utils.descargar_html_familia_completo import generar_seccion_costeo_familia
-            secciones_html.append(generar_seccion_costeo_familia(costeo_global, estructuras))
+            yield generar_seccion_costeo_familia(costeo_global, estructuras)
             logger.debug("Incluir sección: familia:costeo")
             total_included.append("familia:costeo")
 
-    footer = """
+
+_PIE_HTML_PERSONALIZADO = """
     </div>
     <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js"></script>
     <script>
@@ -1014,8 +1077,3 @@ def construir_html_personalizado(nombre_familia: str, resultados_familia: Dict[s
 </body>
 </html>
     """
-
-    contenido = "\n".join(secciones_html)
-    html_final = head + contenido + footer
-    logger.debug(f"HTML personalizado generado para '{nombre_familia}' (longitud={len(html_final)})")
-    return html_final
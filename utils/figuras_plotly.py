@@ -0,0 +1,236 @@
+"""
+Almacenamiento compacto de figuras Plotly en cache
+
+Las figuras se guardaban con `fig.write_json` / `json.dump(fig.to_dict())`, escribiendo
+cada coordenada como texto JSON. Aquí los arrays numéricos de las trazas se guardan en la
+forma de array tipado de Plotly (`{"dtype": "f8", "bdata": "<base64>"}`), que plotly.js
+decodifica directamente en el navegador, y el archivo puede ir además comprimido (gzip).
+
+El nombre de archivo (`*.json`) no cambia: el cargador detecta gzip por los bytes
+iniciales y lee también los JSON anteriores (listas planas). La figura cargada es un dict
+listo para `dcc.Graph(figure=...)`, sin pasar por `go.Figure` ni revalidar; las cargas
+repetidas del mismo archivo salen de un memo en memoria.
+"""
+
+import base64
+import gzip
+import json
+import math
+import threading
+from collections import OrderedDict
+from numbers import Integral, Real
+from pathlib import Path
+
+from config.app_config import CACHE_DIR, FIGURAS_COMPRIMIR
+from utils.importacion_diferida import importar_diferido
+from utils.perfil_calculo import medido
+
+np = importar_diferido("numpy")
+
+# Arrays más cortos quedan como listas JSON (el base64 no compensa)
+LARGO_MIN_ARRAY = 8
+
+_CLAVES_BDATA = ("dtype", "bdata")
+_MAGIA_GZIP = b"\x1f\x8b"
+
+# dtype numpy -> código de array tipado de plotly.js
+_DTYPES_ENTEROS = (
+    ("int8", "i1"), ("uint8", "u1"), ("int16", "i2"),
+    ("uint16", "u2"), ("int32", "i4"), ("uint32", "u4"),
+)
+_DTYPES_PLOTLY = {"f8": "<f8", "f4": "<f4", "i4": "<i4", "u4": "<u4",
+                  "i2": "<i2", "u2": "<u2", "i1": "i1", "u1": "u1", "u1c": "u1"}
+
+_MAX_FIGURAS_MEMO = 32
+_lock = threading.Lock()
+_figuras_memo = OrderedDict()  # (ruta, mtime_ns, tamaño) -> dict de figura
+
+
+def _es_numero(valor):
+    return isinstance(valor, Real) and not isinstance(valor, bool)
+
+
+def _a_array_numerico(valor):
+    """Convierte una lista/ndarray numérica (None = hueco) a ndarray, o None si no aplica"""
+    if isinstance(valor, np.ndarray):
+        if valor.dtype.kind not in "iuf" or valor.ndim not in (1, 2) or valor.size < LARGO_MIN_ARRAY:
+            return None
+        return valor
+    if not isinstance(valor, (list, tuple)) or not valor:
+        return None
+    # 2D rectangular (z de superficies)
+    if all(isinstance(fila, (list, tuple)) for fila in valor):
+        largo = len(valor[0])
+        if largo == 0 or any(len(fila) != largo for fila in valor) or len(valor) * largo < LARGO_MIN_ARRAY:
+            return None
+        filas = [_a_array_numerico_plano(fila) for fila in valor]
+        if any(f is None for f in filas):
+            return None
+        return np.vstack(filas)
+    if len(valor) < LARGO_MIN_ARRAY:
+        return None
+    return _a_array_numerico_plano(valor)
+
+
+def _a_array_numerico_plano(valores):
+    hay_huecos = False
+    todos_enteros = True
+    for v in valores:
+        if v is None:
+            hay_huecos = True
+        elif _es_numero(v):
+            if todos_enteros and not isinstance(v, Integral):
+                todos_enteros = False
+        else:
+            return None
+    if all(v is None for v in valores):
+        return None
+    if todos_enteros and not hay_huecos:
+        return np.asarray(valores, dtype=np.int64)
+    return np.asarray([np.nan if v is None else v for v in valores], dtype=np.float64)
+
+
+def codificar_array(arr):
+    """ndarray numérico -> {"dtype", "bdata"[, "shape"]} (el dtype entero más chico que alcance)"""
+    codigo = "f8"
+    if arr.dtype.kind in "iu":
+        minimo, maximo = (int(arr.min()), int(arr.max())) if arr.size else (0, 0)
+        for tipo, cod in _DTYPES_ENTEROS:
+            info = np.iinfo(tipo)
+            if info.min <= minimo and maximo <= info.max:
+                codigo = cod
+                break
+    datos = np.ascontiguousarray(arr, dtype=_DTYPES_PLOTLY[codigo])
+    codificado = {"dtype": codigo, "bdata": base64.b64encode(datos.tobytes()).decode("ascii")}
+    if arr.ndim == 2:
+        codificado["shape"] = f"{arr.shape[0]}, {arr.shape[1]}"
+    return codificado
+
+
+def decodificar_array(codificado):
+    """{"dtype", "bdata"[, "shape"]} -> lista (NaN vuelve a None)"""
+    arr = np.frombuffer(base64.b64decode(codificado["bdata"]), dtype=_DTYPES_PLOTLY[codificado["dtype"]])
+    if "shape" in codificado:
+        arr = arr.reshape([int(n) for n in str(codificado["shape"]).split(",")])
+    if arr.dtype.kind == "f":
+        return [_lista_sin_nan(fila) for fila in arr.tolist()] if arr.ndim == 2 else _lista_sin_nan(arr.tolist())
+    return arr.tolist()
+
+
+def _lista_sin_nan(valores):
+    return [None if (isinstance(v, float) and math.isnan(v)) else v for v in valores]
+
+
+def _es_array_codificado(valor):
+    return isinstance(valor, dict) and all(k in valor for k in _CLAVES_BDATA)
+
+
+def _compactar(valor):
+    if isinstance(valor, dict):
+        return {k: _compactar(v) for k, v in valor.items()}
+    arr = _a_array_numerico(valor)
+    if arr is not None:
+        return codificar_array(arr)
+    if isinstance(valor, (list, tuple)):
+        return [_compactar(v) for v in valor]
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+
+def compactar_figura(fig):
+    """Figura (go.Figure o dict) -> dict con los arrays numéricos de las trazas tipados"""
+    fig_dict = fig.to_plotly_json() if hasattr(fig, "to_plotly_json") else dict(fig)
+    compacta = {k: v for k, v in fig_dict.items() if k != "data"}
+    compacta["data"] = [_compactar(traza) for traza in fig_dict.get("data", [])]
+    return compacta
+
+
+def expandir_figura(fig_dict):
+    """Inversa de compactar_figura: arrays tipados -> listas (para go.Figure o kaleido)"""
+    if _es_array_codificado(fig_dict):
+        return decodificar_array(fig_dict)
+    if isinstance(fig_dict, dict):
+        return {k: expandir_figura(v) for k, v in fig_dict.items()}
+    if isinstance(fig_dict, list):
+        return [expandir_figura(v) for v in fig_dict]
+    return fig_dict
+
+
+def _ruta(nombre_archivo):
+    ruta = Path(nombre_archivo)
+    return ruta if ruta.is_absolute() or ruta.parent != Path(".") else CACHE_DIR / ruta
+
+
+@medido("figura.guardar")
+def guardar_figura(fig, nombre_archivo, comprimir=None):
+    """
+    Guarda la figura en forma compacta
+
+    Args:
+        fig: go.Figure o dict de figura
+        nombre_archivo: nombre en CACHE_DIR (o ruta)
+        comprimir: gzip sobre el JSON; None = FIGURAS_COMPRIMIR
+
+    Returns:
+        Path del archivo escrito
+    """
+    ruta = _ruta(nombre_archivo)
+    comprimir = FIGURAS_COMPRIMIR if comprimir is None else comprimir
+    texto = json.dumps(compactar_figura(fig), ensure_ascii=False, separators=(",", ":"), default=str)
+    datos = texto.encode("utf-8")
+    if comprimir:
+        datos = gzip.compress(datos, compresslevel=6)
+    ruta.write_bytes(datos)
+    with _lock:
+        for clave in [c for c in _figuras_memo if c[0] == str(ruta)]:
+            del _figuras_memo[clave]
+    return ruta
+
+
+@medido("figura.png")
+def exportar_png(fig, ruta, width, height):
+    """Exporta la figura a PNG con kaleido (imágenes de informes HTML)"""
+    fig.write_image(str(ruta), width=width, height=height)
+
+
+def _decodificar_texto(datos):
+    for encoding in ("utf-8", "latin-1", "cp1252"):
+        try:
+            return datos.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return datos.decode("utf-8", errors="ignore")
+
+
+@medido("figura.cargar")
+def cargar_figura(nombre_archivo):
+    """
+    Carga una figura guardada (compacta, comprimida o JSON anterior)
+
+    Returns:
+        dict listo para dcc.Graph, o None si el archivo no existe
+    """
+    ruta = _ruta(nombre_archivo)
+    try:
+        estado = ruta.stat()
+    except OSError:
+        return None
+    clave = (str(ruta), estado.st_mtime_ns, estado.st_size)
+    with _lock:
+        if clave in _figuras_memo:
+            _figuras_memo.move_to_end(clave)
+            return _figuras_memo[clave]
+
+    datos = ruta.read_bytes()
+    if datos[:2] == _MAGIA_GZIP:
+        datos = gzip.decompress(datos)
+    fig_dict = json.loads(_decodificar_texto(datos))
+
+    with _lock:
+        _figuras_memo[clave] = fig_dict
+        while len(_figuras_memo) > _MAX_FIGURAS_MEMO:
+            _figuras_memo.popitem(last=False)
+    return fig_dict
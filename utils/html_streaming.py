@@ -0,0 +1,320 @@
+"""
+Exportación de reportes HTML en streaming
+
+Los generadores de reportes producen el HTML por secciones. Mientras el modo
+streaming está activo, ViewHelpers.cargar_imagen_base64 no lee la imagen: devuelve
+un marcador con la ruta del PNG. Al escribir cada sección en el archivo destino,
+los marcadores se reemplazan codificando la imagen en base64 por bloques, de modo
+que en memoria solo hay una sección (sin imágenes) y un bloque de imagen a la vez.
+
+Las imágenes se identifican por el hash de su contenido. En MODO_COMPARTIDO cada
+imagen distinta se escribe una sola vez al final del HTML; en MODO_ASSETS el reporte
+se exporta como zip con index.html y una carpeta assets/ referenciada por rutas relativas.
+"""
+
+import base64
+import contextlib
+import contextvars
+import hashlib
+import io
+import mimetypes
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+import zipfile
+from pathlib import Path
+
+
+# Bloque de lectura múltiplo de 3 bytes: el base64 de cada bloque se concatena sin padding intermedio
+TAMANO_BLOQUE = 3 * 64 * 1024
+
+_streaming = contextvars.ContextVar("html_streaming_activo", default=False)
+
+_PREFIJO_MARCADOR = "@@AGP_IMG_STREAM:"
+_SUFIJO_MARCADOR = "@@"
+_PATRON_MARCADOR = re.compile(
+    r"(?P<prefijo>data:image/[\w.+-]+;base64,)?"
+    + re.escape(_PREFIJO_MARCADOR) + r"(?P<ruta>.+?)" + re.escape(_SUFIJO_MARCADOR)
+)
+_PREFIJO_SRC_COMPARTIDO = "data:,agp-img-"
+
+# Modos de exportación de imágenes
+MODO_EMBEBIDO = "embebido"      # un data URI por cada uso (tamaño proporcional a las referencias)
+MODO_COMPARTIDO = "compartido"  # un data URI por imagen distinta (hash de contenido), un solo HTML
+MODO_ASSETS = "assets"          # zip con index.html + assets/<hash>.png
+
+CARPETA_ASSETS = "assets"
+NOMBRE_HTML_ZIP = "index.html"
+
+# Reportes listos para descargar por URL (ver publicar_descarga); compartido entre workers
+DIRECTORIO_DESCARGAS = Path(tempfile.gettempdir()) / "agp_descargas"
+VIGENCIA_DESCARGA_S = 3600
+_PATRON_TOKEN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def streaming_activo():
+    """Indica si hay una exportación en streaming en curso (en este contexto)"""
+    return _streaming.get()
+
+
+@contextlib.contextmanager
+def modo_streaming():
+    """Activa el modo streaming para las imágenes cargadas dentro del bloque"""
+    token = _streaming.set(True)
+    try:
+        yield
+    finally:
+        _streaming.reset(token)
+
+
+def marcador_imagen(ruta):
+    """Marcador que reemplaza al base64 de una imagen dentro del HTML"""
+    return f"{_PREFIJO_MARCADOR}{Path(ruta)}{_SUFIJO_MARCADOR}"
+
+
+def escribir_imagen_base64(ruta, destino):
+    """Escribe el base64 de la imagen en `destino` (archivo de texto) por bloques"""
+    with open(ruta, 'rb') as f:
+        while True:
+            bloque = f.read(TAMANO_BLOQUE)
+            if not bloque:
+                break
+            destino.write(base64.b64encode(bloque).decode('ascii'))
+
+
+def hash_imagen(ruta):
+    """Hash SHA-256 (hex) del contenido de la imagen, leído por bloques"""
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        while True:
+            bloque = f.read(TAMANO_BLOQUE)
+            if not bloque:
+                break
+            h.update(bloque)
+    return h.hexdigest()
+
+
+class _ImagenesEmbebidas:
+    """Cada uso de la imagen lleva su propio data URI (comportamiento histórico)"""
+
+    def escribir(self, ruta, prefijo, destino):
+        destino.write(prefijo)
+        escribir_imagen_base64(ruta, destino)
+
+    def antes_de_body(self, destino):
+        pass
+
+
+class _ImagenesDeduplicadas:
+    """Base para los modos que identifican cada imagen por el hash de su contenido"""
+
+    def __init__(self):
+        self._hash_por_ruta = {}
+        self.rutas_por_hash = {}  # hash -> ruta (primera encontrada), en orden de aparición
+
+    def registrar(self, ruta):
+        clave = str(ruta)
+        if clave not in self._hash_por_ruta:
+            digest = hash_imagen(ruta)
+            self._hash_por_ruta[clave] = digest
+            self.rutas_por_hash.setdefault(digest, Path(ruta))
+        return self._hash_por_ruta[clave]
+
+
+class _ImagenesCompartidas(_ImagenesDeduplicadas):
+    """
+    Un único data URI por imagen distinta, escrito al final del documento
+
+    Las etiquetas <img> quedan con un src mínimo ("data:,agp-img-<hash>") y un script
+    antes de </body> asigna el data URI compartido a todas las que referencian el hash.
+    """
+
+    def escribir(self, ruta, prefijo, destino):
+        digest = self.registrar(ruta)
+        if not prefijo:
+            escribir_imagen_base64(ruta, destino)
+            return
+        destino.write(f"{_PREFIJO_SRC_COMPARTIDO}{digest}")
+
+    def antes_de_body(self, destino):
+        if not self.rutas_por_hash:
+            return
+        destino.write('\n<script id="agp-imagenes-compartidas">\n(function() {\n    var imgs = {\n')
+        for digest, ruta in self.rutas_por_hash.items():
+            destino.write(f'        "{digest}": "data:{_tipo_mime(ruta)};base64,')
+            escribir_imagen_base64(ruta, destino)
+            destino.write('",\n')
+        destino.write(f"""    }};
+    document.querySelectorAll('img[src^="{_PREFIJO_SRC_COMPARTIDO}"]').forEach(function(img) {{
+        var src = imgs[img.getAttribute('src').slice({len(_PREFIJO_SRC_COMPARTIDO)})];
+        if (src) {{ img.src = src; }}
+    }});
+}})();
+</script>
+""")
+
+
+class _ImagenesAssets(_ImagenesDeduplicadas):
+    """Referencias relativas a assets/<hash>.<ext>; los archivos se agregan al zip al final"""
+
+    def escribir(self, ruta, prefijo, destino):
+        digest = self.registrar(ruta)
+        if not prefijo:
+            escribir_imagen_base64(ruta, destino)
+            return
+        destino.write(nombre_asset(digest, ruta))
+
+    def antes_de_body(self, destino):
+        pass
+
+
+MODOS_IMAGENES = {
+    MODO_EMBEBIDO: _ImagenesEmbebidas,
+    MODO_COMPARTIDO: _ImagenesCompartidas,
+    MODO_ASSETS: _ImagenesAssets,
+}
+
+
+def nombre_asset(digest, ruta):
+    """Ruta relativa del asset dentro del zip exportado"""
+    return f"{CARPETA_ASSETS}/{digest}{Path(ruta).suffix.lower() or '.png'}"
+
+
+def _tipo_mime(ruta):
+    return mimetypes.guess_type(str(ruta))[0] or 'image/png'
+
+
+def escribir_seccion(seccion, destino, imagenes=None):
+    """
+    Escribe una sección HTML reemplazando marcadores de imagen
+
+    Args:
+        seccion (str): HTML de la sección (puede contener marcadores)
+        destino: archivo de texto abierto para escritura
+        imagenes: estrategia de escritura de imágenes (ver MODOS_IMAGENES);
+            por defecto se embebe cada imagen como base64 en streaming
+    """
+    imagenes = imagenes or _ImagenesEmbebidas()
+    posicion = 0
+    for match in _PATRON_MARCADOR.finditer(seccion):
+        destino.write(seccion[posicion:match.start()])
+        try:
+            imagenes.escribir(Path(match.group('ruta')), match.group('prefijo') or '', destino)
+        except OSError as e:
+            print(f"❌ Error embebiendo imagen {match.group('ruta')}: {e}")
+        posicion = match.end()
+    destino.write(seccion[posicion:])
+
+
+def _escribir_secciones(secciones, destino, imagenes):
+    """Escribe las secciones e inserta el bloque final de imágenes antes de </body>"""
+    pendiente = True
+    for seccion in secciones:
+        if not seccion:
+            continue
+        idx = seccion.rfind('</body>') if pendiente else -1
+        if idx < 0:
+            escribir_seccion(seccion, destino, imagenes)
+            continue
+        escribir_seccion(seccion[:idx], destino, imagenes)
+        imagenes.antes_de_body(destino)
+        pendiente = False
+        escribir_seccion(seccion[idx:], destino, imagenes)
+    if pendiente:
+        imagenes.antes_de_body(destino)
+
+
+def exportar_secciones(fabrica_secciones, ruta_destino=None, sufijo=None, modo_imagenes=MODO_EMBEBIDO):
+    """
+    Escribe en disco un reporte generado por secciones
+
+    Args:
+        fabrica_secciones (callable): Función sin argumentos que devuelve un iterable de
+            strings (por ejemplo un generador). Se invoca con el modo streaming activo.
+        ruta_destino (Path, optional): Archivo destino. Si es None se crea un temporal.
+        sufijo (str, optional): Extensión del archivo temporal (".html" o ".zip" según el modo)
+        modo_imagenes (str): MODO_EMBEBIDO, MODO_COMPARTIDO o MODO_ASSETS
+
+    Returns:
+        Path: Ruta del archivo escrito (HTML, o zip con index.html + assets/ en MODO_ASSETS)
+    """
+    if modo_imagenes not in MODOS_IMAGENES:
+        raise ValueError(f"Modo de imágenes no soportado: {modo_imagenes}")
+    imagenes = MODOS_IMAGENES[modo_imagenes]()
+
+    if ruta_destino is None:
+        if sufijo is None:
+            sufijo = ".zip" if modo_imagenes == MODO_ASSETS else ".html"
+        fd, nombre = tempfile.mkstemp(prefix="agp_reporte_", suffix=sufijo)
+        os.close(fd)
+        ruta_destino = Path(nombre)
+
+    with modo_streaming():
+        if modo_imagenes == MODO_ASSETS:
+            with zipfile.ZipFile(ruta_destino, 'w', zipfile.ZIP_DEFLATED) as zf:
+                with zf.open(NOMBRE_HTML_ZIP, 'w') as binario:
+                    with io.TextIOWrapper(binario, encoding='utf-8') as destino:
+                        _escribir_secciones(fabrica_secciones(), destino, imagenes)
+                # PNG ya está comprimido: se guarda sin deflate
+                for digest, ruta in imagenes.rutas_por_hash.items():
+                    zf.write(ruta, nombre_asset(digest, ruta), compress_type=zipfile.ZIP_STORED)
+        else:
+            with open(ruta_destino, 'w', encoding='utf-8') as destino:
+                _escribir_secciones(fabrica_secciones(), destino, imagenes)
+
+    return Path(ruta_destino)
+
+
+def iterar_bloques_archivo(ruta, tamano=TAMANO_BLOQUE, eliminar_al_terminar=False):
+    """Itera el archivo en bloques de bytes (para respuestas HTTP por chunks)"""
+    try:
+        with open(ruta, 'rb') as f:
+            while True:
+                bloque = f.read(tamano)
+                if not bloque:
+                    break
+                yield bloque
+    finally:
+        if eliminar_al_terminar:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+
+def publicar_descarga(ruta, nombre_archivo):
+    """
+    Mueve un reporte exportado a la carpeta de descargas y devuelve su token
+
+    El navegador lo pide en /descargar_reporte/<token> (app.py), que lo envía por bloques
+    con iterar_bloques_archivo y lo elimina al terminar. Así el reporte no pasa por la
+    respuesta del callback (dcc.Download lo leería completo y lo codificaría en base64).
+    """
+    _purgar_descargas_vencidas()
+    DIRECTORIO_DESCARGAS.mkdir(parents=True, exist_ok=True)
+    token = uuid.uuid4().hex
+    shutil.move(str(ruta), DIRECTORIO_DESCARGAS / f"{token}__{Path(nombre_archivo).name}")
+    return token
+
+
+def abrir_descarga(token):
+    """Ruta y nombre de descarga del reporte publicado con `token`, o None"""
+    if not _PATRON_TOKEN.match(token or ""):
+        return None
+    for ruta in DIRECTORIO_DESCARGAS.glob(f"{token}__*"):
+        return ruta, ruta.name.split("__", 1)[1]
+    return None
+
+
+def _purgar_descargas_vencidas():
+    """Elimina reportes publicados que nunca se descargaron"""
+    limite = time.time() - VIGENCIA_DESCARGA_S
+    for ruta in DIRECTORIO_DESCARGAS.glob("*__*"):
+        try:
+            if ruta.stat().st_mtime < limite:
+                ruta.unlink()
+        except OSError:
+            pass
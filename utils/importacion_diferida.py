@@ -0,0 +1,190 @@
+"""
+Importación diferida de motores de cálculo y perfil de tiempos de importación
+
+Al iniciar, la app registra vistas y callbacks sin importar numpy, pandas, matplotlib,
+plotly, scipy ni los módulos de cálculo: los controladores los importan dentro de los
+callbacks y los módulos compartidos usan `importar_diferido`. Tras el arranque los motores
+pueden precargarse en un hilo de fondo (PRECARGA_MOTORES) para que el primer cálculo no
+pague la importación.
+
+`PerfilImportacion` mide el costo de cada módulo importado durante el arranque (total y
+propio, sin sus submódulos) para detectar regresiones.
+"""
+
+import importlib
+import importlib.abc
+import sys
+import threading
+import time
+
+# Librerías y módulos de cálculo que no deberían cargarse al iniciar la app
+MOTORES_CALCULO = (
+    "numpy", "pandas", "scipy", "matplotlib", "plotly.graph_objects", "openseespy", "kaleido",
+)
+
+# Orden de precarga: librerías base y luego motores propios
+MODULOS_PRECARGA = (
+    "numpy", "pandas", "matplotlib.pyplot", "plotly.graph_objects",
+    "CalculoCables", "utils.calculo_objetos", "utils.calculo_mecanico_cables",
+    "utils.plot_flechas", "utils.arboles_carga", "utils.Sulzberger",
+)
+
+
+class ModuloDiferido:
+    """Proxy de módulo: importa `nombre` recién en el primer acceso a un atributo"""
+
+    def __init__(self, nombre):
+        self.__dict__["_nombre"] = nombre
+        self.__dict__["_modulo"] = None
+
+    def _cargar(self):
+        modulo = self.__dict__["_modulo"]
+        if modulo is None:
+            modulo = importlib.import_module(self.__dict__["_nombre"])
+            self.__dict__["_modulo"] = modulo
+        return modulo
+
+    def __getattr__(self, atributo):
+        return getattr(self._cargar(), atributo)
+
+    def __setattr__(self, atributo, valor):
+        setattr(self._cargar(), atributo, valor)
+
+    def __repr__(self):
+        estado = "cargado" if self.__dict__["_modulo"] is not None else "diferido"
+        return f"<ModuloDiferido {self.__dict__['_nombre']} ({estado})>"
+
+
+def importar_diferido(nombre):
+    """Devuelve el módulo si ya está importado; si no, un proxy que lo importa al usarlo"""
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+    return ModuloDiferido(nombre)
+
+
+def motores_cargados():
+    """Motores de MOTORES_CALCULO ya presentes en sys.modules"""
+    return [nombre for nombre in MOTORES_CALCULO if nombre in sys.modules]
+
+
+def precargar_motores(modo="segundo_plano"):
+    """
+    Precarga los motores de cálculo
+
+    Args:
+        modo: "segundo_plano" (hilo daemon, no demora el arranque), "inicio" (bloqueante)
+              o "no" (se importan en el primer uso)
+
+    Returns:
+        threading.Thread si se lanzó en segundo plano, None en otro caso
+    """
+    if modo == "no":
+        return None
+
+    def _precargar():
+        inicio = time.perf_counter()
+        for nombre in MODULOS_PRECARGA:
+            try:
+                importlib.import_module(nombre)
+            except Exception as e:
+                print(f"⚠️ Precarga de {nombre} falló: {e}")
+        print(f"⚙️ Motores de cálculo precargados en {time.perf_counter() - inicio:.2f} s")
+
+    if modo == "inicio":
+        _precargar()
+        return None
+    hilo = threading.Thread(target=_precargar, name="precarga-motores", daemon=True)
+    hilo.start()
+    return hilo
+
+
+class _CargadorCronometrado(importlib.abc.Loader):
+    """Envuelve el loader original solo mientras se ejecuta el módulo"""
+
+    def __init__(self, original, perfil):
+        self._original = original
+        self._perfil = perfil
+
+    def __getattr__(self, atributo):
+        return getattr(self._original, atributo)
+
+    def create_module(self, spec):
+        return self._original.create_module(spec)
+
+    def exec_module(self, modulo):
+        self._perfil._entrar()
+        inicio = time.perf_counter()
+        try:
+            self._original.exec_module(modulo)
+        finally:
+            self._perfil._salir(modulo.__name__, time.perf_counter() - inicio)
+            modulo.__loader__ = self._original
+            if getattr(modulo, "__spec__", None) is not None:
+                modulo.__spec__.loader = self._original
+
+
+class PerfilImportacion(importlib.abc.MetaPathFinder):
+    """
+    Mide el tiempo de importación de cada módulo (total y propio)
+
+    Uso:
+        perfil = PerfilImportacion().iniciar()
+        import ...
+        perfil.detener()
+        print(perfil.reporte())
+    """
+
+    def __init__(self):
+        self.tiempos = {}  # módulo -> (total, propio) en segundos
+        self._hijos = []   # pila: tiempo de submódulos acumulado por nivel
+        self._inicio = None
+        self.duracion = 0.0
+
+    def iniciar(self):
+        self._inicio = time.perf_counter()
+        sys.meta_path.insert(0, self)
+        return self
+
+    def detener(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+        if self._inicio is not None:
+            self.duracion = time.perf_counter() - self._inicio
+        return self
+
+    def find_spec(self, nombre, path, target=None):
+        for buscador in sys.meta_path:
+            if buscador is self or not hasattr(buscador, "find_spec"):
+                continue
+            spec = buscador.find_spec(nombre, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _CargadorCronometrado(spec.loader, self)
+        return spec
+
+    def _entrar(self):
+        self._hijos.append(0.0)
+
+    def _salir(self, nombre, total):
+        hijos = self._hijos.pop()
+        self.tiempos[nombre] = (total, max(total - hijos, 0.0))
+        if self._hijos:
+            self._hijos[-1] += total
+
+    def reporte(self, limite=15, prefijos=None):
+        """Tabla de los módulos más costosos (por tiempo total) y motores cargados"""
+        filas = sorted(
+            ((n, t) for n, t in self.tiempos.items()
+             if prefijos is None or n.startswith(tuple(prefijos))),
+            key=lambda item: item[1][0], reverse=True
+        )[:limite]
+        lineas = [f"⏱️ Importación al iniciar: {len(self.tiempos)} módulos en {self.duracion:.2f} s",
+                  f"   {'total [s]':>9} {'propio [s]':>10}  módulo"]
+        for nombre, (total, propio) in filas:
+            lineas.append(f"   {total:9.3f} {propio:10.3f}  {nombre}")
+        cargados = motores_cargados()
+        lineas.append(f"   Motores de cálculo cargados al iniciar: {', '.join(cargados) if cargados else 'ninguno'}")
+        return "\n".join(lineas)
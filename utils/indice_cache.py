@@ -0,0 +1,155 @@
+"""
+Índice de metadatos del cache de cálculos
+
+Al lado de cada etapa guardada (`{nombre}.calculo{TIPO}.json` o la etapa dentro del
+contenedor binario) se escribe `{nombre}.calculo{TIPO}.meta.json`, de unos cientos de bytes:
+
+    {"version": 1, "tipo": "SPH", "hash_parametros": "...", "fecha_calculo": "...",
+     "formato": "json", "bytes": 412331, "mtime_ns": ..., "resumen": {"Rc_adopt": 1800, ...}}
+
+Las consultas de existencia, vigencia (hash) y resumen usan este archivo sin leer ni
+parsear el cálculo completo (tablas HTML, memorias, consola). Lo escribe
+CalculoCache._escribir_calculo; si falta o no coincide con el archivo del cálculo (cache
+anterior al índice, archivo reemplazado a mano) CalculoCache lo reconstruye una vez.
+"""
+
+import json
+import os
+import threading
+
+import utils.cache_binario as cache_binario
+from utils.cache_binario import CacheBinario
+
+VERSION_INDICE = 1
+SUFIJO = ".meta.json"
+LARGO_MAX_RESUMEN = 200
+
+# Valores anidados que se copian al resumen, por etapa
+RESUMEN_POR_TIPO = {
+    "SPH": {
+        "config_seleccionada": ("resultados", "config_seleccionada"),
+        "Rc_adopt": ("resultados", "Rc_adopt"),
+        "Ht_comercial": ("resultados", "dimensiones", "Ht_comercial"),
+    },
+    "FUND": {
+        "hipotesis_dimensionante": ("resultados", "resultados", "hipotesis_dimensionante"),
+        "volumen_maximo": ("resultados", "resultados", "volumen_maximo"),
+    },
+    "COSTEO": {
+        "costo_total": ("resultados", "resumen_costos", "costo_total"),
+    },
+}
+
+
+def _normalizar(nombre_estructura):
+    return nombre_estructura.replace(' ', '_')
+
+
+def _directorio():
+    # El mismo directorio que el contenedor binario (y que lo redirige en pruebas)
+    return cache_binario.CACHE_DIR
+
+
+def ruta_calculo(nombre_estructura, tipo):
+    return _directorio() / f"{_normalizar(nombre_estructura)}.calculo{tipo}.json"
+
+
+def ruta_indice(nombre_estructura, tipo):
+    return _directorio() / f"{_normalizar(nombre_estructura)}.calculo{tipo}{SUFIJO}"
+
+
+def _escalar(valor):
+    if isinstance(valor, bool) or valor is None:
+        return True
+    if isinstance(valor, (int, float)):
+        return True
+    if hasattr(valor, "item") and not hasattr(valor, "__len__"):
+        return True  # escalar numpy
+    return isinstance(valor, str) and len(valor) <= LARGO_MAX_RESUMEN
+
+
+def _valor(valor):
+    return valor.item() if hasattr(valor, "item") else valor
+
+
+def resumir(tipo, calculo_data):
+    """Campos de primer nivel escalares y los valores de RESUMEN_POR_TIPO"""
+    resumen = {k: _valor(v) for k, v in calculo_data.items()
+               if _escalar(v) and k not in ("hash_parametros", "fecha_calculo")}
+    for clave, camino in RESUMEN_POR_TIPO.get(tipo, {}).items():
+        valor = calculo_data
+        for paso in camino:
+            valor = valor.get(paso) if isinstance(valor, dict) else None
+        if valor is not None and _escalar(valor):
+            resumen[clave] = _valor(valor)
+    return resumen
+
+
+def registrar(nombre_estructura, tipo, calculo_data):
+    """Escribe el índice de una etapa recién guardada (o leída) y lo devuelve"""
+    archivo = ruta_calculo(nombre_estructura, tipo)
+    try:
+        estado = archivo.stat()
+        formato, tamano, mtime_ns = "json", estado.st_size, estado.st_mtime_ns
+    except FileNotFoundError:
+        contenedor = CacheBinario.ruta_contenedor(nombre_estructura)
+        formato, tamano, mtime_ns = "binario", contenedor.stat().st_size if contenedor.exists() else None, None
+
+    meta = {
+        "version": VERSION_INDICE,
+        "tipo": tipo,
+        "hash_parametros": calculo_data.get("hash_parametros"),
+        "fecha_calculo": calculo_data.get("fecha_calculo"),
+        "formato": formato,
+        "bytes": tamano,
+        "mtime_ns": mtime_ns,
+        "resumen": resumir(tipo, calculo_data),
+    }
+    ruta = ruta_indice(nombre_estructura, tipo)
+    try:
+        temporal = ruta.with_name(f"{ruta.name}.{threading.get_ident()}.tmp")
+        temporal.write_text(json.dumps(meta, ensure_ascii=False, default=str), encoding="utf-8")
+        os.replace(temporal, ruta)
+    except OSError as e:
+        print(f"⚠️ No se pudo escribir el índice de cache {ruta.name}: {e}")
+    return meta
+
+
+def leer(nombre_estructura, tipo):
+    """
+    Índice de una etapa, o None si no existe o ya no corresponde al cálculo guardado
+
+    Un índice JSON vale si el archivo del cálculo conserva tamaño y fecha de modificación;
+    uno binario, si no hay JSON (que tiene prioridad al leer) y la etapa está en el contenedor.
+    """
+    try:
+        meta = json.loads(ruta_indice(nombre_estructura, tipo).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != VERSION_INDICE:
+        return None
+    archivo = ruta_calculo(nombre_estructura, tipo)
+    if meta.get("formato") == "json":
+        try:
+            estado = archivo.stat()
+        except FileNotFoundError:
+            return None
+        if estado.st_size != meta.get("bytes") or estado.st_mtime_ns != meta.get("mtime_ns"):
+            return None
+        return meta
+    if archivo.exists() or not CacheBinario.existe(nombre_estructura, tipo):
+        return None
+    return meta
+
+
+def eliminar(nombre_estructura, tipo=None):
+    """Borra el índice de una etapa (o de todas las de la estructura)"""
+    if tipo is not None:
+        rutas = [ruta_indice(nombre_estructura, tipo)]
+    else:
+        rutas = _directorio().glob(f"{_normalizar(nombre_estructura)}.calculo*{SUFIJO}")
+    for ruta in rutas:
+        try:
+            ruta.unlink()
+        except OSError:
+            pass
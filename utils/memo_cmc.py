@@ -0,0 +1,80 @@
+"""
+Memo de cálculo mecánico de cables (CMC) compartido por las estructuras de una familia
+
+El cálculo mecánico de un cable (búsqueda del estado básico, tabla de estados, catenarias)
+depende solo del cable, el vano, los estados climáticos, las restricciones y los parámetros
+de viento; no de la geometría ni de la cadena de la estructura. En una familia casi todas
+las estructuras comparten conductor, guardia y vano, así que el memo resuelve cada
+combinación una vez y la copia al objeto cable de cada estructura. La lista de cargas
+(df_cargas_totales), que sí depende de la estructura, se sigue generando en cada una.
+
+Uso (lo activa ejecutar_calculo_familia_completa en el contexto de cada estructura):
+    contexto.memo_cmc = MemoCMC()
+    state.calculo_mecanico.calcular(params, estados, restricciones, memo=contexto.memo_cmc)
+"""
+
+import copy
+import hashlib
+import json
+import threading
+
+from utils.perfil_calculo import contar
+
+
+def _escalares(cable):
+    """Atributos escalares del cable (propiedades, desnivel); excluye tablas y caches"""
+    return {k: v for k, v in vars(cable).items()
+            if isinstance(v, (int, float, str, bool)) or v is None}
+
+
+class MemoCMC:
+    """Resultados de Cable_AEA.calculo_mecanico por combinación de datos de entrada"""
+
+    def __init__(self):
+        self._entradas = {}
+        self._lock = threading.Lock()
+        self.calculos = 0
+        self.aciertos = 0
+
+    @staticmethod
+    def clave(cable, **argumentos):
+        datos = {"cable": _escalares(cable), "argumentos": argumentos}
+        texto = json.dumps(datos, sort_keys=True, default=str)
+        return hashlib.md5(texto.encode()).hexdigest()
+
+    def resolver(self, cable, **argumentos):
+        """
+        Equivalente a cable.calculo_mecanico(**argumentos), reutilizando un resultado previo
+        con los mismos datos; deja en el cable la tabla de estados, las catenarias y los vanos peso
+        """
+        clave = self.clave(cable, **argumentos)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+        if entrada is None:
+            resultado = cable.calculo_mecanico(**argumentos)
+            entrada = {
+                "resultado": copy.deepcopy(resultado),
+                "tabla_estados": (copy.deepcopy(cable._tabla_estados), cable._tabla_estados_clave),
+                "catenarias": copy.deepcopy(getattr(cable, "catenarias_cache", None)),
+                "vanos_peso": (dict(getattr(cable, "vanos_peso", None) or {}), getattr(cable, "L_vanopeso", None)),
+            }
+            with self._lock:
+                self._entradas.setdefault(clave, entrada)
+                self.calculos += 1
+            return resultado
+
+        print(f"♻️ CMC de {cable.nombre} reutilizado (mismo cable, vano, estados y viento)")
+        with self._lock:
+            self.aciertos += 1
+        contar("cmc.memo_aciertos")
+        cable._tabla_estados = copy.deepcopy(entrada["tabla_estados"][0])
+        cable._tabla_estados_clave = entrada["tabla_estados"][1]
+        if entrada["catenarias"] is not None:
+            cable.catenarias_cache = copy.deepcopy(entrada["catenarias"])
+        if entrada["vanos_peso"][0]:
+            cable.vanos_peso = dict(entrada["vanos_peso"][0])
+            cable.L_vanopeso = entrada["vanos_peso"][1]
+        return copy.deepcopy(entrada["resultado"])
+
+    def resumen(self):
+        return f"{self.calculos} cálculo(s) de cable, {self.aciertos} reutilizado(s)"
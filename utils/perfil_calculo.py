@@ -0,0 +1,354 @@
+"""
+Instrumentación de cálculos: línea de tiempo por trabajo, contadores y perfil opcional
+
+Un trabajo (cálculo de familia, "Calcular todo" o una etapa suelta) registra los tramos
+(`etapa`) que se abren en su hilo, anidados: etapas CMC/DGE/.../AEE, sub-pasos (etapas 0-6
+de DGE, resolución OpenSees, lectura/escritura de cache, exportación de figuras) y
+contadores (`contar`, p. ej. iteraciones de la búsqueda CMC). Sin trabajo activo `etapa` y
+`contar` no hacen nada.
+
+Al terminar, el trabajo se guarda como JSON en data/perfiles/ (lo leen todos los workers y
+la vista Consola lo muestra como línea de tiempo). Con PERFIL_CALCULO_PROFILER=cprofile o
+pyinstrument se perfila además el hilo del trabajo y se guarda el .prof / .html al lado.
+
+Uso:
+    with trabajo("familia PSJ", tipo="familia"):
+        with etapa("estructura S1"):
+            ...
+    @medido("dme", tipo="estructura", titulo=titulo_estructura)
+    def ejecutar_calculo_dme(estructura_actual, state): ...
+"""
+
+import cProfile
+import functools
+import io
+import json
+import pstats
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from config.app_config import DATA_DIR, PERFIL_CALCULO, PERFIL_CALCULO_PROFILER, PERFILES_MAX
+
+DIR_PERFILES = DATA_DIR / "perfiles"
+# Tramos guardados con detalle por trabajo; los siguientes solo suman a los totales
+MAX_EVENTOS = 5000
+LINEAS_PERFIL = 40
+
+_local = threading.local()
+
+
+class LineaTiempo:
+    """Tramos, totales por nombre y contadores de un trabajo"""
+
+    def __init__(self, nombre, tipo, datos=None):
+        self.nombre = nombre
+        self.tipo = tipo
+        self.datos = dict(datos or {})
+        self.fecha = datetime.now()
+        self.inicio = time.perf_counter()
+        self.duracion = None
+        self.eventos = []
+        self.totales = {}      # nombre de tramo -> [llamadas, segundos]
+        self.contadores = {}
+        self.error = None
+        self.perfil = None     # texto con las funciones más costosas (profiler)
+        self.archivo_perfil = None
+        self.hilo = threading.current_thread().name
+        # Tramos abiertos por hilo: las etapas en paralelo (utils/planificador_etapas.py)
+        # registran en la misma línea desde otros hilos, anidadas bajo el tramo que las lanzó
+        self._pilas = {}       # id de hilo -> [nivel base, tramos abiertos]
+        self._lock = threading.Lock()
+
+    def _pila(self):
+        return self._pilas.setdefault(threading.get_ident(), [0, []])
+
+    def nivel_actual(self):
+        base, pila = self._pila()
+        return base + len(pila)
+
+    def abrir(self, nombre, datos=None):
+        base, pila = self._pila()
+        evento = {"nombre": nombre, "inicio": time.perf_counter() - self.inicio,
+                  "duracion": None, "nivel": base + len(pila)}
+        if datos:
+            evento["datos"] = datos
+        hilo = threading.current_thread().name
+        if hilo != self.hilo:
+            evento["hilo"] = hilo
+        with self._lock:
+            if len(self.eventos) < MAX_EVENTOS:
+                self.eventos.append(evento)
+        pila.append(evento)
+        return evento
+
+    def cerrar(self, evento, error=None):
+        evento["duracion"] = time.perf_counter() - self.inicio - evento["inicio"]
+        if error:
+            evento["error"] = error
+        with self._lock:
+            total = self.totales.setdefault(evento["nombre"], [0, 0.0])
+            total[0] += 1
+            total[1] += evento["duracion"]
+        pila = self._pila()[1]
+        if pila and pila[-1] is evento:
+            pila.pop()
+
+    def contar(self, nombre, cantidad=1):
+        with self._lock:
+            self.contadores[nombre] = self.contadores.get(nombre, 0) + cantidad
+
+    def a_dict(self):
+        return {
+            "nombre": self.nombre,
+            "tipo": self.tipo,
+            "datos": self.datos,
+            "fecha": self.fecha.isoformat(timespec="seconds"),
+            "duracion": self.duracion,
+            "hilo": self.hilo,
+            "error": self.error,
+            "eventos": self.eventos,
+            "eventos_omitidos": max(sum(t[0] for t in self.totales.values()) - len(self.eventos), 0),
+            "totales": {n: {"llamadas": t[0], "segundos": t[1]} for n, t in self.totales.items()},
+            "contadores": self.contadores,
+            "perfil": self.perfil,
+            "archivo_perfil": self.archivo_perfil,
+        }
+
+
+def linea_actual():
+    """Línea de tiempo del trabajo activo en este hilo, o None"""
+    return getattr(_local, "linea", None)
+
+
+@contextmanager
+def etapa(nombre, **datos):
+    """Tramo dentro del trabajo activo (no hace nada si no hay trabajo)"""
+    linea = getattr(_local, "linea", None)
+    if linea is None:
+        yield
+        return
+    evento = linea.abrir(nombre, datos)
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        linea.cerrar(evento, error)
+
+
+def contar(nombre, cantidad=1):
+    """Suma al contador `nombre` del trabajo activo"""
+    linea = getattr(_local, "linea", None)
+    if linea is not None:
+        linea.contar(nombre, cantidad)
+
+
+def anotar(**datos):
+    """Agrega datos descriptivos al trabajo activo (estructura, familia, ...)"""
+    linea = getattr(_local, "linea", None)
+    if linea is not None:
+        linea.datos.update(datos)
+
+
+@contextmanager
+def trabajo(nombre, tipo="calculo", **datos):
+    """
+    Trabajo medido en el hilo actual
+
+    Si ya hay un trabajo activo se comporta como `etapa` (un cálculo de familia contiene
+    las etapas de cada estructura, no trabajos propios).
+    """
+    if getattr(_local, "linea", None) is not None or not PERFIL_CALCULO:
+        with etapa(nombre, **datos):
+            yield linea_actual()
+        return
+
+    linea = LineaTiempo(nombre, tipo, datos)
+    _local.linea = linea
+    perfilador = _iniciar_perfilador()
+    try:
+        yield linea
+    except BaseException as e:
+        linea.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _local.linea = None
+        linea.duracion = time.perf_counter() - linea.inicio
+        base = _nombre_base(linea)
+        _detener_perfilador(perfilador, linea, base)
+        _guardar(linea, base)
+
+
+@contextmanager
+def adoptar(linea, nivel=0):
+    """
+    Hace que el hilo actual registre en `linea` (trabajo lanzado desde otro hilo)
+
+    Args:
+        nivel: nivel de anidamiento de los tramos del hilo (el del tramo que lo lanzó)
+    """
+    anterior = getattr(_local, "linea", None)
+    if linea is None:
+        yield
+        return
+    _local.linea = linea
+    with linea._lock:
+        linea._pilas[threading.get_ident()] = [nivel, []]
+    try:
+        yield
+    finally:
+        _local.linea = anterior
+        with linea._lock:
+            linea._pilas.pop(threading.get_ident(), None)
+
+
+def titulo_estructura(estructura_actual=None, *args, **kwargs):
+    """Título para `medido` en funciones cuyo primer argumento es la estructura"""
+    return (estructura_actual or {}).get("TITULO") if isinstance(estructura_actual, dict) else None
+
+
+def medido(nombre, tipo=None, titulo=None):
+    """
+    Decorador: la función es un tramo del trabajo activo
+
+    Args:
+        nombre: nombre del tramo
+        tipo: si se indica y no hay trabajo activo, la llamada abre su propio trabajo
+        titulo: función (mismos argumentos) que devuelve un título para el trabajo
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envuelta(*args, **kwargs):
+            if tipo is not None and getattr(_local, "linea", None) is None and PERFIL_CALCULO:
+                nombre_trabajo = nombre
+                if titulo is not None:
+                    try:
+                        sufijo = titulo(*args, **kwargs)
+                    except Exception:
+                        sufijo = None
+                    if sufijo:
+                        nombre_trabajo = f"{nombre} {sufijo}"
+                with trabajo(nombre_trabajo, tipo=tipo):
+                    return funcion(*args, **kwargs)
+            with etapa(nombre):
+                return funcion(*args, **kwargs)
+        return envuelta
+    return decorador
+
+
+# ---------------------------------------------------------------------------------------
+# Profiler opcional
+# ---------------------------------------------------------------------------------------
+
+def _iniciar_perfilador():
+    modo = PERFIL_CALCULO_PROFILER
+    if modo == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+            perfilador = Profiler()
+            perfilador.start()
+            return modo, perfilador
+        except ImportError:
+            print("⚠️ pyinstrument no está instalado, se usa cProfile")
+            modo = "cprofile"
+        except RuntimeError as e:
+            print(f"⚠️ No se pudo iniciar pyinstrument: {e}")
+            return None
+    if modo == "cprofile":
+        perfilador = cProfile.Profile()
+        try:
+            perfilador.enable()
+        except ValueError as e:
+            # Otro profiler activo en el hilo
+            print(f"⚠️ No se pudo iniciar cProfile: {e}")
+            return None
+        return modo, perfilador
+    return None
+
+
+def _detener_perfilador(perfilador, linea, base):
+    if perfilador is None:
+        return
+    modo, perfilador = perfilador
+    try:
+        DIR_PERFILES.mkdir(parents=True, exist_ok=True)
+        if modo == "pyinstrument":
+            perfilador.stop()
+            ruta = DIR_PERFILES / f"{base}.html"
+            ruta.write_text(perfilador.output_html(), encoding="utf-8")
+            texto = perfilador.output_text(unicode=True, color=False)
+            linea.perfil = "\n".join(texto.splitlines()[:LINEAS_PERFIL * 2])
+        else:
+            perfilador.disable()
+            ruta = DIR_PERFILES / f"{base}.prof"
+            perfilador.dump_stats(str(ruta))
+            salida = io.StringIO()
+            pstats.Stats(perfilador, stream=salida).sort_stats("cumulative").print_stats(LINEAS_PERFIL)
+            linea.perfil = salida.getvalue()
+        linea.archivo_perfil = ruta.name
+    except Exception as e:
+        print(f"⚠️ No se pudo guardar el perfil de {linea.nombre}: {e}")
+
+
+# ---------------------------------------------------------------------------------------
+# Persistencia y consulta
+# ---------------------------------------------------------------------------------------
+
+def _nombre_base(linea):
+    slug = re.sub(r"[^\w.-]+", "_", linea.nombre).strip("_")[:60]
+    return f"{linea.fecha:%Y%m%d_%H%M%S_%f}_{slug}"
+
+
+def _guardar(linea, base):
+    resumen = ", ".join(f"{n} {t[1]:.2f} s" for n, t in sorted(
+        ((n, t) for n, t in linea.totales.items() if "." not in n),
+        key=lambda item: item[1][1], reverse=True)[:8])
+    print(f"⏱️ Perfil {linea.nombre}: {linea.duracion:.2f} s" + (f" | {resumen}" if resumen else ""))
+    try:
+        DIR_PERFILES.mkdir(parents=True, exist_ok=True)
+        ruta = DIR_PERFILES / f"{base}.json"
+        ruta.write_text(json.dumps(linea.a_dict(), ensure_ascii=False, default=str), encoding="utf-8")
+        _purgar()
+    except Exception as e:
+        print(f"⚠️ No se pudo guardar la línea de tiempo de {linea.nombre}: {e}")
+
+
+def _purgar():
+    """Conserva los PERFILES_MAX trabajos más recientes (JSON + .prof/.html)"""
+    archivos = sorted(DIR_PERFILES.glob("*.json"), reverse=True)
+    for archivo in archivos[PERFILES_MAX:]:
+        for asociado in (archivo, archivo.with_suffix(".prof"), archivo.with_suffix(".html")):
+            try:
+                asociado.unlink()
+            except OSError:
+                pass
+
+
+def listar_perfiles(limite=None):
+    """[(archivo, nombre, fecha, duración)] de los trabajos guardados, el más reciente primero"""
+    if not DIR_PERFILES.exists():
+        return []
+    perfiles = []
+    for archivo in sorted(DIR_PERFILES.glob("*.json"), reverse=True)[:limite]:
+        try:
+            datos = json.loads(archivo.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        perfiles.append((archivo.name, datos.get("nombre"), datos.get("fecha"), datos.get("duracion")))
+    return perfiles
+
+
+def cargar_perfil(archivo):
+    """Línea de tiempo guardada (dict) o None"""
+    ruta = DIR_PERFILES / archivo
+    if ruta.parent != DIR_PERFILES or not ruta.exists():
+        return None
+    try:
+        return json.loads(ruta.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
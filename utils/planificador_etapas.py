@@ -0,0 +1,164 @@
+"""
+Planificador de etapas de cálculo según el grafo de dependencias
+
+Las etapas de una estructura se ejecutaban en un orden lineal fijo (CMC > DGE > DME >
+Árboles > SPH > Fundación > Costeo > AEE). El grafo de obtener_cadena_dependencias
+(utils/validacion_prerequisitos.py) permite correr en paralelo las que ya tienen sus
+prerequisitos: después de DME, Árboles ‖ SPH ‖ AEE, y Fundación y Costeo mientras siguen
+Árboles o AEE. Si una etapa falla, solo se omiten las que dependen de ella.
+
+Los hilos de las etapas usan el contexto de cálculo y la línea de tiempo del hilo que las
+lanza. AEE recalcula CMC y DGE sobre los objetos de cálculo, así que corre en un contexto
+propio para no reemplazarlos mientras Árboles, SPH o Fundación los leen.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from config.app_config import ETAPAS_PARALELAS
+from models.contexto_calculo import activar, contexto_actual, usar_contexto
+from utils.perfil_calculo import adoptar, linea_actual
+from utils.validacion_prerequisitos import obtener_cadena_dependencias
+
+# Clave en calculos_activos -> nombre en el grafo de dependencias, en el orden de la secuencia
+ETAPAS = {
+    "cmc": "CMC",
+    "dge": "DGE",
+    "dme": "DME",
+    "arboles": "ARBOLES",
+    "sph": "SPH",
+    "fundacion": "FUNDACION",
+    "costeo": "COSTEO",
+    "aee": "AEE",
+}
+NOMBRES = {
+    "cmc": "CMC", "dge": "DGE", "dme": "DME", "arboles": "Árboles", "sph": "SPH",
+    "fundacion": "Fundación", "costeo": "Costeo", "aee": "AEE",
+}
+# Etapas que modifican los objetos de cálculo compartidos después de DME
+CONTEXTO_PROPIO = {"aee"}
+
+
+def dependencias_etapas(calculos_activos):
+    """
+    {etapa: [etapas activas de las que depende]} con las claves de calculos_activos
+
+    Las dependencias desactivadas se dan por cumplidas (la etapa usa el cache existente),
+    igual que en la secuencia lineal.
+    """
+    grafo = obtener_cadena_dependencias()
+    por_nombre = {nombre: clave for clave, nombre in ETAPAS.items()}
+    activas = [clave for clave in ETAPAS if clave in calculos_activos]
+    return {clave: [por_nombre[d] for d in grafo.get(ETAPAS[clave], []) if por_nombre.get(d) in activas]
+            for clave in activas}
+
+
+def ejecutar_grafo(tareas, dependencias, max_paralelas=None):
+    """
+    Ejecuta tareas respetando sus dependencias
+
+    Args:
+        tareas: {nombre: función sin argumentos que devuelve un dict con 'exito'}; el orden
+            del diccionario es la prioridad entre tareas listas a la vez
+        dependencias: {nombre: [nombres]}; las que no están en `tareas` se ignoran
+        max_paralelas: tareas simultáneas (None = ETAPAS_PARALELAS, 1 = en secuencia y en
+            el hilo actual)
+    Returns:
+        {nombre: resultado}. Una excepción se informa como {"exito": False, "mensaje": ...};
+        las tareas cuyas dependencias fallaron no se ejecutan y devuelven "omitida": True.
+    """
+    max_paralelas = max(1, max_paralelas or ETAPAS_PARALELAS)
+    pendientes = {n: [d for d in dependencias.get(n, []) if d in tareas and d != n] for n in tareas}
+    resultados = {}
+
+    def ejecutar(nombre):
+        try:
+            resultado = tareas[nombre]()
+        except Exception as e:
+            import traceback
+            print(f"❌ Error en {nombre}: {traceback.format_exc()}")
+            resultado = {"exito": False, "mensaje": str(e)}
+        return resultado if isinstance(resultado, dict) else {"exito": bool(resultado)}
+
+    def listas():
+        """Tareas con dependencias resueltas; omite las que dependen de una fallida"""
+        hay_omitidas = True
+        while hay_omitidas:
+            hay_omitidas = False
+            for nombre, deps in list(pendientes.items()):
+                fallida = next((d for d in deps if d in resultados and not resultados[d].get("exito")), None)
+                if fallida is not None:
+                    del pendientes[nombre]
+                    resultados[nombre] = {"exito": False, "omitida": True,
+                                          "mensaje": f"Omitida: falló {fallida}"}
+                    hay_omitidas = True
+        return [n for n, deps in pendientes.items() if all(d in resultados for d in deps)]
+
+    if max_paralelas == 1:
+        while pendientes:
+            lista = listas()
+            if not lista:
+                break
+            del pendientes[lista[0]]
+            resultados[lista[0]] = ejecutar(lista[0])
+    else:
+        contexto = contexto_actual()
+        linea = linea_actual()
+        nivel = linea.nivel_actual() if linea is not None else 0
+
+        def en_hilo(nombre):
+            with activar(contexto), adoptar(linea, nivel):
+                return ejecutar(nombre)
+
+        with ThreadPoolExecutor(max_workers=max_paralelas, thread_name_prefix="etapa") as pool:
+            en_curso = {}
+            while True:
+                for nombre in listas():
+                    if len(en_curso) >= max_paralelas:
+                        break
+                    del pendientes[nombre]
+                    en_curso[pool.submit(en_hilo, nombre)] = nombre
+                if not en_curso:
+                    break
+                hechas, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                for futuro in hechas:
+                    resultados[en_curso.pop(futuro)] = futuro.result()
+
+    # Ciclos o dependencias imposibles: no se ejecutan
+    for nombre in pendientes:
+        resultados[nombre] = {"exito": False, "omitida": True, "mensaje": "Omitida: dependencias sin resolver"}
+    return {n: resultados[n] for n in tareas}
+
+
+# Etapas cuya función no recibe generar_plots
+SIN_GRAFICOS = {"sph", "costeo", "aee"}
+
+
+def _etapa(clave, estructura_actual, state, generar_plots):
+    """Función sin argumentos que ejecuta la etapa `clave`"""
+    def ejecutar():
+        if clave in ("cmc", "dge"):
+            from controllers import geometria_controller as modulo
+        else:
+            from controllers import ejecutar_calculos as modulo
+        nombre = "ejecutar_calculo_cmc_automatico" if clave == "cmc" else f"ejecutar_calculo_{clave}"
+        funcion = getattr(modulo, nombre)
+        args = (estructura_actual, state) if clave in SIN_GRAFICOS else (estructura_actual, state, generar_plots)
+        if clave in CONTEXTO_PROPIO:
+            with usar_contexto(descartar_al_salir=True):
+                return funcion(*args)
+        return funcion(*args)
+    return ejecutar
+
+
+def ejecutar_etapas_estructura(estructura_actual, state, calculos_activos, generar_plots=True, max_paralelas=None):
+    """
+    Ejecuta las etapas activas de una estructura en paralelo según sus dependencias
+
+    Returns:
+        {clave de etapa: resultado de ejecutar_calculo_<etapa>} en el orden de la secuencia
+    """
+    activas = [clave for clave in ETAPAS if clave in calculos_activos]
+    tareas = {clave: _etapa(clave, estructura_actual, state, generar_plots) for clave in activas}
+    if (max_paralelas or ETAPAS_PARALELAS) > 1 and len(tareas) > 1:
+        print(f"🧭 Etapas en paralelo (hasta {max_paralelas or ETAPAS_PARALELAS}): {', '.join(NOMBRES[c] for c in activas)}")
+    return ejecutar_grafo(tareas, dependencias_etapas(activas), max_paralelas)
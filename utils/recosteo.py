@@ -0,0 +1,278 @@
+"""
+Recosteo sin recalcular la ingeniería
+
+El costo de una estructura (calcular_costeo_completo) es lineal en cantidades que salen de
+SPH, DGE y Fundación (postes, longitud, resistencia, crucetas, ménsulas, vínculos, volumen
+de hormigón). Si cambian solo los precios, la longitud de traza, el criterio de RR o las
+cantidades, no hace falta volver a calcular las etapas: con las cantidades guardadas de
+cada estructura (y de cada vano, en vano económico) el costo es un producto matricial.
+
+    costos[escenario, vano, estructura] = cantidades[vano, estructura, :] · precios[escenario, vano, estructura, :]
+
+Un escenario de precios es:
+    None                      precios guardados de cada estructura (los del último cálculo)
+    {"postes": ..., ...}      mismos parámetros de costeo para todas las estructuras
+    {titulo: {...}, ...}      parámetros por estructura (las que faltan usan los guardados)
+"""
+
+import copy
+import hashlib
+import json
+
+import numpy as np
+
+from utils.calculo_costeo import cantidades_costeo, coeficientes_costeo
+
+CLAVES_PRECIOS = ("postes", "accesorios", "fundaciones", "montaje", "adicional_estructura")
+# Campos de la familia que no cambian la ingeniería
+CAMPOS_SIN_INGENIERIA = ("costeo", "cantidad", "Cantidad", "fecha_creacion", "fecha_modificacion", "version")
+TIPOS_VANO_ECONOMICO = ("S", "RR", "RA", "T")
+AJUSTES_CANTIDADES = ("longtraza", "criterio_rr", "rr_cada_x_m", "rr_cada_x_s", "cant_rr_manual")
+
+
+def hash_ingenieria_familia(familia_data):
+    """Hash de la familia sin precios ni cantidades: si no cambia, alcanza con recostear"""
+    def limpiar(datos):
+        return {k: v for k, v in datos.items() if k not in CAMPOS_SIN_INGENIERIA}
+    familia = limpiar(familia_data)
+    familia["estructuras"] = {n: limpiar(d) for n, d in familia_data.get("estructuras", {}).items()}
+    texto = json.dumps(familia, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.md5(texto.encode("utf-8")).hexdigest()
+
+
+def datos_costeo_familia(resultado_familia):
+    """
+    {titulo: {"datos_estructura", "parametros_precios"}} desde el resultado de
+    ejecutar_calculo_familia_completa (cache de costeo de cada estructura)
+    """
+    datos = {}
+    for datos_estr in resultado_familia.get("resultados_estructuras", {}).values():
+        costeo = (datos_estr.get("resultados") or {}).get("costeo") or {}
+        resultados = costeo.get("resultados") or {}
+        if "error" in datos_estr or not resultados.get("datos_estructura"):
+            continue
+        datos[datos_estr["titulo"]] = {
+            "datos_estructura": resultados["datos_estructura"],
+            "parametros_precios": resultados.get("parametros_precios") or costeo.get("parametros_precios") or {},
+        }
+    return datos
+
+
+def _precios(escenario, titulo, guardados):
+    if escenario is None:
+        return guardados
+    if any(clave in escenario for clave in CLAVES_PRECIOS):
+        return escenario
+    return escenario.get(titulo, guardados)
+
+
+def matriz_costos(datos_por_vano, titulos, escenarios):
+    """
+    Costos individuales [escenario, vano, estructura] (NaN si la estructura no tiene
+    datos de costeo en ese vano)
+
+    Args:
+        datos_por_vano: lista (un elemento por vano) de {titulo: datos de datos_costeo_familia}
+        titulos: orden de las estructuras
+        escenarios: lista de escenarios de precios (ver docstring del módulo)
+    """
+    n_vanos, n_estr, n_terminos = len(datos_por_vano), len(titulos), 8
+    cantidades = np.full((n_vanos, n_estr, n_terminos), np.nan)
+    precios = np.zeros((len(escenarios), n_vanos, n_estr, n_terminos))
+    for v, datos_vano in enumerate(datos_por_vano):
+        for e, titulo in enumerate(titulos):
+            datos = datos_vano.get(titulo)
+            if not datos:
+                continue
+            cantidades[v, e] = cantidades_costeo(datos["datos_estructura"])
+            for s, escenario in enumerate(escenarios):
+                precios[s, v, e] = coeficientes_costeo(_precios(escenario, titulo, datos["parametros_precios"]))
+    return np.einsum("vek,svek->sve", cantidades, precios)
+
+
+def recostear_familia(resultado_familia, parametros_precios=None):
+    """
+    Resultado de familia con costos recalculados para otros precios (sin recalcular etapas)
+
+    Actualiza costo_individual, el resumen de costos del costeo de cada estructura, el
+    costeo global y los gráficos de la familia.
+    """
+    from utils.calcular_familia_logica_encadenada import _generar_costeo_familia, _generar_graficos_familia
+
+    nuevo = copy.deepcopy(resultado_familia)
+    datos = datos_costeo_familia(nuevo)
+    titulos = list(datos)
+    costos = matriz_costos([datos], titulos, [parametros_precios])[0, 0]
+    for datos_estr in nuevo.get("resultados_estructuras", {}).values():
+        titulo = datos_estr.get("titulo")
+        if titulo not in datos:
+            continue
+        costo = float(costos[titulos.index(titulo)])
+        datos_estr["costo_individual"] = costo
+        resultados_costeo = datos_estr["resultados"]["costeo"]["resultados"]
+        resultados_costeo.setdefault("resumen_costos", {})["costo_total"] = costo
+        resultados_costeo["parametros_precios"] = _precios(parametros_precios, titulo, datos[titulo]["parametros_precios"])
+    nuevo["costeo_global"] = _generar_costeo_familia(nuevo.get("resultados_estructuras", {}))
+    nuevo["graficos_familia"] = _generar_graficos_familia(nuevo.get("resultados_estructuras", {}))
+    return nuevo
+
+
+def _resultado_vano(resultados, vano):
+    """Resultado de un vano (las claves numéricas quedan como texto al pasar por JSON)"""
+    por_vano = resultados.get("resultados", {})
+    for clave in (vano, str(vano), str(float(vano))):
+        if clave in por_vano:
+            return clave, por_vano[clave]
+    return None, None
+
+
+def tipos_vano_economico(datos_estructura):
+    """Tipos (S, RR, RA, T) en los que cuenta una estructura, con el criterio de _calcular_costo_tipo"""
+    tipo = datos_estructura.get("TIPO_ESTRUCTURA", "")
+    alpha = datos_estructura.get("alpha", 0)
+    return {
+        "S": "Suspensi" in tipo,
+        "RR": "Retenci" in tipo and alpha == 0,
+        "RA": ("Retenci" in tipo or "Angular" in tipo) and alpha > 0,
+        "T": "Terminal" in tipo,
+    }
+
+
+def cantidades_vanos(vanos, longtraza, criterio_rr, rr_cada_x_m, rr_cada_x_s, cant_rr_manual, cant_ra):
+    """calcular_cantidades (utils/vano_economico_utils.py) para todos los vanos a la vez"""
+    vanos = np.asarray(vanos, dtype=float)
+    cant_s = np.ceil(longtraza / vanos)
+    if criterio_rr == "Distancia":
+        cant_rr = np.full_like(vanos, np.ceil(longtraza / rr_cada_x_m) - 1 - cant_ra)
+    elif criterio_rr == "Suspensiones":
+        cant_rr = np.ceil(cant_s / rr_cada_x_s) - cant_ra
+    else:  # Manual
+        cant_rr = np.full_like(vanos, cant_rr_manual)
+    return {
+        "cant_T": np.full_like(vanos, 2),
+        "cant_S": cant_s,
+        "cant_RR": np.maximum(cant_rr, 0),
+        "cant_RA": np.full_like(vanos, cant_ra),
+    }
+
+
+def puede_recostear(calculo_guardado, familia_data, vano_min, vano_max, salto):
+    """El cache de vano económico tiene los mismos vanos, la misma ingeniería y cantidades por vano"""
+    if not calculo_guardado:
+        return False
+    parametros = calculo_guardado.get("parametros", {})
+    resultados = calculo_guardado.get("resultados", {})
+    if (parametros.get("vano_min"), parametros.get("vano_max"), parametros.get("salto")) != (vano_min, vano_max, salto):
+        return False
+    if parametros.get("hash_ingenieria") != hash_ingenieria_familia(familia_data):
+        return False
+    for vano in resultados.get("vanos", []):
+        _, resultado_vano = _resultado_vano(resultados, vano)
+        if not resultado_vano or "datos_costeo" not in resultado_vano:
+            return False
+    return bool(resultados.get("vanos"))
+
+
+def costos_vano_economico(resultados, escenarios=(None,), **ajustes):
+    """
+    Curvas de vano económico para varios escenarios de precios
+
+    Args:
+        resultados: resultados de calcular_vano_economico_iterativo (con datos_costeo por vano)
+        escenarios: escenarios de precios (ver docstring del módulo)
+        ajustes: longtraza, criterio_rr, rr_cada_x_m, rr_cada_x_s, cant_rr_manual. Si se
+            indica longtraza o criterio_rr se recalculan las cantidades de todos los vanos;
+            si no, se usan las guardadas.
+    Returns:
+        dict con "vanos", "titulos", "cantidades" ({cant_X: array por vano}),
+        "costos_individuales" [escenario, vano, estructura] y "costos_totales" [escenario, vano]
+    """
+    vanos = list(resultados["vanos"])
+    por_vano = [_resultado_vano(resultados, v)[1] for v in vanos]
+    if any(r is None or "datos_costeo" not in r for r in por_vano):
+        raise ValueError("El cache de vano económico no tiene datos de costeo por vano; recalcular")
+
+    familia = por_vano[0]["familia_modificada"]["estructuras"]
+    titulos = [d.get("TITULO", n) for n, d in familia.items()]
+    tipos = [tipos_vano_economico(d) for d in familia.values()]
+
+    cant_ra = por_vano[0]["cantidades"]["cant_RA"]
+    if ajustes.get("longtraza") is not None or ajustes.get("criterio_rr") is not None:
+        parametros = {clave: ajustes.get(clave) for clave in AJUSTES_CANTIDADES}
+        if parametros["longtraza"] is None:
+            parametros["longtraza"] = resultados["longtraza"]
+        if parametros["criterio_rr"] is None:
+            parametros["criterio_rr"] = resultados["criterio_rr"]
+        cantidades = cantidades_vanos(vanos, cant_ra=cant_ra, **parametros)
+    else:
+        cantidades = {c: np.array([r["cantidades"][c] for r in por_vano], dtype=float)
+                      for c in ("cant_T", "cant_S", "cant_RR", "cant_RA")}
+
+    costos = matriz_costos([r["datos_costeo"] for r in por_vano], titulos, list(escenarios))
+
+    # Por tipo cuenta la primera estructura con costo, como _calcular_costo_tipo
+    totales = np.zeros(costos.shape[:2])
+    for tipo in TIPOS_VANO_ECONOMICO:
+        indices = [i for i, t in enumerate(tipos) if t[tipo]]
+        if not indices:
+            continue
+        del_tipo = costos[:, :, indices]
+        validos = ~np.isnan(del_tipo)
+        primero = np.argmax(validos, axis=2)
+        costo_tipo = np.take_along_axis(del_tipo, primero[..., None], axis=2)[..., 0]
+        costo_tipo = np.where(validos.any(axis=2), costo_tipo, 0.0)
+        totales += costo_tipo * cantidades[f"cant_{tipo}"]
+
+    return {
+        "vanos": vanos,
+        "titulos": titulos,
+        "cantidades": cantidades,
+        "costos_individuales": costos,
+        "costos_totales": totales,
+    }
+
+
+def recostear_vano_economico(resultados, parametros_precios=None, **ajustes):
+    """
+    Resultados de vano económico recalculados para otros precios o cantidades, con el mismo
+    formato que calcular_vano_economico_iterativo (las vistas y el cache no cambian)
+    """
+    from utils.vano_economico_utils import modificar_vano_y_cantidades_familia
+
+    curvas = costos_vano_economico(resultados, [parametros_precios], **ajustes)
+    nuevo = copy.deepcopy(resultados)
+    for clave in ("longtraza", "criterio_rr"):
+        if ajustes.get(clave) is not None:
+            nuevo[clave] = ajustes[clave]
+
+    por_vano = {}
+    for v, vano in enumerate(curvas["vanos"]):
+        _, resultado_vano = _resultado_vano(nuevo, vano)
+        cantidades = {c: int(valores[v]) for c, valores in curvas["cantidades"].items()}
+        familia = modificar_vano_y_cantidades_familia(resultado_vano["familia_modificada"], vano, cantidades)
+
+        costos_individuales, costos_parciales = {}, {}
+        for e, titulo in enumerate(curvas["titulos"]):
+            costo = curvas["costos_individuales"][0, v, e]
+            if np.isnan(costo):
+                continue
+            datos = next((d for d in familia["estructuras"].values() if d.get("TITULO") == titulo), {})
+            costos_individuales[titulo] = float(costo)
+            costos_parciales[titulo] = float(costo) * datos.get("cantidad", 1)
+            if parametros_precios is not None:
+                guardados = resultado_vano["datos_costeo"][titulo]["parametros_precios"]
+                resultado_vano["datos_costeo"][titulo]["parametros_precios"] = _precios(parametros_precios, titulo, guardados)
+
+        resultado_vano.update({
+            "costo_global": sum(costos_parciales.values()),
+            "costeo_detalle": {
+                "costo_global": sum(costos_parciales.values()),
+                "costos_individuales": costos_individuales,
+                "costos_parciales": costos_parciales,
+            },
+            "cantidades": cantidades,
+            "familia_modificada": familia,
+        })
+        por_vano[vano] = resultado_vano
+    nuevo["resultados"] = por_vano
+    return nuevo
@@ -0,0 +1,72 @@
+"""
+Tablas de tendido (tensión y flecha vs temperatura por vano) a partir de un cálculo mecánico
+
+El cálculo de Cable_AEA.tabla_tendido es vectorizado sobre vanos × temperaturas × estados;
+este módulo lo conecta con los resultados de calculo_mecanico y lo lleva a DataFrame y gráfico.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+def estado_basico_desde_resultados(resultados, estado_id):
+    """Estado de referencia para tabla_tendido tomado de los resultados de calculo_mecanico"""
+    res = resultados[estado_id]
+    return {
+        "tension_daN_mm2": res["tension_daN_mm2"],
+        "temperatura_C": res["temperatura_C"],
+        "carga_unitaria_daN_m": res["carga_unitaria_daN_m"],
+    }
+
+
+def tabla_tendido_cable(cable, resultados, estado_id, vanos, temperaturas, vano_regulador=None,
+                        estados=None, parametros_viento=None):
+    """Atajo: tabla_tendido del cable desde el estado `estado_id` de sus resultados"""
+    return cable.tabla_tendido(
+        vanos, temperaturas, estado_basico_desde_resultados(resultados, estado_id),
+        vano_regulador=vano_regulador, estados=estados, parametros_viento=parametros_viento,
+    )
+
+
+def tabla_tendido_a_dataframe(tabla):
+    """Formato largo: una fila por estado, temperatura y vano"""
+    n_estados, n_temp, n_vanos = tabla["tension_daN_mm2"].shape
+    estado, temperatura, vano = np.meshgrid(
+        np.arange(n_estados), tabla["temperaturas"], tabla["vanos"], indexing="ij"
+    )
+    return pd.DataFrame({
+        'Estado': np.asarray(tabla["estados"], dtype=object)[estado.ravel()],
+        'Temperatura [°C]': temperatura.ravel(),
+        'Vano [m]': vano.ravel(),
+        'Tensión [daN/mm2]': tabla["tension_daN_mm2"].ravel(),
+        'Tiro [daN]': tabla["tiro_daN"].ravel(),
+        'Flecha Vertical [m]': tabla["flecha_vertical_m"].ravel(),
+        'Flecha [m]': tabla["flecha_resultante_m"].ravel(),
+        '% rotura': tabla["porcentaje_rotura"].ravel(),
+    }).round(3)
+
+
+def crear_grafico_tabla_tendido(tabla, estado=0, titulo=None):
+    """Flecha vertical vs temperatura, una curva por vano, para un estado de la tabla"""
+    indice = tabla["estados"].index(estado) if isinstance(estado, str) else estado
+    fig = go.Figure()
+    for j, vano in enumerate(tabla["vanos"]):
+        fig.add_trace(go.Scatter(
+            x=tabla["temperaturas"],
+            y=tabla["flecha_vertical_m"][indice, :, j],
+            mode="lines+markers",
+            name=f"{vano:g} m",
+        ))
+    if titulo is None:
+        titulo = f"Tabla de tendido - {tabla['estados'][indice]}"
+        if tabla.get("vano_regulador"):
+            titulo += f" (vano regulador {tabla['vano_regulador']:g} m)"
+    fig.update_layout(
+        title=titulo,
+        xaxis_title="Temperatura [°C]",
+        yaxis_title="Flecha vertical [m]",
+        legend_title="Vano",
+        template="plotly_white",
+    )
+    return fig
@@ -0,0 +1,294 @@
+"""
+Traza de línea: cargas por piquete para muchos vanos a la vez
+
+Las herramientas por estructura trabajan con un vano representativo (L_vano, H_PIQANTERIOR,
+H_PIQPOSTERIOR). Este módulo recibe la traza completa y calcula, para todos los piquetes
+juntos, con la física de Cable_AEA:
+
+- vano regulador de cada tramo entre retenciones y su tensión en cada estado climático
+  (ecuación de cambio de estado vectorizada sobre estados × tramos)
+- vano viento (semisuma de vanos adyacentes) y vano peso (vértices de catenarias) por piquete
+- cargas por cable en cada piquete: vertical, transversal (viento + resultante de ángulo)
+  y longitudinal (desequilibrio de tiros)
+
+y marca los piquetes cuyas cargas superan las de diseño de la estructura asignada, que se
+obtienen con el mismo cálculo aplicado a la condición de diseño de cada estructura de la
+familia (L_vano, alpha, desnivel).
+
+Piquete: {"nombre", "progresiva" [m], "cota" [m], "angulo" [°], "estructura" (TITULO),
+          "retencion" (bool; el primero y el último siempre lo son)}
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COLUMNAS_TRAZA = {
+    "Piquete": "nombre",
+    "Progresiva [m]": "progresiva",
+    "Cota [m]": "cota",
+    "Ángulo [°]": "angulo",
+    "Estructura": "estructura",
+    "Retención": "retencion",
+}
+CARGAS = ("carga_vertical_daN", "carga_transversal_daN", "carga_longitudinal_daN")
+
+
+def piquetes_desde_dataframe(df):
+    """Piquetes desde una tabla con las columnas de COLUMNAS_TRAZA (o sus claves internas)"""
+    df = df.rename(columns=COLUMNAS_TRAZA)
+    piquetes = []
+    for i, fila in enumerate(df.to_dict("records")):
+        piquetes.append({
+            "nombre": str(fila.get("nombre") or f"P{i + 1}"),
+            "progresiva": float(fila["progresiva"]),
+            "cota": float(fila.get("cota") or 0.0),
+            "angulo": float(fila.get("angulo") or 0.0),
+            "estructura": fila.get("estructura"),
+            "retencion": bool(fila.get("retencion") or False),
+        })
+    return piquetes
+
+
+def leer_traza(ruta):
+    """Lee una traza desde CSV o JSON (lista de piquetes o {"piquetes": [...]})"""
+    ruta = Path(ruta)
+    if ruta.suffix.lower() == ".csv":
+        return piquetes_desde_dataframe(pd.read_csv(ruta))
+    datos = json.loads(ruta.read_text(encoding="utf-8"))
+    if isinstance(datos, dict):
+        datos = datos.get("piquetes", [])
+    return piquetes_desde_dataframe(pd.DataFrame(datos))
+
+
+def tramos_tension(piquetes):
+    """Índice de tramo de cada vano: se corta en cada piquete de retención"""
+    retencion = np.array([bool(p.get("retencion")) for p in piquetes[1:-1]], dtype=int)
+    return np.concatenate([[0], np.cumsum(retencion)]) if len(piquetes) > 1 else np.zeros(0, dtype=int)
+
+
+def vanos_reguladores(vanos, tramo):
+    """Vano regulador de cada tramo: sqrt(ΣL³ / ΣL)"""
+    n_tramos = int(tramo.max()) + 1 if len(tramo) else 0
+    suma_l3 = np.bincount(tramo, weights=vanos**3, minlength=n_tramos)
+    suma_l = np.bincount(tramo, weights=vanos, minlength=n_tramos)
+    return np.sqrt(suma_l3 / suma_l)
+
+
+def _cargas_por_vano(cable, estados, vanos, parametros_viento):
+    """[estado, vano] -> peso vertical, carga de viento y carga vectorial [daN/m]"""
+    filas = [[cable._cargas_estado(L, {**estado, "temperatura": estado.get("temperatura", 0)}, parametros_viento)
+              for L in vanos] for estado in estados.values()]
+    return tuple(np.array([[c[campo] for c in fila] for fila in filas], dtype=float)
+                 for campo in ("peso_total", "carga_viento", "G"))
+
+
+def tensiones_tramos(cable, estados, estado_basico, reguladores, parametros_viento):
+    """
+    Tensión [daN/mm²] de cada estado en cada tramo (vano regulador) desde el estado básico,
+    resolviendo todas las ecuaciones de cambio de estado juntas
+
+    Returns:
+        tuple: (tensión [estado, tramo], peso, carga de viento y G [estado, tramo])
+    """
+    E = cable.modulo_elasticidad_dan_mm2
+    S = cable.seccion_mm2
+    alfa = cable.coeficiente_dilatacion
+    t0 = estado_basico["tension_daN_mm2"]
+    q0 = estado_basico["temperatura_C"]
+    Go = estado_basico.get("carga_unitaria_daN_m") or cable.cargaPeso(espesor_hielo_m=0)
+
+    peso, viento, G = _cargas_por_vano(cable, estados, reguladores, parametros_viento)
+    q = np.array([e["temperatura"] for e in estados.values()], dtype=float)[:, None]
+    L = np.asarray(reguladores, dtype=float)[None, :]
+    A = (L**2 * E * Go**2) / (24 * t0**2 * S**2) + alfa * E * (q - q0) - t0
+    B = -(L**2 * E * G**2) / (24 * S**2)
+    return cable._resolver_ecuacion_cubica_vectorizada(A, B, semilla=t0), peso, viento, G
+
+
+def cargas_piquetes(cable, L_atras, L_adelante, h_atras, h_adelante, angulo,
+                    tiro_atras, tiro_adelante, peso_atras, peso_adelante, viento_atras, viento_adelante):
+    """
+    Cargas por cable en piquetes (todo vectorizado, arrays [estado, piquete]; un vano de
+    longitud 0 indica que no hay vano de ese lado)
+
+    Returns:
+        dict: vano_viento_m, vano_peso_m, carga_vertical_daN, carga_transversal_daN,
+            carga_longitudinal_daN
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a_atras = np.where(tiro_atras > 0, tiro_atras / peso_atras, 1.0)
+        a_adelante = np.where(tiro_adelante > 0, tiro_adelante / peso_adelante, 1.0)
+        d_atras = np.where(L_atras > 0, cable._distancia_al_vertice(L_atras, h_atras, a_atras), 0.0)
+        d_adelante = np.where(L_adelante > 0, cable._distancia_al_vertice(L_adelante, h_adelante, a_adelante), 0.0)
+
+    medio = np.radians(angulo) / 2
+    vertical = peso_atras * d_atras + peso_adelante * d_adelante
+    transversal = (viento_atras * L_atras + viento_adelante * L_adelante) / 2 \
+        + (tiro_atras + tiro_adelante) * np.sin(medio)
+    longitudinal = np.abs(tiro_adelante - tiro_atras) * np.cos(medio)
+    return {
+        "vano_viento_m": (L_atras + L_adelante) / 2,
+        "vano_peso_m": d_atras + d_adelante,
+        "carga_vertical_daN": vertical,
+        "carga_transversal_daN": transversal,
+        "carga_longitudinal_daN": longitudinal,
+    }
+
+
+def calcular_traza(piquetes, cable, estados, estado_basico, parametros_viento=None):
+    """
+    Tramos, vanos reguladores, tensiones y cargas por piquete de toda la traza
+
+    Args:
+        piquetes (list): Piquetes ordenados por progresiva
+        cable: Cable_AEA
+        estados (dict): Estados climáticos {id: {temperatura, viento_velocidad, espesor_hielo}}
+        estado_basico (dict): tension_daN_mm2, temperatura_C (y opcional carga_unitaria_daN_m),
+            p. ej. utils.tabla_tendido.estado_basico_desde_resultados(resultados_cmc, id)
+        parametros_viento (dict, optional): exposicion, clase, Zc, Cf
+
+    Returns:
+        dict: vanos, tramo (por vano), vanos_reguladores, tension_tramos_daN_mm2
+            [estado, tramo] y las cargas de cargas_piquetes [estado, piquete]
+    """
+    if len(piquetes) < 2:
+        raise ValueError("La traza necesita al menos dos piquetes")
+    parametros_viento = parametros_viento or {}
+    progresiva = np.array([p["progresiva"] for p in piquetes], dtype=float)
+    cota = np.array([p.get("cota", 0.0) for p in piquetes], dtype=float)
+    angulo = np.array([p.get("angulo", 0.0) for p in piquetes], dtype=float)
+    vanos = np.diff(progresiva)
+    if np.any(vanos <= 0):
+        raise ValueError("Las progresivas de la traza deben ser crecientes")
+    desniveles = np.diff(cota)
+
+    tramo = tramos_tension(piquetes)
+    reguladores = vanos_reguladores(vanos, tramo)
+    tension, peso, viento, _ = tensiones_tramos(cable, estados, estado_basico, reguladores, parametros_viento)
+    tiro_vano = tension[:, tramo] * cable.seccion_mm2
+
+    # Vano atrás / adelante de cada piquete (0 en los extremos)
+    n_estados = len(estados)
+    cero = np.zeros((n_estados, 1))
+
+    def atras(x):
+        return np.concatenate([cero, x], axis=1)
+
+    def adelante(x):
+        return np.concatenate([x, cero], axis=1)
+
+    L = np.broadcast_to(vanos, (n_estados, len(vanos)))
+    h = np.broadcast_to(desniveles, (n_estados, len(vanos)))
+    cargas = cargas_piquetes(
+        cable,
+        L_atras=atras(L), L_adelante=adelante(L),
+        # Cota del piquete vecino respecto del actual
+        h_atras=atras(-h), h_adelante=adelante(h),
+        angulo=angulo[None, :],
+        tiro_atras=atras(tiro_vano), tiro_adelante=adelante(tiro_vano),
+        peso_atras=atras(peso[:, tramo]), peso_adelante=adelante(peso[:, tramo]),
+        viento_atras=atras(viento[:, tramo]), viento_adelante=adelante(viento[:, tramo]),
+    )
+    cargas["vano_viento_m"] = cargas["vano_viento_m"][0]
+    return {
+        "piquetes": [p.get("nombre") for p in piquetes],
+        "estructuras": [p.get("estructura") for p in piquetes],
+        "retencion": [i in (0, len(piquetes) - 1) or bool(p.get("retencion")) for i, p in enumerate(piquetes)],
+        "estados": list(estados.keys()),
+        "vanos": vanos,
+        "tramo": tramo,
+        "vanos_reguladores": reguladores,
+        "tension_tramos_daN_mm2": tension,
+        **cargas,
+    }
+
+
+def disenos_familia(estructuras, cable, estados, estado_basico, parametros_viento=None):
+    """
+    Condición y cargas de diseño (máximo entre estados) de cada estructura de la familia
+
+    La condición de diseño es la de la estructura: vanos L_vano a ambos lados, ángulo alpha,
+    desnivel H_PIQANTERIOR/H_PIQPOSTERIOR si VANO_DESNIVELADO; las terminales tienen un solo
+    vano. Se evalúan todas juntas con cargas_piquetes.
+
+    Returns:
+        dict: {TITULO: {tipo, vano_max_m, angulo_max, carga_*_daN}}
+    """
+    datos = [d for d in estructuras.values() if d.get("TITULO") and d.get("L_vano")]
+    if not datos:
+        return {}
+    parametros_viento = parametros_viento or {}
+    L = np.array([float(d["L_vano"]) for d in datos])
+    terminal = np.array(["Terminal" in d.get("TIPO_ESTRUCTURA", "") for d in datos])
+    desnivel = np.array([bool(d.get("VANO_DESNIVELADO")) for d in datos])
+    h_atras = np.where(desnivel, [float(d.get("H_PIQANTERIOR") or 0) for d in datos], 0.0)
+    h_adelante = np.where(desnivel, [float(d.get("H_PIQPOSTERIOR") or 0) for d in datos], 0.0)
+    angulo = np.array([float(d.get("alpha") or 0) for d in datos])
+
+    tension, peso, viento, _ = tensiones_tramos(cable, estados, estado_basico, L, parametros_viento)
+    tiro = tension * cable.seccion_mm2
+    L_adelante = np.where(terminal, 0.0, L)[None, :]
+    cargas = cargas_piquetes(
+        cable, L_atras=L[None, :], L_adelante=L_adelante, h_atras=h_atras[None, :], h_adelante=h_adelante[None, :],
+        angulo=angulo[None, :], tiro_atras=tiro, tiro_adelante=np.where(terminal, 0.0, tiro),
+        peso_atras=peso, peso_adelante=peso, viento_atras=viento, viento_adelante=viento,
+    )
+    disenos = {}
+    for j, d in enumerate(datos):
+        disenos[d["TITULO"]] = {
+            "tipo": d.get("TIPO_ESTRUCTURA", ""),
+            "vano_max_m": float(L[j]),
+            "angulo_max": float(angulo[j]),
+            **{campo: float(cargas[campo][:, j].max()) for campo in CARGAS},
+        }
+    return disenos
+
+
+def verificar_traza(traza, disenos, tolerancia=0.0):
+    """
+    Compara la envolvente de cargas de cada piquete con el diseño de su estructura
+
+    Returns:
+        DataFrame: una fila por piquete, con envolventes, cargas de diseño y observaciones
+            ("Excede" True si alguna supera el diseño por más de `tolerancia`)
+    """
+    envolvente = {campo: traza[campo].max(axis=0) for campo in CARGAS}
+    filas = []
+    for i, (nombre, estructura) in enumerate(zip(traza["piquetes"], traza["estructuras"])):
+        diseno = disenos.get(estructura)
+        observaciones = []
+        if diseno is None:
+            observaciones.append(f"estructura '{estructura}' sin diseño en la familia")
+        else:
+            limite = 1 + tolerancia
+            if traza["vano_viento_m"][i] > diseno["vano_max_m"] * limite:
+                observaciones.append("vano viento")
+            for campo in CARGAS:
+                if diseno[campo] > 0 and envolvente[campo][i] > diseno[campo] * limite:
+                    observaciones.append(campo.replace("carga_", "").replace("_daN", ""))
+            if traza["retencion"][i] and "Suspensi" in diseno["tipo"]:
+                observaciones.append("retención con estructura de suspensión")
+        filas.append({
+            "Piquete": nombre,
+            "Estructura": estructura,
+            "Vano viento [m]": traza["vano_viento_m"][i],
+            "Vano peso mín. [m]": traza["vano_peso_m"][:, i].min(),
+            "Vertical [daN]": envolvente["carga_vertical_daN"][i],
+            "Transversal [daN]": envolvente["carga_transversal_daN"][i],
+            "Longitudinal [daN]": envolvente["carga_longitudinal_daN"][i],
+            "Vertical diseño [daN]": diseno["carga_vertical_daN"] if diseno else np.nan,
+            "Transversal diseño [daN]": diseno["carga_transversal_daN"] if diseno else np.nan,
+            "Longitudinal diseño [daN]": diseno["carga_longitudinal_daN"] if diseno else np.nan,
+            "Excede": bool(observaciones),
+            "Observaciones": ", ".join(observaciones),
+        })
+    df = pd.DataFrame(filas)
+    excedidos = int(df["Excede"].sum())
+    if excedidos:
+        print(f"⚠️ Traza: {excedidos} de {len(df)} piquete(s) superan el diseño de su estructura")
+    else:
+        print(f"✅ Traza: {len(df)} piquetes dentro del diseño de su estructura")
+    return df
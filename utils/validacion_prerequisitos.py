@@ -5,34 +5,34 @@ from utils.calculo_cache import CalculoCache
 
 def validar_prerequisitos_fundacion(nombre_estructura):
     """Valida que existan SPH y DME antes de ejecutar fundación"""
-    sph_existe = CalculoCache.cargar_calculo_sph(nombre_estructura) is not None
-    dme_existe = CalculoCache.cargar_calculo_dme(nombre_estructura) is not None
+    sph_existe = CalculoCache.existe_calculo(nombre_estructura, 'SPH')
+    dme_existe = CalculoCache.existe_calculo(nombre_estructura, 'DME')
     return sph_existe and dme_existe, f"SPH: {'✅' if sph_existe else '❌'}, DME: {'✅' if dme_existe else '❌'}"
 
 
 def validar_prerequisitos_costeo(nombre_estructura):
     """Valida que existan todos los prerequisitos para costeo"""
-    sph_existe = CalculoCache.cargar_calculo_sph(nombre_estructura) is not None
-    fund_existe = CalculoCache.cargar_calculo_fund(nombre_estructura) is not None
+    sph_existe = CalculoCache.existe_calculo(nombre_estructura, 'SPH')
+    fund_existe = CalculoCache.existe_calculo(nombre_estructura, 'FUND')
     return sph_existe and fund_existe, f"SPH: {'✅' if sph_existe else '❌'}, Fundación: {'✅' if fund_existe else '❌'}"
 
 
 def validar_prerequisitos_dme(nombre_estructura):
     """Valida que existan CMC y DGE antes de ejecutar DME"""
-    cmc_existe = CalculoCache.cargar_calculo_cmc(nombre_estructura) is not None
-    dge_existe = CalculoCache.cargar_calculo_dge(nombre_estructura) is not None
+    cmc_existe = CalculoCache.existe_calculo(nombre_estructura, 'CMC')
+    dge_existe = CalculoCache.existe_calculo(nombre_estructura, 'DGE')
     return cmc_existe and dge_existe, f"CMC: {'✅' if cmc_existe else '❌'}, DGE: {'✅' if dge_existe else '❌'}"
 
 
 def validar_prerequisitos_arboles(nombre_estructura):
     """Valida que exista DME antes de ejecutar árboles"""
-    dme_existe = CalculoCache.cargar_calculo_dme(nombre_estructura) is not None
+    dme_existe = CalculoCache.existe_calculo(nombre_estructura, 'DME')
     return dme_existe, f"DME: {'✅' if dme_existe else '❌'}"
 
 
 def validar_prerequisitos_sph(nombre_estructura):
     """Valida que exista DME antes de ejecutar SPH"""
-    dme_existe = CalculoCache.cargar_calculo_dme(nombre_estructura) is not None
+    dme_existe = CalculoCache.existe_calculo(nombre_estructura, 'DME')
     return dme_existe, f"DME: {'✅' if dme_existe else '❌'}"
 
 
@@ -45,7 +45,8 @@ def obtener_cadena_dependencias():
         'ARBOLES': ['DME'],
         'SPH': ['DME'],
         'FUNDACION': ['SPH', 'DME'],
-        'COSTEO': ['SPH', 'FUNDACION']
+        'COSTEO': ['SPH', 'FUNDACION'],
+        'AEE': ['DGE', 'DME']
     }
 
 
@@ -66,22 +67,22 @@ def validar_cadena_completa(nombre_estructura, hasta_calculo='COSTEO'):
     
     agregar_prerequisitos(hasta_calculo)
     
-    # Verificar que todos existan
+    # Verificar que todos existan (solo el índice de metadatos, sin leer los cálculos)
     faltantes = []
     for prereq in prerequisitos_necesarios:
         cache_existe = False
         if prereq == 'CMC':
-            cache_existe = CalculoCache.cargar_calculo_cmc(nombre_estructura) is not None
+            cache_existe = CalculoCache.existe_calculo(nombre_estructura, 'CMC')
         elif prereq == 'DGE':
-            cache_existe = CalculoCache.cargar_calculo_dge(nombre_estructura) is not None
+            cache_existe = CalculoCache.existe_calculo(nombre_estructura, 'DGE')
         elif prereq == 'DME':
-            cache_existe = CalculoCache.cargar_calculo_dme(nombre_estructura) is not None
+            cache_existe = CalculoCache.existe_calculo(nombre_estructura, 'DME')
         elif prereq == 'ARBOLES':
-            cache_existe = CalculoCache.cargar_calculo_arboles(nombre_estructura) is not None
+            cache_existe = CalculoCache.existe_calculo(nombre_estructura, 'ARBOLES')
         elif prereq == 'SPH':
-            cache_existe = CalculoCache.cargar_calculo_sph(nombre_estructura) is not None
+            cache_existe = CalculoCache.existe_calculo(nombre_estructura, 'SPH')
         elif prereq == 'FUNDACION':
-            cache_existe = CalculoCache.cargar_calculo_fund(nombre_estructura) is not None
+            cache_existe = CalculoCache.existe_calculo(nombre_estructura, 'FUND')
         
         if not cache_existe:
             faltantes.append(prereq)
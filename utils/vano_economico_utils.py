@@ -125,6 +125,7 @@ def calcular_vano_economico_iterativo(nombre_familia: str,
     """
     from utils.familia_manager import FamiliaManager
     from utils.calcular_familia_logica_encadenada import ejecutar_calculo_familia_completa
+    from utils.recosteo import datos_costeo_familia
     
     # Cargar familia base
     familia_base = FamiliaManager.cargar_familia(nombre_familia)
@@ -168,7 +169,9 @@ def calcular_vano_economico_iterativo(nombre_familia: str,
                 "costo_global": costo_global,
                 "costeo_detalle": resultado["costeo_global"],
                 "cantidades": cantidades,
-                "familia_modificada": familia_modificada  # Guardar familia para obtener alpha
+                "familia_modificada": familia_modificada,  # Guardar familia para obtener alpha
+                # Cantidades de ingeniería por estructura: permiten recostear sin recalcular (utils/recosteo.py)
+                "datos_costeo": datos_costeo_familia(resultado)
             }
             print(f"✅ Vano {vano}m: {costo_global:.2f} UM")
         else:
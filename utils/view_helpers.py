@@ -1,7 +1,6 @@
 """Helpers centralizados para vistas - Carga y guardado de datos de caché"""
 
 import base64
-import json
 from pathlib import Path
 from dash import html, dcc
 import dash_bootstrap_components as dbc
@@ -14,39 +13,29 @@ class ViewHelpers:
     # ==================== CARGA DE IMÁGENES ====================
     
     @staticmethod
-    def cargar_imagen_base64(nombre_archivo):
-        """Carga imagen y retorna string base64
+    def resolver_ruta_imagen(nombre_archivo):
+        """Busca la imagen en cache y, si no está, en la raíz del proyecto
         
         Args:
             nombre_archivo: Nombre del archivo PNG
             
         Returns:
-            String base64 o None si no existe
+            Path del archivo o None si no existe
         """
         img_path = CACHE_DIR / nombre_archivo
         print(f"Buscando imagen en cache: {img_path}")
-        if img_path.exists():
-            try:
-                with open(img_path, 'rb') as f:
-                    print(f"✅ Imagen cargada desde cache: {nombre_archivo}")
-                    return base64.b64encode(f.read()).decode()
-            except Exception as e:
-                print(f"❌ Error cargando imagen desde cache: {e}")
-                # seguir a búsqueda en repo root
-        else:
-            print(f"🔎 No encontrada en cache: {img_path}")
+        if img_path.is_file():
+            print(f"✅ Imagen encontrada en cache: {nombre_archivo}")
+            return img_path
+        print(f"🔎 No encontrada en cache: {img_path}")
 
         # Intentar buscar en carpeta raíz del proyecto (persistente aunque se borre cache)
         repo_root = Path(__file__).resolve().parents[1]
         candidate = repo_root / nombre_archivo
         print(f"Buscando imagen en repo root: {candidate}")
-        if candidate.exists():
-            try:
-                with open(candidate, 'rb') as f:
-                    print(f"✅ Imagen cargada desde repo root: {candidate.name}")
-                    return base64.b64encode(f.read()).decode()
-            except Exception as e:
-                print(f"❌ Error cargando imagen desde repo root: {e}")
+        if candidate.is_file():
+            print(f"✅ Imagen encontrada en repo root: {candidate.name}")
+            return candidate
 
         # Búsqueda más tolerante (case-insensitive / tokens) en repo root
         lower_target = nombre_archivo.lower()
@@ -54,18 +43,41 @@ class ViewHelpers:
             try:
                 if p.is_file() and p.suffix.lower() in ('.png', '.jpg', '.jpeg'):
                     if p.name.lower() == lower_target or ('logo' in p.name.lower() and 'distrocuyo' in p.name.lower()):
-                        try:
-                            with open(p, 'rb') as f:
-                                print(f"✅ Imagen encontrada por heurística en repo root: {p.name}")
-                                return base64.b64encode(f.read()).decode()
-                        except Exception as e:
-                            print(f"❌ Error cargando imagen heurística: {e}")
+                        print(f"✅ Imagen encontrada por heurística en repo root: {p.name}")
+                        return p
             except Exception:
                 continue
 
         print(f"❌ Imagen no encontrada en cache ni en repo root: {nombre_archivo}")
         return None
     
+    @staticmethod
+    def cargar_imagen_base64(nombre_archivo):
+        """Carga imagen y retorna string base64
+        
+        Durante una exportación en streaming (utils/html_streaming) retorna un
+        marcador con la ruta; los bytes se codifican al escribir el archivo.
+        
+        Args:
+            nombre_archivo: Nombre del archivo PNG
+            
+        Returns:
+            String base64 o None si no existe
+        """
+        from utils import html_streaming
+        
+        ruta = ViewHelpers.resolver_ruta_imagen(nombre_archivo)
+        if ruta is None:
+            return None
+        if html_streaming.streaming_activo():
+            return html_streaming.marcador_imagen(ruta)
+        try:
+            with open(ruta, 'rb') as f:
+                return base64.b64encode(f.read()).decode()
+        except Exception as e:
+            print(f"❌ Error cargando imagen {ruta}: {e}")
+            return None
+    
     @staticmethod
     def crear_img_component(nombre_archivo, style=None, className=None):
         """Crea componente html.Img desde archivo
@@ -160,10 +172,10 @@ class ViewHelpers:
             print(f"Advertencia: Figura vacía para {nombre_archivo}")
             return False
         
-        json_path = CACHE_DIR / nombre_archivo
         try:
-            # Usar write_json con encoding explícito
-            fig.write_json(str(json_path), pretty=False, engine='json')
+            # Arrays numéricos tipados (bdata) y gzip, ver utils/figuras_plotly.py
+            from utils.figuras_plotly import guardar_figura
+            guardar_figura(fig, nombre_archivo)
             print(f"✅ JSON guardado: {nombre_archivo}")
             return True
         except Exception as e:
@@ -182,27 +194,16 @@ class ViewHelpers:
         Returns:
             Dict con figura Plotly o None si no existe
         """
-        json_path = CACHE_DIR / nombre_archivo
-        if not json_path.exists():
-            print(f"⚠️ JSON no encontrado: {nombre_archivo}")
-            return None
-        
+        from utils.figuras_plotly import cargar_figura
         try:
-            # Intentar múltiples encodings
-            for encoding in ['utf-8', 'latin-1', 'cp1252']:
-                try:
-                    with open(json_path, 'r', encoding=encoding) as f:
-                        fig_dict = json.load(f)
-                        print(f"✅ JSON cargado: {nombre_archivo} (encoding: {encoding})")
-                        return fig_dict
-                except UnicodeDecodeError:
-                    continue
-            
-            # Si ninguno funciona, intentar con errors='ignore'
-            with open(json_path, 'r', encoding='utf-8', errors='ignore') as f:
-                fig_dict = json.load(f)
-                print(f"⚠️ JSON cargado con caracteres ignorados: {nombre_archivo}")
-                return fig_dict
+            # Lee el formato compacto (tipado/comprimido) y los JSON anteriores;
+            # el dict va directo a dcc.Graph, sin revalidar con go.Figure
+            fig_dict = cargar_figura(nombre_archivo)
+            if fig_dict is None:
+                print(f"⚠️ JSON no encontrado: {nombre_archivo}")
+                return None
+            print(f"✅ JSON cargado: {nombre_archivo}")
+            return fig_dict
         except Exception as e:
             print(f"❌ Error cargando JSON Plotly {nombre_archivo}: {e}")
             import traceback
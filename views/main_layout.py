@@ -18,6 +18,7 @@ from components.menu import (
 from components.vista_home import crear_vista_home
 from models.app_state import AppState
 from config.app_config import TOAST_DURATION
+from utils.almacen_estructuras import referenciar
 
 
 def crear_layout():
@@ -29,7 +30,9 @@ def crear_layout():
     
     return html.Div([
         # Almacenamiento de estado
-        dcc.Store(id="estructura-actual", data=estructura_actual),
+        # storage_type="session": al recargar la página se conserva la referencia de la pestaña
+        # (y con ella su sesión/contexto de cálculo) en lugar de abrir una sesión nueva
+        dcc.Store(id="estructura-actual", data=referenciar(estructura_actual), storage_type="session"),
         dcc.Store(id="estructuras-disponibles", data=state.estructura_manager.listar_estructuras()),
         dcc.Store(id="familia-actual-state", data=None),  # Store para familia de estructuras
         